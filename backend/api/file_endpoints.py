@@ -2,11 +2,11 @@
 File upload and management endpoints
 """
 from fastapi import APIRouter, UploadFile, File, HTTPException
-import tempfile
 import os
 
 # Import models from centralized location
 from backend.api.models import UploadResponse, CleanupResponse
+from backend.api.upload_storage import save_upload
 
 file_router = APIRouter()
 
@@ -17,24 +17,24 @@ uploaded_files = {}
 async def upload_file(file: UploadFile = File(...)):
     """Upload CSV file and return file info"""
     try:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
-        content = await file.read()
-        temp_file.write(content)
-        temp_file.close()
+        stored = await save_upload(file)
         
-        file_id = os.path.basename(temp_file.name)
+        file_id = os.path.basename(stored["temp_path"])
         uploaded_files[file_id] = {
             "original_name": file.filename,
-            "temp_path": temp_file.name,
-            "size": len(content)
+            **stored
         }
         
         return {
             "success": True,
             "file_id": file_id,
             "original_name": file.filename,
-            "size": len(content)
+            "size": stored["size"],
+            "content_hash": stored["content_hash"],
+            "line_count": stored["line_count"]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
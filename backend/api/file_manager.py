@@ -2,41 +2,44 @@
 File upload and management functionality
 Handles temporary file storage and cleanup for uploaded CSV files
 """
-import tempfile
 import os
-from typing import Dict
+from typing import Dict, Optional
 from fastapi import UploadFile, HTTPException
 
+from backend.api.upload_storage import save_upload
+
 
 class FileManager:
     """Manages uploaded file storage and cleanup"""
     
-    def __init__(self):
+    def __init__(self, max_upload_bytes: Optional[int] = None):
         self.uploaded_files: Dict[str, Dict] = {}
+        # None uses HISAABFLOW_MAX_UPLOAD_BYTES or the default limit
+        self.max_upload_bytes = max_upload_bytes
     
     async def upload_file(self, file: UploadFile) -> Dict[str, any]:
         """Upload CSV file and return file info"""
         try:
-            # Create temp file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
-            content = await file.read()
-            temp_file.write(content)
-            temp_file.close()
+            # Stream to a temp file, hashing and counting lines on the way
+            stored = await save_upload(file, self.max_upload_bytes)
             
             # Store file info
-            file_id = os.path.basename(temp_file.name)
+            file_id = os.path.basename(stored["temp_path"])
             self.uploaded_files[file_id] = {
                 "original_name": file.filename,
-                "temp_path": temp_file.name,
-                "size": len(content)
+                **stored
             }
             
             return {
                 "success": True,
                 "file_id": file_id,
                 "original_name": file.filename,
-                "size": len(content)
+                "size": stored["size"],
+                "content_hash": stored["content_hash"],
+                "line_count": stored["line_count"]
             }
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
@@ -3,12 +3,25 @@ Middleware setup for logging and request handling
 """
 from fastapi import Request
 
+from backend.infrastructure.config.unified_config_service import get_unified_config_service
+from backend.shared.utils.tracing import start_trace, tracing_enabled
+
 def setup_logging_middleware(app):
     """Setup logging middleware for the FastAPI app"""
     
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
         print(f" {request.method} {request.url} - Origin: {request.headers.get('origin', 'None')}")
-        response = await call_next(request)
+        # Tag trace events of this request so they can be fetched from /api/v1/trace/{trace_id}
+        trace_id = start_trace(request.headers.get('x-trace-id')) if tracing_enabled() else None
+        # Read one config snapshot for the whole request, even if configs are reloaded meanwhile
+        config_service = get_unified_config_service()
+        config_token = config_service.pin_snapshot()
+        try:
+            response = await call_next(request)
+        finally:
+            config_service.unpin_snapshot(config_token)
+        if trace_id:
+            response.headers['X-Trace-Id'] = trace_id
         print(f"Response: {response.status_code}")
         return response
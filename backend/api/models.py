@@ -74,6 +74,8 @@ class UploadResponse(BaseModel):
     file_id: str
     original_name: str
     size: int
+    content_hash: Optional[str] = None  # SHA-256 of the file bytes
+    line_count: Optional[int] = None
 
 
 class CleaningSummary(BaseModel):
@@ -127,6 +129,7 @@ class TransferAnalysis(BaseModel):
     potential_transfers: Optional[List[Dict[str, Any]]] = None
     conflicts: Optional[List[Dict[str, Any]]] = None
     flagged_transactions: Optional[List[Dict[str, Any]]] = None
+    session_id: Optional[str] = None
 
 
 class TransformationSummary(BaseModel):
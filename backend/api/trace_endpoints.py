@@ -0,0 +1,28 @@
+"""
+Structured trace endpoints for debugging transfer detection, bank detection and cleaning
+"""
+from fastapi import APIRouter, HTTPException
+from typing import Dict
+
+from backend.shared.utils.tracing import configure_tracing, get_trace, tracing_enabled
+
+trace_router = APIRouter()
+
+
+@trace_router.get("/trace/{trace_id}")
+async def get_request_trace(trace_id: str):
+    """Get the buffered trace events of one request (trace id from the X-Trace-Id response header)"""
+    events = get_trace(trace_id)
+    if not events:
+        raise HTTPException(status_code=404, detail=f"No trace events for '{trace_id}'")
+    return {"trace_id": trace_id, "count": len(events), "events": events}
+
+
+@trace_router.post("/trace/config")
+async def set_trace_config(levels: Dict[str, str]):
+    """Set per-module trace levels, e.g. {"transfer_detection": "debug", "*": "off"}"""
+    try:
+        configure_tracing(levels)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "enabled": tracing_enabled(), "levels": levels}
@@ -0,0 +1,71 @@
+"""
+Streaming storage for uploaded CSV files
+Copies an upload to a temp file in fixed-size chunks on a worker thread, hashing and
+counting lines as it goes, so the event loop never blocks on disk writes, memory use
+does not grow with the file, and later stages can key caches on the returned hash
+"""
+import contextlib
+import hashlib
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# HISAABFLOW_MAX_UPLOAD_BYTES overrides it
+DEFAULT_MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+
+
+def max_upload_bytes() -> int:
+    return int(os.environ.get('HISAABFLOW_MAX_UPLOAD_BYTES', DEFAULT_MAX_UPLOAD_BYTES))
+
+
+def _discard(temp_file) -> None:
+    """Close and remove a partly written temp file; a file already gone is not an error"""
+    temp_file.close()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(temp_file.name)
+
+
+async def save_upload(file: UploadFile, max_bytes: Optional[int] = None,
+                      chunk_size: int = UPLOAD_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Write an upload to a new temp .csv file. Returns its temp_path, size, content_hash
+    (SHA-256 hex digest, the same as FileBuffer.digest) and line_count. Raises a 413
+    HTTPException, leaving no file behind, if the upload is larger than max_bytes.
+    """
+    limit = max_bytes if max_bytes is not None else max_upload_bytes()
+    temp_file = await run_in_threadpool(tempfile.NamedTemporaryFile, delete=False, suffix=".csv")
+    digest = hashlib.sha256()
+    size = 0
+    line_count = 0
+    last_byte = b''
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > limit:
+                raise HTTPException(status_code=413, detail=f"File exceeds the {limit} byte upload limit")
+            digest.update(chunk)
+            line_count += chunk.count(b'\n')
+            last_byte = chunk[-1:]
+            await run_in_threadpool(temp_file.write, chunk)
+        await run_in_threadpool(temp_file.close)
+    except BaseException:
+        await run_in_threadpool(_discard, temp_file)
+        raise
+
+    # A last line without a trailing newline still counts
+    if size and last_byte != b'\n':
+        line_count += 1
+    return {
+        "temp_path": temp_file.name,
+        "size": size,
+        "content_hash": digest.hexdigest(),
+        "line_count": line_count
+    }
@@ -0,0 +1,21 @@
+"""
+Synthetic statement generation and benchmarks for the processing pipeline
+
+- synthetic_data: writes realistic CSV statements for every configured bank,
+  with a known set of planted transfer pairs
+- run_benchmarks: times parsing, transfer detection and the full transformation
+  at increasing history sizes and checks the planted pairs are recovered
+
+    python -m backend.benchmarks.run_benchmarks --sizes 1000 10000
+"""
+from backend.benchmarks.synthetic_data import (
+    BankProfile, PlantedPair, SyntheticDataset, SyntheticStatement, SyntheticStatementGenerator
+)
+
+__all__ = [
+    'BankProfile',
+    'PlantedPair',
+    'SyntheticDataset',
+    'SyntheticStatement',
+    'SyntheticStatementGenerator'
+]
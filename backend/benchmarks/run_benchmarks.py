@@ -0,0 +1,142 @@
+"""
+Benchmark runner for transfer detection and the full transformation pipeline
+
+For each history size, generates synthetic statements for every configured bank,
+then times:
+- parse: ParsingService.parse_single_file on every generated CSV
+- detect: TransferDetector.detect_transfers on the generated transactions
+- transform: TransformationService.transform_multi_csv_data on the parsed CSVs
+and checks that the planted transfer pairs are recovered.
+
+    python -m backend.benchmarks.run_benchmarks
+    python -m backend.benchmarks.run_benchmarks --sizes 1000 10000 --skip-transform --json results.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from backend.api.models import ParseConfig
+from backend.benchmarks.synthetic_data import SyntheticDataset, SyntheticStatementGenerator
+from backend.core.transfer_detection import TransferDetector
+from backend.services.parsing_service import ParsingService
+from backend.services.transformation_service import TransformationService
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+STAGES = ['generate', 'parse', 'detect', 'transform']
+
+
+@contextlib.contextmanager
+def _quiet(enabled: bool):
+    """Silence the pipeline's progress prints, which would otherwise dominate large runs"""
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def parse_statements(dataset: SyntheticDataset) -> List[Dict[str, Any]]:
+    """Parse every written statement the way the parse endpoint does, as a transform csv_data_list"""
+    parsing_service = ParsingService()
+    csv_data_list = []
+    for statement in dataset.statements:
+        result = parsing_service.parse_single_file(statement.path, statement.file_name,
+                                                   ParseConfig(start_row=statement.profile.header_row))
+        if not result.get('success'):
+            raise RuntimeError(f"Parsing {statement.file_name} failed: {result.get('error')}")
+        csv_data_list.append({'data': result['data'], 'filename': statement.file_name,
+                              'bank_info': result['bank_info']})
+    return csv_data_list
+
+
+def run_size(total_rows: int, stages: List[str], seed: int = 42, output_dir: Optional[str] = None,
+             quiet: bool = True) -> Dict[str, Any]:
+    """Run the selected stages for one history size and return timings and recovery counts"""
+    result: Dict[str, Any] = {'rows': total_rows, 'timings': {}}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        statement_dir = output_dir or temp_dir
+
+        started = time.perf_counter()
+        dataset = SyntheticStatementGenerator(seed=seed).generate(total_rows, statement_dir)
+        result['timings']['generate'] = time.perf_counter() - started
+        result['files'] = len(dataset.statements)
+        result['planted_pairs'] = len(dataset.planted_pairs)
+
+        if 'detect' in stages:
+            with _quiet(quiet):
+                started = time.perf_counter()
+                detection = TransferDetector().detect_transfers(dataset.detector_input())
+                result['timings']['detect'] = time.perf_counter() - started
+            result['detect_pairs'] = len(detection['transfers'])
+            result['detect_recovered'] = len(dataset.recovered_pairs(detection['transfers']))
+
+        if 'parse' in stages or 'transform' in stages:
+            with _quiet(quiet):
+                started = time.perf_counter()
+                csv_data_list = parse_statements(dataset)
+                result['timings']['parse'] = time.perf_counter() - started
+
+        if 'transform' in stages:
+            with _quiet(quiet):
+                started = time.perf_counter()
+                transformation = TransformationService().transform_multi_csv_data({'csv_data_list': csv_data_list})
+                result['timings']['transform'] = time.perf_counter() - started
+            transfers = (transformation.get('transfer_analysis') or {}).get('transfers', [])
+            result['transform_pairs'] = len(transfers)
+            result['transform_recovered'] = len(dataset.recovered_pairs(transfers))
+    return result
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    timings = ', '.join(f"{stage}={seconds:.2f}s" for stage, seconds in result['timings'].items())
+    recovered = []
+    for stage in ('detect', 'transform'):
+        if f'{stage}_recovered' in result:
+            recovered.append(f"{stage} recovered {result[f'{stage}_recovered']}/{result['planted_pairs']} "
+                             f"({result[f'{stage}_pairs']} pairs)")
+    return f"{result['rows']:>9} rows, {result['files']} files | {timings} | {'; '.join(recovered)}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark transfer detection and transformation on synthetic statements")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="total rows per run")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-parse', action='store_true', help="skip parsing (implies --skip-transform)")
+    parser.add_argument('--skip-transform', action='store_true')
+    parser.add_argument('--output-dir', help="keep generated statements here instead of a temporary directory")
+    parser.add_argument('--json', dest='json_path', help="write results to this JSON file")
+    parser.add_argument('--verbose', action='store_true', help="show the pipeline's progress output")
+    args = parser.parse_args(argv)
+
+    stages = ['generate', 'detect']
+    if not args.skip_parse:
+        stages.append('parse')
+        if not args.skip_transform:
+            stages.append('transform')
+
+    results = []
+    all_recovered = True
+    print(f"[START] Benchmarking {', '.join(stages)} at sizes {args.sizes}")
+    for size in args.sizes:
+        result = run_size(size, stages, seed=args.seed, output_dir=args.output_dir, quiet=not args.verbose)
+        results.append(result)
+        print(f"[DATA] {_format_result(result)}")
+        for stage in ('detect', 'transform'):
+            if result.get(f'{stage}_recovered', result['planted_pairs']) != result['planted_pairs']:
+                all_recovered = False
+                print(f"[WARNING] {stage}: only {result[f'{stage}_recovered']} of {result['planted_pairs']} planted pairs recovered")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as json_file:
+            json.dump(results, json_file, indent=2)
+        print(f"[SUCCESS] Results written to {args.json_path}")
+    return 0 if all_recovered else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
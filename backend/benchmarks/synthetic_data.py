@@ -0,0 +1,385 @@
+"""
+Synthetic bank statement generator
+
+Reads the bank configurations in configs/ and writes realistic CSV statements for
+each bank: the configured headers and header row, date format, amount format and
+currency columns, transfer descriptions built from the configured {name} patterns,
+and Wise-style conversion rows. A known set of transfer pairs is planted so that
+detection results can be checked against it.
+"""
+import csv
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.transfer_detection.amount_parser import AmountParser
+from backend.infrastructure.config.unified_config_service import get_unified_config_service
+from backend.shared.amount_formats import AmountFormat, RegionalFormatRegistry
+
+NAME_PLACEHOLDERS = ('{name}', '{user_name}')
+
+FIRST_NAMES = [
+    'Ammar', 'Sara', 'Bilal', 'Hina', 'Usman', 'Ayesha', 'Kamran', 'Zainab', 'Daniel', 'Eva',
+    'Peter', 'Anna', 'Lukas', 'Mia', 'Omar', 'Fatima', 'Tamas', 'Reka', 'Jonas', 'Lea'
+]
+LAST_NAMES = [
+    'Qazi', 'Malik', 'Siddiqui', 'Chaudhry', 'Farooq', 'Kovacs', 'Nagy', 'Horvath', 'Weber',
+    'Schmidt', 'Fischer', 'Rahman', 'Butt', 'Mirza', 'Szabo', 'Toth', 'Varga', 'Keller'
+]
+MERCHANTS = [
+    'Coffee Bean Cafe', 'Grocery Mart', 'Netflix', 'Spotify', 'City Pharmacy', 'Fuel Station',
+    'Bookstore', 'Electronics Hub', 'Restaurant Milano', 'Gym Membership', 'Online Shopping',
+    'Bakery Corner', 'Cinema Tickets', 'Utility Bill', 'Mobile Top Up', 'Pet Supplies'
+]
+INCOME_DESCRIPTIONS = ['Salary Payment', 'Cashback Reward', 'Interest Payment', 'Refund', 'Freelance Payment']
+
+DEFAULT_DATE_FORMAT = '%Y-%m-%d'
+
+# Share of generated rows used for planted transfer legs and conversion legs
+TRANSFER_ROW_SHARE = 0.10
+CONVERSION_ROW_SHARE = 0.02
+
+# Rough exchange rates for the exchange amounts of cross-currency transfers
+EXCHANGE_RATES = {'USD': 1.0, 'EUR': 1.08, 'GBP': 1.27, 'HUF': 0.0028, 'PKR': 0.0036, 'CAD': 0.74}
+
+
+def _has_name_placeholder(pattern: str) -> bool:
+    return any(placeholder in pattern for placeholder in NAME_PLACEHOLDERS)
+
+
+def _fill_pattern(pattern: str, name: str) -> str:
+    for placeholder in NAME_PLACEHOLDERS:
+        pattern = pattern.replace(placeholder, name)
+    return pattern
+
+
+def format_amount(value: float, amount_format: AmountFormat) -> str:
+    """Format an amount with the bank's decimal and thousand separators and negative style"""
+    text = f"{abs(value):,.2f}".replace(',', '\x00').replace('.', amount_format.decimal_separator)
+    text = text.replace('\x00', amount_format.thousand_separator)
+    if value >= 0:
+        return text
+    if amount_format.negative_style == 'parentheses':
+        return f"({text})"
+    if amount_format.negative_style == 'suffix':
+        return f"{text}-"
+    return f"-{text}"
+
+
+@dataclass
+class SyntheticTransaction:
+    """One generated transaction before it is formatted for its bank"""
+    date: datetime
+    amount: float
+    description: str
+    currency: str
+    note: str = ''
+    exchange_amount: Optional[float] = None
+    exchange_currency: Optional[str] = None
+
+
+@dataclass
+class BankProfile:
+    """The parts of a bank configuration needed to write its statements"""
+    bank_name: str
+    headers: List[str]
+    header_row: int
+    date_column: str
+    date_format: str
+    title_column: str
+    amount_format: AmountFormat
+    currencies: List[str]
+    amount_column: Optional[str] = None
+    debit_column: Optional[str] = None
+    credit_column: Optional[str] = None
+    currency_column: Optional[str] = None
+    note_column: Optional[str] = None
+    exchange_amount_column: Optional[str] = None
+    exchange_currency_column: Optional[str] = None
+    backup_date_column: Optional[str] = None
+    preamble: List[List[str]] = field(default_factory=list)
+    outgoing_patterns: List[str] = field(default_factory=list)
+    incoming_patterns: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_config(cls, bank_config) -> Optional['BankProfile']:
+        """Build a profile from a UnifiedBankConfig; None if it lacks date, title or amount columns"""
+        mapping = bank_config.column_mapping
+        date_column = mapping.get('date')
+        title_column = mapping.get('title')
+        amount_column = mapping.get('amount')
+        debit_column, credit_column = mapping.get('debit'), mapping.get('credit')
+        if not date_column or not title_column or not (amount_column or (debit_column and credit_column)):
+            return None
+
+        headers = [h for h in bank_config.detection_info.required_headers if h]
+        for column in mapping.values():
+            if column and column not in headers:
+                headers.append(column)
+
+        if bank_config.data_cleaning.multi_currency and bank_config.account_mapping:
+            currencies = [currency.upper() for currency in bank_config.account_mapping][:2]
+        else:
+            currencies = [bank_config.currency_primary or bank_config.data_cleaning.default_currency]
+
+        # Lines before the header row carry the bank's non-header content signatures
+        header_row = bank_config.csv_config.header_row or 0
+        signatures = [s for s in bank_config.detection_info.content_signatures if s and s not in headers]
+        preamble = [[signatures[i] if i < len(signatures) else f'Statement Info {i + 1}', 'Synthetic']
+                    for i in range(header_row)]
+
+        return cls(
+            bank_name=bank_config.name,
+            headers=headers,
+            header_row=header_row,
+            date_column=date_column,
+            date_format=bank_config.csv_config.date_format or DEFAULT_DATE_FORMAT,
+            title_column=title_column,
+            amount_format=bank_config.data_cleaning.amount_format or RegionalFormatRegistry.AMERICAN,
+            currencies=currencies,
+            amount_column=amount_column,
+            debit_column=debit_column if not amount_column else None,
+            credit_column=credit_column if not amount_column else None,
+            currency_column=mapping.get('currency'),
+            note_column=mapping.get('note'),
+            exchange_amount_column=mapping.get('exchangetoamount'),
+            exchange_currency_column=mapping.get('exchangetocurrency'),
+            backup_date_column=mapping.get('backupdate'),
+            preamble=preamble,
+            outgoing_patterns=[p for p in bank_config.outgoing_patterns if _has_name_placeholder(p)],
+            incoming_patterns=[p for p in bank_config.incoming_patterns if _has_name_placeholder(p)],
+        )
+
+    def file_name(self, currency: str) -> str:
+        return f"{self.bank_name.lower()}_{currency.lower()}_synthetic_statement.csv"
+
+    def format_row(self, transaction: SyntheticTransaction) -> Dict[str, str]:
+        row = {header: '' for header in self.headers}
+        row[self.date_column] = transaction.date.strftime(self.date_format)
+        if self.backup_date_column:
+            row[self.backup_date_column] = row[self.date_column]
+        row[self.title_column] = transaction.description
+        if self.amount_column:
+            row[self.amount_column] = format_amount(transaction.amount, self.amount_format)
+        elif transaction.amount < 0:
+            row[self.debit_column] = format_amount(-transaction.amount, self.amount_format)
+        else:
+            row[self.credit_column] = format_amount(transaction.amount, self.amount_format)
+        if self.currency_column:
+            row[self.currency_column] = transaction.currency
+        if self.note_column and self.note_column not in (self.title_column, self.date_column):
+            row[self.note_column] = transaction.note
+        if transaction.exchange_amount is not None and self.exchange_amount_column:
+            row[self.exchange_amount_column] = format_amount(transaction.exchange_amount, self.amount_format)
+            row[self.exchange_currency_column] = transaction.exchange_currency
+        return row
+
+
+@dataclass
+class SyntheticStatement:
+    """One generated CSV file: a bank account in one currency"""
+    profile: BankProfile
+    currency: str
+    file_name: str
+    transactions: List[SyntheticTransaction] = field(default_factory=list)
+    path: Optional[str] = None
+
+    @property
+    def bank_name(self) -> str:
+        return self.profile.bank_name
+
+    def rows(self) -> List[Dict[str, str]]:
+        return [self.profile.format_row(transaction) for transaction in self.transactions]
+
+    def write(self, output_dir: str) -> str:
+        self.path = os.path.join(output_dir, self.file_name)
+        with open(self.path, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerows(self.profile.preamble)
+            writer.writerow(self.profile.headers)
+            for row in self.rows():
+                writer.writerow([row[header] for header in self.profile.headers])
+        return self.path
+
+
+@dataclass
+class PlantedPair:
+    """A transfer pair the detector is expected to find, with the (file name, data row) of each leg"""
+    kind: str  # 'cross_bank' or 'currency_conversion'
+    outgoing: Tuple[str, int]
+    incoming: Tuple[str, int]
+    outgoing_amount: float  # negative
+    incoming_amount: float
+
+    @property
+    def key(self) -> Tuple[float, float]:
+        """Identifies the pair in detection results; planted amounts are unique"""
+        return pair_key(self.outgoing_amount, self.incoming_amount)
+
+
+def pair_key(outgoing_amount: float, incoming_amount: float) -> Tuple[float, float]:
+    return round(abs(outgoing_amount), 2), round(abs(incoming_amount), 2)
+
+
+@dataclass
+class SyntheticDataset:
+    statements: List[SyntheticStatement]
+    planted_pairs: List[PlantedPair]
+
+    @property
+    def total_rows(self) -> int:
+        return sum(len(statement.transactions) for statement in self.statements)
+
+    def detector_input(self) -> List[Dict]:
+        """
+        csv_data_list for TransferDetector.detect_transfers, with rows shaped like the
+        transformed rows TransferProcessingService passes to the detector
+        """
+        csv_data_list = []
+        for statement in self.statements:
+            rows = []
+            for transaction in statement.transactions:
+                row = {
+                    'Date': transaction.date.strftime('%Y-%m-%d %H:%M:%S'),
+                    'Amount': str(transaction.amount),
+                    'Title': transaction.description,
+                    'Note': transaction.note,
+                    'Currency': transaction.currency,
+                    'Account': f"{statement.bank_name} {statement.currency}"
+                }
+                if transaction.exchange_amount is not None:
+                    row['Exchange To Amount'] = str(transaction.exchange_amount)
+                    row['Exchange To'] = transaction.exchange_currency
+                rows.append(row)
+            csv_data_list.append({'data': rows, 'file_name': statement.file_name,
+                                  'bank_info': {'bank_name': statement.bank_name}})
+        return csv_data_list
+
+    def recovered_pairs(self, transfer_pairs: List[Dict]) -> List[PlantedPair]:
+        """Planted pairs found among detected transfer pairs (amounts as parsed from the pair legs)"""
+        detected = {pair_key(AmountParser.parse_amount(pair['outgoing'].get('Amount', 0)),
+                             AmountParser.parse_amount(pair['incoming'].get('Amount', 0)))
+                    for pair in transfer_pairs}
+        return [planted for planted in self.planted_pairs if planted.key in detected]
+
+
+class SyntheticStatementGenerator:
+    """
+    Generates statements for every configured bank with planted transfer pairs.
+
+    Transfers are planted between every ordered pair of banks where the sender has
+    an outgoing {name} pattern and the receiver an incoming one, in a shared currency
+    or, when the sender has exchange columns, as a cross-currency transfer. Banks
+    with exchange columns and two currencies also get conversion rows in both of
+    their currency statements. Every planted pair has a unique amount, so noise
+    rows and other pairs cannot compete for it.
+    """
+
+    def __init__(self, config_service=None, seed: int = 42, start_date: datetime = datetime(2024, 1, 1)):
+        self.config = config_service or get_unified_config_service()
+        self.seed = seed
+        self.start_date = start_date
+
+    def build_profiles(self) -> List[BankProfile]:
+        profiles = []
+        for bank_name in self.config.list_banks():
+            bank_config = self.config.get_bank_config(bank_name)
+            profile = BankProfile.from_config(bank_config) if bank_config else None
+            if profile:
+                profiles.append(profile)
+        return profiles
+
+    def generate(self, total_rows: int, output_dir: Optional[str] = None) -> SyntheticDataset:
+        """Generate about total_rows transactions; statements are written to output_dir if given"""
+        rng = random.Random(self.seed)
+        profiles = self.build_profiles()
+        statements = {(p.bank_name, currency): SyntheticStatement(p, currency, p.file_name(currency))
+                      for p in profiles for currency in p.currencies}
+        days = max(30, min(3650, total_rows // 40))
+
+        planted: List[Tuple[str, SyntheticTransaction, SyntheticStatement, SyntheticTransaction, SyntheticStatement]] = []
+        routes = self._transfer_routes(profiles)
+        transfer_count = int(total_rows * TRANSFER_ROW_SHARE / 2) if routes else 0
+        for k in range(transfer_count):
+            sender, receiver, send_currency, receive_currency = routes[k % len(routes)]
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            amount = 20 + k + rng.randint(1, 99) / 100  # unique per pair
+            date = self.start_date + timedelta(days=rng.randrange(days))
+            outgoing = SyntheticTransaction(date, 0.0, _fill_pattern(rng.choice(sender.outgoing_patterns), name),
+                                            send_currency, note='Transfer')
+            if send_currency == receive_currency:
+                outgoing.amount = -amount
+            else:
+                rate = EXCHANGE_RATES.get(receive_currency, 1.0) / EXCHANGE_RATES.get(send_currency, 1.0)
+                outgoing.amount = -max(round(amount * rate, 2), 0.01)
+                outgoing.exchange_amount, outgoing.exchange_currency = amount, receive_currency
+            incoming = SyntheticTransaction(date + timedelta(days=rng.choice((0, 0, 1))), amount,
+                                            _fill_pattern(rng.choice(receiver.incoming_patterns), name),
+                                            receive_currency, note='Transfer')
+            planted.append(('cross_bank', outgoing, statements[(sender.bank_name, send_currency)],
+                            incoming, statements[(receiver.bank_name, receive_currency)]))
+
+        converters = [p for p in profiles if p.exchange_amount_column and len(p.currencies) >= 2]
+        conversion_count = int(total_rows * CONVERSION_ROW_SHARE / 2) if converters else 0
+        for k in range(conversion_count):
+            profile = converters[k % len(converters)]
+            from_currency, to_currency = profile.currencies[0], profile.currencies[1]
+            from_amount = 10 + k + rng.randint(1, 99) / 100
+            rate = EXCHANGE_RATES.get(from_currency, 1.0) / EXCHANGE_RATES.get(to_currency, 1.0)
+            to_amount = round(from_amount * rate, 2)
+            description = f"Converted {from_amount:.2f} {from_currency} to {to_amount:.2f} {to_currency}"
+            date = self.start_date + timedelta(days=rng.randrange(days))
+            planted.append(('currency_conversion',
+                            SyntheticTransaction(date, -from_amount, description, from_currency, note='Conversion'),
+                            statements[(profile.bank_name, from_currency)],
+                            SyntheticTransaction(date, to_amount, description, to_currency, note='Conversion'),
+                            statements[(profile.bank_name, to_currency)]))
+
+        for _, outgoing, outgoing_statement, incoming, incoming_statement in planted:
+            outgoing_statement.transactions.append(outgoing)
+            incoming_statement.transactions.append(incoming)
+
+        statement_list = list(statements.values())
+        for _ in range(max(0, total_rows - 2 * len(planted))):
+            statement = rng.choice(statement_list)
+            date = self.start_date + timedelta(days=rng.randrange(days))
+            if rng.random() < 0.8:
+                transaction = SyntheticTransaction(date, -rng.randint(100, 50000) / 100, rng.choice(MERCHANTS),
+                                                   statement.currency, note='Card Payment')
+            else:
+                transaction = SyntheticTransaction(date, rng.randint(1000, 500000) / 100,
+                                                   rng.choice(INCOME_DESCRIPTIONS), statement.currency, note='Income')
+            statement.transactions.append(transaction)
+
+        # Statements are chronological; row positions are known only after sorting
+        for statement in statement_list:
+            statement.transactions.sort(key=lambda transaction: transaction.date)
+        positions = {id(transaction): (statement.file_name, row)
+                     for statement in statement_list for row, transaction in enumerate(statement.transactions)}
+        planted_pairs = [PlantedPair(kind, positions[id(outgoing)], positions[id(incoming)],
+                                     outgoing.amount, incoming.amount)
+                         for kind, outgoing, _, incoming, _ in planted]
+
+        statement_list = [statement for statement in statement_list if statement.transactions]
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            for statement in statement_list:
+                statement.write(output_dir)
+        return SyntheticDataset(statement_list, planted_pairs)
+
+    @staticmethod
+    def _transfer_routes(profiles: List[BankProfile]) -> List[Tuple[BankProfile, BankProfile, str, str]]:
+        """(sender, receiver, sender currency, receiver currency) for every plantable bank pair"""
+        routes = []
+        for sender in profiles:
+            for receiver in profiles:
+                if sender is receiver or not sender.outgoing_patterns or not receiver.incoming_patterns:
+                    continue
+                shared = [currency for currency in sender.currencies if currency in receiver.currencies]
+                if shared:
+                    routes.append((sender, receiver, shared[0], shared[0]))
+                elif sender.exchange_amount_column:
+                    routes.append((sender, receiver, sender.currencies[0], receiver.currencies[0]))
+        return routes
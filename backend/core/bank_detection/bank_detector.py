@@ -1,10 +1,12 @@
 """
 Bank detector for identifying bank type from CSV files
 """
-import re
-from typing import Any, Dict, List, Tuple
-from backend.infrastructure.config.unified_config_service import get_unified_config_service, BankDetectionInfo
+from typing import Any, Dict, List
+from backend.infrastructure.config.unified_config_service import get_unified_config_service
 from backend.shared.models.csv_models import BankDetectionResult
+from backend.shared.utils.tracing import get_tracer
+
+_trace = get_tracer('bank_detection')
 
 class BankDetector:
     """Detects bank type from CSV files using content signatures and header analysis"""
@@ -28,17 +30,22 @@ class BankDetector:
             BankDetectionResult with bank name and confidence score
         """
         print(f" Detecting bank for file: {filename}")
-        print(f" Headers found: {headers}")
-        print(f" Content preview: {csv_content[:200]}...")
+        if _trace.debug:
+            _trace.event('detect_bank', filename=filename, headers=headers, content_preview=csv_content[:200])
         
         candidates = []
         
-        for bank_name, patterns in self.detection_patterns.items():
-            confidence, reasons = self._calculate_confidence(filename, csv_content, headers, patterns)
+        for score in self.config_service.get_detection_index().score_banks(filename, csv_content, headers):
+            if _trace.trace:
+                _trace.event('bank_scores', level='trace', bank=score.bank_name, filename_score=score.filename_score,
+                             content_matches=score.content_matches, header_matches=score.header_matches)
             
-            if confidence > 0:
-                candidates.append(BankDetectionResult(bank_name=bank_name, confidence=confidence, reasons=reasons))
-                print(f" {bank_name}: confidence={confidence:.2f}, reasons={reasons}")
+            if score.confidence > 0:
+                candidates.append(BankDetectionResult(bank_name=score.bank_name, confidence=score.confidence,
+                                                      reasons=score.reasons))
+                if _trace.debug:
+                    _trace.event('bank_candidate', bank=score.bank_name, confidence=score.confidence,
+                                 reasons=score.reasons)
         
         # Sort by confidence (highest first)
         candidates.sort(key=lambda x: x.confidence, reverse=True)
@@ -51,142 +58,6 @@ class BankDetector:
             print(f" No bank detected, using unknown")
             return BankDetectionResult(bank_name='unknown', confidence=0.0, reasons=['No patterns matched'])
     
-    def _calculate_confidence(self, filename: str, content: str, headers: List[str], 
-                            patterns: BankDetectionInfo) -> Tuple[float, List[str]]:
-        """Calculate confidence score for a bank pattern"""
-        confidence = 0.0
-        reasons = []
-        
-        # 1. Filename pattern matching (20% weight)
-        filename_score = self._check_filename_patterns(filename, patterns.filename_patterns)
-        if filename_score > 0:
-            confidence += filename_score * 0.2
-            reasons.append(f"filename_match({filename_score:.1f})")
-        
-        # 2. Content signature matching (40% weight)
-        content_score = self._check_content_signatures(content, patterns.content_signatures)
-        if content_score > 0:
-            confidence += content_score * 0.4
-            reasons.append(f"content_signature({content_score:.1f})")
-        
-        # 3. Header matching (40% weight)
-        header_score = self._check_header_patterns(headers, patterns.required_headers)
-        if header_score > 0:
-            confidence += header_score * 0.4
-            reasons.append(f"header_match({header_score:.1f})")
-        
-        return confidence, reasons
-    
-    def _check_filename_patterns(self, filename: str, patterns: List[str]) -> float:
-        """Check if filename matches any patterns (supports both simple and regex)"""
-        if not patterns:
-            return 0.0
-            
-        filename_lower = filename.lower()
-        max_score = 0.0
-        
-        # Debug filename matching
-        print(f" Checking filename '{filename}' against patterns: {patterns}")
-        
-        for pattern in patterns:
-            pattern_lower = pattern.lower()
-            score = 0.0
-            
-            # Check if pattern is a glob pattern (starts/ends with * but not regex)
-            if pattern.startswith('*') and pattern.endswith('*') and pattern.count('*') == 2:
-                # Handle glob patterns like *statement*
-                inner_pattern = pattern[1:-1].lower()  # Remove surrounding *
-                if inner_pattern in filename_lower:
-                    score = 0.9  # High confidence for glob patterns
-                    print(f"[SUCCESS] Glob pattern '{pattern}' matched filename '{filename}' (contains '{inner_pattern}')")
-                else:
-                    print(f"[ERROR]  Glob pattern '{pattern}' did not match filename '{filename}'")
-            elif any(char in pattern for char in ['^', '$', '\\d', '\\w', '+', '?', '[', ']', '(', ')']) or (pattern.count('*') > 0 and not (pattern.startswith('*') and pattern.endswith('*'))):
-                try:
-                    # Treat as regex pattern
-                    if re.match(pattern, filename, re.IGNORECASE):
-                        score = 1.0
-                        print(f"[SUCCESS] Regex pattern '{pattern}' matched filename '{filename}'")
-                    else:
-                        print(f"[ERROR]  Regex pattern '{pattern}' did not match filename '{filename}'")
-                except re.error as e:
-                    print(f"[WARNING] Invalid regex pattern '{pattern}': {e}")
-                    # Fallback to simple string matching
-                    if pattern_lower in filename_lower:
-                        score = 0.7  # Lower confidence for fallback
-                        print(f"[SUCCESS] Fallback string match for pattern '{pattern}'")
-            else:
-                # Simple string containment check
-                if pattern_lower in filename_lower:
-                    score = 0.8  # Good confidence for simple patterns
-                    print(f"[SUCCESS] Simple pattern '{pattern}' found in filename '{filename}'")
-                else:
-                    print(f"[ERROR]  Simple pattern '{pattern}' not found in filename '{filename}'")
-            
-            max_score = max(max_score, score)
-        
-        print(f"Final filename score: {max_score}")
-        return max_score
-    
-    def _check_content_signatures(self, content: str, signatures: List[str]) -> float:
-        """Check if content contains bank-specific signatures"""
-        if not signatures:
-            print("[DEBUG] No content signatures to check")
-            return 0.0
-            
-        content_lower = content.lower()
-        matches = 0
-        
-        print(f"\n[DEBUG] Content Signature Matching")
-        print(f"[DEBUG] Looking for {len(signatures)} signatures in content:")
-        print("-" * 80)
-        
-        for signature in signatures:
-            signature_lower = signature.lower()
-            if signature_lower in content_lower:
-                matches += 1
-                # Find where the signature appears in the content
-                pos = content_lower.find(signature_lower)
-                context_start = max(0, pos - 20)
-                context_end = min(len(content_lower), pos + len(signature_lower) + 20)
-                context = content_lower[context_start:context_end].replace('\n', ' ').replace('\r', ' ')
-                print(f"✅ FOUND: '{signature}'")
-                print(f"   Context: ...{context}...")
-            else:
-                print(f"❌ MISSING: '{signature}'")
-        
-        score = matches / len(signatures) if signatures else 0.0
-        print(f"\n[DEBUG] Signature matching complete: {matches}/{len(signatures)} signatures found (score: {score:.2f})")
-        print("=" * 80)
-        
-        return score
-    
-    def _check_header_patterns(self, headers: List[str], required_headers: List[str]) -> float:
-        """Check if headers match required patterns"""
-        if not required_headers or not headers:
-            return 0.0
-        
-        headers_lower = [h.lower().strip() for h in headers]
-        matches = 0
-        
-        for required in required_headers:
-            required_lower = required.lower().strip()
-            found_match_for_required = False
-            
-            for header in headers_lower:
-                # Prioritize exact match or required being a part of a longer actual header
-                if required_lower == header: # Exact match
-                    found_match_for_required = True
-                    break
-                if required_lower in header: # required is a substring of an actual header (e.g. "Date" in "Transaction Date")
-                    found_match_for_required = True
-                    break
-            if found_match_for_required:
-                    matches += 1
-        
-        # Return percentage of required headers found
-        return matches / len(required_headers)
-    
     def detect_bank_from_data(self, filename: str, data_rows: List[Dict[str, Any]]) -> BankDetectionResult:
         """
         Detect bank from parsed CSV data
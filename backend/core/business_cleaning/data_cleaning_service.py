@@ -5,6 +5,10 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 from backend.infrastructure.config.unified_config_service import get_unified_config_service
+from backend.shared.models.transaction_frame import TransactionFrame
+from backend.shared.utils.tracing import get_tracer
+
+_trace = get_tracer('data_cleaning')
 
 
 class DataCleaningService:
@@ -36,9 +40,12 @@ class DataCleaningService:
         """
         print(f"ℹ [DataCleaningService] Applying advanced processing pipeline...")
         
+        # All three steps update the same frame's columns in place
+        frame = TransactionFrame.coerce(transformed_data)
+        
         # Step 1: Apply standard, config-based description cleaning
         data_after_standard_cleaning = self._apply_standard_description_cleaning(
-            transformed_data, csv_data_list
+            frame, csv_data_list
         )
         
         # Step 2: Apply conditional description overrides from .conf files
@@ -51,7 +58,7 @@ class DataCleaningService:
             data_after_conditional_overrides, csv_data_list
         )
         
-        return data_after_recategorization
+        return data_after_recategorization.like(transformed_data)
     
     def _apply_standard_description_cleaning(self, data: List[Dict[str, Any]], 
                                            csv_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -59,165 +66,134 @@ class DataCleaningService:
         print(f"   Applying standard description cleaning...")
         print(f"      [DATA] Data rows to clean: {len(data)}")
         
-        # DEBUG: Show sample data structure
-        if data:
-            print(f"         Sample row: {data[0]}")
-        
-        print(f"         CSV data list count: {len(csv_data_list)}")
+        frame = TransactionFrame.coerce(data)
+        if _trace.debug and len(frame):
+            _trace.event('cleaning_input', sample_row=frame[0], csv_count=len(csv_data_list))
         
         # Track cleaning results
         cleaned_count = 0
         bank_matches = {}
+        bank_rows: Dict[str, List[int]] = {}
         
-        for row_idx, row in enumerate(data):
-            account = row.get('Account', '')
-            bank_name = None
-            
-            print(f"         Row {row_idx + 1}: Account='{account}', Title='{row.get('Title', '')}'")
-            
-            # Find bank type based on Account name matching
-            for csv_idx, csv_data in enumerate(csv_data_list):
-                bank_info = csv_data.get('bank_info', {})
-                detected_bank = bank_info.get('bank_name', bank_info.get('detected_bank'))
-                print(f"            CSV {csv_idx}: detected_bank='{detected_bank}'")
-                
-                if detected_bank and detected_bank != 'unknown':
-                    # Check if this transaction's account matches this bank's account
-                    if self._account_matches_bank_config(account, detected_bank):
-                        bank_name = detected_bank
-                        print(f"            [SUCCESS] MATCH! Using bank: {bank_name}")
-                        break
-                    else:
-                        print(f"            [NO MATCH] Account '{account}' doesn't match this bank")
-            
+        # Find bank type based on Account name matching, once per distinct account
+        detected_banks = self._detected_banks(csv_data_list)
+        account_codes, accounts = frame.factorize('Account', '')
+        banks_by_code = [next((bank for bank in detected_banks if self._account_matches_bank_config(account, bank)),
+                              None)
+                         for account in accounts]
+        
+        for row_idx, code in enumerate(account_codes.tolist()):
+            bank_name = banks_by_code[code]
             if bank_name:
                 bank_matches[bank_name] = bank_matches.get(bank_name, 0) + 1
-                
-                original_title_for_row = row.get('Title', '')
-                if '_original_title' not in row:
-                    row['_original_title'] = original_title_for_row
-                
-                # Apply description cleaning for this bank
-                cleaned_title = self.config_service.apply_description_cleaning(bank_name, original_title_for_row)
+                bank_rows.setdefault(bank_name, []).append(row_idx)
+            elif _trace.warning:
+                _trace.event('no_bank_for_account', level='warning', row=row_idx + 1, account=accounts[code])
+        
+        titles = frame.column('Title', '')
+        has_original_title = frame.present('_original_title')
+        matched_rows = sorted(row_idx for row_indices in bank_rows.values() for row_idx in row_indices
+                              if not has_original_title[row_idx])
+        frame.set_values('_original_title', matched_rows, [titles[row_idx] for row_idx in matched_rows])
+        
+        # Clean each bank's descriptions in one batch, once per unique description
+        for bank_name, row_indices in bank_rows.items():
+            original_titles = [titles[row_idx] for row_idx in row_indices]
+            cleaned_titles = self.config_service.clean_descriptions(bank_name, original_titles)
+            changed_rows, changed_titles = [], []
+            for row_idx, original_title_for_row, cleaned_title in zip(row_indices, original_titles, cleaned_titles):
                 if cleaned_title != original_title_for_row:
-                    print(f"            CLEANED: '{original_title_for_row}' → '{cleaned_title}'")
-                    row['Title'] = cleaned_title
-                    cleaned_count += 1
-                else:
-                    print(f"            No change: '{original_title_for_row}'")
-            else:
-                print(f"         [ERROR] No bank match for account: '{account}'")
+                    if _trace.debug:
+                        _trace.event('description_cleaned', row=row_idx + 1, bank=bank_name,
+                                     original=original_title_for_row, cleaned=cleaned_title)
+                    changed_rows.append(row_idx)
+                    changed_titles.append(cleaned_title)
+            frame.set_values('Title', changed_rows, changed_titles)
+            cleaned_count += len(changed_rows)
         
         print(f"      [DATA] Description cleaning summary:")
         print(f"            Total rows cleaned: {cleaned_count}")
         print(f"            Bank matches: {bank_matches}")
         
-        return data
+        return frame.like(data)
     
     def _apply_conditional_description_overrides(self, data: List[Dict[str, Any]], 
                                                csv_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Apply conditional description overrides defined in bank .conf files"""
         print(f"   Applying conditional description overrides...")
         conditional_changes_count = 0
+        frame = TransactionFrame.coerce(data)
         
-        for row_idx, row in enumerate(data):
-            account = row.get('Account', '')
-            bank_name_for_row = None
-            
-            # Determine bank_name for the current row
-            for csv_data in csv_data_list:
-                bank_info = csv_data.get('bank_info', {})
-                detected_bank = bank_info.get('bank_name', bank_info.get('detected_bank'))
-                if detected_bank and detected_bank != 'unknown':
-                    try:
-                        bank_cfg_obj_check = self.config_service.get_bank_config(detected_bank)
-                        if bank_cfg_obj_check and bank_cfg_obj_check.cashew_account == account:
-                            bank_name_for_row = detected_bank
-                            break
-                    except Exception:
-                        continue
-            
-            if not bank_name_for_row:
+        # Determine each row's bank: the first detected bank whose cashew account is the row's account
+        bank_for_account: Dict[str, str] = {}
+        for detected_bank in self._detected_banks(csv_data_list):
+            try:
+                bank_cfg_obj_check = self.config_service.get_bank_config(detected_bank)
+                if bank_cfg_obj_check:
+                    bank_for_account.setdefault(bank_cfg_obj_check.cashew_account, detected_bank)
+            except Exception:
                 continue
-            
-            bank_cfg_obj = self.config_service.get_bank_config(bank_name_for_row)
-            if not bank_cfg_obj or not bank_cfg_obj.conditional_description_overrides:
+        
+        account_codes, accounts = frame.factorize('Account', '')
+        banks_by_code = [bank_for_account.get(account) for account in accounts]
+        bank_rows: Dict[str, List[int]] = {}
+        for row_idx, code in enumerate(account_codes.tolist()):
+            bank_name_for_row = banks_by_code[code]
+            if bank_name_for_row:
+                bank_rows.setdefault(bank_name_for_row, []).append(row_idx)
+        
+        # Evaluate each bank's compiled overrides over its amount/note/title columns in one pass
+        amounts, notes, titles = frame.column('Amount'), frame.column('Note', ''), frame.column('Title', '')
+        for bank_name_for_row, row_indices in bank_rows.items():
+            overrides = self.config_service.get_conditional_overrides(bank_name_for_row)
+            if not overrides:
                 continue
-            
-            for rule in bank_cfg_obj.conditional_description_overrides:
-                conditions_met = True
-                amount_val = row.get('Amount')
-                note_val = row.get('Note', '')
-                current_title = row.get('Title', '')
-                
-                # Convert amount_val to float if it's a string
-                if isinstance(amount_val, str):
-                    try:
-                        amount_val = float(amount_val)
-                    except ValueError:
-                        conditions_met = False
-                        continue
-                
-                # Check conditions
-                if 'if_amount_min' in rule and not (isinstance(amount_val, (int, float)) and amount_val >= float(rule['if_amount_min'])):
-                    conditions_met = False
-                if conditions_met and 'if_amount_max' in rule and not (isinstance(amount_val, (int, float)) and amount_val <= float(rule['if_amount_max'])):
-                    conditions_met = False
-                if conditions_met and 'if_amount_less_than' in rule and not (isinstance(amount_val, (int, float)) and amount_val < float(rule['if_amount_less_than'])):
-                    conditions_met = False
-                if conditions_met and 'if_amount_greater_than' in rule and not (isinstance(amount_val, (int, float)) and amount_val > float(rule['if_amount_greater_than'])):
-                    conditions_met = False
-                if conditions_met and 'if_amount_equals' in rule and not (isinstance(amount_val, (int, float)) and amount_val == float(rule['if_amount_equals'])):
-                    conditions_met = False
-                if conditions_met and 'if_note_equals' in rule and note_val != rule['if_note_equals']:
-                    conditions_met = False
-                if conditions_met and 'if_note_contains' in rule and rule['if_note_contains'].lower() not in note_val.lower():
-                    conditions_met = False
-                if conditions_met and 'if_description_contains' in rule and rule['if_description_contains'].lower() not in current_title.lower():
-                    conditions_met = False
-                
-                if conditions_met:
-                    new_title = rule.get('set_description')
-                    if new_title and current_title != new_title:
-                        rule_name_display = rule.get('name', rule.get('set_description', 'Unnamed Rule'))
-                        print(f"            CONDITIONAL OVERRIDE (Row {row_idx + 1}, Bank: {bank_name_for_row}, Rule: {rule_name_display}): '{current_title}' → '{new_title}'")
-                        row['Title'] = new_title
-                        conditional_changes_count += 1
-                        break
+            matched_rules = overrides.apply([amounts[row_idx] for row_idx in row_indices],
+                                            [notes[row_idx] for row_idx in row_indices],
+                                            [titles[row_idx] for row_idx in row_indices])
+            changed_rows, new_titles = [], []
+            for row_idx, rule in zip(row_indices, matched_rules):
+                if rule is None:
+                    continue
+                if _trace.debug:
+                    _trace.event('conditional_override', row=row_idx + 1, bank=bank_name_for_row,
+                                 rule=rule.name, original=titles[row_idx], new=rule.set_description)
+                changed_rows.append(row_idx)
+                new_titles.append(rule.set_description)
+            frame.set_values('Title', changed_rows, new_titles)
+            conditional_changes_count += len(changed_rows)
         
         if conditional_changes_count > 0:
             print(f"      Applied {conditional_changes_count} conditional override changes")
         
-        return data
+        return frame.like(data)
     
     def _apply_keyword_categorization(self, data: List[Dict[str, Any]], 
                                     csv_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Apply keyword-based categorization from .conf files using final descriptions"""
         print(f"   Applying keyword-based categorization (post-cleaning)...")
-        categorized_count = 0
+        frame = TransactionFrame.coerce(data)
         
-        for row_idx, row in enumerate(data):
-            account = row.get('Account', '')
-            bank_name_for_row = None
-            
-            # Determine bank_name for the current row
-            for csv_data in csv_data_list:
-                bank_info = csv_data.get('bank_info', {})
-                detected_bank = bank_info.get('bank_name', bank_info.get('detected_bank'))
-                if detected_bank and detected_bank != 'unknown':
-                    try:
-                        bank_cfg_obj_check = self.config_service.get_bank_config(detected_bank)
-                        if bank_cfg_obj_check and self._account_matches_bank(bank_cfg_obj_check, account, csv_data_list):
-                            bank_name_for_row = detected_bank
-                            break
-                    except Exception:
-                        continue
-            
+        # Determine bank_name once per distinct account
+        detected_banks = self._detected_banks(csv_data_list)
+        account_codes, accounts = frame.factorize('Account', '')
+        banks_by_code = [self._categorization_bank(account, detected_banks, csv_data_list) for account in accounts]
+        
+        titles, categories = frame.column('Title', ''), frame.column('Category')
+        categorization_results: Dict[tuple, Optional[Dict[str, Any]]] = {}
+        changed_rows, new_categories = [], []
+        
+        for row_idx, code in enumerate(account_codes.tolist()):
+            bank_name_for_row = banks_by_code[code]
             if not bank_name_for_row:
                 continue
             
-            description = row.get('Title', '')
-            categorization_result = self.config_service.categorize_merchant_with_debug(bank_name_for_row, description)
+            description = titles[row_idx]
+            key = (bank_name_for_row, description)
+            if key not in categorization_results:
+                categorization_results[key] = self.config_service.categorize_merchant_with_debug(
+                    bank_name_for_row, description)
+            categorization_result = categorization_results[key]
             
             if categorization_result:
                 category = categorization_result['category']
@@ -226,13 +202,40 @@ class DataCleaningService:
                 rule_type = categorization_result['rule_type']
                 
                 # Log only if category changes or is newly set by this step
-                if row.get('Category') != category:
-                    print(f"            CATEGORIZED (Row {row_idx + 1}, Bank: {bank_name_for_row}): Desc='{description[:50]}...' → Category='{category}' [Pattern: '{pattern}' from {source} {rule_type}]")
-                    row['Category'] = category
-                    categorized_count += 1
+                if categories[row_idx] != category:
+                    if _trace.debug:
+                        _trace.event('categorized', row=row_idx + 1, bank=bank_name_for_row,
+                                     description=description[:50], category=category, pattern=pattern,
+                                     source=source, rule_type=rule_type)
+                    changed_rows.append(row_idx)
+                    new_categories.append(category)
+        
+        frame.set_values('Category', changed_rows, new_categories)
         
-        print(f"      Applied keyword categorization to {categorized_count} rows (post-cleaning)")
-        return data
+        print(f"      Applied keyword categorization to {len(changed_rows)} rows (post-cleaning)")
+        return frame.like(data)
+    
+    def _detected_banks(self, csv_data_list: List[Dict[str, Any]]) -> List[str]:
+        """Known banks detected for the uploaded CSVs, in upload order"""
+        detected_banks = []
+        for csv_data in csv_data_list:
+            bank_info = csv_data.get('bank_info', {})
+            detected_bank = bank_info.get('bank_name', bank_info.get('detected_bank'))
+            if detected_bank and detected_bank != 'unknown':
+                detected_banks.append(detected_bank)
+        return detected_banks
+    
+    def _categorization_bank(self, account: str, detected_banks: List[str],
+                             csv_data_list: List[Dict[str, Any]]) -> Optional[str]:
+        """First detected bank whose config claims the account"""
+        for detected_bank in detected_banks:
+            try:
+                bank_cfg_obj_check = self.config_service.get_bank_config(detected_bank)
+                if bank_cfg_obj_check and self._account_matches_bank(bank_cfg_obj_check, account, csv_data_list):
+                    return detected_bank
+            except Exception:
+                continue
+        return None
     
     def _account_matches_bank_config(self, account: str, bank_name: str) -> bool:
         """Check if account matches bank configuration"""
@@ -242,24 +245,15 @@ class DataCleaningService:
                 cashew_account = bank_config.cashew_account
                 has_account_mapping = bool(bank_config.account_mapping)
                 
-                print(f"               Bank config cashew_account: '{cashew_account}'")
-                
                 # Check if this transaction's account matches this bank's account
                 if cashew_account and account == cashew_account:
                     # Single account bank - direct match
-                    print(f"               [MATCH] Account '{account}' matches cashew_account '{cashew_account}'")
                     return True
                 elif has_account_mapping:
                     # Multi-currency bank - check account_mapping
                     account_mapping = bank_config.account_mapping
-                    if account in account_mapping.values():
-                        print(f"               [MATCH] Account '{account}' found in account_mapping")
-                        return True
-                    else:
-                        print(f"               [NO MATCH] Account '{account}' not in account_mapping")
-                        return False
+                    return account in account_mapping.values()
                 else:
-                    print(f"               [NO MATCH] Account '{account}' doesn't match cashew_account '{cashew_account}'")
                     return False
         except Exception as e:
             print(f"            [WARNING] Error getting bank config: {e}")
@@ -11,6 +11,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from .interfaces import CSVParserPort, CSVPreprocessorPort, EncodingDetectorPort
 from .exceptions import CSVProcessingError, CSVParsingError, BankDetectionError
 from backend.infrastructure.csv_cleaning.data_cleaner import DataCleaner
+from backend.infrastructure.csv_parsing.file_buffer import FileBuffer
+from backend.infrastructure.csv_parsing.parse_cache import MISSING, get_parse_cache, options_key
 from backend.core.bank_detection import BankDetector
 from backend.infrastructure.config.unified_config_service import get_unified_config_service
 from backend.shared.models.csv_models import BankDetectionResult
@@ -41,6 +43,7 @@ class CSVProcessingService:
         
         # Domain services - these stay as direct dependencies
         self.config_service = get_unified_config_service()
+        self.parse_cache = get_parse_cache()
         
         print(f"ℹ [CSVProcessingService] Initialized with injected components")
     
@@ -61,19 +64,33 @@ class CSVProcessingService:
         
         file_path = file_info["temp_path"]
         filename = file_info["original_name"]
+        file_buffer = None
+        preprocessing_result = None
         
         try:
+            # Read the upload once; every step below works from this buffer
+            file_buffer = FileBuffer.open(file_path, file_info.get("content_hash"))
+            
+            # Results depend on the loaded configs too, so the key carries the config
+            # generation; generations are per process, so these entries stay in memory
+            cache_key = ('process', file_buffer.digest, filename, self._config_key(parse_config),
+                         enable_cleaning, self.config_service.config_generation)
+            cached_result = self.parse_cache.get(cache_key)
+            if cached_result is not MISSING:
+                print(f"      [CACHE] Reusing processing result of identical file content for {filename}")
+                return {**cached_result, "file_id": file_info["file_id"]}
+            
             # Step 1: Determine effective encoding
-            effective_encoding = self._determine_effective_encoding(file_path, filename, parse_config)
+            effective_encoding = self._determine_effective_encoding(file_buffer, filename, parse_config)
             
             # Update config with effective encoding
             current_config = self._update_config_with_encoding(parse_config, effective_encoding)
             
             # Step 2: Initial bank detection with raw file access
-            initial_bank_detection = self._initial_bank_detection(filename, file_path, effective_encoding)
+            initial_bank_detection = self._initial_bank_detection(filename, file_buffer, effective_encoding)
             
             # Step 3: Apply preprocessing if needed
-            preprocessing_result = self._apply_preprocessing(file_path, current_config, initial_bank_detection)
+            preprocessing_result = self._apply_preprocessing(file_buffer, current_config, initial_bank_detection)
             
             # Step 4: Bank detection and header finding
             bank_detection, header_info = self._detect_bank_and_headers(
@@ -106,7 +123,7 @@ class CSVProcessingService:
                 reasons=final_bank_info.get('reasons', [])
             )
             
-            return {
+            result = {
                 "file_id": file_info["file_id"],
                 "filename": filename,
                 "success": final_result['success'],
@@ -119,6 +136,9 @@ class CSVProcessingService:
                 },
                 "config": current_config,
             }
+            if result['success']:
+                self.parse_cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             print(f"[ERROR] File processing exception for {filename}: {str(e)}")
@@ -133,8 +153,19 @@ class CSVProcessingService:
                 "parse_result": {"success": False, "headers": [], "data": [], "row_count": 0},
                 "config": parse_config,
             }
+        finally:
+            if preprocessing_result is not None and preprocessing_result['file_path'] is not file_buffer:
+                preprocessing_result['file_path'].close()
+            if file_buffer is not None:
+                file_buffer.close()
     
-    def _determine_effective_encoding(self, file_path: str, filename: str, config: Any) -> str:
+    @staticmethod
+    def _config_key(config: Any) -> Any:
+        """Hashable form of a parse config, whether a Pydantic model or a dictionary"""
+        values = config.dict() if hasattr(config, 'dict') else dict(config)
+        return options_key(**values)
+    
+    def _determine_effective_encoding(self, file_buffer: FileBuffer, filename: str, config: Any) -> str:
         """Determine the effective encoding for the file"""
         encoding_from_config = config.encoding if hasattr(config, 'encoding') else config.get('encoding')
         effective_encoding = encoding_from_config
@@ -142,7 +173,7 @@ class CSVProcessingService:
         # If config encoding is None or generic 'utf-8', try to detect
         if not effective_encoding or (effective_encoding.lower() == 'utf-8' and filename.startswith("11600006-")):
             print(f"      Config encoding is '{effective_encoding}'. Detecting encoding for '{filename}'")
-            detection_result = self.encoding_detector.detect_encoding(file_path)
+            detection_result = self.encoding_detector.detect_encoding(file_buffer)
             effective_encoding = detection_result['encoding']
             print(f"      Detected encoding for '{filename}': {effective_encoding} (confidence: {detection_result['confidence']:.2f})")
         
@@ -167,12 +198,12 @@ class CSVProcessingService:
         
         return current_config
     
-    def _initial_bank_detection(self, filename: str, file_path: str, encoding: str) -> Dict[str, Any]:
+    def _initial_bank_detection(self, filename: str, file_buffer: FileBuffer, encoding: str) -> Dict[str, Any]:
         """Phase 1: Initial detection with raw file access for filename + content signatures"""
         
         # Try to use cached bank detection result from global cache first
         cache = get_bank_detection_cache()
-        cached_result = cache.get(filename, file_path)
+        cached_result = cache.get(filename, file_buffer.path)
         if cached_result:
             print(f"      ✅ [CACHE] Using cached bank detection for {filename}: {cached_result['bank_name']} (confidence: {cached_result['confidence']:.2f})")
             
@@ -214,16 +245,16 @@ class CSVProcessingService:
         encoding_used = encoding
         
         try:
-            with open(file_path, 'r', encoding=encoding, newline='') as f:
+            with file_buffer.open_text(encoding, newline='') as f:
                 raw_content = f.read(2000)  # First 2KB for signatures
         except UnicodeDecodeError:
             # If the provided encoding fails, try to re-detect the correct encoding
             print(f"      Encoding {encoding} failed, re-detecting encoding for {filename}")
             try:
-                detection_result = self.encoding_detector.detect_encoding(file_path)
+                detection_result = self.encoding_detector.detect_encoding(file_buffer)
                 encoding_used = detection_result['encoding']
                 print(f"      Re-detected encoding: {encoding_used} (confidence: {detection_result['confidence']:.2f})")
-                with open(file_path, 'r', encoding=encoding_used, newline='') as f:
+                with file_buffer.open_text(encoding_used, newline='') as f:
                     raw_content = f.read(2000)
             except Exception as e2:
                 print(f"Warning: Re-detection also failed: {e2}")
@@ -276,7 +307,7 @@ class CSVProcessingService:
                     continue
         return 0.0
     
-    def _apply_preprocessing(self, file_path: str, config: Any, quick_detection: Dict[str, Any]) -> Dict[str, Any]:
+    def _apply_preprocessing(self, file_buffer: FileBuffer, config: Any, quick_detection: Dict[str, Any]) -> Dict[str, Any]:
         """Apply generic CSV preprocessing"""
         print(f"      Generic CSV preprocessing (bank-agnostic)")
         
@@ -291,18 +322,18 @@ class CSVProcessingService:
         # Apply generic CSV preprocessing
         encoding = config.encoding if hasattr(config, 'encoding') else config.get('encoding')
         preprocessing_result = self.csv_preprocessor.preprocess_csv(
-            file_path, 
+            file_buffer, 
             'generic',
             encoding,
             skip_empty_row_removal=skip_empty_row_removal
         )
         
-        # Use preprocessed file if successful, otherwise use original
-        actual_file_path = file_path
+        # Use preprocessed buffer if successful, otherwise use original
+        actual_file_buffer = file_buffer
         preprocessing_info = {'applied': False}
         
         if preprocessing_result['success'] and preprocessing_result['issues_fixed']:
-            actual_file_path = preprocessing_result['processed_file_path']
+            actual_file_buffer = preprocessing_result['processed_file_path']
             preprocessing_info = {
                 'applied': True,
                 'issues_fixed': preprocessing_result['issues_fixed'],
@@ -315,11 +346,11 @@ class CSVProcessingService:
             print(f"      Generic preprocessing skipped (no issues found)")
         
         return {
-            'file_path': actual_file_path,
+            'file_path': actual_file_buffer,
             'info': preprocessing_info
         }
     
-    def _detect_bank_and_headers(self, file_path: str, filename: str, current_file_config: Any, 
+    def _detect_bank_and_headers(self, file_path: FileBuffer, filename: str, current_file_config: Any, 
                                 file_encoding: str, preprocessing_applied: bool, 
                                 initial_detection: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
         """Detect bank and validate header using robust header validation - optimized to reuse initial detection"""
@@ -390,7 +421,7 @@ class CSVProcessingService:
                 'data_start_row': 1
             }
     
-    def _parse_with_bank_info(self, file_path: str, config: Any, header_info: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_with_bank_info(self, file_path: FileBuffer, config: Any, header_info: Dict[str, Any]) -> Dict[str, Any]:
         """Parse file with enhanced parser using bank-detected info"""
         print(f"      Parsing with UnifiedCSVParser")
         
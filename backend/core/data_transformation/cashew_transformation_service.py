@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 from backend.services.cashew_transformer import CashewTransformer
+from backend.shared.models.transaction_frame import TransactionFrame
 from backend.core.bank_detection import BankDetector
 from backend.infrastructure.config.unified_config_service import get_unified_config_service
 
@@ -106,27 +107,18 @@ class CashewTransformationService:
             if data:
                 print(f"   Sample data (first row): {data[0] if data else 'none'}")
             
-            # Transform data
+            # Transform data into a frame the later pipeline stages update in place
             if categorization_rules or default_category_rules:
                 print(f"ℹ [CashewTransformationService] Using transformation with categorization rules")
-                result = self.transformer.transform_to_cashew(
-                    data, 
-                    column_mapping, 
-                    bank_name,
-                    categorization_rules,
-                    default_category_rules,
-                    account_mapping,
-                    config=bank_configs
-                )
             else:
                 print(f"ℹ [CashewTransformationService] Using basic transformation")
-                result = self.transformer.transform_to_cashew(
-                    data, 
-                    column_mapping, 
-                    bank_name,
-                    account_mapping=account_mapping,
-                    config=bank_configs
-                )
+            result = self.transformer.transform_to_cashew_frame(
+                data, 
+                column_mapping, 
+                bank_name,
+                account_mapping=account_mapping,
+                config=bank_configs
+            )
             
             print(f"[SUCCESS] Transformation successful: {len(result)} rows transformed")
             if result:
@@ -159,7 +151,7 @@ class CashewTransformationService:
     
     def _process_csv_data_list(self, csv_data_list: List[Dict[str, Any]]):
         """Process each CSV file using PRE-CLEANED data"""
-        all_transformed_data = []
+        csv_frames = []
         
         for csv_index, csv_data in enumerate(csv_data_list):
             print(f"\n   Processing CSV {csv_index + 1}/{len(csv_data_list)}")
@@ -187,19 +179,26 @@ class CashewTransformationService:
             # Get Account name from bank configuration
             base_account_name = self._get_account_name(bank_info, filename)
             
-            # Update Account field and add bank source for each row
+            # Set Account and add bank source as columns, leaving the request's rows untouched
             detected_bank_name = bank_info.get('bank_name', bank_info.get('detected_bank', 'unknown'))
-            for row in csv_file_data:
-                # For multi-currency banks like Wise, map account name based on currency
-                final_account_name = self._map_account_by_currency(detected_bank_name, base_account_name, row, filename)
-                row['Account'] = final_account_name
-                row['_source_bank'] = detected_bank_name  # For bank-specific account mapping
+            csv_frame = TransactionFrame.from_records(csv_file_data)
+            
+            # For multi-currency banks like Wise, map account name based on currency, once per currency
+            currencies = csv_frame.coalesce(['Currency', 'currency', 'CURRENCY'], '')
+            currency_accounts = {}
+            for currency in currencies:
+                if currency not in currency_accounts:
+                    currency_accounts[currency] = self._map_account_by_currency(
+                        detected_bank_name, base_account_name, currency, filename)
+            csv_frame.set_column('Account', [currency_accounts[currency] for currency in currencies])
+            csv_frame.fill('_source_bank', detected_bank_name)  # For bank-specific account mapping
             
-            print(f"      [SUCCESS] Account field '{base_account_name}' set for all {len(csv_file_data)} rows")
+            print(f"      [SUCCESS] Account field '{base_account_name}' set for all {len(csv_frame)} rows")
             
             # Add cleaned data to combined results
-            all_transformed_data.extend(csv_file_data)
+            csv_frames.append(csv_frame)
         
+        all_transformed_data = TransactionFrame.concat(csv_frames)
         print(f"\n   Combined data from all CSVs: {len(all_transformed_data)} total rows")
         
         # Use identity mapping since data is already cleaned with bank-specific configs
@@ -273,7 +272,7 @@ class CashewTransformationService:
         return account_name
     
     def _map_account_by_currency(self, detected_bank: str, base_account_name: str, 
-                                row: Dict[str, Any], filename: str) -> str:
+                                currency: Any, filename: str) -> str:
         """Map account name based on currency for multi-currency banks like Wise"""
         if not detected_bank or detected_bank == 'unknown':
             return base_account_name
@@ -281,8 +280,6 @@ class CashewTransformationService:
         try:
             bank_config = self.config_service.get_bank_config(detected_bank)
             if bank_config and bank_config.account_mapping:
-                # Get currency from row
-                currency = row.get('Currency', row.get('currency', row.get('CURRENCY', '')))
                 currency = currency.strip() if currency else ''
                 
                 print(f"         [DEBUG] Currency value found: '{currency}'")
@@ -5,6 +5,10 @@ from backend.core.transfer_detection.date_parser import DateParser
 from backend.core.transfer_detection.cross_bank_matcher import CrossBankMatcher
 from backend.core.transfer_detection.currency_converter import CurrencyConverter
 from backend.core.transfer_detection.confidence_calculator import ConfidenceCalculator
+from backend.core.transfer_detection.matching_index import MatchingIndex
+from backend.core.transfer_detection.name_index import NameTokenIndex
+from backend.core.transfer_detection.detection_session import TransferDetectionSession
+from backend.core.transfer_detection.vectorized_kernel import VectorizedMatchingKernel
 
 __all__ = [
     'TransferDetector',
@@ -12,5 +16,9 @@ __all__ = [
     'DateParser',
     'CrossBankMatcher', 
     'CurrencyConverter',
-    'ConfidenceCalculator'
+    'ConfidenceCalculator',
+    'MatchingIndex',
+    'NameTokenIndex',
+    'TransferDetectionSession',
+    'VectorizedMatchingKernel'
 ]
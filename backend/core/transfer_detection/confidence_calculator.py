@@ -3,6 +3,7 @@ Confidence calculation for transfer matches
 """
 from typing import Dict
 from backend.core.transfer_detection.date_parser import DateParser
+from backend.core.transfer_detection.transaction_record import TransactionRecord
 
 
 class ConfidenceCalculator:
@@ -41,6 +42,31 @@ class ConfidenceCalculator:
         
         return min(confidence, 1.0)
     
+    def calculate_record_confidence(self, outgoing: TransactionRecord, incoming: TransactionRecord,
+                                    is_cross_bank: bool = False,
+                                    is_exchange_match: bool = False) -> float:
+        """Same scoring as calculate_confidence, using pre-parsed transaction records"""
+        confidence = 0.5  # Base confidence
+        
+        if is_cross_bank:
+            confidence += 0.2
+        
+        if is_exchange_match:
+            confidence += 0.3
+        
+        # Same day bonus, from the 'Date' column only like calculate_confidence
+        if outgoing.score_day is not None and outgoing.score_day == incoming.score_day:
+            confidence += 0.2
+        
+        # Name match bonus
+        outgoing_desc = outgoing.raw_description_lower
+        incoming_desc = incoming.raw_description_lower
+        if ('transfer to' in outgoing_desc and 'from' in incoming_desc) or \
+           ('sent to' in outgoing_desc and 'received from' in incoming_desc):
+            confidence += 0.1
+        
+        return min(confidence, 1.0)
+    
     def calculate_conversion_confidence(self, outgoing: Dict, incoming: Dict, 
                                       conv1: Dict, conv2: Dict) -> float:
         """Calculate confidence for currency conversion matches"""
@@ -1,16 +1,27 @@
 """
 Configuration-driven cross-bank transfer matching
 """
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 from backend.core.transfer_detection.amount_parser import AmountParser
-from backend.core.transfer_detection.date_parser import DateParser
 from backend.core.transfer_detection.confidence_calculator import ConfidenceCalculator
+from backend.core.transfer_detection.matching_index import MatchingIndex
+from backend.core.transfer_detection.name_index import NameTokenIndex
+from backend.core.transfer_detection.vectorized_kernel import VectorizedMatchingKernel
+from backend.core.transfer_detection.transaction_record import (
+    TransactionRecord, get_description, get_date_string, get_exchange_amount, get_exchange_currency
+)
 from backend.infrastructure.config.unified_config_service import get_unified_config_service
+from backend.shared.utils.tracing import get_tracer
+
+_trace = get_tracer('transfer_detection')
 
 
 class CrossBankMatcher:
     """Handles cross-bank transfer detection using configuration-driven rules"""
     
+    # Evaluate amount/date/confidence checks with the NumPy kernel instead of pair by pair
+    use_vectorized_kernel = True
+    
     def __init__(self, config_dir: str = "configs", config_service=None):
         if config_service:
             self.config = config_service
@@ -21,85 +32,58 @@ class CrossBankMatcher:
         # self.currency_converter = CurrencyConverter() # Already initialized in main_detector
         
         self.confidence_calculator = ConfidenceCalculator()
+        self.matching_kernel = VectorizedMatchingKernel(self.date_tolerance_hours)
+        self._use_records(None)
         
         print(f" CrossBankMatcher: Banks: {', '.join(self.config.list_banks())}")
     
-    def find_transfer_candidates(self, transactions: List[Dict]) -> List[Dict]:
+    def find_transfer_candidates(self, transactions: List[Dict],
+                                 records: Optional[Dict[int, TransactionRecord]] = None) -> List[Dict]:
         """Find transactions that match configured transfer patterns"""
         candidates = []
+        self._use_records(records)
         
         for transaction in transactions:
             bank_type = transaction.get('_bank_type', 'unknown')
-            original_description = self._get_description(transaction) # Keep original case for logging
-            description_for_matching = original_description.lower() # Use lower for matching
+            original_description = self._record(transaction).description # Keep original case for logging
             
-            print(f"DEBUG CBM find_candidates: Processing Tx from CSV '{transaction.get('_csv_name')}', BankType='{bank_type}', Desc='{original_description[:60]}...'")
-
-            # Check outgoing patterns
-            outgoing_patterns = self.config.get_transfer_patterns(bank_type, 'outgoing')
-            for pattern in outgoing_patterns:
-                print(f"DEBUG CBM find_candidates:   Checking OUT pattern '{pattern}' for desc '{original_description[:50]}...' (Bank: {bank_type})")
-                extracted_name = self.config.extract_name_from_transfer_pattern(pattern, original_description) # Pass original_description
-                
-                # Check if pattern matches (either name extracted OR direct pattern match)
-                pattern_matches = False
-                if extracted_name is not None:
-                    pattern_matches = True
-                elif '{name}' not in pattern and '{user_name}' not in pattern:
-                    # Pattern without placeholder - check direct match
-                    if pattern.lower() in original_description.lower():
-                        pattern_matches = True
-                        extracted_name = "DIRECT_MATCH"  # Placeholder for patterns without names
-                
-                if pattern_matches:
-                    candidates.append({
-                        **transaction,
-                        '_transfer_pattern': pattern,
-                        '_is_transfer_candidate': True,
-                        '_transfer_direction': 'outgoing'
-                    })
-                    print(f"DEBUG CBM find_candidates:   -> ADDED OUTGOING Candidate: Desc='{original_description[:60]}...', Name='{extracted_name}', Amt='{transaction.get('Amount')}', Bank='{bank_type}', CSV='{transaction.get('_csv_name')}'")
-                    break # Found an outgoing pattern, no need to check more for this transaction
-                else:
-                    print(f"DEBUG CBM find_candidates:     -> No outgoing name extracted with pattern '{pattern}' for desc '{original_description[:60]}...'")
+            # One pass over the bank's compiled outgoing patterns, then incoming patterns
+            pattern_match = self.config.match_transfer_pattern(bank_type, original_description)
+            if not pattern_match:
+                if _trace.trace:
+                    _trace.event('candidate_no_pattern', level='trace', csv=transaction.get('_csv_name'),
+                                 bank=bank_type, description=original_description[:60])
+                continue
             
-            # Check incoming patterns if not already matched
-            if not any(t['_transaction_index'] == transaction['_transaction_index'] for t in candidates):
-                incoming_patterns = self.config.get_transfer_patterns(bank_type, 'incoming')
-                for pattern in incoming_patterns:
-                    print(f"DEBUG CBM find_candidates:   Checking IN pattern '{pattern}' for desc '{original_description[:50]}...' (Bank: {bank_type})")
-                    extracted_name = self.config.extract_name_from_transfer_pattern(pattern, original_description) # Pass original_description
-                    
-                    # Check if pattern matches (either name extracted OR direct pattern match)
-                    pattern_matches = False
-                    if extracted_name is not None:
-                        pattern_matches = True
-                    elif '{name}' not in pattern and '{user_name}' not in pattern:
-                        # Pattern without placeholder - check direct match
-                        if pattern.lower() in original_description.lower():
-                            pattern_matches = True
-                            extracted_name = "DIRECT_MATCH"  # Placeholder for patterns without names
-                    
-                    if pattern_matches:
-                        candidates.append({
-                            **transaction,
-                            '_transfer_pattern': pattern,
-                            '_is_transfer_candidate': True,
-                            '_transfer_direction': 'incoming'
-                        })
-                        print(f"DEBUG CBM find_candidates:   -> ADDED INCOMING Candidate: Desc='{original_description[:60]}...', Name='{extracted_name}', Amt='{transaction.get('Amount')}', Bank='{bank_type}', CSV='{transaction.get('_csv_name')}'")
-                        break # Found an incoming pattern
-                    else:
-                        print(f"DEBUG CBM find_candidates:     -> No incoming name extracted with pattern '{pattern}' for desc '{original_description[:60]}...'")
+            direction, pattern, extracted_name = pattern_match
+            if extracted_name is None:
+                extracted_name = "DIRECT_MATCH"  # Placeholder for patterns without names
+            
+            candidates.append({
+                **transaction,
+                '_transfer_pattern': pattern,
+                '_is_transfer_candidate': True,
+                '_transfer_direction': direction
+            })
+            if _trace.debug:
+                _trace.event('candidate_added', direction=direction, description=original_description[:60],
+                             pattern=pattern, name=extracted_name, amount=transaction.get('Amount'),
+                             bank=bank_type, csv=transaction.get('_csv_name'))
         
         return candidates
     
     def match_cross_bank_transfers(self, potential_transfers: List[Dict], 
                                  all_transactions: List[Dict], 
-                                 existing_pairs: List[Dict]) -> List[Dict]:
-        """Match cross-bank transfers using configuration-driven rules"""
-        transfer_pairs = []
+                                 existing_pairs: List[Dict],
+                                 records: Optional[Dict[int, TransactionRecord]] = None) -> List[Dict]:
+        """
+        Match cross-bank transfers using configuration-driven rules.
+        
+        records: pre-parsed TransactionRecords keyed by _transaction_index (built by
+        TransferDetector._prepare_transactions); missing records are built on demand.
+        """
         self.potential_pairs = []  # Store potential pairs that failed name matching
+        self._use_records(records)
         existing_transaction_ids: Set[int] = set()
         
         # Get IDs of already matched transactions
@@ -112,32 +96,73 @@ class CrossBankMatcher:
         # Filter available transactions
         available_outgoing = [t for t in potential_transfers 
                             if t['_transaction_index'] not in existing_transaction_ids and 
-                               AmountParser.parse_amount(t.get('Amount', '0')) < 0]
+                               self._record(t).amount < 0]
         
-        print(f"DEBUG CBM match_cross_bank_transfers: Total {len(available_outgoing)} available_outgoing transactions to process.")
-        # for idx, ao_txn in enumerate(available_outgoing):
-        #     print(f"DEBUG CBM match_cross_bank_transfers: Available Outgoing {idx}: Desc='{self._get_description(ao_txn)[:60]}...', Amt='{ao_txn.get('Amount')}', Bank='{ao_txn.get('_bank_type')}', CSV='{ao_txn.get('_csv_name')}'")
-
-        print(f"DEBUG CBM match_cross_bank_transfers: Initial outgoing transaction processing order (first 5):")
-        for i, tx in enumerate(available_outgoing[:5]):
-            print(f"DEBUG CBM match_cross_bank_transfers:  {i+1}. {self._get_description(tx)[:50]}..., Amt={tx.get('Amount')}, Date={tx.get('Date')}, Bank={tx.get('_bank_type')}")
-        print("DEBUG CBM match_cross_bank_transfers: ... (rest of outgoing transactions)")
+        print(f"   {len(available_outgoing)} outgoing transactions to match")
 
         available_incoming = [t for t in all_transactions 
                             if t['_transaction_index'] not in existing_transaction_ids and 
-                               AmountParser.parse_amount(t.get('Amount', '0')) > 0]
+                               self._record(t).amount > 0]
+        
+        # Index incoming transactions by (currency, amount) so each outgoing transaction
+        # only evaluates candidates that can pass the amount and date checks
+        incoming_index = self._build_incoming_index(available_incoming)
+        if _trace.debug:
+            _trace.event('incoming_indexed', outgoing=len(available_outgoing), incoming=len(incoming_index))
 
+        transfer_pairs = self._match_outgoing(available_outgoing, available_incoming, incoming_index, existing_transaction_ids)
+        
+        print(f"[SUCCESS] Created {len(transfer_pairs)} cross-bank transfer pairs")
+        print(f"[INFO] Found {len(self.potential_pairs)} potential pairs (failed name matching)")
+        return transfer_pairs
+    
+    def match_outgoing_against_index(self, available_outgoing: List[Dict],
+                                     available_incoming: List[Dict],
+                                     incoming_index: MatchingIndex,
+                                     existing_transaction_ids: Set[int],
+                                     records: Optional[Dict[int, TransactionRecord]] = None) -> List[Dict]:
+        """
+        Match outgoing transfer candidates against an incoming index built by the caller.
+        
+        Used by incremental detection, where the index outlives a single call. Positions
+        in incoming_index refer to available_incoming, and existing_transaction_ids is
+        updated in place with the transactions paired here.
+        """
+        self.potential_pairs = []
+        if records is not None and records is not self._records:
+            self._use_records(records)
+        
+        available_outgoing = [t for t in available_outgoing
+                              if t['_transaction_index'] not in existing_transaction_ids and
+                                 self._record(t).amount < 0]
+        return self._match_outgoing(available_outgoing, available_incoming, incoming_index, existing_transaction_ids)
+    
+    def _match_outgoing(self, available_outgoing: List[Dict], available_incoming: List[Dict],
+                        incoming_index: MatchingIndex, existing_transaction_ids: Set[int]) -> List[Dict]:
+        """Pair each outgoing transaction with its best incoming match, in order"""
+        transfer_pairs = []
+        
+        # Per-candidate tracing needs the pair-by-pair evaluation in _find_best_match
+        candidate_pairs = None
+        if self.use_vectorized_kernel and not _trace.trace and available_outgoing and available_incoming:
+            incoming_positions = incoming_index.positions()
+            candidate_pairs = self.matching_kernel.find_candidate_pairs(
+                [self._record(t) for t in available_outgoing],
+                [self._record(t) for t in available_incoming],
+                incoming_positions
+            )
+            name_index = self._build_name_index(available_incoming, incoming_positions)
+        
         # Match each outgoing transaction
-        for outgoing in available_outgoing:
+        for outgoing_position, outgoing in enumerate(available_outgoing):
             if outgoing['_transaction_index'] in existing_transaction_ids:
                 continue
-                
-            print(f"\nDEBUG CBM match_cross_bank_transfers: --- Processing OUTGOING: Desc='{self._get_description(outgoing)[:60]}...', Amt={outgoing.get('Amount')}, Date='{outgoing.get('Date')}', Bank='{outgoing.get('_bank_type')}', CSV='{outgoing.get('_csv_name')}'")
-            # Debugging info: Show the contents of existing_transaction_ids
-            print(f"DEBUG CBM match_cross_bank_transfers:   Current existing_transaction_ids: {sorted(list(existing_transaction_ids))}")
-            
             
-            best_match = self._find_best_match(outgoing, available_incoming, existing_transaction_ids)
+            if candidate_pairs is not None:
+                best_match = self._select_best_match(outgoing, candidate_pairs[outgoing_position],
+                                                     available_incoming, existing_transaction_ids, name_index)
+            else:
+                best_match = self._find_best_match(outgoing, available_incoming, existing_transaction_ids, incoming_index)
             
             if best_match and best_match['confidence'] >= self.confidence_threshold:
                 transfer_pair = self._create_transfer_pair(outgoing, best_match, len(transfer_pairs))
@@ -150,95 +175,168 @@ class CrossBankMatcher:
                 existing_transaction_ids.add(outgoing['_transaction_index'])
                 existing_transaction_ids.add(best_match['incoming']['_transaction_index'])
         
-        print(f"[SUCCESS] Created {len(transfer_pairs)} cross-bank transfer pairs")
-        print(f"[INFO] Found {len(self.potential_pairs)} potential pairs (failed name matching)")
         return transfer_pairs
     
+    def _build_name_index(self, available_incoming: List[Dict], positions: List[int]) -> NameTokenIndex:
+        """Index incoming transactions by the transfer name extracted from their description"""
+        name_index = NameTokenIndex()
+        for position in positions:
+            name_index.add(position, self._transfer_name(available_incoming[position], 'incoming')[0])
+        return name_index
+    
+    def _select_best_match(self, outgoing: Dict, candidate_pairs: List[Tuple[int, bool, float]],
+                           available_incoming: List[Dict], existing_transaction_ids: Set[int],
+                           name_index: NameTokenIndex) -> Optional[Dict]:
+        """
+        Same result as _find_best_match, for candidates that already passed the
+        vectorized date, amount, CSV and bank checks. The name check of
+        _is_cross_bank_transfer becomes a lookup in the incoming name index, and
+        candidates whose names do not match are recorded as potential pairs in the
+        same pass.
+        """
+        outgoing_record = self._record(outgoing)
+        outgoing_name, outgoing_matches = self._transfer_name(outgoing, 'outgoing')
+        name_matches = name_index.matching_positions(outgoing_name) if outgoing_name else None
+        best_incoming = None
+        best_confidence = 0.0
+        
+        for incoming_position, _, confidence in candidate_pairs:
+            incoming = available_incoming[incoming_position]
+            if incoming['_transaction_index'] in existing_transaction_ids:
+                continue
+            
+            incoming_name = name_index.name_at(incoming_position) if name_matches is not None else None
+            if incoming_name:
+                if incoming_position not in name_matches:
+                    # Amounts and dates already match, so a name mismatch is a potential pair
+                    self.potential_pairs.append({
+                        'outgoing': outgoing,
+                        'incoming': incoming,
+                        'reason': 'name_mismatch',
+                        'outgoing_name': outgoing_name,
+                        'incoming_name': incoming_name,
+                        'amount_match': True,
+                        'date_match': True,
+                        'date_diff_hours': outgoing_record.hours_between(self._record(incoming)),
+                        'confidence': 0.7  # High confidence except for name
+                    })
+                    continue
+            elif not (outgoing_matches and self._transfer_name(incoming, 'incoming')[1]):
+                # Fallback pattern match when a name is missing on either side
+                continue
+            
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best_incoming = incoming
+        
+        if best_incoming is None:
+            if _trace.debug:
+                _trace.event('best_match', outgoing=outgoing_record.transaction_index, incoming=None)
+            return None
+        
+        # Build the match details for the winner only
+        incoming_amount = self._record(best_incoming).amount
+        matches = self._evaluate_matching_strategies(
+            outgoing, best_incoming, outgoing_record.abs_amount, incoming_amount,
+            outgoing_record.exchange_amount, outgoing_record.exchange_currency
+        )
+        best_match = {
+            'incoming': best_incoming,
+            'incoming_amount': incoming_amount,
+            **max(matches, key=lambda x: x['confidence'])
+        }
+        if _trace.debug:
+            _trace.event('best_match', outgoing=outgoing_record.transaction_index,
+                         incoming=best_incoming['_transaction_index'], confidence=best_match['confidence'],
+                         strategy=best_match['type'])
+        return best_match
+    
+    def _build_incoming_index(self, available_incoming: List[Dict]) -> MatchingIndex:
+        """Index incoming transactions by currency, amount and date for candidate lookup"""
+        incoming_index = MatchingIndex(self.date_tolerance_hours)
+        for position, incoming in enumerate(available_incoming):
+            incoming_record = self._record(incoming)
+            incoming_index.add(position, incoming_record.currency, incoming_record.amount, incoming_record.timestamp)
+        return incoming_index
+    
+    def _get_candidate_positions(self, outgoing_record: TransactionRecord,
+                                 incoming_index: MatchingIndex) -> List[int]:
+        """Positions of incoming candidates that can satisfy one of the amount matching strategies"""
+        probes = [(outgoing_record.currency, outgoing_record.abs_amount)]
+        if outgoing_record.exchange_amount is not None and outgoing_record.exchange_currency:
+            probes.append((outgoing_record.exchange_currency, outgoing_record.exchange_amount))
+        return incoming_index.find_candidates(probes, outgoing_record.timestamp)
+    
     def _find_best_match(self, outgoing: Dict, available_incoming: List[Dict], 
-                        existing_transaction_ids: Set[int]) -> Optional[Dict]: # Return type can be None
-        """Find the best matching incoming transaction using configuration"""
-        print(f"\nDEBUG CBM _find_best_match: >>> Attempting to match OUTGOING: "
-              f"Desc='{self._get_description(outgoing)[:60]}...', Amt={outgoing.get('Amount')}, Date='{outgoing.get('Date')}', "
-              f"Bank='{outgoing.get('_bank_type')}', CSV='{outgoing.get('_csv_name')}'")
-
-        outgoing_amount = abs(AmountParser.parse_amount(outgoing.get('Amount', '0')))
-        exchange_amount = self._get_exchange_amount_from_csv(outgoing)
-        exchange_currency = self._get_exchange_currency_from_csv(outgoing)
-
-        # === Logging as per request ===
-        print(f"\nDEBUG CBM _find_best_match: === EVALUATING INCOMING CANDIDATES ===")
-        print(f"DEBUG CBM _find_best_match: Outgoing: Desc='{self._get_description(outgoing)[:60]}...', Amt={outgoing.get('Amount')}, Date='{self._get_date_string(outgoing)}', ExchAmt={exchange_amount}, ExchCurr={exchange_currency}")
+                        existing_transaction_ids: Set[int],
+                        incoming_index: Optional[MatchingIndex] = None) -> Optional[Dict]: # Return type can be None
+        """
+        Find the best matching incoming transaction using configuration.
+        When an incoming_index is given, only candidates from the outgoing transaction's
+        amount buckets within the date window are evaluated; all other incoming
+        transactions fail the amount checks and cannot produce a match or potential pair.
+        """
+        outgoing_record = self._record(outgoing)
+        outgoing_amount = outgoing_record.abs_amount
+        exchange_amount = outgoing_record.exchange_amount
+        exchange_currency = outgoing_record.exchange_currency
 
         if not available_incoming:
-            # === Logging as per request ===
-            print("DEBUG CBM _find_best_match: CAUTION: available_incoming candidates list is EMPTY - filtering issue detected!")
+            if _trace.warning:
+                _trace.event('no_incoming_candidates', level='warning', outgoing=outgoing_record.transaction_index)
             return None # Explicitly return None if no candidates
 
-        print(f"DEBUG CBM _find_best_match:   Outgoing details - Amount: {outgoing_amount}, ExchAmt: {exchange_amount}, ExchCurr: {exchange_currency}")
-        print(f"DEBUG CBM _find_best_match:   Number of available_incoming candidates: {len(available_incoming)}")
+        if incoming_index is not None:
+            candidate_positions = self._get_candidate_positions(outgoing_record, incoming_index)
+        else:
+            candidate_positions = range(len(available_incoming))
+        
+        if _trace.debug:
+            _trace.event('match_outgoing', outgoing=outgoing_record.transaction_index,
+                         description=outgoing_record.description[:60], amount=outgoing_record.amount,
+                         date=self._get_date_string(outgoing), bank=outgoing_record.bank_type,
+                         csv=outgoing.get('_csv_name'), exchange_amount=exchange_amount,
+                         exchange_currency=exchange_currency, candidates=len(candidate_positions))
         
         best_match = None
         best_confidence = 0.0
         
-        # Corrected loop with enumerate and proper indentation for the body
-        for incoming_idx, incoming in enumerate(available_incoming):
-            # === Logging as per request: Candidate details ===
-            print(f"\nDEBUG CBM _find_best_match: Candidate {incoming_idx + 1}:")
-            # Safely get bank_type and then bank_config to avoid errors if bank_type is None
-            bank_type_for_currency = incoming.get('_bank_type')
-            default_currency = "N/A"
-            if bank_type_for_currency:
-                bank_config_for_currency = self.config.get_bank_config(bank_type_for_currency)
-                if bank_config_for_currency:
-                    default_currency = bank_config_for_currency.currency_primary
-            
-            incoming_desc_full = self._get_description(incoming)
-            incoming_amt_val = AmountParser.parse_amount(incoming.get('Amount', '0'))
-            incoming_date_str_val = self._get_date_string(incoming)
-            incoming_curr_val = incoming.get('Currency', default_currency)
-            incoming_csv_val = incoming.get('_csv_name')
-
-            print(f"  - Description: {incoming_desc_full}")
-            print(f"  - Amount: {incoming_amt_val}")
-            print(f"  - Date: {incoming_date_str_val}")
-            print(f"  - Currency: {incoming_curr_val}")
-            print(f"  - CSV: {incoming_csv_val}")
+        for incoming_idx in candidate_positions:
+            incoming = available_incoming[incoming_idx]
+            incoming_record = self._record(incoming)
+            if _trace.trace:
+                _trace.event('evaluate_candidate', level='trace', outgoing=outgoing_record.transaction_index,
+                             incoming=incoming_record.transaction_index, description=incoming_record.description,
+                             amount=incoming_record.amount, date=self._get_date_string(incoming),
+                             currency=incoming_record.currency, csv=incoming.get('_csv_name'))
 
             # Check if already used or same CSV
-            if (incoming['_transaction_index'] in existing_transaction_ids or
-                incoming['_csv_index'] == outgoing['_csv_index']):  # Must be different CSV
-                # === Logging as per request: Rejection reason ===
-                print(f"  - Reason for rejection: Already used or same CSV file.")
+            if (incoming_record.transaction_index in existing_transaction_ids or
+                incoming_record.csv_index == outgoing_record.csv_index):  # Must be different CSV
+                if _trace.trace:
+                    _trace.event('candidate_rejected', level='trace', incoming=incoming_record.transaction_index,
+                                 reason='already_used_or_same_csv')
                 continue
             
-            incoming_amount = AmountParser.parse_amount(incoming.get('Amount', '0'))
+            incoming_amount = incoming_record.amount
             
             # Check date tolerance first
-            # === Logging as per request: Date tolerance check ===
-            outgoing_date_obj = DateParser.parse_date(self._get_date_string(outgoing))
-            incoming_date_obj = DateParser.parse_date(self._get_date_string(incoming))
-            hours_diff = abs((outgoing_date_obj - incoming_date_obj).total_seconds() / 3600) if outgoing_date_obj and incoming_date_obj else float('inf')
-            date_check_passed = self._check_date_tolerance(outgoing, incoming) # Uses internal parsing
-            
-            print(f"DEBUG CBM: Date tolerance check:")
-            print(f"  - Outgoing date: {self._get_date_string(outgoing)}") # Already logged as part of Outgoing details
-            print(f"  - Incoming date: {incoming_date_str_val}") # Use already fetched value
-            print(f"  - Difference in hours: {hours_diff:.2f}")
-            print(f"  - Date tolerance setting: {self.date_tolerance_hours} hours")
-            print(f"  - Result: {'PASS' if date_check_passed else 'FAIL'}")
+            hours_diff = outgoing_record.hours_between(incoming_record)
+            date_check_passed = hours_diff <= self.date_tolerance_hours
 
             if not date_check_passed:
-                # === Logging as per request: Rejection reason ===
-                print(f"  - Reason for rejection: Date mismatch (Diff: {hours_diff:.2f}h, Tolerance: {self.date_tolerance_hours}h)")
+                if _trace.trace:
+                    _trace.event('candidate_rejected', level='trace', incoming=incoming_record.transaction_index,
+                                 reason='date_mismatch', hours_diff=round(hours_diff, 2),
+                                 tolerance_hours=self.date_tolerance_hours)
                 continue
 
             # Check if this could be a cross-bank transfer using config
-            # === Logging as per request: Cross-bank transfer validation (done inside _is_cross_bank_transfer) ===
-            is_transfer_check_result, details = self._is_cross_bank_transfer(outgoing, incoming, debug=True)
+            is_transfer_check_result, details = self._is_cross_bank_transfer(outgoing, incoming, debug=_trace.trace)
             if not is_transfer_check_result:
-                # === Logging as per request: Rejection reason ===
-                # _is_cross_bank_transfer logs its own details when debug=True
-                print(f"  - Reason for rejection: _is_cross_bank_transfer failed (Details logged above by _is_cross_bank_transfer)")
+                if _trace.trace:
+                    _trace.event('candidate_rejected', level='trace', incoming=incoming_record.transaction_index,
+                                 reason='not_cross_bank_transfer', details=details)
                 
                 # Check if this was a name mismatch - if so, validate amounts before storing as potential pair
                 if details.get('names_match_result') is False:
@@ -258,9 +356,11 @@ class CrossBankMatcher:
                             'confidence': 0.7  # High confidence except for name
                         }
                         self.potential_pairs.append(potential_pair)
-                        print(f"  - CAPTURED POTENTIAL PAIR: Names don't match ('{details.get('outgoing_name')}' vs '{details.get('incoming_name')}') but amount/date do")
-                    else:
-                        print(f"  - NOT capturing potential pair: Names don't match AND amounts don't match")
+                        if _trace.debug:
+                            _trace.event('potential_pair', outgoing=outgoing_record.transaction_index,
+                                         incoming=incoming_record.transaction_index,
+                                         outgoing_name=details.get('outgoing_name'),
+                                         incoming_name=details.get('incoming_name'))
                 
                 continue
             
@@ -274,7 +374,11 @@ class CrossBankMatcher:
                 best_incoming_match = max(matches, key=lambda x: x['confidence'])
                 
                 if best_incoming_match['confidence'] > best_confidence:
-                    print(f"DEBUG CBM:         ==> NEW BEST for this OUTGOING: IN='{self._get_description(incoming)[:40]}...' with conf {best_incoming_match['confidence']:.2f} (Strategy: {best_incoming_match.get('type')})")
+                    if _trace.trace:
+                        _trace.event('new_best_match', level='trace', outgoing=outgoing_record.transaction_index,
+                                     incoming=incoming_record.transaction_index,
+                                     confidence=best_incoming_match['confidence'],
+                                     strategy=best_incoming_match.get('type'))
                     best_confidence = best_incoming_match['confidence']
                     best_match = {
                         'incoming': incoming,
@@ -282,13 +386,12 @@ class CrossBankMatcher:
                         **best_incoming_match
                     }
                 # No specific log if not better, to reduce noise
-            else:
-                print(f"DEBUG CBM:         No matching strategies found for this IN candidate.")
         
-        if not best_match:
-            print(f"DEBUG CBM _find_best_match: <<< No suitable match ultimately found for OUTGOING: '{self._get_description(outgoing)[:60]}...'")
-        else:
-            print(f"DEBUG CBM _find_best_match: <<< FINAL BEST MATCH for OUT: '{self._get_description(outgoing)[:60]}...' is IN: '{self._get_description(best_match['incoming'])[:60]}...' with conf {best_match['confidence']:.2f}")
+        if _trace.debug:
+            _trace.event('best_match', outgoing=outgoing_record.transaction_index,
+                         incoming=best_match['incoming']['_transaction_index'] if best_match else None,
+                         confidence=best_match['confidence'] if best_match else None,
+                         strategy=best_match['type'] if best_match else None)
         return best_match
     
     def _is_cross_bank_transfer(self, outgoing: Dict, incoming: Dict, debug: bool = False) -> (bool, Dict):
@@ -300,58 +403,47 @@ class CrossBankMatcher:
         if outgoing_bank == incoming_bank:
             return False, {"reason": "Same bank"}
 
-        outgoing_desc = self._get_description(outgoing)
-        incoming_desc = self._get_description(incoming)
-        
-        outgoing_patterns = self.config.get_transfer_patterns(outgoing_bank, 'outgoing')
-        incoming_patterns = self.config.get_transfer_patterns(incoming_bank, 'incoming')
-        
+        # Extract names using the banks' precompiled transfer patterns
+        outgoing_name, outgoing_matches = self._transfer_name(outgoing, 'outgoing')
+        incoming_name, incoming_matches = self._transfer_name(incoming, 'incoming')
         if debug:
-            print(f"DEBUG CBM _is_cross_bank_transfer: OutBank='{outgoing_bank}', OutDesc='{outgoing_desc[:50]}...', InBank='{incoming_bank}', InDesc='{incoming_desc[:50]}...'")
-            # Requested format for name extraction logging
-            print(f"DEBUG CBM _is_cross_bank_transfer: Name extraction and matching:")
-
-        # Extract names from outgoing transaction
-        outgoing_name = None
-        for pattern in outgoing_patterns:
-            extracted_name = self.config.extract_name_from_transfer_pattern(pattern, outgoing_desc)
-
-        # Extract names from outgoing transaction
-        outgoing_name = None
-        for pattern in outgoing_patterns:
-            extracted_name = self.config.extract_name_from_transfer_pattern(pattern, outgoing_desc)
-            if extracted_name:
-                outgoing_name = extracted_name
-                break
-        if debug: # Log extracted name as per request
-            print(f"  - Outgoing name extracted: '{outgoing_name}' (using patterns: {outgoing_patterns})")
-        
-        # Extract names from incoming transaction  
-        incoming_name = None
-        for pattern in incoming_patterns:
-            extracted_name = self.config.extract_name_from_transfer_pattern(pattern, incoming_desc)
-            if extracted_name:
-                incoming_name = extracted_name
-                break
-        if debug: # Log extracted name as per request
-            print(f"  - Incoming name extracted: '{incoming_name}' (using patterns: {incoming_patterns})")
+            _trace.event('name_extraction', level='trace', outgoing_bank=outgoing_bank, incoming_bank=incoming_bank,
+                         outgoing_name=outgoing_name, incoming_name=incoming_name)
         
         # If we found names in both transactions, check if they could match
         if outgoing_name and incoming_name:
             # Names should be similar (same person transferring)
-            names_match_res = self._names_match(outgoing_name, incoming_name)
+            names_match_res = self._name_matches.get((outgoing_name, incoming_name))
+            if names_match_res is None:
+                names_match_res = self._names_match(outgoing_name, incoming_name)
+                self._name_matches[(outgoing_name, incoming_name)] = names_match_res
             if debug:
-                print(f"  - Name match result: {str(names_match_res).upper()}") # Requested format
+                _trace.event('name_match', level='trace', result=names_match_res)
             return names_match_res, {"outgoing_name": outgoing_name, "incoming_name": incoming_name, "names_match_result": names_match_res}
         
         # Fallback to simple pattern matching if name extraction fails
-        outgoing_matches = any(self._pattern_matches(pattern, outgoing_desc) for pattern in outgoing_patterns)
-        incoming_matches = any(self._pattern_matches(pattern, incoming_desc) for pattern in incoming_patterns)
-        
         if debug:
-            print(f"  - Fallback pattern match: Out={outgoing_matches}, In={incoming_matches}, Result: {str(outgoing_matches and incoming_matches).upper()}")
+            _trace.event('fallback_pattern_match', level='trace', outgoing_matches=outgoing_matches,
+                         incoming_matches=incoming_matches)
         return outgoing_matches and incoming_matches, {"reason": "Fallback pattern match", "outgoing_matches": outgoing_matches, "incoming_matches": incoming_matches}
     
+    def _transfer_name(self, transaction: Dict, direction: str) -> Tuple[Optional[str], bool]:
+        """
+        Name extracted by the transaction's bank patterns for one direction, and whether
+        the fallback pattern check matches. Cached per transaction, since each transaction
+        is compared with many counterparts.
+        """
+        key = (transaction['_transaction_index'], direction)
+        cached = self._transfer_names.get(key)
+        if cached is None:
+            bank = transaction.get('_bank_type', '')
+            description = self._record(transaction).description
+            name = self.config.extract_transfer_name(bank, direction, description)
+            patterns = self.config.get_transfer_patterns(bank, direction)
+            cached = (name, any(self._pattern_matches(pattern, description) for pattern in patterns))
+            self._transfer_names[key] = cached
+        return cached
+    
     def _pattern_matches(self, pattern: str, description: str) -> bool:
         """Check if pattern matches description (simple version without name extraction)"""
         # Remove {name} placeholder and check if rest of pattern matches
@@ -402,23 +494,11 @@ class CrossBankMatcher:
     
     def _check_date_tolerance(self, outgoing: Dict, incoming: Dict) -> bool:
         """Check if dates are within tolerance"""
-        outgoing_date_str = self._get_date_string(outgoing)
-        incoming_date_str = self._get_date_string(incoming)
-        
-        return DateParser.dates_within_tolerance(
-            DateParser.parse_date(outgoing_date_str),
-            DateParser.parse_date(incoming_date_str),
-            self.date_tolerance_hours
-        )
+        return self._record(outgoing).hours_between(self._record(incoming)) <= self.date_tolerance_hours
     
     def _get_date_string(self, transaction: Dict) -> str:
         """Get date string from transaction"""
-        return (
-            transaction.get('Date', '') or 
-            transaction.get('\ufeffDate', '') or 
-            transaction.get('TIMESTAMP', '') or 
-            transaction.get('TransactionDate', '')
-        )
+        return get_date_string(transaction)
     
     def _evaluate_matching_strategies(self, outgoing: Dict, incoming: Dict,
                                     outgoing_amount: float, incoming_amount: float,
@@ -430,60 +510,43 @@ class CrossBankMatcher:
         """Evaluate all matching strategies and return matches"""
         matches = []
 
-        outgoing_currency = outgoing.get('Currency', self.config.get_bank_config(outgoing.get('_bank_type')).currency_primary if outgoing.get('_bank_type') and self.config.get_bank_config(outgoing.get('_bank_type')) else None)
-        incoming_currency = incoming.get('Currency', self.config.get_bank_config(incoming.get('_bank_type')).currency_primary if incoming.get('_bank_type') and self.config.get_bank_config(incoming.get('_bank_type')) else None)
-
-        print(f"DEBUG CBM _eval_strat: Outgoing: {outgoing_amount_orig_curr} {outgoing_currency}, Incoming: {incoming_amount_orig_curr} {incoming_currency}, Exchange: {exchange_amount} {exchange_currency}")
+        outgoing_record = self._record(outgoing)
+        incoming_record = self._record(incoming)
+        outgoing_currency = outgoing_record.currency
+        incoming_currency = incoming_record.currency
 
         # Strategy 1: Exchange To Amount matching (PRIORITY for Wise-like transactions)
         if exchange_amount is not None and exchange_currency: # exchange_amount can be 0.0
-            print(f"\nDEBUG CBM _eval_strat: === STRATEGY 1 (Exchange Amount) EVALUATION ===") # Requested header
-            print(f"DEBUG CBM _eval_strat: Outgoing ExchangeToCurrency: '{exchange_currency}'")
-            print(f"DEBUG CBM _eval_strat: Incoming Currency: '{incoming_currency}'")
-
             currency_match_check = (exchange_currency == incoming_currency)
-            print(f"DEBUG CBM _eval_strat: Currency match result: {'PASS' if currency_match_check else 'FAIL'}")
 
             if currency_match_check:
                 # Only check amount if currency matches
                 amount_match_check = AmountParser.amounts_match(exchange_amount, incoming_amount_orig_curr)
-                # Calculate difference directly as AmountParser.calculate_difference does not exist
-                amount_diff = abs(exchange_amount - incoming_amount_orig_curr)
-                
-                print(f"DEBUG CBM _eval_strat: Outgoing ExchangeToAmount: {exchange_amount}")
-                print(f"DEBUG CBM _eval_strat: Incoming Amount: {incoming_amount_orig_curr}")
-                print(f"DEBUG CBM _eval_strat: Amount match result: {'PASS' if amount_match_check else 'FAIL'}")
-                print(f"DEBUG CBM _eval_strat: Amount difference: {amount_diff:.2f}")
+                if _trace.trace:
+                    _trace.event('strategy_exchange_amount', level='trace', exchange_amount=exchange_amount,
+                                 exchange_currency=exchange_currency, incoming_amount=incoming_amount_orig_curr,
+                                 amount_diff=round(abs(exchange_amount - incoming_amount_orig_curr), 2),
+                                 result=amount_match_check)
 
                 if amount_match_check:
-                    confidence = self.confidence_calculator.calculate_confidence(
-                        outgoing, incoming, is_cross_bank=True, is_exchange_match=True
+                    confidence = self.confidence_calculator.calculate_record_confidence(
+                        outgoing_record, incoming_record, is_cross_bank=True, is_exchange_match=True
                     )
-                    print(f"DEBUG CBM _eval_strat: Strategy 1 final result: PASS with confidence: {confidence:.2f}")
                     matches.append({
                         'type': 'exchange_amount',
                         'confidence': confidence,
                         'matched_amount': exchange_amount, # This is the amount in the target currency
                         'match_details': f"Exchange {exchange_amount} {exchange_currency}"
                     })
-                    # Old log, replaced by "Strategy 1 final result..."
-                    # print(f"DEBUG CBM _eval_strat: Strategy 1 (Exchange): MATCHED. Amount: {exchange_amount}, Currency: {exchange_currency}. Conf: {confidence:.2f}")
-                else:
-                    print(f"DEBUG CBM _eval_strat: Strategy 1 final result: FAIL (Amount mismatch)")
-                    # Old log, replaced by "Strategy 1 final result..."
-                    # print(f"DEBUG CBM _eval_strat: Strategy 1 (Exchange): REJECTED - Amounts do not match ({exchange_amount} vs {incoming_amount_orig_curr})")
-            else:
-                print(f"DEBUG CBM _eval_strat: Strategy 1 final result: FAIL (Currency mismatch)")
-                # This path is taken if currencies do not match. The reason is already logged by the currency comparison print.
-                pass
-        else: # exchange_amount or exchange_currency is None/empty
-            print(f"DEBUG CBM _eval_strat: Strategy 1 (Exchange Amount) SKIPPED - Missing exchange_amount ({exchange_amount}) or exchange_currency ({exchange_currency}) on outgoing tx.")
+            elif _trace.trace:
+                _trace.event('strategy_exchange_amount', level='trace', exchange_currency=exchange_currency,
+                             incoming_currency=incoming_currency, result=False, reason='currency_mismatch')
 
         # Strategy 2: Traditional amount matching (same currency only)
         if outgoing_currency == incoming_currency:
             if AmountParser.amounts_match(outgoing_amount_orig_curr, incoming_amount_orig_curr):
-                confidence = self.confidence_calculator.calculate_confidence(
-                    outgoing, incoming, is_cross_bank=True
+                confidence = self.confidence_calculator.calculate_record_confidence(
+                    outgoing_record, incoming_record, is_cross_bank=True
                 )
                 matches.append({
                     'type': 'traditional_same_currency',
@@ -491,32 +554,30 @@ class CrossBankMatcher:
                     'matched_amount': outgoing_amount_orig_curr,
                     'match_details': f"Traditional {outgoing_amount_orig_curr} {outgoing_currency}"
                 })
-                print(f"DEBUG CBM _eval_strat: Strategy 2 (Traditional Same Currency) MATCHED. Conf: {confidence:.2f}")
-        else:
-            print(f"DEBUG CBM _eval_strat: Strategy 2 (Traditional) - Currencies differ ({outgoing_currency} vs {incoming_currency}). SKIPPING - no exchange data available.")
+                if _trace.trace:
+                    _trace.event('strategy_same_currency', level='trace', amount=outgoing_amount_orig_curr,
+                                 currency=outgoing_currency, confidence=confidence)
         
-        if not matches:
-            print(f"DEBUG CBM _eval_strat: No matching strategies found for this pair.")
         return matches
     
     def _create_transfer_pair(self, outgoing: Dict, best_match: Dict, pair_index: int) -> Dict:
         """Create a transfer pair from matched transactions"""
-        outgoing_amount = abs(AmountParser.parse_amount(outgoing.get('Amount', '0')))
-        incoming_amount = AmountParser.parse_amount(best_match['incoming'].get('Amount', '0'))
+        outgoing_record = self._record(outgoing)
+        incoming_amount = self._record(best_match['incoming']).amount
         
         # Set exchange_amount based on strategy
         if best_match['type'] == 'exchange_amount':
-            exchange_amount = self._get_exchange_amount_from_csv(outgoing)
+            exchange_amount = outgoing_record.exchange_amount
         else:
             exchange_amount = incoming_amount  # Default to incoming amount
         
         return {
             'outgoing': outgoing,
             'incoming': best_match['incoming'],
-            'amount': outgoing_amount,
+            'amount': outgoing_record.abs_amount,
             'matched_amount': best_match['matched_amount'],
             'exchange_amount': exchange_amount,
-            'date': DateParser.parse_date(outgoing.get('Date', '')),
+            'date': outgoing_record.date,
             'confidence': best_match['confidence'],
             'pair_id': f"cross_bank_{pair_index}",
             'transfer_type': f"cross_bank_{best_match['type']}",
@@ -524,80 +585,61 @@ class CrossBankMatcher:
             'match_details': best_match['match_details']
         }
     
+    def _use_records(self, records: Optional[Dict[int, TransactionRecord]]) -> None:
+        """Use a new set of pre-parsed records and drop per-transaction caches built for the previous set"""
+        self._records: Dict[int, TransactionRecord] = records if records is not None else {}
+        self._transfer_names: Dict[Tuple[int, str], Tuple[Optional[str], bool]] = {}
+        self._name_matches: Dict[Tuple[str, str], bool] = {}
+    
+    def _record(self, transaction: Dict) -> TransactionRecord:
+        """Get the pre-parsed record for a transaction, building it on first use if missing"""
+        transaction_index = transaction['_transaction_index']
+        record = self._records.get(transaction_index)
+        if record is None:
+            record = TransactionRecord.from_transaction(transaction, self._get_default_currency(transaction))
+            self._records[transaction_index] = record
+        return record
+    
+    def _get_default_currency(self, transaction: Dict) -> Optional[str]:
+        """Primary currency of the transaction's bank, used when it has no Currency column"""
+        bank_type = transaction.get('_bank_type')
+        bank_config = self.config.get_bank_config(bank_type) if bank_type else None
+        return bank_config.currency_primary if bank_config else None
+    
+    def _get_currency(self, transaction: Dict) -> Optional[str]:
+        """Get transaction currency, falling back to the bank's primary currency"""
+        return self._record(transaction).currency
+    
     def _get_description(self, transaction: Dict) -> str:
         """Get description from transaction with fallback fields"""
-        return str(
-            transaction.get('_original_title', '') or # Prioritize original title
-            transaction.get('Description', '') or 
-            transaction.get('Title', '') or 
-            transaction.get('Note', '') or 
-            transaction.get('DESCRIPTION', '') or 
-            transaction.get('TYPE', '')
-        )
+        return get_description(transaction)
     
     def _get_exchange_amount_from_csv(self, transaction: Dict) -> Optional[float]:
         """Get exchange amount from static CSV columns only"""
-        exchange_amount_columns = [
-            'Exchange To Amount',
-            'Exchange_To_Amount', 
-            'ExchangeToAmount',
-            'exchange_to_amount',
-            'exchangetoamount'
-        ]
-        
-        for col in exchange_amount_columns:
-            if col in transaction:
-                exchange_value = transaction[col]
-                if exchange_value and str(exchange_value).strip() not in ['', 'nan', 'NaN', 'null', 'None']:
-                    try:
-                        parsed_amount = AmountParser.parse_amount(str(exchange_value))
-                        if parsed_amount != 0:
-                            return abs(parsed_amount)
-                    except (ValueError, TypeError):
-                        continue
-        return None
+        return get_exchange_amount(transaction)
     
     def _get_exchange_currency_from_csv(self, transaction: Dict) -> Optional[str]:
         """Get exchange currency from static CSV columns only"""
-        exchange_currency_columns = [
-            'Exchange To',
-            'Exchange_To',
-            'ExchangeTo',
-            'exchange_to',
-            'exchangetocurrency'
-        ]
-        
-        for col in exchange_currency_columns:
-            if col in transaction:
-                currency_value = transaction[col]
-                if currency_value and str(currency_value).strip() not in ['', 'nan', 'NaN', 'null', 'None']:
-                    val_str = str(currency_value).strip().upper()
-                    if len(val_str) == 3 and val_str.isalpha():
-                        return val_str
-        return None
+        return get_exchange_currency(transaction)
     
     def _validate_amount_matching(self, outgoing: Dict, incoming: Dict,
                                 outgoing_amount: float, incoming_amount: float,
                                 exchange_amount: float, exchange_currency: str) -> bool:
         """Validate if amounts match using the same logic as _evaluate_matching_strategies"""
         
-        outgoing_currency = outgoing.get('Currency', self.config.get_bank_config(outgoing.get('_bank_type')).currency_primary if outgoing.get('_bank_type') and self.config.get_bank_config(outgoing.get('_bank_type')) else None)
-        incoming_currency = incoming.get('Currency', self.config.get_bank_config(incoming.get('_bank_type')).currency_primary if incoming.get('_bank_type') and self.config.get_bank_config(incoming.get('_bank_type')) else None)
-        
-        print(f"DEBUG CBM _validate_amount: Checking amounts - Outgoing: {outgoing_amount} {outgoing_currency}, Incoming: {incoming_amount} {incoming_currency}, Exchange: {exchange_amount} {exchange_currency}")
+        outgoing_currency = self._record(outgoing).currency
+        incoming_currency = self._record(incoming).currency
         
         # Strategy 1: Exchange To Amount matching (PRIORITY for Wise-like transactions)
         if exchange_amount is not None and exchange_currency:
             if exchange_currency == incoming_currency:
                 amount_match = AmountParser.amounts_match(exchange_amount, incoming_amount)
-                print(f"DEBUG CBM _validate_amount: Strategy 1 (Exchange): {exchange_amount} vs {incoming_amount} = {'MATCH' if amount_match else 'NO MATCH'}")
                 if amount_match:
                     return True
         
         # Strategy 2: Direct amount matching (same currency)
         if outgoing_currency == incoming_currency:
             amount_match = AmountParser.amounts_match(outgoing_amount, incoming_amount)
-            print(f"DEBUG CBM _validate_amount: Strategy 2 (Direct): {outgoing_amount} vs {incoming_amount} = {'MATCH' if amount_match else 'NO MATCH'}")
             if amount_match:
                 return True
         
@@ -605,7 +647,6 @@ class CrossBankMatcher:
         # For now, we'll skip this as it requires external currency conversion data
         # This could be added later if needed
         
-        print(f"DEBUG CBM _validate_amount: No amount matching strategy succeeded")
         return False
 
     def get_potential_pairs(self) -> List[Dict]:
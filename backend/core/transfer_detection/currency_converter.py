@@ -1,20 +1,50 @@
 """
 Currency conversion detection and matching
 """
+import math
 import re
-from typing import Dict, List, Optional, Set
+from bisect import bisect_right
+from typing import Dict, List, Optional, Set, Tuple
 from backend.core.transfer_detection.amount_parser import AmountParser
 from backend.core.transfer_detection.date_parser import DateParser
+from backend.core.transfer_detection.transaction_record import TransactionRecord
+from backend.shared.utils.tracing import get_tracer
+
+_trace = get_tracer('transfer_detection')
+
+# Description patterns for internal conversions, e.g. "Converted 100 USD to 92.50 EUR"
+CONVERSION_PATTERNS = [
+    re.compile(r"converted\s+([\d,.]+)\s+(\w{3})\s+(?:from\s+\w{3}\s+balance\s+)?to\s+([\d,.]+)\s*(\w{3})", re.IGNORECASE),
+    re.compile(r"converted\s+([\d,.]+)\s+(\w{3}).*?to\s+([\d,.]+)\s*(\w{3})", re.IGNORECASE),
+    re.compile(r"converted\s+([\d,.]+)\s+(\w{3})\s+from\s+\w{3}\s+balance\s+to\s+([\d,.]+)\s*(\w{3})", re.IGNORECASE)
+]
 
 
 class CurrencyConverter:
     """Handles currency conversion detection and matching"""
     
-    def match_currency_conversions(self, all_transactions: List[Dict]) -> List[Dict]:
-        """Match internal currency conversions"""
-        conversion_pairs = []
-        matched_transactions: Set[int] = set()
+    # Largest difference between the amounts of two legs of the same conversion
+    AMOUNT_TOLERANCE = 0.01
+    
+    # Neighbouring cent buckets probed for each amount of a conversion key; derived from
+    # the tolerance so widening it widens the probe instead of silently missing pairs
+    KEY_SPREAD = tuple(range(-math.ceil(AMOUNT_TOLERANCE * 100), math.ceil(AMOUNT_TOLERANCE * 100) + 1))
+    
+    def match_currency_conversions(self, all_transactions: List[Dict],
+                                   records: Optional[Dict[int, TransactionRecord]] = None) -> List[Dict]:
+        """
+        Match internal currency conversions.
         
+        records: optional pre-parsed TransactionRecords keyed by _transaction_index,
+        used instead of re-parsing amounts and dates.
+        """
+        conversion_candidates = self.find_conversion_candidates(all_transactions, records)
+        return self.match_conversion_candidates(conversion_candidates)
+    
+    def find_conversion_candidates(self, all_transactions: List[Dict],
+                                   records: Optional[Dict[int, TransactionRecord]] = None) -> List[Dict]:
+        """Find transactions whose description describes an internal currency conversion"""
+        records = records or {}
         conversion_candidates = []
         
         for transaction in all_transactions:
@@ -22,9 +52,6 @@ class CurrencyConverter:
             if '_transaction_index' not in transaction:
                 transaction['_transaction_index'] = id(transaction) # Use object id as a fallback unique id
 
-            if transaction['_transaction_index'] in matched_transactions:
-                continue
-                
             # Prioritize original title if available, fallback to current (potentially cleaned) title/description
             original_title_val = transaction.get('_original_title')
             current_title_val = transaction.get('Title', transaction.get('Description', '')) # Use Title first, then Description
@@ -33,8 +60,13 @@ class CurrencyConverter:
             # Ensure desc_to_use_for_conversion is a string before calling .lower()
             desc_for_conversion_matching = str(desc_to_use_for_conversion).lower()
             
-            amount = AmountParser.parse_amount(transaction.get('Amount', '0'))
-            date = DateParser.parse_date(transaction.get('Date', ''))
+            record = records.get(transaction['_transaction_index'])
+            if record is not None:
+                amount = record.amount
+                date = record.date
+            else:
+                amount = AmountParser.parse_amount(transaction.get('Amount', '0'))
+                date = DateParser.parse_date(transaction.get('Date', ''))
             conversion_info = self.extract_conversion_info(desc_for_conversion_matching, amount)
             
             if conversion_info:
@@ -45,9 +77,22 @@ class CurrencyConverter:
                     '_date': date
                 })
         
-        print(f"DEBUG CC: Initial conversion_candidates count: {len(conversion_candidates)}")
-        for idx, cand in enumerate(conversion_candidates):
-            print(f"DEBUG CC: Candidate {idx}: Desc='{cand.get('Description', '')[:60]}...', Amt={cand.get('_amount')}, Date={cand.get('_date')}, Info={cand.get('_conversion_info')}, CSV='{cand.get('_csv_name')}'")
+        return conversion_candidates
+    
+    def match_conversion_candidates(self, conversion_candidates: List[Dict]) -> List[Dict]:
+        """
+        Pair conversion candidates from different CSVs that describe the same conversion.
+        Candidates are tried in list order, so earlier candidates pick their partner first.
+        """
+        conversion_pairs = []
+        matched_transactions: Set[int] = set()
+        
+        if _trace.debug:
+            _trace.event('conversion_candidates', count=len(conversion_candidates))
+        
+        # Hash join: bucket candidates by conversion key so each candidate is only
+        # compared with candidates describing the same conversion
+        conversion_index = self._build_conversion_index(conversion_candidates)
         
         # Match conversion pairs
         for i, candidate1 in enumerate(conversion_candidates):
@@ -56,18 +101,15 @@ class CurrencyConverter:
                 
             conv1 = candidate1['_conversion_info']
             
-            for j, candidate2 in enumerate(conversion_candidates):
-                if (i >= j or 
-                    candidate2['_transaction_index'] in matched_transactions or
+            for j in self._get_conversion_partners(conversion_index, conv1, i):
+                candidate2 = conversion_candidates[j]
+                if (candidate2['_transaction_index'] in matched_transactions or
                     candidate1['_csv_index'] == candidate2['_csv_index']):
                     continue
                 
                 conv2 = candidate2['_conversion_info']
                 
-                print(f"DEBUG CC: Checking pair: C1({candidate1.get('_csv_name', 'N/A')}/{candidate1.get('_transaction_index', 'N/A')}) vs C2({candidate2.get('_csv_name', 'N/A')}/{candidate2.get('_transaction_index', 'N/A')})")
-                match_result = self.is_matching_conversion(conv1, conv2, candidate1, candidate2)
-                print(f"DEBUG CC: is_matching_conversion result for C1 vs C2: {match_result}")
-                if match_result:
+                if self.is_matching_conversion(conv1, conv2, candidate1, candidate2):
                     if candidate1['_amount'] < 0 and candidate2['_amount'] > 0:
                         outgoing, incoming = candidate1, candidate2
                     elif candidate1['_amount'] > 0 and candidate2['_amount'] < 0:
@@ -95,6 +137,10 @@ class CurrencyConverter:
                         }
                     }
                     
+                    if _trace.debug:
+                        _trace.event('conversion_pair', outgoing=outgoing['_transaction_index'],
+                                     incoming=incoming['_transaction_index'], outgoing_csv=outgoing.get('_csv_name'),
+                                     incoming_csv=incoming.get('_csv_name'), conversion=conv1)
                     conversion_pairs.append(transfer_pair)
                     matched_transactions.add(outgoing['_transaction_index'])
                     matched_transactions.add(incoming['_transaction_index'])
@@ -102,17 +148,68 @@ class CurrencyConverter:
         
         return conversion_pairs
     
+    @staticmethod
+    def _conversion_key(conv: Dict, from_offset: int = 0, to_offset: int = 0) -> Tuple[str, str, int, int]:
+        """Hash key of a conversion: currencies plus both amounts in minor units (cents)"""
+        return (
+            conv['from_currency'],
+            conv['to_currency'],
+            int(round(conv['from_amount'] * 100)) + from_offset,
+            int(round(conv['to_amount'] * 100)) + to_offset
+        )
+    
+    def _build_conversion_index(self, conversion_candidates: List[Dict]) -> Dict[Tuple[str, str, int, int], List[int]]:
+        """
+        Bucket candidate positions by conversion key. Candidates whose own amount is
+        neither side of their conversion can never match and are left out.
+        """
+        conversion_index: Dict[Tuple[str, str, int, int], List[int]] = {}
+        for position, candidate in enumerate(conversion_candidates):
+            conv = candidate['_conversion_info']
+            if not self._amount_matches_conversion(candidate['_amount'], conv):
+                continue
+            conversion_index.setdefault(self._conversion_key(conv), []).append(position)
+        return conversion_index
+    
+    def _get_conversion_partners(self, conversion_index: Dict[Tuple[str, str, int, int], List[int]],
+                                 conv: Dict, position: int) -> List[int]:
+        """
+        Positions after ``position`` whose conversion may match ``conv``, in ascending
+        order. Amounts within AMOUNT_TOLERANCE can round into a neighbouring cent,
+        so the neighbouring buckets are probed too; is_matching_conversion makes the
+        exact decision.
+        
+        This probe stands in for a date-sorted sweep over fuzzy amounts: it keeps the
+        original candidate order, so the same partner is picked as before. It costs
+        len(KEY_SPREAD) ** 2 lookups per candidate, fine for a cent-level tolerance. A
+        tolerance of many cents, or one relative to the amount, would need a sweep over
+        candidates sorted by amount within the date window instead.
+        """
+        partners = []
+        for from_offset in self.KEY_SPREAD:
+            for to_offset in self.KEY_SPREAD:
+                bucket = conversion_index.get(self._conversion_key(conv, from_offset, to_offset))
+                if bucket:
+                    partners.extend(bucket[bisect_right(bucket, position):])
+        if len(partners) > 1:
+            partners.sort()
+        return partners
+    
+    @staticmethod
+    def _amount_matches_conversion(amount: float, conv: Dict) -> bool:
+        """Check the transaction amount is either side of its own conversion"""
+        return (
+            abs(abs(amount) - conv['from_amount']) < 0.01 or
+            abs(abs(amount) - conv['to_amount']) < 0.01
+        )
+    
     def extract_conversion_info(self, description: str, amount: float) -> Optional[Dict]:
         """Extract currency conversion details from description"""
-        print(f"DEBUG CC extract_conversion_info: Received Desc='{description}', Amt={amount}")
-        patterns = [
-            r"converted\s+([\d,.]+)\s+(\w{3})\s+(?:from\s+\w{3}\s+balance\s+)?to\s+([\d,.]+)\s*(\w{3})",
-            r"converted\s+([\d,.]+)\s+(\w{3}).*?to\s+([\d,.]+)\s*(\w{3})",
-            r"converted\s+([\d,.]+)\s+(\w{3})\s+from\s+\w{3}\s+balance\s+to\s+([\d,.]+)\s*(\w{3})"
-        ]
-        
-        for pattern_idx, pattern in enumerate(patterns):
-            match = re.search(pattern, description, re.IGNORECASE)
+        if 'converted' not in description.lower():
+            return None
+        
+        for pattern_idx, pattern in enumerate(CONVERSION_PATTERNS):
+            match = pattern.search(description)
             if match:
                 from_amount = float(match.group(1).replace(',', ''))
                 from_currency = match.group(2).upper()
@@ -124,18 +221,18 @@ class CurrencyConverter:
                     'to_amount': to_amount,
                     'to_currency': to_currency
                 }
-                # print(f"DEBUG CC extract_conversion_info: Matched pattern {pattern_idx}. Info: {result_dict}")
+                if _trace.trace:
+                    _trace.event('conversion_info', level='trace', description=description, amount=amount,
+                                 pattern=pattern_idx, conversion=result_dict)
                 return result_dict
-        # print(f"DEBUG CC extract_conversion_info: No match for Desc='{description[:60]}...'")
-        
         return None
     
     def is_matching_conversion(self, conv1: Dict, conv2: Dict, 
                              candidate1: Dict, candidate2: Dict) -> bool:
         """Check if two conversion records represent the same conversion"""
         amounts_match = (
-            abs(conv1['from_amount'] - conv2['from_amount']) < 0.01 and
-            abs(conv1['to_amount'] - conv2['to_amount']) < 0.01 and
+            abs(conv1['from_amount'] - conv2['from_amount']) < self.AMOUNT_TOLERANCE and
+            abs(conv1['to_amount'] - conv2['to_amount']) < self.AMOUNT_TOLERANCE and
             conv1['from_currency'] == conv2['from_currency'] and
             conv1['to_currency'] == conv2['to_currency']
         )
@@ -143,15 +240,8 @@ class CurrencyConverter:
         date_match = DateParser.dates_within_tolerance(candidate1['_date'], candidate2['_date'])
         opposite_signs = (candidate1['_amount'] * candidate2['_amount']) < 0
         
-        amount1_matches = (
-            abs(abs(candidate1['_amount']) - conv1['from_amount']) < 0.01 or
-            abs(abs(candidate1['_amount']) - conv1['to_amount']) < 0.01
-        )
-        
-        amount2_matches = (
-            abs(abs(candidate2['_amount']) - conv2['from_amount']) < 0.01 or
-            abs(abs(candidate2['_amount']) - conv2['to_amount']) < 0.01
-        )
+        amount1_matches = self._amount_matches_conversion(candidate1['_amount'], conv1)
+        amount2_matches = self._amount_matches_conversion(candidate2['_amount'], conv2)
         
         return amounts_match and date_match and opposite_signs and amount1_matches and amount2_matches
     
@@ -164,9 +254,7 @@ class CurrencyConverter:
             abs(abs(incoming['_amount']) - conv1['to_amount']) < 0.01):
             confidence += 0.3
         
-        outgoing_date = DateParser.parse_date(outgoing.get('Date', ''))
-        incoming_date = DateParser.parse_date(incoming.get('Date', ''))
-        if DateParser.same_day(outgoing_date, incoming_date):
+        if DateParser.same_day(outgoing['_date'], incoming['_date']):
             confidence += 0.2
         
         if ('converted' in str(outgoing.get('Description', '')).lower() and
@@ -1,38 +1,67 @@
 """
 Date parsing utilities for transfer detection
 """
-from datetime import datetime
-from typing import Union
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+from backend.shared.utils.date_inference import ColumnDateParser, normalize_date_value
+
+EPOCH = datetime(1970, 1, 1)
+
+DATE_FORMATS = [
+    '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%Y-%m-%d %H:%M:%S',
+    '%m-%d-%y', '%d-%m-%y', '%y-%m-%d'  # 2-digit year formats (MM-DD-YY prioritized)
+]
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(date_str: str) -> Optional[datetime]:
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
 
 
 class DateParser:
     """Utility class for parsing and comparing dates"""
     
     @staticmethod
-    def parse_date(date_str: Union[str, datetime]) -> datetime:
-        """Parse date string to datetime object"""
-        try:
-            if isinstance(date_str, datetime):
-                return date_str
-                
-            # Handle empty or None dates
-            if not date_str or date_str == '':
-                return datetime.now()
-            
-            date_formats = [
-                '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%Y-%m-%d %H:%M:%S',
-                '%m-%d-%y', '%d-%m-%y', '%y-%m-%d'  # 2-digit year formats (MM-DD-YY prioritized)
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(str(date_str), fmt)
-                except ValueError:
-                    continue
-            
-            return datetime.now()
-        except Exception:
-            return datetime.now()
+    def parse_date(date_str: Union[str, datetime, None]) -> Optional[datetime]:
+        """
+        Parse date string to datetime object.
+        
+        Returns None for empty or unparseable dates so callers can flag them;
+        a whole column is better parsed with column_parser.
+        """
+        if isinstance(date_str, datetime):
+            return date_str
+        date_str = normalize_date_value(date_str)
+        if not date_str:
+            return None
+        return _parse_date_string(date_str)
+    
+    @staticmethod
+    def format_date(date_str: Union[str, datetime, None], date_format: str = '%Y-%m-%d') -> str:
+        """Parse and format a date; '' when it cannot be parsed"""
+        date = DateParser.parse_date(date_str)
+        return date.strftime(date_format) if date is not None else ''
+    
+    @staticmethod
+    def column_parser(date_values: Iterable, date_format: Optional[str] = None) -> ColumnDateParser:
+        """Memoizing parser for one column, using date_format or a format inferred from its values"""
+        return ColumnDateParser.for_column(date_values, DATE_FORMATS, configured_format=date_format)
+    
+    @staticmethod
+    def to_timestamp(date: datetime) -> float:
+        """Convert a naive datetime to seconds since the epoch without local timezone shifts"""
+        return (date - EPOCH).total_seconds()
+    
+    @staticmethod
+    def from_timestamp(timestamp: float) -> datetime:
+        """Convert seconds since the epoch (see to_timestamp) back to a naive datetime"""
+        return EPOCH + timedelta(seconds=timestamp)
     
     @staticmethod
     def dates_within_tolerance(date1: datetime, date2: datetime, tolerance_hours: int = 72) -> bool:
@@ -0,0 +1,105 @@
+"""
+Server-side state for incremental transfer detection
+"""
+import threading
+from typing import Dict, List, Set, Tuple
+from backend.core.transfer_detection.matching_index import MatchingIndex
+from backend.core.transfer_detection.transaction_record import TransactionRecord
+
+
+class TransferDetectionSession:
+    """
+    Everything a detection session has seen so far: the transactions and their
+    parsed records, the confirmed pairs, and the unmatched candidates and incoming
+    index that transactions from newly added statements are matched against.
+    Confirmed pairs are never re-matched.
+    """
+
+    def __init__(self, session_id: str, date_tolerance_hours: float):
+        self.session_id = session_id
+        self.date_tolerance_hours = date_tolerance_hours
+        # Held for a whole batch, so concurrent requests never interleave their changes
+        self.lock = threading.Lock()
+
+        self.transactions: List[Dict] = []
+        self.records: Dict[int, TransactionRecord] = {}
+        self.csv_indices: Dict[str, int] = {}  # file name -> _csv_index, stable across batches
+
+        self.pairs: List[Dict] = []
+        self.matched_ids: Set[int] = set()
+        self.pair_counts: Dict[str, int] = {}
+
+        # Unmatched transfer candidates carried over to the next batch
+        self.outgoing_candidates: List[Dict] = []
+        self.conversion_candidates: List[Dict] = []
+
+        # Every positive transaction seen so far; positions are MatchingIndex positions
+        self.incoming: List[Dict] = []
+        self.incoming_index = MatchingIndex(date_tolerance_hours)
+
+    @property
+    def next_transaction_index(self) -> int:
+        return len(self.transactions)
+
+    def split_new_files(self, csv_data_list: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """
+        Split a batch into files not yet in the session and the names of those already
+        added, whose transactions would otherwise be matched twice
+        """
+        new_files: List[Dict] = []
+        skipped_files: List[str] = []
+        seen = set(self.csv_indices)
+        for csv_data in csv_data_list:
+            file_name = csv_data.get('file_name')
+            if file_name and file_name in seen:
+                skipped_files.append(file_name)
+                continue
+            if file_name:
+                seen.add(file_name)
+            new_files.append(csv_data)
+        return new_files, skipped_files
+
+    def add_transactions(self, transactions: List[Dict], records: Dict[int, TransactionRecord]) -> range:
+        """
+        Add a batch of prepared transactions and index its incoming ones.
+        Returns the positions of the batch's incoming transactions in self.incoming.
+        """
+        self.transactions.extend(transactions)
+        self.records.update(records)
+
+        start = len(self.incoming)
+        for transaction in transactions:
+            record = self.records[transaction['_transaction_index']]
+            if record.amount > 0:
+                self.incoming_index.add(len(self.incoming), record.currency, record.amount, record.timestamp)
+                self.incoming.append(transaction)
+        return range(start, len(self.incoming))
+
+    def build_batch_index(self, positions: range) -> MatchingIndex:
+        """Index only the given incoming positions, e.g. the incoming transactions of the latest batch"""
+        batch_index = MatchingIndex(self.date_tolerance_hours)
+        for position in positions:
+            record = self.records[self.incoming[position]['_transaction_index']]
+            batch_index.add(position, record.currency, record.amount, record.timestamp)
+        return batch_index
+
+    def confirm_pairs(self, pairs: List[Dict], prefix: str) -> List[Dict]:
+        """
+        Record newly detected pairs, renumbering their pair_id so ids stay unique
+        across batches of the session
+        """
+        for pair in pairs:
+            count = self.pair_counts.get(prefix, 0)
+            pair['pair_id'] = f"{prefix}_{count}"
+            self.pair_counts[prefix] = count + 1
+            self.matched_ids.add(pair['outgoing']['_transaction_index'])
+            self.matched_ids.add(pair['incoming']['_transaction_index'])
+            self.pairs.append(pair)
+        return pairs
+
+    def set_unmatched_candidates(self, outgoing_candidates: List[Dict], conversion_candidates: List[Dict]) -> None:
+        """Keep only candidates that are still unpaired for the next batch"""
+        self.outgoing_candidates = [t for t in outgoing_candidates
+                                    if t['_transaction_index'] not in self.matched_ids]
+        self.conversion_candidates = [t for t in conversion_candidates
+                                      if t['_transaction_index'] not in self.matched_ids]
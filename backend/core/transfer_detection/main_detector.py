@@ -1,13 +1,21 @@
 """
 Main transfer detector orchestrating all components
 """
-from typing import Dict, List, Any, Optional
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 from backend.core.transfer_detection.amount_parser import AmountParser
 from backend.core.transfer_detection.date_parser import DateParser
 from backend.core.transfer_detection.cross_bank_matcher import CrossBankMatcher
 from backend.core.transfer_detection.currency_converter import CurrencyConverter
 from backend.core.transfer_detection.confidence_calculator import ConfidenceCalculator
+from backend.core.transfer_detection.transaction_record import TransactionRecord, get_date_string, get_description
+from backend.core.transfer_detection.detection_session import TransferDetectionSession
 from backend.infrastructure.config.unified_config_service import get_unified_config_service
+from backend.shared.utils.tracing import get_tracer
+
+_trace = get_tracer('transfer_detection')
 
 
 class TransferDetector:
@@ -19,6 +27,9 @@ class TransferDetector:
     4. 24-hour date tolerance with fallback to traditional amount matching
     """
     
+    # Incremental detection sessions kept in memory; the least recently used is dropped first
+    MAX_SESSIONS = 8
+    
     def __init__(self, config_dir: str = "configs", config_service=None):
         if config_service:
             self.config = config_service
@@ -31,6 +42,9 @@ class TransferDetector:
         self.date_tolerance_hours = self.config.get_date_tolerance()
         self.currency_converter = CurrencyConverter()
         self.confidence_calculator = ConfidenceCalculator()
+        self._sessions: "OrderedDict[str, TransferDetectionSession]" = OrderedDict()
+        # The detector is shared between requests; guards the session table only
+        self._sessions_lock = threading.Lock()
     
     def detect_transfers(self, csv_data_list: List[Dict]) -> Dict[str, Any]:
         """Main transfer detection function with configurable specifications"""
@@ -42,28 +56,31 @@ class TransferDetector:
         print(f"Confidence threshold: {self.config.get_confidence_threshold()}")
         print("=" * 70)
         
-        # Flatten all transactions with source info
-        all_transactions = self._prepare_transactions(csv_data_list)
+        # Flatten all transactions with source info and parse amounts/dates once
+        all_transactions, records = self._prepare_transactions(csv_data_list)
         
         print(f"\n[DATA] TOTAL TRANSACTIONS LOADED: {len(all_transactions)}")
         
         # Find potential transfers
         print("\n FINDING TRANSFER CANDIDATES...")
-        potential_transfers = self.cross_bank_matcher.find_transfer_candidates(all_transactions)
-        print(f"DEBUG MainDetector: Potential Transfer Candidates ({len(potential_transfers)}):")
-        for pt_idx, pt in enumerate(potential_transfers):
-            print(f"  PT {pt_idx}: Desc='{pt.get('Description', pt.get('Title', ''))[:60]}...', Amt={pt.get('Amount')}, Date={pt.get('Date')}, Bank={pt.get('_bank_type')}, Dir={pt.get('_transfer_direction')}, CSV='{pt.get('_csv_name')}'")
+        potential_transfers = self.cross_bank_matcher.find_transfer_candidates(all_transactions, records)
+        if _trace.debug:
+            for pt in potential_transfers:
+                _trace.event('potential_transfer', transaction=pt['_transaction_index'],
+                             description=pt.get('Description', pt.get('Title', ''))[:60], amount=pt.get('Amount'),
+                             date=pt.get('Date'), bank=pt.get('_bank_type'),
+                             direction=pt.get('_transfer_direction'), csv=pt.get('_csv_name'))
         print(f"   [SUCCESS] Found {len(potential_transfers)} potential transfer candidates")
         
         # STEP 1: Match currency conversions (internal conversions)
         print("\n MATCHING CURRENCY CONVERSIONS...")
-        conversion_pairs = self.currency_converter.match_currency_conversions(all_transactions)
+        conversion_pairs = self.currency_converter.match_currency_conversions(all_transactions, records)
         print(f"   [SUCCESS] Found {len(conversion_pairs)} currency conversion pairs")
         
         # STEP 2: Match cross-bank transfers using configured specifications
         print(" MATCHING CROSS-BANK TRANSFERS (CONFIGURED SPECS)...")
         cross_bank_pairs = self.cross_bank_matcher.match_cross_bank_transfers(
-            potential_transfers, all_transactions, conversion_pairs
+            potential_transfers, all_transactions, conversion_pairs, records
         )
         print(f"   [SUCCESS] Found {len(cross_bank_pairs)} cross-bank transfer pairs")
         
@@ -108,38 +125,171 @@ class TransferDetector:
             }
         }
     
-    def _prepare_transactions(self, csv_data_list: List[Dict]) -> List[Dict]:
-        """Flatten all transactions with source info and metadata"""
+    def detect_transfers_incremental(self, csv_data_list: List[Dict],
+                                     session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Detect transfers for newly added CSVs within a detection session.
+        
+        Only the new transactions are parsed and matched: new outgoing candidates are
+        looked up in the session's incoming index, and earlier unmatched outgoing
+        candidates are looked up in an index of the new incoming transactions only.
+        Pairs confirmed in earlier batches are kept as they are. The result has the
+        same shape as detect_transfers but lists only the new transactions, pairs and
+        candidates, plus the session_id to send with the next batch. Files already
+        added to the session are skipped and listed in skipped_files.
+        """
+        session = self._get_session(session_id)
+        # Batches of one session are matched one at a time
+        with session.lock:
+            return self._detect_in_session(session, csv_data_list)
+    
+    def _detect_in_session(self, session: TransferDetectionSession, csv_data_list: List[Dict]) -> Dict[str, Any]:
+        csv_data_list, skipped_files = session.split_new_files(csv_data_list)
+        for file_name in skipped_files:
+            print(f"   [WARNING] {file_name} was already added to session {session.session_id}, skipping it")
+        
+        print("\n STARTING INCREMENTAL TRANSFER DETECTION")
+        print("=" * 70)
+        print(f" Session: {session.session_id} ({len(session.transactions)} transactions, {len(session.pairs)} pairs so far)")
+        print("=" * 70)
+        
+        new_transactions, new_records = self._prepare_transactions(
+            csv_data_list, start_index=session.next_transaction_index, csv_indices=session.csv_indices
+        )
+        new_incoming_positions = session.add_transactions(new_transactions, new_records)
+        print(f"\n[DATA] NEW TRANSACTIONS LOADED: {len(new_transactions)}")
+        
+        potential_transfers = self.cross_bank_matcher.find_transfer_candidates(new_transactions, session.records)
+        print(f"   [SUCCESS] Found {len(potential_transfers)} new potential transfer candidates")
+        
+        # STEP 1: Currency conversions between new candidates and earlier unmatched ones
+        new_conversion_candidates = self.currency_converter.find_conversion_candidates(new_transactions, session.records)
+        conversion_candidates = session.conversion_candidates + new_conversion_candidates
+        conversion_pairs = session.confirm_pairs(
+            self.currency_converter.match_conversion_candidates(conversion_candidates), 'conversion'
+        )
+        print(f"   [SUCCESS] Found {len(conversion_pairs)} new currency conversion pairs")
+        
+        # STEP 2: Cross-bank transfers. Earlier outgoing candidates already failed against
+        # earlier incoming transactions, so they only need the new incoming ones.
+        batch_index = session.build_batch_index(new_incoming_positions)
+        carried_pairs = self.cross_bank_matcher.match_outgoing_against_index(
+            session.outgoing_candidates, session.incoming, batch_index, session.matched_ids, session.records
+        )
+        potential_pairs = self.cross_bank_matcher.get_potential_pairs()
+        
+        new_outgoing = [t for t in potential_transfers if session.records[t['_transaction_index']].amount < 0]
+        new_pairs = self.cross_bank_matcher.match_outgoing_against_index(
+            new_outgoing, session.incoming, session.incoming_index, session.matched_ids, session.records
+        )
+        potential_pairs = potential_pairs + self.cross_bank_matcher.get_potential_pairs()
+        cross_bank_pairs = session.confirm_pairs(carried_pairs + new_pairs, 'cross_bank')
+        print(f"   [SUCCESS] Found {len(cross_bank_pairs)} new cross-bank transfer pairs")
+        
+        session.set_unmatched_candidates(session.outgoing_candidates + new_outgoing, conversion_candidates)
+        
+        all_transfer_pairs = conversion_pairs + cross_bank_pairs
+        conflicts = self._detect_conflicts(all_transfer_pairs)
+        flagged_transactions = self._flag_manual_review(new_transactions, all_transfer_pairs)
+        
+        print(f"\n INCREMENTAL DETECTION SUMMARY: {len(all_transfer_pairs)} new pairs, "
+              f"{len(session.pairs)} pairs in session")
+        
+        return {
+            'session_id': session.session_id,
+            'processed_transactions': new_transactions,
+            'transfers': all_transfer_pairs,
+            'potential_transfers': potential_transfers,
+            'potential_pairs': potential_pairs,
+            'conflicts': conflicts,
+            'flagged_transactions': flagged_transactions,
+            'skipped_files': skipped_files,
+            'summary': {
+                'total_transactions': len(new_transactions),
+                'transfer_pairs_found': len(all_transfer_pairs),
+                'currency_conversions': len(conversion_pairs),
+                'other_transfers': len(cross_bank_pairs),
+                'potential_transfers': len(potential_transfers),
+                'potential_pairs': len(potential_pairs),
+                'conflicts': len(conflicts),
+                'flagged_for_review': len(flagged_transactions),
+                'skipped_files': len(skipped_files),
+                'session_transactions': len(session.transactions),
+                'session_transfer_pairs': len(session.pairs)
+            }
+        }
+    
+    def get_session(self, session_id: str) -> Optional[TransferDetectionSession]:
+        """Return an existing detection session, or None if it expired or never existed"""
+        with self._sessions_lock:
+            return self._sessions.get(session_id)
+    
+    def end_session(self, session_id: str) -> bool:
+        """Drop a detection session and its state"""
+        with self._sessions_lock:
+            return self._sessions.pop(session_id, None) is not None
+    
+    def _get_session(self, session_id: Optional[str]) -> TransferDetectionSession:
+        """Get the session for session_id, starting a new one if it is unknown"""
+        with self._sessions_lock:
+            session = self._sessions.get(session_id) if session_id else None
+            if session is None:
+                session = TransferDetectionSession(session_id or uuid.uuid4().hex, self.date_tolerance_hours)
+                self._sessions[session.session_id] = session
+                while len(self._sessions) > self.MAX_SESSIONS:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return session
+    
+    def _prepare_transactions(self, csv_data_list: List[Dict], start_index: int = 0,
+                              csv_indices: Optional[Dict[str, int]] = None) -> Tuple[List[Dict], Dict[int, TransactionRecord]]:
+        """
+        Flatten all transactions with source info and metadata.
+        
+        Returns the enhanced transaction dicts and their pre-parsed TransactionRecords
+        keyed by _transaction_index, shared by all matchers and scorers.
+        
+        start_index and csv_indices let an incremental session continue numbering
+        transactions and keep the same _csv_index for a file seen in an earlier batch.
+        """
         all_transactions = []
-        global_transaction_counter = 0 # Initialize a global counter
+        records: Dict[int, TransactionRecord] = {}
+        global_transaction_counter = start_index # Initialize a global counter
         
-        for csv_idx, csv_data in enumerate(csv_data_list):
+        for position, csv_data in enumerate(csv_data_list):
+            if csv_indices is None:
+                csv_idx = position
+            else:
+                csv_idx = csv_indices.setdefault(csv_data.get('file_name', f'CSV_{position}'), len(csv_indices))
             print(f"\n Processing CSV {csv_idx}: {csv_data.get('file_name', f'CSV_{csv_idx}')}")
             print(f"   [DATA] Transaction count: {len(csv_data['data'])}")
             
-            # DEBUG: Check CSV data structure
-            if csv_data['data']:
-                sample_transaction = csv_data['data'][0]
-                print(f"    Available columns: {list(sample_transaction.keys())}")
+            if _trace.debug and csv_data['data']:
+                _trace.event('csv_columns', csv=csv_data.get('file_name'), columns=list(csv_data['data'][0].keys()))
+            
+            # Get bank type from CSV bank_info if available
+            bank_type = 'unknown'
+            bank_info = csv_data.get('bank_info', {})
+            if bank_info:
+                detected_bank = bank_info.get('bank_name', bank_info.get('detected_bank'))
+                if detected_bank and detected_bank != 'unknown':
+                    bank_type = detected_bank
+            
+            # Fallback to filename detection if bank info not available
+            if bank_type == 'unknown':
+                bank_type = self.config.detect_bank_type(csv_data.get('file_name', ''))
+            
+            bank_config = self.config.get_bank_config(bank_type) if bank_type else None
+            primary_currency = bank_config.currency_primary if bank_config else None
+            
+            # Statements use one date format per column: infer it once per CSV and memoize parsing
+            date_parser = DateParser.column_parser(get_date_string(t) for t in csv_data['data'])
             
             for trans_idx, transaction in enumerate(csv_data['data']):
-                # Get bank type from CSV bank_info if available
-                bank_type = 'unknown'
-                bank_info = csv_data.get('bank_info', {})
-                if bank_info:
-                    detected_bank = bank_info.get('bank_name', bank_info.get('detected_bank'))
-                    if detected_bank and detected_bank != 'unknown':
-                        bank_type = detected_bank
-                
-                # Fallback to filename detection if bank info not available
-                if bank_type == 'unknown':
-                    bank_type = self.config.detect_bank_type(csv_data.get('file_name', ''))
-                
                 # Ensure currency is set
-                if 'Currency' not in transaction or not transaction['Currency']:
-                    bank_config = self.config.get_bank_config(bank_type)
-                    if bank_config and bank_config.currency_primary:
-                        transaction['Currency'] = bank_config.currency_primary
+                if ('Currency' not in transaction or not transaction['Currency']) and primary_currency:
+                    transaction['Currency'] = primary_currency
                 
                 enhanced_transaction = {
                     **transaction,
@@ -149,18 +299,36 @@ class TransferDetector:
                     '_bank_type': bank_type,
                     '_raw_data': transaction
                 }
+                record = TransactionRecord.from_transaction(enhanced_transaction, primary_currency, date_parser)
+                if not record.date_valid:
+                    enhanced_transaction['_date_invalid'] = True
                 all_transactions.append(enhanced_transaction)
+                records[global_transaction_counter] = record
                 global_transaction_counter += 1 # Increment global counter
+            
+            if date_parser.invalid_count:
+                print(f"   [WARNING] {date_parser.invalid_count} unparseable date value(s), flagged for review: "
+                      f"{date_parser.invalid_values[:3]}")
         
-        return all_transactions
+        return all_transactions, records
     
     def _detect_conflicts(self, transfer_pairs: List[Dict]) -> List[Dict]:
         """Detect transactions that could match multiple partners"""
         return []
     
     def _flag_manual_review(self, all_transactions: List[Dict], transfer_pairs: List[Dict]) -> List[Dict]:
-        """Flag transactions that need manual review"""
-        return []
+        """Flag transactions that need manual review: those whose date could not be parsed"""
+        return [
+            {
+                'transaction_index': transaction['_transaction_index'],
+                'csv_name': transaction.get('_csv_name', ''),
+                'date': get_date_string(transaction),
+                'amount': transaction.get('Amount'),
+                'description': get_description(transaction),
+                'reason': 'invalid_date'
+            }
+            for transaction in all_transactions if transaction.get('_date_invalid')
+        ]
     
     def apply_transfer_categorization(self, csv_data_list: List[Dict], transfer_pairs: List[Dict]) -> List[Dict]:
         """Apply Balance Correction category to detected transfers"""
@@ -178,7 +346,7 @@ class TransferDetector:
             transfer_matches.append({
                 'csv_index': outgoing['_csv_index'],
                 'amount': str(AmountParser.parse_amount(outgoing.get('Amount', '0'))),
-                'date': DateParser.parse_date(outgoing.get('Date', '')).strftime('%Y-%m-%d'),
+                'date': DateParser.format_date(outgoing.get('Date', '')),
                 'description': str(outgoing.get('Description', '')),
                 'category': 'Balance Correction',
                 'note': f"Transfer out - {pair['transfer_type']} - Pair ID: {pair['pair_id']}{exchange_note}",
@@ -190,7 +358,7 @@ class TransferDetector:
             transfer_matches.append({
                 'csv_index': incoming['_csv_index'],
                 'amount': str(AmountParser.parse_amount(incoming.get('Amount', '0'))),
-                'date': DateParser.parse_date(incoming.get('Date', '')).strftime('%Y-%m-%d'),
+                'date': DateParser.format_date(incoming.get('Date', '')),
                 'description': str(incoming.get('Description', '')),
                 'category': 'Balance Correction',
                 'note': f"Transfer in - {pair['transfer_type']} - Pair ID: {pair['pair_id']}{exchange_note}",
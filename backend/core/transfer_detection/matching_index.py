@@ -0,0 +1,76 @@
+"""
+Amount/date index for cross-bank transfer candidate lookup
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class MatchingIndex:
+    """
+    Buckets incoming transactions by (currency, amount in minor units) and keeps
+    each bucket sorted by timestamp, so an outgoing transaction only has to look
+    at incoming transactions with the same currency and amount inside the date
+    tolerance window instead of scanning every incoming transaction.
+    """
+
+    # AmountParser.amounts_match uses a 0.01 tolerance, so a matching amount can
+    # round into the neighbouring cent bucket
+    AMOUNT_BUCKET_SPREAD = 1
+
+    # Slack for floating point timestamps at the window edges; callers still
+    # apply the exact date tolerance check on every candidate
+    WINDOW_SLACK_SECONDS = 60.0
+
+    def __init__(self, date_tolerance_hours: float):
+        self.window_seconds = date_tolerance_hours * 3600 + self.WINDOW_SLACK_SECONDS
+        self._buckets: Dict[Tuple[Any, int], List[Tuple[float, int]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def positions(self) -> List[int]:
+        """All indexed positions in ascending order"""
+        return sorted(position for bucket in self._buckets.values() for _, position in bucket)
+
+    @staticmethod
+    def to_minor_units(amount: float) -> int:
+        """Convert a decimal amount to integer minor units (cents)"""
+        return int(round(abs(amount) * 100))
+
+    def add(self, position: int, currency: Any, amount: float, timestamp: float) -> None:
+        """Add the incoming transaction stored at ``position`` to the index"""
+        if timestamp != timestamp:
+            return  # Invalid date (NaN timestamp), can never be inside a date window
+        key = (currency, self.to_minor_units(amount))
+        insort(self._buckets.setdefault(key, []), (timestamp, position))
+        self._size += 1
+
+    def lookup(self, currency: Any, amount: Optional[float], timestamp: float) -> List[int]:
+        """Return positions of indexed transactions that may match amount and date"""
+        if amount is None:
+            return []
+
+        lower = (timestamp - self.window_seconds,)
+        upper = (timestamp + self.window_seconds, float('inf'))
+        minor_units = self.to_minor_units(amount)
+
+        positions = []
+        for offset in range(-self.AMOUNT_BUCKET_SPREAD, self.AMOUNT_BUCKET_SPREAD + 1):
+            bucket = self._buckets.get((currency, minor_units + offset))
+            if not bucket:
+                continue
+            start = bisect_left(bucket, lower)
+            end = bisect_right(bucket, upper)
+            positions.extend(position for _, position in bucket[start:end])
+        return positions
+
+    def find_candidates(self, probes: List[Tuple[Any, Optional[float]]], timestamp: float) -> List[int]:
+        """
+        Return the union of candidate positions for several (currency, amount) probes,
+        in ascending position order so callers see candidates in their original order
+        """
+        positions = set()
+        for currency, amount in probes:
+            positions.update(self.lookup(currency, amount, timestamp))
+        return sorted(positions)
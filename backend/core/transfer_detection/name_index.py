@@ -0,0 +1,68 @@
+"""
+Name-token inverted index for cross-bank transfer matching
+"""
+from typing import Dict, List, Optional, Set
+
+
+def normalize_name(name: str) -> str:
+    """Normalized form compared by CrossBankMatcher._names_match"""
+    return name.lower().strip()
+
+
+class NameTokenIndex:
+    """
+    Indexes incoming transactions by the transfer name extracted from their
+    description. Each distinct normalized name is split into tokens once, and an
+    inverted index maps every token to the names containing it, so the incoming
+    transactions whose name matches an outgoing name are found with a few set
+    lookups instead of comparing names pair by pair.
+
+    Matching follows CrossBankMatcher._names_match: names match when they share a
+    token or one contains the other (e.g. "John" and "Johnny Doe"). Containment
+    without a shared token cannot come from the token index, so it is checked
+    against the distinct names, of which a statement has far fewer than rows.
+    """
+
+    def __init__(self):
+        self._names: Dict[int, str] = {}  # position -> name as extracted
+        self._name_positions: Dict[str, List[int]] = {}  # normalized name -> positions
+        self._token_names: Dict[str, Set[str]] = {}  # token -> normalized names
+        self._matches: Dict[str, Set[int]] = {}  # normalized outgoing name -> matching positions
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, position: int, name: Optional[str]) -> None:
+        """Index the incoming transaction at ``position``; transactions without a name are not indexed"""
+        if not name:
+            return
+        normalized = normalize_name(name)
+        self._names[position] = name
+        positions = self._name_positions.get(normalized)
+        if positions is None:
+            self._name_positions[normalized] = positions = []
+            for token in set(normalized.split()):
+                self._token_names.setdefault(token, set()).add(normalized)
+        positions.append(position)
+        self._matches.clear()
+
+    def name_at(self, position: int) -> Optional[str]:
+        """Name of the transaction at ``position``, None if it has none"""
+        return self._names.get(position)
+
+    def matching_positions(self, name: Optional[str]) -> Set[int]:
+        """Positions of indexed transactions whose name matches ``name``"""
+        if not name:
+            return set()
+        normalized = normalize_name(name)
+        positions = self._matches.get(normalized)
+        if positions is None:
+            names: Set[str] = set()
+            for token in set(normalized.split()):
+                names.update(self._token_names.get(token, ()))
+            for other in self._name_positions:
+                if other not in names and (normalized in other or other in normalized):
+                    names.add(other)
+            positions = {position for other in names for position in self._name_positions[other]}
+            self._matches[normalized] = positions
+        return positions
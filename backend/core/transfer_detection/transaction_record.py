@@ -0,0 +1,168 @@
+"""
+Pre-parsed transaction records for transfer detection
+"""
+from typing import Any, Dict, Optional
+from backend.shared.utils.date_inference import ColumnDateParser
+from backend.core.transfer_detection.amount_parser import AmountParser
+from backend.core.transfer_detection.date_parser import DateParser
+
+SECONDS_PER_DAY = 86400
+
+# Timestamp of records whose date could not be parsed; NaN fails every date comparison
+INVALID_TIMESTAMP = float('nan')
+
+_EMPTY_VALUES = ['', 'nan', 'NaN', 'null', 'None']
+
+_EXCHANGE_AMOUNT_COLUMNS = [
+    'Exchange To Amount',
+    'Exchange_To_Amount',
+    'ExchangeToAmount',
+    'exchange_to_amount',
+    'exchangetoamount'
+]
+
+_EXCHANGE_CURRENCY_COLUMNS = [
+    'Exchange To',
+    'Exchange_To',
+    'ExchangeTo',
+    'exchange_to',
+    'exchangetocurrency'
+]
+
+
+def get_description(transaction: Dict) -> str:
+    """Get description from transaction with fallback fields"""
+    return str(
+        transaction.get('_original_title', '') or # Prioritize original title
+        transaction.get('Description', '') or 
+        transaction.get('Title', '') or 
+        transaction.get('Note', '') or 
+        transaction.get('DESCRIPTION', '') or 
+        transaction.get('TYPE', '')
+    )
+
+
+def get_date_string(transaction: Dict) -> str:
+    """Get date string from transaction"""
+    return (
+        transaction.get('Date', '') or 
+        transaction.get('\ufeffDate', '') or 
+        transaction.get('TIMESTAMP', '') or 
+        transaction.get('TransactionDate', '')
+    )
+
+
+def get_exchange_amount(transaction: Dict) -> Optional[float]:
+    """Get exchange amount from static CSV columns only"""
+    for col in _EXCHANGE_AMOUNT_COLUMNS:
+        if col in transaction:
+            exchange_value = transaction[col]
+            if exchange_value and str(exchange_value).strip() not in _EMPTY_VALUES:
+                try:
+                    parsed_amount = AmountParser.parse_amount(str(exchange_value))
+                    if parsed_amount != 0:
+                        return abs(parsed_amount)
+                except (ValueError, TypeError):
+                    continue
+    return None
+
+
+def get_exchange_currency(transaction: Dict) -> Optional[str]:
+    """Get exchange currency from static CSV columns only"""
+    for col in _EXCHANGE_CURRENCY_COLUMNS:
+        if col in transaction:
+            currency_value = transaction[col]
+            if currency_value and str(currency_value).strip() not in _EMPTY_VALUES:
+                val_str = str(currency_value).strip().upper()
+                if len(val_str) == 3 and val_str.isalpha():
+                    return val_str
+    return None
+
+
+class TransactionRecord:
+    """
+    Compact, parse-once view of a transaction used by the matchers and scorers.
+    
+    Amounts, dates and descriptions are parsed a single time when transactions are
+    prepared, instead of on every pairwise comparison.
+    """
+    
+    __slots__ = (
+        'transaction_index', 'csv_index', 'bank_type', 'currency',
+        'amount', 'amount_minor', 'timestamp',
+        'description', 'description_lower', 'raw_description_lower',
+        'exchange_amount', 'exchange_currency', 'has_date_column'
+    )
+    
+    def __init__(self, transaction_index: int, csv_index: int, bank_type: str, currency: Any,
+                 amount: float, timestamp: float, description: str, raw_description: str,
+                 exchange_amount: Optional[float] = None, exchange_currency: Optional[str] = None,
+                 has_date_column: bool = True):
+        self.transaction_index = transaction_index
+        self.csv_index = csv_index
+        self.bank_type = bank_type
+        self.currency = currency
+        self.amount = amount  # Signed amount as parsed
+        self.amount_minor = int(round(amount * 100))  # Signed amount in minor units (cents)
+        self.timestamp = timestamp  # Seconds since the epoch, see DateParser.to_timestamp
+        self.description = description  # Description used for pattern and name matching
+        self.description_lower = description.lower()
+        self.raw_description_lower = raw_description.lower()  # 'Description' column, used for scoring
+        self.exchange_amount = exchange_amount
+        self.exchange_currency = exchange_currency
+        self.has_date_column = has_date_column  # Date came from the 'Date' column, see score_day
+    
+    @classmethod
+    def from_transaction(cls, transaction: Dict, default_currency: Optional[str] = None,
+                         date_parser: Optional[ColumnDateParser] = None) -> 'TransactionRecord':
+        """
+        Build a record from a prepared transaction dict.
+        
+        date_parser is the memoizing parser of the transaction's CSV date column;
+        records with an unparseable date get INVALID_TIMESTAMP and never match.
+        """
+        currency = transaction['Currency'] if 'Currency' in transaction else default_currency
+        date_string = get_date_string(transaction)
+        date = date_parser.parse(date_string) if date_parser else DateParser.parse_date(date_string)
+        return cls(
+            transaction_index=transaction.get('_transaction_index'),
+            csv_index=transaction.get('_csv_index'),
+            bank_type=transaction.get('_bank_type', ''),
+            currency=currency,
+            amount=AmountParser.parse_amount(transaction.get('Amount', '0')),
+            timestamp=DateParser.to_timestamp(date) if date is not None else INVALID_TIMESTAMP,
+            description=get_description(transaction),
+            raw_description=str(transaction.get('Description', '')),
+            exchange_amount=get_exchange_amount(transaction),
+            exchange_currency=get_exchange_currency(transaction),
+            has_date_column=bool(transaction.get('Date', ''))
+        )
+    
+    @property
+    def abs_amount(self) -> float:
+        return abs(self.amount)
+    
+    @property
+    def date_valid(self) -> bool:
+        return self.timestamp == self.timestamp  # False only for INVALID_TIMESTAMP (NaN)
+    
+    @property
+    def day(self) -> Optional[int]:
+        """Calendar day number, equal for two records on the same date"""
+        return int(self.timestamp // SECONDS_PER_DAY) if self.date_valid else None
+    
+    @property
+    def score_day(self) -> Optional[int]:
+        """Day used for the same-day confidence bonus, which only counts the 'Date' column"""
+        return self.day if self.has_date_column else None
+    
+    @property
+    def date(self):
+        return DateParser.from_timestamp(self.timestamp) if self.date_valid else None
+    
+    def hours_between(self, other: 'TransactionRecord') -> float:
+        return abs(self.timestamp - other.timestamp) / 3600
+    
+    def __repr__(self) -> str:
+        return (f"TransactionRecord(index={self.transaction_index}, bank={self.bank_type}, "
+                f"amount={self.amount} {self.currency}, date={self.date.strftime('%Y-%m-%d') if self.date_valid else 'invalid'})")
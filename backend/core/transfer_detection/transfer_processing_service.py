@@ -4,8 +4,11 @@ Transfer processing service for orchestrating transfer detection and categorizat
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+import numpy as np
+
 from backend.core.transfer_detection.main_detector import TransferDetector
 from backend.infrastructure.config.unified_config_service import get_unified_config_service
+from backend.shared.models.transaction_frame import TransactionFrame
 
 
 class TransferProcessingService:
@@ -25,16 +28,20 @@ class TransferProcessingService:
         print(f"ℹ [TransferProcessingService] Initialized with TransferDetector")
     
     def run_transfer_detection(self, data: List[Dict[str, Any]], 
-                              csv_data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+                              csv_data_list: List[Dict[str, Any]],
+                              incremental: bool = False,
+                              session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Run transfer detection on processed data
         
         Args:
             data: List of processed transaction data
             csv_data_list: Original CSV data list with bank info
+            incremental: Match only this data against an incremental detection session
+            session_id: Session to continue; a new session is started if missing or expired
             
         Returns:
-            dict: Transfer detection results
+            dict: Transfer detection results (with session_id in incremental mode)
         """
         print(f"ℹ [TransferProcessingService] Running transfer detection...")
         print(f"   [DATA] Input data rows: {len(data)}")
@@ -44,22 +51,21 @@ class TransferProcessingService:
             print(f"      Sample row keys: {list(data[0].keys())}")
             print(f"      Sample row: {data[0]}")
         
-        # Group data by account/bank for transfer detection
-        accounts = {}
-        for row in data:
-            account = row.get('Account', 'Unknown')
-            if account not in accounts:
-                accounts[account] = []
-            accounts[account].append(row)
+        # Group data by account/bank for transfer detection; the detector still takes dict rows
+        frame = TransactionFrame.coerce(data)
+        account_codes, accounts = frame.factorize('Account', 'Unknown')
         
-        print(f"      Accounts found: {list(accounts.keys())}")
+        print(f"      Accounts found: {accounts}")
         
         # Create csv_data_list format for transfer detector with bank info
         csv_data_for_detector = []
         
-        for account, rows in accounts.items():
+        for code, account in enumerate(accounts):
             # Find the matching CSV data for this account to get bank info
             bank_info = self._find_bank_info_for_account(account, csv_data_list)
+            positions = np.flatnonzero(account_codes == code)
+            # Dict rows passed in go to the detector as they are; a frame's rows are built per account
+            rows = frame.records(positions) if data is frame else [data[position] for position in positions.tolist()]
             
             csv_data = {
                 'data': rows,
@@ -74,28 +80,41 @@ class TransferProcessingService:
         
         try:
             # Run transfer detection
-            print(f"      Calling TransferDetector.detect_transfers()...")
-            detection_result = self.transfer_detector.detect_transfers(csv_data_for_detector)
+            if incremental:
+                print(f"      Calling TransferDetector.detect_transfers_incremental() for session {session_id}...")
+                detection_result = self.transfer_detector.detect_transfers_incremental(csv_data_for_detector, session_id)
+            else:
+                print(f"      Calling TransferDetector.detect_transfers()...")
+                detection_result = self.transfer_detector.detect_transfers(csv_data_for_detector)
             
             print(f"   [DATA] Transfer detection results:")
             print(f"         Summary: {detection_result.get('summary', {})}")
             print(f"         Transfer pairs: {len(detection_result.get('transfers', []))}")
             print(f"         Potential transfers: {len(detection_result.get('potential_transfers', []))}")
             
+            # Detected rows stay the detector's dicts: the transfer pairs share them, so
+            # categorizing a row also updates the pair shown in the transfer analysis
+            processed_transactions = detection_result.get('processed_transactions')
+            if processed_transactions is None:
+                processed_transactions = frame.to_records() if data is frame else data
+            
             return {
+                "session_id": detection_result.get('session_id'),
                 "summary": detection_result.get('summary', {}),
                 "transfers": detection_result.get('transfers', []),
                 "potential_transfers": detection_result.get('potential_transfers', []),
                 "potential_pairs": detection_result.get('potential_pairs', []),
-                "processed_transactions": detection_result.get('processed_transactions', data),
+                "processed_transactions": processed_transactions,
                 "conflicts": detection_result.get('conflicts', []),
-                "flagged_transactions": detection_result.get('flagged_transactions', [])
+                "flagged_transactions": detection_result.get('flagged_transactions', []),
+                "skipped_files": detection_result.get('skipped_files', [])
             }
         except Exception as e:
             print(f"[WARNING] Transfer detection error: {e}")
             import traceback
             print(f"   Transfer detection traceback: {traceback.format_exc()}")
             return {
+                "session_id": session_id,
                 "summary": {
                     "transfer_pairs_found": 0,
                     "potential_transfers": 0,
@@ -104,7 +123,7 @@ class TransferProcessingService:
                     "flagged_for_review": 0
                 },
                 "transfers": [],
-                "processed_transactions": data,
+                "processed_transactions": frame.to_records() if data is frame else data,
                 "potential_transfers": [],
                 "potential_pairs": [],
                 "conflicts": [],
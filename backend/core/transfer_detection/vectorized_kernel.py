@@ -0,0 +1,178 @@
+"""
+Vectorized amount/date/confidence kernel for cross-bank transfer matching
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.core.transfer_detection.transaction_record import SECONDS_PER_DAY, TransactionRecord
+
+# (incoming position, exchange amount matched, confidence of the best strategy)
+CandidatePair = Tuple[int, bool, float]
+
+
+class VectorizedMatchingKernel:
+    """
+    Computes the pair checks of CrossBankMatcher._find_best_match that do not
+    depend on which transactions are already matched: different CSV, different
+    bank, date tolerance, the exchange_amount and traditional_same_currency amount
+    checks, and the confidence score. Outgoing and incoming records are loaded
+    into NumPy arrays and compared one block of outgoing x incoming at a time.
+
+    Only pairs passing every check are returned, so the order-dependent part of
+    matching (already used transactions, name checks, picking the best match)
+    runs on a small sparse result instead of every pair.
+    """
+
+    # Outgoing rows per block; outgoing records are blocked in timestamp order so
+    # each block only spans the incoming records inside its date window
+    BLOCK_ROWS = 128
+    # Incoming columns per broadcast, bounding the size of the temporary matrices
+    BLOCK_COLUMNS = 8192
+
+    # AmountParser.amounts_match tolerance
+    AMOUNT_TOLERANCE = 0.01
+
+    def __init__(self, date_tolerance_hours: float):
+        self.date_tolerance_hours = date_tolerance_hours
+        # Slack for floating point timestamps at the window edges; the exact
+        # tolerance check runs in the broadcast
+        self.window_seconds = date_tolerance_hours * 3600 + 60.0
+
+    def find_candidate_pairs(self, outgoing_records: Sequence[TransactionRecord],
+                             incoming_records: Sequence[TransactionRecord],
+                             incoming_positions: Sequence[int]) -> List[List[CandidatePair]]:
+        """
+        For each outgoing record, the incoming candidates passing every pair check,
+        in ascending incoming position.
+
+        incoming_records is indexed by position; only incoming_positions are considered.
+        """
+        candidate_pairs: List[List[CandidatePair]] = [[] for _ in outgoing_records]
+        if not outgoing_records or not incoming_positions:
+            return candidate_pairs
+
+        currency_ids: Dict[object, int] = {}
+        bank_ids: Dict[object, int] = {}
+        outgoing = self._outgoing_arrays(outgoing_records, currency_ids, bank_ids)
+        incoming = self._incoming_arrays(incoming_records, incoming_positions, currency_ids, bank_ids)
+
+        incoming_order = np.argsort(incoming['timestamp'], kind='stable')
+        incoming_sorted_timestamps = incoming['timestamp'][incoming_order]
+        outgoing_order = np.argsort(outgoing['timestamp'], kind='stable')
+        # Records with an invalid date (NaN timestamp) never pass the date check
+        outgoing_order = outgoing_order[~np.isnan(outgoing['timestamp'][outgoing_order])]
+
+        for block_start in range(0, len(outgoing_order), self.BLOCK_ROWS):
+            rows = outgoing_order[block_start:block_start + self.BLOCK_ROWS]
+            row_timestamps = outgoing['timestamp'][rows]
+            first = np.searchsorted(incoming_sorted_timestamps, row_timestamps.min() - self.window_seconds, 'left')
+            last = np.searchsorted(incoming_sorted_timestamps, row_timestamps.max() + self.window_seconds, 'right')
+
+            for column_start in range(first, last, self.BLOCK_COLUMNS):
+                columns = incoming_order[column_start:min(last, column_start + self.BLOCK_COLUMNS)]
+                self._evaluate_block(outgoing, incoming, rows, columns, candidate_pairs)
+
+        for pairs in candidate_pairs:
+            if len(pairs) > 1:
+                pairs.sort()
+        return candidate_pairs
+
+    def _evaluate_block(self, outgoing: Dict[str, np.ndarray], incoming: Dict[str, np.ndarray],
+                        rows: np.ndarray, columns: np.ndarray,
+                        candidate_pairs: List[List[CandidatePair]]) -> None:
+        """Broadcast all pair checks over rows x columns and collect the passing pairs"""
+        def out(name):
+            return outgoing[name][rows][:, None]
+
+        def inc(name):
+            return incoming[name][columns][None, :]
+
+        incoming_amount = inc('amount')
+        mask = np.abs(out('timestamp') - inc('timestamp')) / 3600 <= self.date_tolerance_hours
+        mask &= out('csv') != inc('csv')
+        mask &= out('bank') != inc('bank')
+
+        exchange_match = (out('exchange_currency') == inc('currency')) & \
+            (np.abs(out('exchange_amount') - incoming_amount) < self.AMOUNT_TOLERANCE)
+        same_currency_match = (out('currency') == inc('currency')) & \
+            (np.abs(out('abs_amount') - incoming_amount) < self.AMOUNT_TOLERANCE)
+        mask &= exchange_match | same_currency_match
+
+        row_hits, column_hits = np.nonzero(mask)
+        if not len(row_hits):
+            return
+
+        outgoing_rows = rows[row_hits]
+        incoming_columns = columns[column_hits]
+        is_exchange = exchange_match[row_hits, column_hits]
+        confidence = self._confidence(outgoing, incoming, outgoing_rows, incoming_columns, is_exchange)
+
+        positions = incoming['position'][incoming_columns]
+        for row, position, exchange, score in zip(outgoing_rows.tolist(), positions.tolist(),
+                                                  is_exchange.tolist(), confidence.tolist()):
+            candidate_pairs[row].append((position, exchange, score))
+
+    @staticmethod
+    def _confidence(outgoing: Dict[str, np.ndarray], incoming: Dict[str, np.ndarray],
+                    outgoing_rows: np.ndarray, incoming_columns: np.ndarray,
+                    is_exchange: np.ndarray) -> np.ndarray:
+        """
+        ConfidenceCalculator.calculate_record_confidence for cross-bank pairs, adding the
+        bonuses in the same order so the scores are bit-for-bit identical. Exchange
+        matches always score at least as high as same-currency ones, so they win.
+        """
+        confidence = np.full(len(outgoing_rows), 0.5)
+        confidence += 0.2  # is_cross_bank
+        confidence += np.where(is_exchange, 0.3, 0.0)
+        confidence += np.where(outgoing['score_day'][outgoing_rows] == incoming['score_day'][incoming_columns], 0.2, 0.0)
+        name_bonus = (outgoing['transfer_to'][outgoing_rows] & incoming['from'][incoming_columns]) | \
+            (outgoing['sent_to'][outgoing_rows] & incoming['received_from'][incoming_columns])
+        confidence += np.where(name_bonus, 0.1, 0.0)
+        return np.minimum(confidence, 1.0)
+
+    @staticmethod
+    def _score_days(records: Sequence[TransactionRecord], timestamps: np.ndarray) -> np.ndarray:
+        """TransactionRecord.score_day as floats, NaN (never equal) where it is None"""
+        has_date_column = np.array([r.has_date_column for r in records], dtype=bool)
+        return np.where(has_date_column, np.floor_divide(timestamps, SECONDS_PER_DAY), np.nan)
+
+    @staticmethod
+    def _id(ids: Dict[object, int], value: object) -> int:
+        return ids.setdefault(value, len(ids))
+
+    def _outgoing_arrays(self, records: Sequence[TransactionRecord], currency_ids: Dict[object, int],
+                         bank_ids: Dict[object, int]) -> Dict[str, np.ndarray]:
+        has_exchange = [r.exchange_amount is not None and bool(r.exchange_currency) for r in records]
+        timestamps = np.array([r.timestamp for r in records], dtype=np.float64)
+        return {
+            'timestamp': timestamps,
+            'score_day': self._score_days(records, timestamps),
+            'abs_amount': np.array([r.abs_amount for r in records], dtype=np.float64),
+            'currency': np.array([self._id(currency_ids, r.currency) for r in records], dtype=np.int64),
+            # Records without exchange data can never pass the exchange amount check
+            'exchange_amount': np.array([r.exchange_amount if has else np.inf
+                                         for r, has in zip(records, has_exchange)], dtype=np.float64),
+            'exchange_currency': np.array([self._id(currency_ids, r.exchange_currency) if has else -1
+                                           for r, has in zip(records, has_exchange)], dtype=np.int64),
+            'csv': np.array([r.csv_index for r in records], dtype=np.int64),
+            'bank': np.array([self._id(bank_ids, r.bank_type) for r in records], dtype=np.int64),
+            'transfer_to': np.array(['transfer to' in r.raw_description_lower for r in records], dtype=bool),
+            'sent_to': np.array(['sent to' in r.raw_description_lower for r in records], dtype=bool),
+        }
+
+    def _incoming_arrays(self, records: Sequence[TransactionRecord], positions: Sequence[int],
+                         currency_ids: Dict[object, int], bank_ids: Dict[object, int]) -> Dict[str, np.ndarray]:
+        selected = [records[position] for position in positions]
+        timestamps = np.array([r.timestamp for r in selected], dtype=np.float64)
+        return {
+            'position': np.array(positions, dtype=np.int64),
+            'timestamp': timestamps,
+            'score_day': self._score_days(selected, timestamps),
+            'amount': np.array([r.amount for r in selected], dtype=np.float64),
+            'currency': np.array([self._id(currency_ids, r.currency) for r in selected], dtype=np.int64),
+            'csv': np.array([r.csv_index for r in selected], dtype=np.int64),
+            'bank': np.array([self._id(bank_ids, r.bank_type) for r in selected], dtype=np.int64),
+            'from': np.array(['from' in r.raw_description_lower for r in selected], dtype=bool),
+            'received_from': np.array(['received from' in r.raw_description_lower for r in selected], dtype=bool),
+        }
@@ -0,0 +1,200 @@
+"""
+Compiled bank detection index
+Built once from every bank's [bank_info] detection patterns, so scoring all banks
+takes one pass over the filename, one over the content sample and one over the
+headers instead of re-lowering and re-scanning them per bank and per pattern
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.infrastructure.config.categorization_engine import LiteralAutomaton
+
+# BankDetector filename scores per pattern kind
+GLOB_SCORE = 0.9
+REGEX_SCORE = 1.0
+INVALID_REGEX_SCORE = 0.7
+SUBSTRING_SCORE = 0.8
+
+# BankDetector weights for the three evidence sources
+FILENAME_WEIGHT = 0.2
+CONTENT_WEIGHT = 0.4
+HEADER_WEIGHT = 0.4
+
+# Joins headers for a single scan; required headers never contain it
+HEADER_SEPARATOR = '\x00'
+
+DETECTOR_REGEX_MARKERS = ['^', '$', '\\d', '\\w', '+', '?', '[', ']', '(', ')']
+
+
+def _is_glob(pattern: str) -> bool:
+    return pattern.startswith('*') and pattern.endswith('*') and pattern.count('*') == 2
+
+
+def _is_detector_regex(pattern: str) -> bool:
+    """Whether BankDetector treats a filename pattern as a regex"""
+    return (any(marker in pattern for marker in DETECTOR_REGEX_MARKERS)
+            or (pattern.count('*') > 0 and not (pattern.startswith('*') and pattern.endswith('*'))))
+
+
+def _found(literal: str, found: Set[str]) -> bool:
+    # An empty literal is contained in any text
+    return not literal or literal in found
+
+
+@dataclass
+class BankScore:
+    """BankDetector confidence for one bank with the evidence behind it"""
+    bank_name: str
+    confidence: float
+    reasons: List[str]
+    filename_score: float = 0.0
+    content_matches: int = 0
+    header_matches: int = 0
+
+
+@dataclass
+class BankDetectionEntry:
+    """One bank's detection patterns, compiled"""
+    bank_name: str
+    weight: float
+    # BankDetector filename rules: (score, regex or None, lowercased literal)
+    filename_rules: List[Tuple[float, Optional[re.Pattern], str]] = field(default_factory=list)
+    # UnifiedConfigService.detect_bank filename rules: (regex or None, lowercased literal, points)
+    service_filename_rules: List[Tuple[Optional[re.Pattern], str, float]] = field(default_factory=list)
+    signatures: List[str] = field(default_factory=list)
+    required_headers: List[str] = field(default_factory=list)
+
+
+class BankDetectionIndex:
+    """
+    Precompiled filename regexes and one literal automaton each for filename
+    literals, content signatures and required headers across all banks.
+    Scores are identical to checking every pattern of every bank in turn.
+    """
+
+    def __init__(self, detection_patterns: Dict[str, Any]):
+        self.entries: List[BankDetectionEntry] = [self._compile_entry(bank_name, info)
+                                                  for bank_name, info in detection_patterns.items()]
+        filename_literals = set()
+        for entry in self.entries:
+            filename_literals.update(literal for _, regex, literal in entry.filename_rules if regex is None)
+            filename_literals.update(literal for regex, literal, _ in entry.service_filename_rules if regex is None)
+        self._filename_matcher = LiteralAutomaton(sorted(filename_literals))
+        self._signature_matcher = LiteralAutomaton(sorted({s for entry in self.entries for s in entry.signatures}))
+        self._header_matcher = LiteralAutomaton(sorted({h for entry in self.entries for h in entry.required_headers}))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _compile_entry(bank_name: str, info: Any) -> BankDetectionEntry:
+        entry = BankDetectionEntry(bank_name=bank_name, weight=info.confidence_weight)
+
+        for pattern in info.filename_patterns:
+            if _is_glob(pattern):
+                entry.filename_rules.append((GLOB_SCORE, None, pattern[1:-1].lower()))
+            elif _is_detector_regex(pattern):
+                try:
+                    entry.filename_rules.append((REGEX_SCORE, re.compile(pattern, re.IGNORECASE), ''))
+                except re.error as e:
+                    print(f"[WARNING] Invalid regex pattern '{pattern}': {e}")
+                    entry.filename_rules.append((INVALID_REGEX_SCORE, None, pattern.lower()))
+            else:
+                entry.filename_rules.append((SUBSTRING_SCORE, None, pattern.lower()))
+
+            # Anchored patterns are regexes for detect_bank, everything else a substring
+            substring_rule = (None, pattern.lower(), len(pattern) * info.confidence_weight)
+            if pattern.startswith('^') or pattern.startswith('.*'):
+                try:
+                    entry.service_filename_rules.append((re.compile(pattern), '', 100 * info.confidence_weight))
+                except re.error:
+                    entry.service_filename_rules.append(substring_rule)
+            else:
+                entry.service_filename_rules.append(substring_rule)
+
+        entry.signatures = [signature.lower() for signature in info.content_signatures]
+        entry.required_headers = [required.lower().strip() for required in info.required_headers]
+        return entry
+
+    @staticmethod
+    def _scan(matcher: LiteralAutomaton, text: str) -> Set[str]:
+        literals = matcher.literals
+        return {literals[literal_id] for literal_id, _ in matcher.find_all(text)}
+
+    def score_banks(self, filename: str, content: str, headers: List[str]) -> List[BankScore]:
+        """BankDetector confidence for every bank, in config order"""
+        filename_lower = filename.lower()
+        filename_found = self._scan(self._filename_matcher, filename_lower)
+        content_found = self._scan(self._signature_matcher, content.lower())
+        headers_lower = [header.lower().strip() for header in headers]
+        header_found = self._scan(self._header_matcher, HEADER_SEPARATOR.join(headers_lower))
+
+        scores = []
+        for entry in self.entries:
+            confidence = 0.0
+            reasons = []
+
+            # 1. Filename pattern matching (20% weight)
+            filename_score = 0.0
+            for score, regex, literal in entry.filename_rules:
+                if score > filename_score:
+                    if regex is not None:
+                        matched = regex.match(filename) is not None
+                    else:
+                        matched = _found(literal, filename_found)
+                    if matched:
+                        filename_score = score
+            if filename_score > 0:
+                confidence += filename_score * FILENAME_WEIGHT
+                reasons.append(f"filename_match({filename_score:.1f})")
+
+            # 2. Content signature matching (40% weight)
+            content_matches = sum(1 for signature in entry.signatures if _found(signature, content_found))
+            content_score = content_matches / len(entry.signatures) if entry.signatures else 0.0
+            if content_score > 0:
+                confidence += content_score * CONTENT_WEIGHT
+                reasons.append(f"content_signature({content_score:.1f})")
+
+            # 3. Header matching (40% weight)
+            header_matches = 0
+            if headers_lower:
+                header_matches = sum(1 for required in entry.required_headers if _found(required, header_found))
+            header_score = header_matches / len(entry.required_headers) if entry.required_headers else 0.0
+            if header_score > 0:
+                confidence += header_score * HEADER_WEIGHT
+                reasons.append(f"header_match({header_score:.1f})")
+
+            scores.append(BankScore(entry.bank_name, confidence, reasons,
+                                    filename_score, content_matches, header_matches))
+        return scores
+
+    def detect(self, filename: str, content_sample: Optional[str] = None) -> Optional[str]:
+        """Highest scoring bank by UnifiedConfigService.detect_bank's filename and signature points"""
+        filename_lower = filename.lower()
+        filename_found = self._scan(self._filename_matcher, filename_lower)
+        content_found = self._scan(self._signature_matcher, content_sample.lower()) if content_sample else set()
+
+        matches = []
+        for entry in self.entries:
+            confidence = 0.0
+            for regex, literal, points in entry.service_filename_rules:
+                if regex is not None:
+                    if regex.match(filename) or regex.match(filename_lower):
+                        confidence += points
+                elif _found(literal, filename_found):
+                    confidence += points
+
+            if content_sample:
+                for signature in entry.signatures:
+                    if _found(signature, content_found):
+                        confidence += 50 * entry.weight
+
+            if confidence > 0:
+                matches.append((entry.bank_name, confidence))
+
+        # Return highest confidence match
+        if matches:
+            matches.sort(key=lambda x: x[1], reverse=True)
+            return matches[0][0]
+        return None
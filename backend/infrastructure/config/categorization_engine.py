@@ -0,0 +1,292 @@
+"""
+Compiled categorization engine
+Sorts and compiles each tier of categorization rules once per config load, so
+categorize_merchant_with_debug does not re-sort hundreds of app.conf patterns and
+rebuild a regex per pattern for every transaction
+"""
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# A pattern containing any of these is matched as a regex, otherwise as a whole word
+REGEX_MARKERS = ['.*', '|', '\\', '^', '$', '[', ']', '{', '}', '(', ')', '+', '?']
+
+REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+
+APP_RESERVED_SECTIONS = ['general', 'transfer_detection', 'transfer_categorization', 'default_category_rules']
+
+APP_SOURCE = 'app-wide (app.conf)'
+
+
+def is_regex_pattern(pattern: str) -> bool:
+    """Whether a categorization pattern is matched as a regex rather than a whole word"""
+    return any(marker in pattern for marker in REGEX_MARKERS)
+
+
+def literal_alternatives(pattern_lower: str) -> Optional[List[str]]:
+    """
+    The literals a regex pattern is equivalent to searching for, or None.
+    Patterns such as 'amazon.*' or 'marks & spencer.*|m&s.*' match exactly when one
+    alternative's text occurs anywhere in the merchant, since '.*' may match nothing.
+    """
+    literals = []
+    for alternative in pattern_lower.split('|'):
+        if alternative.startswith('.*'):
+            alternative = alternative[2:]
+        if alternative.endswith('.*'):
+            alternative = alternative[:-2]
+        if any(char in REGEX_SPECIAL_CHARS for char in alternative):
+            return None
+        literals.append(alternative)
+    return literals
+
+
+def _is_word_char(char: str) -> bool:
+    """Unicode word character, as used by the regex \\b assertion"""
+    return char.isalnum() or char == '_'
+
+
+def _has_word_boundaries(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is surrounded by \\b boundaries"""
+    before = start > 0 and _is_word_char(text[start - 1])
+    after = end < len(text) and _is_word_char(text[end])
+    return (before != _is_word_char(text[start])) and (_is_word_char(text[end - 1]) != after)
+
+
+class LiteralAutomaton:
+    """
+    Aho-Corasick automaton over a set of literal strings: a single pass over a text
+    reports every occurrence of every literal, overlapping ones included
+    """
+
+    def __init__(self, literals: Iterable[str]):
+        self.literals: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        literal_ids: Dict[str, int] = {}
+        for literal in literals:
+            if not literal or literal in literal_ids:
+                continue
+            literal_ids[literal] = len(self.literals)
+            self.literals.append(literal)
+            node = 0
+            for char in literal:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = child
+                node = child
+            self._output[node].append(literal_ids[literal])
+
+        # Failure links, breadth first; root children keep failing to the root
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (literal_id, end) for every occurrence, where text[end - len(literal):end] is the literal"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for literal_id in output[node]:
+                yield literal_id, index + 1
+
+
+class CategorizationRule:
+    """A single categorization pattern with the metadata reported when it matches"""
+
+    __slots__ = ('pattern', 'category', 'rule_type')
+
+    def __init__(self, pattern: str, category: str, rule_type: str):
+        self.pattern = pattern
+        self.category = category
+        self.rule_type = rule_type
+
+    def result(self, source: str) -> Dict[str, Any]:
+        return {
+            'category': self.category,
+            'pattern': self.pattern,
+            'source': source,
+            'rule_type': self.rule_type
+        }
+
+
+class CategorizationTier:
+    """
+    One tier of rules in priority order: longest pattern first, config order among
+    patterns of equal length. Whole-word patterns and regexes equivalent to literal
+    searches are found together with one automaton pass; the remaining regexes are
+    precompiled and only tried while they rank ahead of the best literal match.
+    """
+
+    def __init__(self, rules: Iterable[CategorizationRule], source: str):
+        self.source = source
+        self.rules: List[CategorizationRule] = sorted(rules, key=lambda rule: len(rule.pattern), reverse=True)
+        self._regex_rules: List[Tuple[int, 're.Pattern']] = []
+        self._always_rank = len(self.rules)
+        # Best (lowest) rank per literal, for substring matches and for whole-word matches
+        substring_ranks: Dict[str, int] = {}
+        word_ranks: Dict[str, int] = {}
+
+        for rank, rule in enumerate(self.rules):
+            pattern_lower = rule.pattern.lower()
+            if is_regex_pattern(rule.pattern):
+                literals = literal_alternatives(pattern_lower)
+                if literals is None:
+                    try:
+                        self._regex_rules.append((rank, re.compile(pattern_lower)))
+                        continue
+                    except re.error:
+                        # Invalid regexes fall back to plain substring matching
+                        literals = [pattern_lower]
+                for literal in literals:
+                    if not literal:
+                        self._always_rank = min(self._always_rank, rank)
+                    else:
+                        substring_ranks.setdefault(literal, rank)
+            elif pattern_lower:
+                word_ranks.setdefault(pattern_lower, rank)
+            else:
+                self._regex_rules.append((rank, re.compile(r'\b\b')))
+
+        self._automaton = LiteralAutomaton(list(substring_ranks) + list(word_ranks))
+        no_rank = len(self.rules)
+        self._substring_ranks = [substring_ranks.get(literal, no_rank) for literal in self._automaton.literals]
+        self._word_ranks = [word_ranks.get(literal, no_rank) for literal in self._automaton.literals]
+        self._lengths = [len(literal) for literal in self._automaton.literals]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, merchant_lower: str) -> Optional[CategorizationRule]:
+        """Highest priority rule matching the lowercased merchant, or None"""
+        best = self._always_rank
+        for literal_id, end in self._automaton.find_all(merchant_lower):
+            rank = self._substring_ranks[literal_id]
+            if rank < best:
+                best = rank
+            rank = self._word_ranks[literal_id]
+            if rank < best and _has_word_boundaries(merchant_lower, end - self._lengths[literal_id], end):
+                best = rank
+
+        for rank, regex in self._regex_rules:
+            if rank >= best:
+                break
+            if regex.search(merchant_lower):
+                return self.rules[rank]
+        return self.rules[best] if best < len(self.rules) else None
+
+
+class CategorizationEngine:
+    """
+    Compiled categorization tiers, checked in precedence order: bank categorization
+    rules, bank default category rules, app.conf category sections (ranked together),
+    then app.conf default category rules.
+
+    Tiers are built lazily and keyed on the identity of the config object they were
+    built from, so a reloaded bank or app config is recompiled on first use.
+    """
+
+    def __init__(self):
+        self._bank_tiers: Dict[str, Tuple[Any, List[CategorizationTier]]] = {}
+        self._app_config: Any = None
+        self._app_section_tier: Optional[CategorizationTier] = None
+        self._app_default_tier: Optional[CategorizationTier] = None
+
+    def invalidate(self, bank_name: Optional[str] = None) -> None:
+        """Drop compiled tiers for one bank, or everything including app.conf tiers"""
+        if bank_name is None:
+            self._bank_tiers.clear()
+            self._app_config = None
+            self._app_section_tier = None
+            self._app_default_tier = None
+        else:
+            self._bank_tiers.pop(bank_name, None)
+
+    def prepare(self, bank_configs: Dict[str, Any], app_config: Any) -> None:
+        """Compile every tier up front instead of on first use, e.g. before snapshotting the engine"""
+        for bank_name, bank_config in bank_configs.items():
+            self._get_bank_tiers(bank_name, bank_config)
+        if app_config:
+            self._app_config = app_config
+            self._app_section_tier = self._build_app_section_tier(app_config)
+            if 'default_category_rules' in app_config:
+                self._app_default_tier = self._build_app_default_tier(app_config)
+
+    def categorize(self, bank_name: str, bank_config: Any, app_config: Any, merchant: str) -> Optional[Dict[str, Any]]:
+        """Categorize a merchant, returning the matched category with its debug metadata"""
+        merchant_lower = merchant.lower()
+
+        # First tier: bank-specific rules (highest priority)
+        if bank_config:
+            for tier in self._get_bank_tiers(bank_name, bank_config):
+                rule = tier.match(merchant_lower)
+                if rule:
+                    return rule.result(tier.source)
+
+        if not app_config:
+            return None
+        if app_config is not self._app_config:
+            self._app_config = app_config
+            self._app_section_tier = None
+            self._app_default_tier = None
+
+        # Second tier: app-wide category sections, prioritized by length across all sections
+        if self._app_section_tier is None:
+            self._app_section_tier = self._build_app_section_tier(app_config)
+        rule = self._app_section_tier.match(merchant_lower)
+        if rule:
+            return rule.result(APP_SOURCE)
+
+        # Third tier: app-wide default category rules (final fallback)
+        if 'default_category_rules' in app_config:
+            if self._app_default_tier is None:
+                self._app_default_tier = self._build_app_default_tier(app_config)
+            rule = self._app_default_tier.match(merchant_lower)
+            if rule:
+                return rule.result(APP_SOURCE)
+
+        return None
+
+    def _get_bank_tiers(self, bank_name: str, bank_config: Any) -> List[CategorizationTier]:
+        cached = self._bank_tiers.get(bank_name)
+        if cached is not None and cached[0] is bank_config:
+            return cached[1]
+
+        source = f'bank-specific ({bank_name})'
+        tiers = [
+            CategorizationTier([CategorizationRule(pattern, category, 'categorization_rules')
+                                for pattern, category in bank_config.categorization_rules.items()], source),
+            CategorizationTier([CategorizationRule(pattern, category, 'default_category_rules')
+                                for pattern, category in bank_config.default_category_rules.items()], source)
+        ]
+        self._bank_tiers[bank_name] = (bank_config, tiers)
+        return tiers
+
+    def _build_app_section_tier(self, app_config: Any) -> CategorizationTier:
+        rules = []
+        for section_name in app_config.sections():
+            if section_name not in APP_RESERVED_SECTIONS:
+                for pattern in app_config[section_name]:
+                    rules.append(CategorizationRule(pattern, section_name, f'section [{section_name}]'))
+        return CategorizationTier(rules, APP_SOURCE)
+
+    def _build_app_default_tier(self, app_config: Any) -> CategorizationTier:
+        rules = [CategorizationRule(pattern, category, 'default_category_rules')
+                 for pattern, category in app_config['default_category_rules'].items()]
+        return CategorizationTier(rules, APP_SOURCE)
@@ -0,0 +1,130 @@
+"""
+Compiled conditional description overrides
+Converts each bank's [conditional_overrides] rule dicts once per config load into
+predicates with numeric thresholds and case-folded needles, then evaluates them
+over a bank's amount/note/title columns in one pass
+"""
+import operator
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Amount conditions in the order rules are checked, with the comparison each applies
+AMOUNT_CONDITIONS = (
+    ('if_amount_min', operator.ge),
+    ('if_amount_max', operator.le),
+    ('if_amount_less_than', operator.lt),
+    ('if_amount_greater_than', operator.gt),
+    ('if_amount_equals', operator.eq),
+)
+
+
+class ConditionalOverrideRule:
+    """One override rule: all of its conditions must hold for set_description to apply"""
+
+    __slots__ = ('name', 'set_description', 'amount_checks', 'note_equals', 'note_contains',
+                 'description_contains', 'error')
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.name = rule.get('name', rule.get('set_description', 'Unnamed Rule'))
+        self.set_description = rule.get('set_description')
+        self.amount_checks: List[Tuple[Any, float]] = []
+        self.error: Optional[str] = None
+        for key, compare in AMOUNT_CONDITIONS:
+            if key in rule:
+                try:
+                    self.amount_checks.append((compare, float(rule[key])))
+                except (TypeError, ValueError):
+                    self.error = f"{key}={rule[key]!r} is not a number"
+        self.note_equals = rule.get('if_note_equals')
+        self.note_contains = rule['if_note_contains'].lower() if 'if_note_contains' in rule else None
+        self.description_contains = (rule['if_description_contains'].lower()
+                                     if 'if_description_contains' in rule else None)
+
+    def matches(self, amount: Any, amount_is_number: bool, note: Any, note_lower: str, title_lower: str) -> bool:
+        if self.error is not None:
+            return False
+        for compare, threshold in self.amount_checks:
+            if not (amount_is_number and compare(amount, threshold)):
+                return False
+        if self.note_equals is not None and note != self.note_equals:
+            return False
+        if self.note_contains is not None and self.note_contains not in note_lower:
+            return False
+        if self.description_contains is not None and self.description_contains not in title_lower:
+            return False
+        return True
+
+
+def _normalize_amount(amount: Any) -> Tuple[Any, bool, bool]:
+    """(amount, is a number, usable): string amounts are parsed; unparseable ones match no rule"""
+    if isinstance(amount, str):
+        try:
+            amount = float(amount)
+        except ValueError:
+            return amount, False, False
+    return amount, isinstance(amount, (int, float)), True
+
+
+class ConditionalOverrideRules:
+    """A bank's conditional overrides, compiled in config order"""
+
+    def __init__(self, bank_name: str, rules: List[Dict[str, Any]]):
+        self.bank_name = bank_name
+        self.rules = [ConditionalOverrideRule(rule) for rule in rules]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @property
+    def invalid_rules(self) -> List[ConditionalOverrideRule]:
+        return [rule for rule in self.rules if rule.error is not None]
+
+    def apply(self, amounts: Sequence[Any], notes: Sequence[Any],
+              titles: Sequence[str]) -> List[Optional[ConditionalOverrideRule]]:
+        """
+        For each row, the first rule whose conditions hold and whose description differs
+        from the row's title, or None. Each row's values are normalized and case-folded once.
+        """
+        overrides: List[Optional[ConditionalOverrideRule]] = [None] * len(titles)
+        if not self.rules:
+            return overrides
+        rules = self.rules
+        for index, (amount, note, title) in enumerate(zip(amounts, notes, titles)):
+            amount, amount_is_number, usable = _normalize_amount(amount)
+            if not usable:
+                continue
+            note_lower = (note or '').lower()
+            title_lower = (title or '').lower()
+            for rule in rules:
+                if (rule.matches(amount, amount_is_number, note, note_lower, title_lower)
+                        and rule.set_description and title != rule.set_description):
+                    overrides[index] = rule
+                    break
+        return overrides
+
+
+class ConditionalOverrideRegistry:
+    """
+    Compiled overrides per bank, keyed on the identity of the rule list they were
+    built from so a reloaded bank config is recompiled on first use
+    """
+
+    def __init__(self):
+        self._compiled: Dict[str, Tuple[Any, ConditionalOverrideRules]] = {}
+
+    def get(self, bank_name: str, rules: List[Dict[str, Any]]) -> ConditionalOverrideRules:
+        cached = self._compiled.get(bank_name)
+        if cached is not None and cached[0] is rules:
+            return cached[1]
+        compiled = ConditionalOverrideRules(bank_name, rules)
+        for rule in compiled.invalid_rules:
+            print(f"[WARNING] [UnifiedConfigService] Skipping conditional override rule '{rule.name}' "
+                  f"for bank '{bank_name}': {rule.error}")
+        self._compiled[bank_name] = (rules, compiled)
+        return compiled
+
+    def invalidate(self, bank_name: Optional[str] = None) -> None:
+        """Drop compiled overrides for one bank, or for every bank"""
+        if bank_name is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(bank_name, None)
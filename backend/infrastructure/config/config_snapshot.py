@@ -0,0 +1,112 @@
+"""
+On-disk config snapshot
+Pickles the fully built config state (parsed app.conf, bank configs, detection
+patterns and compiled engines) to the per-user cache directory, so a cold start
+restores it with one read instead of re-parsing and recompiling every config.
+Snapshots stay out of the config directory, which users share and edit.
+"""
+import functools
+import glob
+import hashlib
+import os
+import pickle
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+import backend
+from backend.infrastructure.csv_parsing.utils import get_user_cache_dir
+
+# Bump whenever the pickled classes change shape
+SNAPSHOT_VERSION = 3
+
+SNAPSHOT_FILE = 'config_snapshot-{config_dir_hash}.pickle'
+
+# Source of the classes a snapshot pickles
+_SNAPSHOT_SOURCES = ('infrastructure/config/*.py', 'shared/amount_formats.py')
+
+
+def _file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version() -> str:
+    """App version plus a hash of the pickled classes' source, where the source ships"""
+    package_dir = os.path.dirname(os.path.abspath(backend.__file__))
+    digest = hashlib.sha256()
+    for pattern in _SNAPSHOT_SOURCES:
+        for path in sorted(glob.glob(os.path.join(package_dir, pattern))):
+            digest.update(os.path.relpath(path, package_dir).encode())
+            digest.update(_file_hash(path).encode())
+    return f"{backend.__version__}+{digest.hexdigest()[:16]}"
+
+
+def _snapshot_key() -> Tuple[int, str, int, int]:
+    # Pickles of compiled regexes and dataclasses are only trusted by the same code and Python
+    return (SNAPSHOT_VERSION, _code_version(), sys.version_info.major, sys.version_info.minor)
+
+
+def snapshot_path(config_dir: str) -> str:
+    """HISAABFLOW_CONFIG_SNAPSHOT, or a file per config directory in the user cache directory"""
+    configured = os.environ.get('HISAABFLOW_CONFIG_SNAPSHOT')
+    if configured:
+        return configured
+    config_dir_hash = hashlib.sha256(os.path.abspath(config_dir).encode()).hexdigest()[:16]
+    return os.path.join(get_user_cache_dir(), SNAPSHOT_FILE.format(config_dir_hash=config_dir_hash))
+
+
+def snapshots_enabled() -> bool:
+    return os.environ.get('HISAABFLOW_CONFIG_SNAPSHOT_DISABLED', '').lower() not in ('1', 'true', 'yes')
+
+
+def load_snapshot(config_dir: str, file_stamps: Dict[str, Tuple[int, int]]) -> Optional[Dict[str, Any]]:
+    """
+    The snapshotted state if it was built from the current .conf files, else None.
+    A file whose mtime or size changed is still accepted if its content hash matches.
+    """
+    try:
+        with open(snapshot_path(config_dir), 'rb') as f:
+            snapshot = pickle.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[WARNING] [ConfigSnapshot] Ignoring unreadable config snapshot: {e}")
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('key') != _snapshot_key():
+        return None
+    files = snapshot['files']
+    if set(files) != set(file_stamps):
+        return None
+    for file_name, stamp in file_stamps.items():
+        mtime_ns, size, digest = files[file_name]
+        if (mtime_ns, size) == stamp:
+            continue
+        try:
+            if size != stamp[1] or _file_hash(os.path.join(config_dir, file_name)) != digest:
+                return None
+        except OSError:
+            return None
+    return snapshot['state']
+
+
+def write_snapshot(config_dir: str, file_stamps: Dict[str, Tuple[int, int]], state: Dict[str, Any]) -> bool:
+    """Write the state with the stamps and hashes of the files it was built from"""
+    path = snapshot_path(config_dir)
+    try:
+        files = {file_name: (mtime_ns, size, _file_hash(os.path.join(config_dir, file_name)))
+                 for file_name, (mtime_ns, size) in file_stamps.items()}
+        data = pickle.dumps({'key': _snapshot_key(), 'files': files, 'state': state},
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        # Only this user may write what later gets unpickled
+        os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        # Write then rename so concurrent workers never read a partial snapshot
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return True
+    except Exception as e:
+        print(f"[WARNING] [ConfigSnapshot] Could not write config snapshot to {path}: {e}")
+        return False
@@ -0,0 +1,65 @@
+"""
+Immutable configuration state
+A request reads one ConfigState from start to finish; reloads build a new state and
+swap it in with a single assignment, so readers never see a half-cleared config
+"""
+import itertools
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+# Process-wide, so no two states (including per-request pinned ones) share a generation
+_generations = itertools.count(1)
+
+
+def next_generation() -> int:
+    return next(_generations)
+
+
+def _frozen(mapping: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+    return MappingProxyType(dict(mapping or {}))
+
+
+@dataclass(frozen=True)
+class ConfigState:
+    """
+    Loaded app.conf, bank configs and detection patterns. Mappings are read-only;
+    every change returns a new state with a new generation, which per-state caches
+    use as part of their keys.
+    """
+    app_config: Any = None
+    bank_configs: Mapping[str, Any] = field(default_factory=_frozen)
+    detection_patterns: Mapping[str, Any] = field(default_factory=_frozen)
+    generation: int = field(default_factory=next_generation)
+
+    @classmethod
+    def build(cls, app_config: Any = None, bank_configs: Optional[Mapping[str, Any]] = None,
+              detection_patterns: Optional[Mapping[str, Any]] = None) -> 'ConfigState':
+        return cls(app_config, _frozen(bank_configs), _frozen(detection_patterns))
+
+    def _changed(self, **changes: Any) -> 'ConfigState':
+        return replace(self, generation=next_generation(), **changes)
+
+    def with_app_config(self, app_config: Any) -> 'ConfigState':
+        return self._changed(app_config=app_config)
+
+    def with_bank_configs(self, bank_configs: Mapping[str, Any]) -> 'ConfigState':
+        return self._changed(bank_configs=_frozen(bank_configs))
+
+    def with_detection_patterns(self, detection_patterns: Mapping[str, Any]) -> 'ConfigState':
+        return self._changed(detection_patterns=_frozen(detection_patterns))
+
+    def with_bank_config(self, bank_name: str, bank_config: Any) -> 'ConfigState':
+        return self._changed(bank_configs=_frozen({**self.bank_configs, bank_name: bank_config}))
+
+    def with_detection_info(self, bank_name: str, detection_info: Any) -> 'ConfigState':
+        """Index a bank's detection patterns and drop its loaded config so it is reloaded"""
+        bank_configs = {name: config for name, config in self.bank_configs.items() if name != bank_name}
+        return self._changed(bank_configs=_frozen(bank_configs),
+                             detection_patterns=_frozen({**self.detection_patterns, bank_name: detection_info}))
+
+    def without_bank(self, bank_name: str) -> 'ConfigState':
+        return self._changed(
+            bank_configs=_frozen({name: config for name, config in self.bank_configs.items() if name != bank_name}),
+            detection_patterns=_frozen({name: info for name, info in self.detection_patterns.items()
+                                        if name != bank_name}))
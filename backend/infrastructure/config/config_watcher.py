@@ -0,0 +1,50 @@
+"""
+Background config watcher
+Polls the config directory's .conf files (a stat per file, no reads) and asks the
+config service to reload the ones whose mtime or size changed, so requests never
+pay for a reload
+"""
+import threading
+from typing import Any, List, Optional
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+class ConfigWatcher:
+    """Calls reload_changed_configs() on a config service from a daemon thread"""
+
+    def __init__(self, config_service: Any, interval: float = DEFAULT_POLL_INTERVAL):
+        self.config_service = config_service
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='hisaabflow-config-watcher', daemon=True)
+        self._thread.start()
+        print(f"[WATCH] [ConfigWatcher] Watching {self.config_service.config_dir} every {self.interval}s")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def poll(self) -> List[str]:
+        """Reload changed config files once, returning their names"""
+        try:
+            return self.config_service.reload_changed_configs()
+        except Exception as e:
+            print(f"[ERROR] [ConfigWatcher] Config reload failed: {e}")
+            return []
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.poll()
@@ -0,0 +1,98 @@
+"""
+Compiled description cleaning rules
+Splits and compiles each bank's [description_cleaning] rules once per config load,
+so cleaning a description does not re-split and re-parse every rule for every row
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+CLEANING_FLAGS = re.IGNORECASE | re.DOTALL
+
+
+class CleaningRule:
+    """
+    A single cleaning rule. 'pattern|replacement' rules are regex substitutions
+    (split from the right so patterns may contain pipes); other rules replace the
+    rule name with the rule value as plain text.
+    """
+
+    __slots__ = ('name', 'regex', 'literal', 'replacement', 'error')
+
+    def __init__(self, name: str, rule_pattern: str):
+        self.name = name
+        self.regex = None
+        self.literal = name
+        self.replacement = rule_pattern
+        self.error: Optional[str] = None
+        if '|' not in rule_pattern:
+            return
+
+        pattern, replacement = rule_pattern.rsplit('|', 1)
+        try:
+            regex = re.compile(pattern.strip(), CLEANING_FLAGS)
+            # Parse the replacement template now so bad group references fail here too
+            regex.sub(replacement.strip(), '')
+        except re.error as e:
+            # Invalid regex: fall back to replacing the unstripped pattern text
+            self.error = str(e)
+            self.literal = pattern
+            self.replacement = replacement
+            return
+        self.regex = regex
+        self.literal = None
+        self.replacement = replacement.strip()
+
+    def apply(self, description: str) -> str:
+        if self.regex is not None:
+            return self.regex.sub(self.replacement, description)
+        if self.literal in description:
+            return description.replace(self.literal, self.replacement)
+        return description
+
+
+class DescriptionCleaningRules:
+    """A bank's cleaning rules, compiled in config order"""
+
+    def __init__(self, bank_name: str, rules: Dict[str, str]):
+        self.bank_name = bank_name
+        self.rules = [CleaningRule(rule_name, rule_pattern) for rule_name, rule_pattern in rules.items()]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @property
+    def invalid_rules(self) -> List[CleaningRule]:
+        return [rule for rule in self.rules if rule.error is not None]
+
+    def apply(self, description: str) -> str:
+        """Run every rule over a description, each rule seeing the previous one's output"""
+        for rule in self.rules:
+            description = rule.apply(description)
+        return description
+
+
+class DescriptionCleaningRegistry:
+    """
+    Compiled cleaning rules per bank, keyed on the identity of the rules dict they
+    were built from so a reloaded bank config is recompiled on first use
+    """
+
+    def __init__(self):
+        self._compiled: Dict[str, Tuple[Any, DescriptionCleaningRules]] = {}
+
+    def get(self, bank_name: str, rules: Dict[str, str]) -> DescriptionCleaningRules:
+        cached = self._compiled.get(bank_name)
+        if cached is not None and cached[0] is rules:
+            return cached[1]
+        compiled = DescriptionCleaningRules(bank_name, rules)
+        for rule in compiled.invalid_rules:
+            print(f"[WARNING] [UnifiedConfigService] Invalid regex in rule '{rule.name}' for bank '{bank_name}': {rule.error}")
+        self._compiled[bank_name] = (rules, compiled)
+        return compiled
+
+    def invalidate(self, bank_name: Optional[str] = None) -> None:
+        """Drop compiled rules for one bank, or for every bank"""
+        if bank_name is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(bank_name, None)
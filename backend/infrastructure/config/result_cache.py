@@ -0,0 +1,68 @@
+"""
+Bounded LRU cache for config-derived per-description results
+Statements repeat the same merchant descriptions many times, so description
+cleaning and categorization results are memoized per (bank, config generation,
+description) and dropped whenever configs are reloaded or saved
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+# Returned by get() on a miss, since None is a valid cached result
+MISSING = object()
+
+DEFAULT_MAX_SIZE = 10000
+
+
+class ResultCache:
+    """Least-recently-used result cache with hit/miss counters, safe to share between threads"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # Reordering and evicting are separate steps, so a concurrent put could drop a key mid-get
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Cached result for key, or MISSING; counts the lookup as a hit or a miss"""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept so a whole run can be reported"""
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,185 @@
+"""
+Compiled transfer pattern registry
+Compiles each bank's [outgoing_patterns]/[incoming_patterns] once so transfer
+detection does not rebuild regexes for every transaction and candidate pair
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Characters allowed in a name captured by a {name}/{user_name} placeholder
+NAME_CAPTURE = r'([^,\(\)]+)'
+
+PLACEHOLDER_REGEX = re.compile(r'\{(\w+)\}')
+
+DIRECTIONS = ('outgoing', 'incoming')
+
+
+def build_name_regex(pattern: str) -> Optional[str]:
+    """
+    Build the name-extraction regex source for a transfer pattern, or None if
+    the pattern has no {name}/{user_name} placeholder
+    """
+    if '{name}' not in pattern and '{user_name}' not in pattern:
+        return None
+
+    # Find the placeholder (e.g., {name}, {user_name})
+    placeholder_match = PLACEHOLDER_REGEX.search(pattern)
+    if not placeholder_match:
+        return None
+
+    placeholder_text = placeholder_match.group(0)
+
+    # Escape the original pattern and replace the placeholder with a capture group
+    escaped_pattern = re.escape(pattern)
+    return escaped_pattern.replace(re.escape(placeholder_text), NAME_CAPTURE)
+
+
+class CompiledTransferPattern:
+    """A single transfer pattern with its precompiled name regex"""
+
+    __slots__ = ('pattern', 'direction', 'name_regex', 'literal')
+
+    def __init__(self, pattern: str, direction: str):
+        self.pattern = pattern
+        self.direction = direction
+        source = build_name_regex(pattern)
+        self.name_regex = None
+        if source is not None:
+            try:
+                self.name_regex = re.compile(source, re.IGNORECASE)
+            except re.error:
+                self.name_regex = None
+        # Patterns without a placeholder match as plain case-insensitive substrings
+        self.literal = pattern.lower() if source is None else None
+
+    @property
+    def has_placeholder(self) -> bool:
+        return self.literal is None
+
+    def extract_name(self, description: str, is_valid_name: Callable[[str], bool]) -> Optional[str]:
+        """Extract and validate the name captured by this pattern"""
+        if self.name_regex is None:
+            return None
+        match = self.name_regex.search(description)
+        if match:
+            extracted_name = match.group(1).strip()
+            if extracted_name and is_valid_name(extracted_name):
+                return extracted_name
+        return None
+
+    def matches(self, description: str, description_lower: str,
+                is_valid_name: Callable[[str], bool]) -> Tuple[bool, Optional[str]]:
+        """Return (matched, extracted_name) with the same rules as transfer candidate detection"""
+        if self.literal is not None:
+            return self.literal in description_lower, None
+        name = self.extract_name(description, is_valid_name)
+        return name is not None, name
+
+
+class BankTransferPatterns:
+    """
+    Compiled outgoing/incoming patterns for one bank, plus a combined alternation
+    that finds the first matching pattern (outgoing patterns first, in config order)
+    with a single regex call
+    """
+
+    def __init__(self, outgoing_patterns: List[str], incoming_patterns: List[str],
+                 is_valid_name: Callable[[str], bool]):
+        self.is_valid_name = is_valid_name
+        self.patterns: Dict[str, List[CompiledTransferPattern]] = {
+            'outgoing': [CompiledTransferPattern(p, 'outgoing') for p in outgoing_patterns],
+            'incoming': [CompiledTransferPattern(p, 'incoming') for p in incoming_patterns],
+        }
+        self.ordered: List[CompiledTransferPattern] = self.patterns['outgoing'] + self.patterns['incoming']
+        self.combined = self._build_combined_regex()
+
+    def _build_combined_regex(self) -> Optional['re.Pattern']:
+        """
+        Each alternative is a lookahead anchored at the start of the description, so
+        alternatives are tried in pattern order and each finds its leftmost match,
+        exactly like searching the patterns one by one
+        """
+        alternatives = []
+        for position, compiled in enumerate(self.ordered):
+            if compiled.literal is not None:
+                body = re.escape(compiled.pattern)
+            elif compiled.name_regex is not None:
+                body = compiled.name_regex.pattern
+            else:
+                continue
+            alternatives.append(f'(?=[\\s\\S]*?(?P<p{position}>{body}))')
+        if not alternatives:
+            return None
+        try:
+            return re.compile('|'.join(alternatives), re.IGNORECASE)
+        except re.error:
+            return None
+
+    def match(self, description: str) -> Optional[Tuple[str, str, Optional[str]]]:
+        """
+        Return (direction, pattern, extracted_name) for the first pattern matching the
+        description, or None. extracted_name is None for patterns without a placeholder.
+        """
+        description = str(description)
+        description_lower = description.lower()
+        start = 0
+
+        if self.combined is not None:
+            match = self.combined.match(description)
+            if not match:
+                return None
+            start = int(match.lastgroup[1:])
+
+        # Confirm the candidate with the exact per-pattern rules; a placeholder pattern
+        # whose captured name is rejected falls through to the following patterns
+        for compiled in self.ordered[start:]:
+            matched, name = compiled.matches(description, description_lower, self.is_valid_name)
+            if matched:
+                return compiled.direction, compiled.pattern, name
+        return None
+
+    def extract_name(self, direction: str, description: str) -> Optional[str]:
+        """Return the first valid name extracted by the patterns of one direction"""
+        for compiled in self.patterns.get(direction, []):
+            name = compiled.extract_name(description, self.is_valid_name)
+            if name:
+                return name
+        return None
+
+
+class TransferPatternRegistry:
+    """Per-bank compiled transfer patterns, built once per config load"""
+
+    def __init__(self, is_valid_name: Callable[[str], bool]):
+        self.is_valid_name = is_valid_name
+        self._banks: Dict[str, Tuple[Any, BankTransferPatterns]] = {}
+        self._single_patterns: Dict[str, CompiledTransferPattern] = {}
+
+    def register(self, bank_name: str, outgoing_patterns: List[str],
+                 incoming_patterns: List[str], source: Any = None) -> BankTransferPatterns:
+        compiled = BankTransferPatterns(outgoing_patterns, incoming_patterns, self.is_valid_name)
+        self._banks[bank_name] = (source, compiled)
+        return compiled
+
+    def get(self, bank_name: str, source: Any = None) -> Optional[BankTransferPatterns]:
+        """Compiled patterns for a bank, if they were registered from the given source object"""
+        cached = self._banks.get(bank_name)
+        if cached is None or cached[0] is not source:
+            return None
+        return cached[1]
+
+    def compile_pattern(self, pattern: str) -> CompiledTransferPattern:
+        """Compiled form of a single pattern, cached for ad-hoc name extraction"""
+        compiled = self._single_patterns.get(pattern)
+        if compiled is None:
+            compiled = CompiledTransferPattern(pattern, '')
+            self._single_patterns[pattern] = compiled
+        return compiled
+
+    def invalidate(self, bank_name: Optional[str] = None) -> None:
+        """Drop compiled patterns for one bank, or for all banks"""
+        if bank_name is None:
+            self._banks.clear()
+            self._single_patterns.clear()
+        else:
+            self._banks.pop(bank_name, None)
@@ -5,11 +5,13 @@ Replaces 4 separate ConfigManager implementations with one unified interface
 """
 import os
 import configparser
-from typing import Dict, List, Optional, Any
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
 import csv
-import re
 import sys
 
 # Add project root to path for imports
@@ -19,6 +21,17 @@ if project_root not in sys.path:
 
 # Import AmountFormat after path setup
 from backend.shared.amount_formats import AmountFormat, RegionalFormatRegistry
+from backend.infrastructure.config.transfer_pattern_registry import TransferPatternRegistry, BankTransferPatterns
+from backend.infrastructure.config.categorization_engine import CategorizationEngine
+from backend.infrastructure.config.bank_detection_index import BankDetectionIndex
+from backend.infrastructure.config.description_cleaning_rules import DescriptionCleaningRegistry
+from backend.infrastructure.config.conditional_override_rules import ConditionalOverrideRegistry, ConditionalOverrideRules
+from backend.infrastructure.config.result_cache import ResultCache, MISSING
+from backend.infrastructure.config.config_watcher import ConfigWatcher, DEFAULT_POLL_INTERVAL
+from backend.infrastructure.config.config_snapshot import load_snapshot, write_snapshot, snapshots_enabled
+from backend.infrastructure.config.config_state import ConfigState
+
+APP_CONFIG_FILE = 'app.conf'
 
 
 @dataclass
@@ -112,14 +125,35 @@ class UnifiedConfigService:
     def __init__(self, config_dir: str = None):
         """Initialize with config directory"""
         self.config_dir = self._resolve_config_dir(config_dir)
-        self._app_config: Optional[configparser.ConfigParser] = None
-        self._bank_configs: Dict[str, UnifiedBankConfig] = {}
-        self._detection_patterns: Dict[str, BankDetectionInfo] = {}
+        # Loaded configs live in an immutable state that changes are swapped into;
+        # a request can pin the state it started with (see pinned_snapshot)
+        self._shared_state = ConfigState.build()
+        self._pinned_state: contextvars.ContextVar[Optional[ConfigState]] = contextvars.ContextVar(
+            f'hisaabflow_config_state_{id(self)}', default=None)
+        self._state_lock = threading.RLock()  # Serializes writers only; readers never lock
+        # (detection patterns it was built from, index), rebuilt lazily when patterns change
+        self._detection_index: Optional[Tuple[Mapping[str, BankDetectionInfo], BankDetectionIndex]] = None
         self._configs_loaded: bool = False  # Track if configs have been loaded
+        self._transfer_patterns = TransferPatternRegistry(self._is_valid_name)
+        self._categorization = CategorizationEngine()
+        self._cleaning_rules = DescriptionCleaningRegistry()
+        self._conditional_overrides = ConditionalOverrideRegistry()
+        # Per-description results, keyed by (bank, config generation, description)
+        self._cleaning_cache = ResultCache()
+        self._categorization_cache = ResultCache()
+        # (mtime_ns, size) of each .conf file as of its last load, for incremental reloads
+        self._file_stamps: Dict[str, Tuple[int, int]] = {}
+        # Bank configs parsed for the snapshot, by bank: (stamp of their .conf, config). They are
+        # handed out by get_bank_config, so banks are still only loaded when first used
+        self._snapshot_bank_configs: Dict[str, Tuple[Optional[Tuple[int, int]], UnifiedBankConfig]] = {}
+        self._watcher: Optional[ConfigWatcher] = None
         
-        # Load configurations on initialization
-        self._load_app_config()
-        self._build_detection_index()
+        # Load configurations on initialization, from the snapshot when it is still current
+        self._file_stamps = self._scan_config_files()
+        if not self._restore_snapshot():
+            self._swap_state(lambda state: ConfigState.build(self._read_app_config(), {},
+                                                             self._read_detection_patterns()))
+            self._save_snapshot()
         self._configs_loaded = True
         
         print(f"[BUILD] [UnifiedConfigService] Initialized with {len(self._detection_patterns)} bank detection patterns")
@@ -145,28 +179,154 @@ class UnifiedConfigService:
         project_root = os.path.dirname(backend_dir)  # project root
         return os.path.join(project_root, 'configs')
     
+    # ========== Config State ==========
+    
+    @property
+    def _state(self) -> ConfigState:
+        """The state pinned in the current context, or the latest shared state"""
+        pinned = self._pinned_state.get()
+        return pinned if pinned is not None else self._shared_state
+    
+    # Attribute-style access to the current state; assigning swaps in a new state
+    @property
+    def _app_config(self) -> Optional[configparser.ConfigParser]:
+        return self._state.app_config
+    
+    @_app_config.setter
+    def _app_config(self, app_config: Optional[configparser.ConfigParser]) -> None:
+        self._swap_state(lambda state: state.with_app_config(app_config))
+    
+    @property
+    def _bank_configs(self) -> Mapping[str, UnifiedBankConfig]:
+        return self._state.bank_configs
+    
+    @_bank_configs.setter
+    def _bank_configs(self, bank_configs: Mapping[str, UnifiedBankConfig]) -> None:
+        self._swap_state(lambda state: state.with_bank_configs(bank_configs))
+    
+    @property
+    def _detection_patterns(self) -> Mapping[str, BankDetectionInfo]:
+        return self._state.detection_patterns
+    
+    @_detection_patterns.setter
+    def _detection_patterns(self, detection_patterns: Mapping[str, BankDetectionInfo]) -> None:
+        self._swap_state(lambda state: state.with_detection_patterns(detection_patterns))
+    
+    def _swap_state(self, update) -> ConfigState:
+        """
+        Build a new state from the latest shared one and publish it with one assignment.
+        A context that pinned a state applies the same change to its pinned state, so it
+        follows its own changes without picking up reloads made since it pinned.
+        """
+        pinned = self._pinned_state.get()
+        with self._state_lock:
+            self._shared_state = update(self._shared_state)
+            if pinned is None:
+                return self._shared_state
+            new_state = update(pinned)
+        self._pinned_state.set(new_state)
+        return new_state
+    
+    def snapshot(self) -> ConfigState:
+        """The immutable config state the current context reads from"""
+        return self._state
+    
+    def pin_snapshot(self, state: Optional[ConfigState] = None) -> contextvars.Token:
+        """
+        Make the current context (e.g. one API request, including the threads it hands
+        work to) read a single state until it is unpinned, whatever reloads happen meanwhile
+        """
+        return self._pinned_state.set(state if state is not None else self._shared_state)
+    
+    def unpin_snapshot(self, token: contextvars.Token) -> None:
+        self._pinned_state.reset(token)
+    
+    @contextmanager
+    def pinned_snapshot(self, state: Optional[ConfigState] = None) -> Iterator[ConfigState]:
+        """Read one state for the duration of a with block"""
+        token = self.pin_snapshot(state)
+        try:
+            yield self._state
+        finally:
+            self.unpin_snapshot(token)
+    
+    # ========== Config Snapshot ==========
+    
+    def _restore_snapshot(self) -> bool:
+        """Restore the fully built config state from the on-disk snapshot, if it is current"""
+        if not snapshots_enabled():
+            return False
+        state = load_snapshot(self.config_dir, self._file_stamps)
+        if state is None:
+            return False
+        restored = self._swap_state(lambda _: ConfigState.build(state['app_config'], {},
+                                                                state['detection_patterns']))
+        self._snapshot_bank_configs = {bank_name: (self._file_stamps.get(f"{bank_name}.conf"), bank_config)
+                                       for bank_name, bank_config in state['bank_configs'].items()}
+        self._detection_index = (restored.detection_patterns, state['detection_index'])
+        self._categorization = state['categorization']
+        self._cleaning_rules = state['cleaning_rules']
+        self._conditional_overrides = state['conditional_overrides']
+        print(f"[SNAPSHOT] [UnifiedConfigService] Restored {len(state['bank_configs'])} bank configs from snapshot")
+        return True
+    
+    def _save_snapshot(self) -> None:
+        """
+        Parse every bank, compile all engines and write them to the on-disk snapshot.
+        The parsed banks are kept aside rather than loaded, so outputs do not depend on
+        whether a snapshot was written.
+        """
+        if not snapshots_enabled():
+            return
+        state = self._state
+        bank_configs = {}
+        for bank_name in self.list_banks():
+            bank_config = state.bank_configs.get(bank_name) or self._load_bank_config(
+                os.path.join(self.config_dir, f"{bank_name}.conf"), bank_name)
+            if bank_config:
+                bank_configs[bank_name] = bank_config
+        self._categorization.prepare(bank_configs, state.app_config)
+        for bank_name, bank_config in bank_configs.items():
+            if bank_config.data_cleaning and bank_config.data_cleaning.description_cleaning_rules:
+                self._cleaning_rules.get(bank_name, bank_config.data_cleaning.description_cleaning_rules)
+            if bank_config.conditional_description_overrides:
+                self._conditional_overrides.get(bank_name, bank_config.conditional_description_overrides)
+        self._snapshot_bank_configs = {bank_name: (self._file_stamps.get(f"{bank_name}.conf"), bank_config)
+                                       for bank_name, bank_config in bank_configs.items()}
+        # Transfer patterns stay out: the registry holds a bound validator and registers lazily
+        write_snapshot(self.config_dir, self._file_stamps, {
+            'app_config': state.app_config,
+            'bank_configs': bank_configs,
+            'detection_patterns': dict(state.detection_patterns),
+            'detection_index': self.get_detection_index(),
+            'categorization': self._categorization,
+            'cleaning_rules': self._cleaning_rules,
+            'conditional_overrides': self._conditional_overrides
+        })
+    
     # ========== App Configuration ==========
     
-    def _load_app_config(self) -> None:
-        """Load application configuration"""
-        self._app_config = configparser.ConfigParser(allow_no_value=True)
-        app_config_path = os.path.join(self.config_dir, "app.conf")
+    def _read_app_config(self) -> configparser.ConfigParser:
+        """Read application configuration"""
+        app_config = configparser.ConfigParser(allow_no_value=True)
+        app_config_path = os.path.join(self.config_dir, APP_CONFIG_FILE)
         
         if os.path.exists(app_config_path):
-            self._app_config.read(app_config_path)
+            app_config.read(app_config_path)
         else:
             print("[WARNING] [UnifiedConfigService] app.conf not found, using defaults")
             # Set defaults
-            self._app_config['general'] = {
+            app_config['general'] = {
                 'date_tolerance_hours': '72',
                 'user_name': 'Your Name Here'
             }
-            self._app_config['transfer_detection'] = {
+            app_config['transfer_detection'] = {
                 'confidence_threshold': '0.7'
             }
-            self._app_config['transfer_categorization'] = {
+            app_config['transfer_categorization'] = {
                 'default_pair_category': 'Balance Correction'
             }
+        return app_config
     
     def get_user_name(self) -> str:
         """Get configured user name"""
@@ -186,19 +346,20 @@ class UnifiedConfigService:
     
     # ========== Bank Configuration Loading ==========
     
-    def _build_detection_index(self) -> None:
+    def _read_detection_patterns(self) -> Dict[str, BankDetectionInfo]:
         """Build lightweight detection index by reading only [bank_info] sections from .conf files"""
+        detection_patterns: Dict[str, BankDetectionInfo] = {}
         print(f"[BUILD] [UnifiedConfigService] Building detection index from: {self.config_dir}")
         
         if not os.path.exists(self.config_dir):
             print(f"[ERROR] [UnifiedConfigService] Config directory not found: {self.config_dir}")
-            return
+            return detection_patterns
         
         config_files = [f for f in os.listdir(self.config_dir) if f.endswith('.conf')]
         print(f"[BUILD] [UnifiedConfigService] Found .conf files: {config_files}")
         
         for config_file in config_files:
-            if config_file == 'app.conf':  # Skip app config
+            if config_file == APP_CONFIG_FILE:  # Skip app config
                 continue
                 
             bank_name = config_file.replace('.conf', '')
@@ -209,12 +370,13 @@ class UnifiedConfigService:
                 bank_info_data = self._parse_bank_info_section(config_path)
                 if bank_info_data:
                     detection_info = self._build_detection_info_from_partial(bank_info_data, bank_name)
-                    self._detection_patterns[bank_name] = detection_info
+                    detection_patterns[bank_name] = detection_info
                     print(f"[SUCCESS] [UnifiedConfigService] Indexed detection patterns for bank: {bank_name}")
                 else:
                     print(f"[WARNING] [UnifiedConfigService] No [bank_info] section found in {config_file}")
             except Exception as e:
                 print(f"[ERROR] [UnifiedConfigService] Failed to index {config_file}: {e}")
+        return detection_patterns
     
     def _load_bank_config(self, config_path: str, bank_name: str) -> Optional[UnifiedBankConfig]:
         """Load individual bank configuration"""
@@ -337,7 +499,7 @@ class UnifiedConfigService:
     def _build_detection_info_from_partial(self, bank_info_data: Dict[str, str], bank_name: str) -> BankDetectionInfo:
         """
         Build BankDetectionInfo from partial bank_info data (for fast indexing).
-        Used by _build_detection_index for lightweight startup.
+        Used by _read_detection_patterns for lightweight startup.
         """
         display_name = bank_info_data.get('display_name', bank_name.title())
         
@@ -610,22 +772,31 @@ class UnifiedConfigService:
         Loads configuration from disk on first access and caches it.
         """
         # Check cache first
-        if bank_name in self._bank_configs:
-            return self._bank_configs[bank_name]
+        bank_config = self._state.bank_configs.get(bank_name)
+        if bank_config is not None:
+            return bank_config
         
         # Cache miss - load from disk
         config_path = os.path.join(self.config_dir, f"{bank_name}.conf")
         
         # Verify file exists
-        if not os.path.exists(config_path):
+        try:
+            stat = os.stat(config_path)
+        except FileNotFoundError:
             return None
         
         try:
-            # Load full configuration using existing method
-            bank_config = self._load_bank_config(config_path, bank_name)
+            # Use the config parsed for the snapshot if its file is unchanged since
+            stamp, bank_config = self._snapshot_bank_configs.pop(bank_name, (None, None))
+            if stamp != (stat.st_mtime_ns, stat.st_size):
+                # Load full configuration using existing method
+                bank_config = self._load_bank_config(config_path, bank_name)
             if bank_config:
-                # Cache the loaded configuration
-                self._bank_configs[bank_name] = bank_config
+                # Cache the loaded configuration and compile its transfer patterns
+                self._swap_state(lambda state: state.with_bank_config(bank_name, bank_config))
+                self._transfer_patterns.register(bank_name, bank_config.outgoing_patterns,
+                                                 bank_config.incoming_patterns, bank_config)
+                self._invalidate_result_caches()
                 print(f"[LAZY_LOAD] [UnifiedConfigService] Loaded and cached config for bank: {bank_name}")
                 return bank_config
             else:
@@ -639,69 +810,34 @@ class UnifiedConfigService:
         """Get all bank detection patterns"""
         return self._detection_patterns.copy()
     
+    def get_detection_index(self) -> BankDetectionIndex:
+        """Compiled detection patterns of every indexed bank"""
+        detection_patterns = self._state.detection_patterns
+        cached = self._detection_index
+        if cached is None or cached[0] is not detection_patterns:
+            cached = self._detection_index = (detection_patterns, BankDetectionIndex(detection_patterns))
+        return cached[1]
+    
     def detect_bank(self, filename: str, content_sample: str = None) -> Optional[str]:
         """
         Detect bank from filename and optionally content
         Returns bank name or None if not detected
         """
-        import re
-        
-        filename_lower = filename.lower()
-        
-        # Collect matches with confidence scores
-        matches = []
-        
-        for bank_name, detection_info in self._detection_patterns.items():
-            confidence = 0.0
-            
-            # Check filename patterns
-            for pattern in detection_info.filename_patterns:
-                pattern_lower = pattern.lower()
-                
-                # Check if it's a regex pattern (starts with ^)
-                if pattern.startswith('^') or pattern.startswith('.*'):
-                    try:
-                        if re.match(pattern, filename) or re.match(pattern, filename_lower):
-                            confidence += 100 * detection_info.confidence_weight  # Higher score for regex match
-                    except re.error:
-                        # If regex is invalid, fall back to substring match
-                        if pattern_lower in filename_lower:
-                            confidence += len(pattern) * detection_info.confidence_weight
-                else:
-                    # Simple substring match
-                    if pattern_lower in filename_lower:
-                        confidence += len(pattern) * detection_info.confidence_weight
-            
-            # Check content signatures if content provided
-            if content_sample and detection_info.content_signatures:
-                content_lower = content_sample.lower()
-                for signature in detection_info.content_signatures:
-                    if signature.lower() in content_lower:
-                        confidence += 50 * detection_info.confidence_weight
-            
-            if confidence > 0:
-                matches.append((bank_name, confidence))
-        
-        # Return highest confidence match
-        if matches:
-            matches.sort(key=lambda x: x[1], reverse=True)
-            return matches[0][0]
-        
-        return None
+        return self.get_detection_index().detect(filename, content_sample)
     
     def get_csv_config(self, bank_name: str) -> Optional[CSVConfig]:
-        """Get CSV configuration for bank"""
-        bank_config = self._bank_configs.get(bank_name)
+        """Get CSV configuration for bank, loading its config if needed"""
+        bank_config = self.get_bank_config(bank_name)
         return bank_config.csv_config if bank_config else None
     
     def get_column_mapping(self, bank_name: str) -> Dict[str, str]:
-        """Get column mapping for bank"""
-        bank_config = self._bank_configs.get(bank_name)
+        """Get column mapping for bank, loading its config if needed"""
+        bank_config = self.get_bank_config(bank_name)
         return bank_config.column_mapping if bank_config else {}
     
     def get_account_mapping(self, bank_name: str) -> Dict[str, str]:
-        """Get account mapping for bank"""
-        bank_config = self._bank_configs.get(bank_name)
+        """Get account mapping for bank, loading its config if needed"""
+        bank_config = self.get_bank_config(bank_name)
         return bank_config.account_mapping if bank_config else {}
     
     def get_transfer_patterns(self, bank_name: str, direction: str) -> List[str]:
@@ -717,140 +853,100 @@ class UnifiedConfigService:
         else:
             return []
     
+    def get_compiled_transfer_patterns(self, bank_name: str) -> Optional[BankTransferPatterns]:
+        """Get the precompiled transfer patterns for a loaded bank"""
+        bank_config = self._bank_configs.get(bank_name)
+        if not bank_config:
+            return None
+        compiled = self._transfer_patterns.get(bank_name, bank_config)
+        if compiled is None:
+            compiled = self._transfer_patterns.register(bank_name, bank_config.outgoing_patterns,
+                                                        bank_config.incoming_patterns, bank_config)
+        return compiled
+    
+    def match_transfer_pattern(self, bank_name: str, description: str) -> Optional[tuple]:
+        """
+        Find the first transfer pattern (outgoing before incoming) matching a description.
+        Returns (direction, pattern, extracted_name) or None; extracted_name is None for
+        patterns without a {name} placeholder.
+        """
+        compiled = self.get_compiled_transfer_patterns(bank_name)
+        return compiled.match(description) if compiled else None
+    
+    def extract_transfer_name(self, bank_name: str, direction: str, description: str) -> Optional[str]:
+        """Extract the first valid name from a description using a bank's patterns for one direction"""
+        compiled = self.get_compiled_transfer_patterns(bank_name)
+        return compiled.extract_name(direction, description) if compiled else None
+    
     def categorize_merchant(self, bank_name: str, merchant: str) -> Optional[str]:
         """Categorize merchant using two-tier precedence: bank-specific first, then app-wide"""
         result = self.categorize_merchant_with_debug(bank_name, merchant)
         return result['category'] if result else None
     
     def categorize_merchant_with_debug(self, bank_name: str, merchant: str) -> Optional[dict]:
-        """Categorize merchant and return debug info including matched pattern"""
-        merchant_lower = merchant.lower()
-        
-        # First tier: Bank-specific categorization rules (highest priority)
-        bank_config = self._bank_configs.get(bank_name)
-        if bank_config:
-            # Check bank-specific categorization rules (now loaded from sections)
-            # Sort patterns by length (longest first) for specificity-based matching
-            sorted_patterns = sorted(bank_config.categorization_rules.items(), key=lambda x: len(x[0]), reverse=True)
-            for pattern, category in sorted_patterns:
-                if self._pattern_matches(pattern, merchant_lower):
-                    return {
-                        'category': category,
-                        'pattern': pattern,
-                        'source': f'bank-specific ({bank_name})',
-                        'rule_type': 'categorization_rules'
-                    }
-            
-            # Check bank-specific default category rules
-            # Sort patterns by length (longest first) for specificity-based matching
-            sorted_default_patterns = sorted(bank_config.default_category_rules.items(), key=lambda x: len(x[0]), reverse=True)
-            for pattern, category in sorted_default_patterns:
-                if self._pattern_matches(pattern, merchant_lower):
-                    return {
-                        'category': category,
-                        'pattern': pattern,
-                        'source': f'bank-specific ({bank_name})',
-                        'rule_type': 'default_category_rules'
-                    }
-        
-        # Second tier: App-wide categorization rules from sections (fallback)
-        # Collect ALL patterns from ALL sections, then prioritize by length globally
-        if self._app_config:
-            reserved_sections = ['general', 'transfer_detection', 'transfer_categorization', 'default_category_rules']
-            all_patterns = []
-            
-            # Collect all patterns with their metadata
-            for section_name in self._app_config.sections():
-                if section_name not in reserved_sections:
-                    category = section_name
-                    for pattern in self._app_config[section_name]:
-                        all_patterns.append({
-                            'pattern': pattern,
-                            'category': category,
-                            'section': section_name,
-                            'length': len(pattern)
-                        })
-            
-            # Sort all patterns by length (longest first) for global specificity-based matching
-            sorted_all_patterns = sorted(all_patterns, key=lambda x: x['length'], reverse=True)
-            
-            # Try patterns in order of specificity (longest first)
-            for pattern_info in sorted_all_patterns:
-                if self._pattern_matches(pattern_info['pattern'], merchant_lower):
-                    return {
-                        'category': pattern_info['category'],
-                        'pattern': pattern_info['pattern'],
-                        'source': 'app-wide (app.conf)',
-                        'rule_type': f'section [{pattern_info["section"]}]'
-                    }
-        
-        # Third tier: App-wide default category rules (final fallback)
-        if self._app_config and 'default_category_rules' in self._app_config:
-            # Sort patterns by length (longest first) for specificity-based matching
-            sorted_default_rules = sorted(self._app_config['default_category_rules'].items(), key=lambda x: len(x[0]), reverse=True)
-            for pattern, category in sorted_default_rules:
-                if self._pattern_matches(pattern, merchant_lower):
-                    return {
-                        'category': category,
-                        'pattern': pattern,
-                        'source': 'app-wide (app.conf)',
-                        'rule_type': 'default_category_rules'
-                    }
-        
-        return None
-    
-    def _pattern_matches(self, pattern: str, merchant_lower: str) -> bool:
-        """Check if pattern matches merchant name with regex support"""
-        try:
-            # If pattern contains regex characters, use regex matching
-            if any(char in pattern for char in ['.*', '|', '\\', '^', '$', '[', ']', '{', '}', '(', ')', '+', '?']):
-                return bool(re.search(pattern.lower(), merchant_lower))
-            else:
-                # Use word boundary matching for simple patterns
-                return bool(re.search(r'\b' + re.escape(pattern.lower()) + r'\b', merchant_lower))
-        except re.error:
-            # If regex is invalid, fall back to simple string matching
-            return pattern.lower() in merchant_lower
+        """
+        Categorize merchant and return debug info including matched pattern.
+        Precedence: bank categorization rules, bank default rules, app.conf sections,
+        app.conf default rules; within a tier the longest pattern wins.
+        """
+        # Matching is case-insensitive, so differently cased repeats share an entry
+        state = self._state
+        key = (bank_name, state.generation, merchant.lower())
+        result = self._categorization_cache.get(key)
+        if result is MISSING:
+            result = self._categorization.categorize(bank_name, state.bank_configs.get(bank_name),
+                                                     state.app_config, merchant)
+            self._categorization_cache.put(key, result)
+        # Callers may annotate the returned dict, so never hand out the cached one
+        return dict(result) if result else result
     
     def apply_description_cleaning(self, bank_name: str, description: str) -> str:
         """Apply bank-specific description cleaning rules with multi-line support"""
-        bank_config = self._bank_configs.get(bank_name)
+        state = self._state
+        key = (bank_name, state.generation, description)
+        cleaned_description = self._cleaning_cache.get(key)
+        if cleaned_description is MISSING:
+            cleaned_description = self._clean_description(state.bank_configs.get(bank_name), bank_name, description)
+            self._cleaning_cache.put(key, cleaned_description)
+        return cleaned_description
+    
+    def clean_descriptions(self, bank_name: str, descriptions: List[str]) -> List[str]:
+        """Apply a bank's description cleaning to many descriptions, once per unique description"""
+        cleaned: Dict[str, str] = {}
+        for description in descriptions:
+            if description not in cleaned:
+                cleaned[description] = self.apply_description_cleaning(bank_name, description)
+        return [cleaned[description] for description in descriptions]
+    
+    def _clean_description(self, bank_config: Optional[UnifiedBankConfig], bank_name: str, description: str) -> str:
+        """Run a bank's compiled description cleaning rules over one description"""
         if not bank_config or not bank_config.data_cleaning or not bank_config.data_cleaning.description_cleaning_rules:
             return description
-
-        cleaned_description = description
-        
-        # Apply each cleaning rule
-        for rule_name, rule_pattern in bank_config.data_cleaning.description_cleaning_rules.items():
-            try:
-                # Check if it's a regex replacement pattern (contains |)
-                if '|' in rule_pattern:
-                    # Format: pattern|replacement (split from right to handle pipes in pattern)
-                    pattern, replacement = rule_pattern.rsplit('|', 1)
-                    pattern = pattern.strip()
-                    replacement = replacement.strip()
-                    
-                    # Use re.DOTALL to match across newlines
-                    new_description = re.sub(pattern, replacement, cleaned_description, flags=re.IGNORECASE | re.DOTALL)
-                    
-                    if new_description != cleaned_description:
-                        print(f"      [CLEANING] Applied rule '{rule_name}': '{cleaned_description}' -> '{new_description}'")
-                        cleaned_description = new_description
-                else:
-                    # Simple replacement (less common now)
-                    if rule_name in cleaned_description:
-                        new_description = cleaned_description.replace(rule_name, rule_pattern)
-                        print(f"      [CLEANING] Applied simple replacement '{rule_name}': '{cleaned_description}' -> '{new_description}'")
-                        cleaned_description = new_description
-
-            except re.error as e:
-                print(f"[WARNING] [UnifiedConfigService] Invalid regex in rule '{rule_name}' for bank '{bank_name}': {e}")
-                # Fallback to simple replacement if regex is invalid
-                if '|' in rule_pattern:
-                    pattern, replacement = rule_pattern.rsplit('|', 1)
-                    cleaned_description = cleaned_description.replace(pattern, replacement)
-        
-        return cleaned_description
+        return self._cleaning_rules.get(bank_name, bank_config.data_cleaning.description_cleaning_rules).apply(description)
+    
+    def get_conditional_overrides(self, bank_name: str) -> Optional[ConditionalOverrideRules]:
+        """Compiled conditional description overrides of a loaded bank, None if it has none"""
+        bank_config = self._bank_configs.get(bank_name)
+        if not bank_config or not bank_config.conditional_description_overrides:
+            return None
+        return self._conditional_overrides.get(bank_name, bank_config.conditional_description_overrides)
+    
+    def get_result_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters of the description cleaning and categorization caches"""
+        return {
+            'description_cleaning': self._cleaning_cache.stats(),
+            'categorization': self._categorization_cache.stats()
+        }
+    
+    def reset_result_cache_stats(self) -> None:
+        """Zero the result cache counters, e.g. at the start of a processing run"""
+        self._cleaning_cache.reset_stats()
+        self._categorization_cache.reset_stats()
+    
+    def _invalidate_result_caches(self) -> None:
+        """Drop results computed under older config generations"""
+        self._cleaning_cache.clear()
+        self._categorization_cache.clear()
     
     def get_data_cleaning_config(self, bank_name: str) -> Optional[DataCleaningConfig]:
         """Get data cleaning configuration for bank"""
@@ -861,36 +957,118 @@ class UnifiedConfigService:
         """Check if a bank configuration exists"""
         return bank_name in self._detection_patterns
     
-    def reload_all_configs(self, force: bool = False) -> bool:
+    @property
+    def config_generation(self) -> int:
+        """Counter bumped whenever loaded configs change; downstream caches key on it"""
+        return self._state.generation
+    
+    def reload_all_configs(self, force: bool = False, full: bool = False) -> bool:
         """
-        Hot-reload all bank configurations and rebuild detection index
+        Hot-reload bank configurations
         
         Args:
             force: If True, force reload even if configs are already loaded
+            full: If True, drop every cached config and rebuild the whole detection
+                index; otherwise only .conf files whose mtime or size changed are reloaded
         """
         # Skip reload if configs are already loaded and not forced
         if self._configs_loaded and not force:
             print("[SKIP] [UnifiedConfigService] Configs already loaded, skipping reload (use force=True to override)")
             return True
+        
+        if not full:
+            try:
+                changed = self.reload_changed_configs()
+                print(f"[SUCCESS] [UnifiedConfigService] Reloaded {len(changed)} changed config files: {changed}")
+                return True
+            except Exception as e:
+                print(f"[ERROR] [UnifiedConfigService] Failed to reload changed configs: {e}")
+                return False
             
         try:
             print("[INFO] [UnifiedConfigService] Reloading all configurations...")
             
-            # Clear both caches
-            self._bank_configs.clear()
-            self._detection_patterns.clear()
+            # Build the new state completely before swapping it in, so readers never see it half-built
+            file_stamps = self._scan_config_files()
+            new_state = self._swap_state(lambda _: ConfigState.build(self._read_app_config(), {},
+                                                                     self._read_detection_patterns()))
+            self._file_stamps = file_stamps
             
-            # Rebuild detection index
-            self._build_detection_index()
+            # Clear all caches
+            self._transfer_patterns.invalidate()
+            self._categorization.invalidate()
+            self._cleaning_rules.invalidate()
+            self._conditional_overrides.invalidate()
+            self._invalidate_result_caches()
             self._configs_loaded = True
             
-            print(f"[SUCCESS] [UnifiedConfigService] Reloaded {len(self._detection_patterns)} bank detection patterns")
+            print(f"[SUCCESS] [UnifiedConfigService] Reloaded {len(new_state.detection_patterns)} bank detection patterns")
             return True
             
         except Exception as e:
             print(f"[ERROR] [UnifiedConfigService] Failed to reload configs: {e}")
             return False
     
+    def reload_changed_configs(self) -> List[str]:
+        """
+        Reload only the .conf files added, removed or modified (by mtime or size) since
+        they were last read. Returns the changed file names; if any changed, the config
+        generation is bumped.
+        """
+        current_stamps = self._scan_config_files()
+        changed = sorted(file_name for file_name in set(current_stamps) | set(self._file_stamps)
+                         if current_stamps.get(file_name) != self._file_stamps.get(file_name))
+        if not changed:
+            return []
+        
+        for file_name in changed:
+            if file_name == APP_CONFIG_FILE:
+                # Categorization recompiles its app.conf tiers when the parser object changes
+                app_config = self._read_app_config()
+                self._swap_state(lambda state: state.with_app_config(app_config))
+                print(f"[REFRESH] [UnifiedConfigService] Reloaded {APP_CONFIG_FILE}")
+            elif not self.refresh_bank_detection_index(file_name[:-len('.conf')]):
+                # Without a [bank_info] section a full rebuild would not index the bank either
+                self._forget_bank(file_name[:-len('.conf')])
+        
+        self._file_stamps = current_stamps
+        self._invalidate_result_caches()
+        return changed
+    
+    def _scan_config_files(self) -> Dict[str, Tuple[int, int]]:
+        """(mtime_ns, size) of every .conf file in the config directory"""
+        stamps = {}
+        try:
+            with os.scandir(self.config_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.conf') and entry.is_file():
+                        stat = entry.stat()
+                        stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return stamps
+    
+    def _forget_bank(self, bank_name: str) -> None:
+        """Drop a bank's detection patterns, loaded config and compiled rules"""
+        self._swap_state(lambda state: state.without_bank(bank_name))
+        self._transfer_patterns.invalidate(bank_name)
+        self._categorization.invalidate(bank_name)
+        self._cleaning_rules.invalidate(bank_name)
+        self._conditional_overrides.invalidate(bank_name)
+        self._invalidate_result_caches()
+    
+    def start_config_watcher(self, interval: float = DEFAULT_POLL_INTERVAL) -> ConfigWatcher:
+        """Keep configs fresh in the background by polling for changed .conf files"""
+        if self._watcher is None:
+            self._watcher = ConfigWatcher(self, interval)
+        self._watcher.start()
+        return self._watcher
+    
+    def stop_config_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+    
     def add_bank_config_dynamically(self, bank_name: str, config_data: Dict[str, Any]) -> bool:
         """
         Dynamically add a new bank configuration for unknown bank panel support.
@@ -906,7 +1084,7 @@ class UnifiedConfigService:
             if bank_info_data:
                 # Create detection info and add to index
                 detection_info = self._build_detection_info_from_partial(bank_info_data, bank_name)
-                self._detection_patterns[bank_name] = detection_info
+                self._swap_state(lambda state: state.with_detection_info(bank_name, detection_info))
                 print(f"[DYNAMIC_ADD] [UnifiedConfigService] Added detection patterns for new bank: {bank_name}")
             
             # Note: Full config will be lazy loaded when first requested via get_bank_config()
@@ -927,20 +1105,25 @@ class UnifiedConfigService:
             if not os.path.exists(config_path):
                 # Remove from index if file no longer exists
                 if bank_name in self._detection_patterns:
-                    del self._detection_patterns[bank_name]
                     print(f"[REFRESH] [UnifiedConfigService] Removed detection patterns for deleted bank: {bank_name}")
+                self._forget_bank(bank_name)
                 return True
             
             # Parse bank_info and update detection index
             bank_info_data = self._parse_bank_info_section(config_path)
             if bank_info_data:
                 detection_info = self._build_detection_info_from_partial(bank_info_data, bank_name)
-                self._detection_patterns[bank_name] = detection_info
+                had_config = bank_name in self._bank_configs
+                # Swapping in new detection info also drops the cached config to force a reload
+                self._swap_state(lambda state: state.with_detection_info(bank_name, detection_info))
                 print(f"[REFRESH] [UnifiedConfigService] Refreshed detection patterns for bank: {bank_name}")
                 
-                # Clear cached config to force reload
-                if bank_name in self._bank_configs:
-                    del self._bank_configs[bank_name]
+                self._transfer_patterns.invalidate(bank_name)
+                self._categorization.invalidate(bank_name)
+                self._cleaning_rules.invalidate(bank_name)
+                self._conditional_overrides.invalidate(bank_name)
+                self._invalidate_result_caches()
+                if had_config:
                     print(f"[REFRESH] [UnifiedConfigService] Cleared cached config for bank: {bank_name}")
                 
                 return True
@@ -973,6 +1156,7 @@ class UnifiedConfigService:
             # Write to file
             with open(config_path, 'w') as config_file:
                 config.write(config_file)
+            self._invalidate_result_caches()
             
             print(f"[SUCCESS] [UnifiedConfigService] Saved configuration for {bank_name}")
             return True
@@ -989,33 +1173,7 @@ class UnifiedConfigService:
     
     def extract_name_from_transfer_pattern(self, pattern: str, description: str) -> Optional[str]:
         """Extract name from transfer description using pattern with {name} placeholder"""
-        import re
-        if '{name}' not in pattern and '{user_name}' not in pattern:
-            return None
-
-        # Find the placeholder (e.g., {name}, {user_name})
-        placeholder_match = re.search(r'\{(\w+)\}', pattern)
-        if not placeholder_match:
-            return None
-
-        placeholder_text = placeholder_match.group(0)  # e.g., "{name}" or "{user_name}"
-        
-        # Create a regex pattern by escaping the original pattern and replacing placeholder
-        escaped_pattern = re.escape(pattern)
-        name_regex = escaped_pattern.replace(re.escape(placeholder_text), r'([^,\(\)]+)')
-        
-        try:
-            match = re.search(name_regex, description, re.IGNORECASE)
-            if match:
-                extracted_name = match.group(1).strip()
-                
-                # Validate extracted name quality
-                if extracted_name and self._is_valid_name(extracted_name):
-                    return extracted_name
-        except re.error:
-            pass
-        
-        return None
+        return self._transfer_patterns.compile_pattern(pattern).extract_name(description, self._is_valid_name)
     
     def _is_valid_name(self, name: str) -> bool:
         """Validate if extracted name is meaningful enough for transfer matching"""
@@ -1060,6 +1218,10 @@ def get_unified_config_service(config_dir: str = None) -> UnifiedConfigService:
     
     if _unified_config_service is None:
         _unified_config_service = UnifiedConfigService(config_dir)
+        # HISAABFLOW_CONFIG_WATCH=<seconds> polls for config file changes in the background
+        watch_interval = os.environ.get('HISAABFLOW_CONFIG_WATCH')
+        if watch_interval:
+            _unified_config_service.start_config_watcher(float(watch_interval))
     
     return _unified_config_service
 
@@ -1067,4 +1229,6 @@ def get_unified_config_service(config_dir: str = None) -> UnifiedConfigService:
 def reset_unified_config_service():
     """Reset singleton instance (for testing)"""
     global _unified_config_service
+    if _unified_config_service is not None:
+        _unified_config_service.stop_config_watcher()
     _unified_config_service = None
\ No newline at end of file
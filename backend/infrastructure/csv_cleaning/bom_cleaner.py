@@ -8,6 +8,8 @@ This module provides fallback cleanup for cases where proper encoding wasn't use
 
 from typing import List, Dict
 
+from backend.shared.models.transaction_frame import TransactionFrame
+
 class BOMCleaner:
     """
     Handles BOM character cleanup in CSV data
@@ -33,31 +35,37 @@ class BOMCleaner:
         if not data:
             return []
         
-        # Check first row for BOM characters
-        if not self.has_bom_characters(data):
-            print(f"      [SUCCESS] No BOM characters detected, skipping BOM cleanup")
-            return data
-        
-        print(f"       BOM characters detected, cleaning column names...")
-        print(f"       RECOMMENDATION: Use utf-8-sig encoding when reading CSV files")
+        return self.clean_bom_from_frame(TransactionFrame.from_records(data)).to_records()
+    
+    def clean_bom_from_frame(self, frame: TransactionFrame) -> TransactionFrame:
+        """
+        Remove BOM characters from column names of a frame, in place
         
-        # Strip BOM from all column names
-        cleaned_data = []
-        for row in data:
-            cleaned_row = {}
-            for col, value in row.items():
-                # Remove BOM character (\ufeff) from column name
-                clean_col = str(col).replace('\ufeff', '').strip()
-                cleaned_row[clean_col] = value
-                
-                # Debug first few BOM cleanups
-                if len(cleaned_data) < 3 and clean_col != str(col):
-                    print(f"       BOM cleanup: '{col}' → '{clean_col}'")
+        Args:
+            frame: Transaction frame with potentially BOM-affected column names
             
-            cleaned_data.append(cleaned_row)
+        Returns:
+            TransactionFrame: The same frame with clean column names
+        """
+        if not len(frame):
+            return frame
         
-        print(f"      [SUCCESS] BOM cleanup complete: {len(cleaned_data)} rows processed")
-        return cleaned_data
+        if not self.has_bom_characters(frame):
+            print(f"      [SUCCESS] No BOM characters detected, skipping BOM cleanup")
+            return frame
+
+        print(f"       BOM characters detected, cleaning column names...")
+        print(f"       RECOMMENDATION: Use utf-8-sig encoding when reading CSV files")
+
+        # Renaming a column renames it in every row at once
+        renames = {col: str(col).replace('\ufeff', '').strip() for col in frame.columns}
+        for col, clean_col in renames.items():
+            if clean_col != str(col):
+                print(f"       BOM cleanup: '{col}' → '{clean_col}'")
+        frame.rename_columns(renames)
+
+        print(f"      [SUCCESS] BOM cleanup complete: {len(frame)} rows processed")
+        return frame
     
     def has_bom_characters(self, data: List[Dict]) -> bool:
         """
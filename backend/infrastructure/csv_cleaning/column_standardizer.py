@@ -5,6 +5,8 @@ Handles column name standardization and mapping for consistent data structure
 
 from typing import List, Dict, Tuple
 
+from backend.shared.models.transaction_frame import TransactionFrame
+
 class ColumnStandardizer:
     """
     Standardizes column names for consistent data processing
@@ -36,21 +38,35 @@ class ColumnStandardizer:
         Returns:
             Tuple: (standardized_data, column_name_mapping)
         """
+        frame, column_mapping = self.standardize_frame(TransactionFrame.from_records(data), template_config)
+        return frame.to_records(), column_mapping
+    
+    def standardize_frame(self, frame: TransactionFrame,
+                          template_config: Dict = None) -> Tuple[TransactionFrame, Dict[str, str]]:
+        """
+        Standardize column names of a frame, in place
+        
+        Args:
+            frame: Transaction frame with original column names
+            template_config: Template configuration with column mapping
+            
+        Returns:
+            Tuple: (standardized_frame, column_name_mapping)
+        """
         print(f"    Step 2: Standardizing column names")
         
-        if not data:
-            return [], {}
+        if not len(frame):
+            return frame, {}
         
         # Create column mapping for standardization
-        column_mapping = self._create_column_mapping(data, template_config)
-        
+        column_mapping = self._create_column_mapping(frame, template_config)
         print(f"       Column name mapping: {column_mapping}")
         
-        # Apply column renaming
-        standardized_data = self._apply_column_mapping(data, column_mapping)
+        # Rename each column once instead of rebuilding every row
+        frame.rename_columns(column_mapping)
         
-        print(f"      [SUCCESS] Standardized columns: {list(standardized_data[0].keys()) if standardized_data else []}")
-        return standardized_data, column_mapping
+        print(f"      [SUCCESS] Standardized columns: {list(frame[0].keys())}")
+        return frame, column_mapping
     
     def _create_column_mapping(self, data: List[Dict], template_config: Dict = None) -> Dict[str, str]:
         """
@@ -90,27 +106,6 @@ class ColumnStandardizer:
         
         return column_mapping
     
-    def _apply_column_mapping(self, data: List[Dict], column_mapping: Dict[str, str]) -> List[Dict]:
-        """
-        Apply column name mapping to data
-        
-        Args:
-            data: Original data with old column names
-            column_mapping: Mapping from old to new column names
-            
-        Returns:
-            List[Dict]: Data with standardized column names
-        """
-        standardized_data = []
-        for row in data:
-            new_row = {}
-            for old_col, value in row.items():
-                new_col = column_mapping.get(old_col, old_col)
-                new_row[new_col] = value
-            standardized_data.append(new_row)
-        
-        return standardized_data
-    
     def create_cashew_mapping(self, template_config: Dict = None, column_name_mapping: Dict = None) -> Dict[str, str]:
         """
         Create mapping for Cashew transformation format
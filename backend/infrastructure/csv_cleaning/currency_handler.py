@@ -5,6 +5,8 @@ Manages currency column detection and addition for bank data
 
 from typing import List, Dict
 
+from backend.shared.models.transaction_frame import TransactionFrame
+
 class CurrencyHandler:
     """
     Handles currency column management for bank statements
@@ -43,10 +45,23 @@ class CurrencyHandler:
         Returns:
             List[Dict]: Data with currency column added if needed
         """
+        return self.add_currency_frame(TransactionFrame.from_records(data), template_config).to_records()
+    
+    def add_currency_frame(self, frame: TransactionFrame, template_config: Dict = None) -> TransactionFrame:
+        """
+        Add currency column to a frame if missing, in place
+        
+        Args:
+            frame: Transaction frame potentially missing currency column
+            template_config: Template configuration with bank information
+            
+        Returns:
+            TransactionFrame: The same frame with currency column added if needed
+        """
         print(f"    Step 3: Adding currency column if needed")
         
-        if not data:
-            return []
+        if not len(frame):
+            return frame
         
         # Check if currency addition is disabled in config
         # Check multiple possible config structures
@@ -62,26 +77,22 @@ class CurrencyHandler:
             
             if not enable_currency_addition:
                 print(f"      [SUCCESS] Currency addition disabled in config, skipping...")
-                return data
+                return frame
         
         # Check if currency column already exists
-        if self._has_currency_column(data):
+        if self._has_currency_column(frame):
             print(f"      [SUCCESS] Currency column already exists, skipping...")
-            return data
+            return frame
         
         # Determine default currency
         default_currency = self._determine_default_currency(template_config)
         print(f"       Adding currency column with default: {default_currency}")
         
-        # Add currency column to all rows
-        currency_added_data = []
-        for row in data:
-            new_row = row.copy()
-            new_row['Currency'] = default_currency  # Use Title case for consistency
-            currency_added_data.append(new_row)
+        # One code shared by every row
+        frame.fill('Currency', default_currency)  # Use Title case for consistency
         
         print(f"      [SUCCESS] Currency column added: {default_currency}")
-        return currency_added_data
+        return frame
     
     def _has_currency_column(self, data: List[Dict]) -> bool:
         """
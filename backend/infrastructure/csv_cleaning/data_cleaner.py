@@ -4,8 +4,9 @@ Main orchestration class for data cleaning pipeline
 Coordinates all cleaning modules for comprehensive data processing
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from backend.shared.amount_formats import AmountFormat
+from backend.shared.models.transaction_frame import TransactionFrame
 try:
     # Package imports (when used as module)
     from .bom_cleaner import BOMCleaner
@@ -89,33 +90,31 @@ class DataCleaner:
                     }
             
             # Step 1: Focus on target data only (remove unwanted rows/columns)
-            focused_data = self._focus_target_data(
+            # Steps 1-7 work column by column on one frame; rows become dicts again at the end
+            frame = self._focus_target_data(
                 parsed_data['data'], 
                 parsed_data.get('headers', []),
                 template_config
             )
             
             # Step 2: Clean BOM characters from column names (IMPROVED - should use proper encoding)
-            bom_cleaned_data = self.bom_cleaner.clean_bom_from_data(focused_data)
+            self.bom_cleaner.clean_bom_from_frame(frame)
             
             # Step 3: Clean and standardize column names
-            standardized_data, column_name_mapping = self.column_standardizer.standardize_columns(
-                bom_cleaned_data, template_config
-            )
+            frame, column_name_mapping = self.column_standardizer.standardize_frame(frame, template_config)
             
             # Step 4: Add currency column if missing
-            currency_added_data = self.currency_handler.add_currency_column(
-                standardized_data, template_config
-            )
+            self.currency_handler.add_currency_frame(frame, template_config)
             
             # Step 5: Clean numeric columns (amounts, balances, etc.)
-            numeric_cleaned_data = self.numeric_cleaner.clean_numeric_columns(currency_added_data)
+            self.numeric_cleaner.clean_numeric_frame(frame)
             
             # Step 6: Clean date columns
-            date_cleaned_data = self.date_cleaner.clean_date_columns(numeric_cleaned_data)
+            self.date_cleaner.clean_date_frame(frame)
             
             # Step 7: Remove empty/invalid rows
-            valid_data = self.data_validator.remove_invalid_rows(date_cleaned_data)
+            self.data_validator.remove_invalid_frame_rows(frame)
+            valid_data = frame.to_records()
             
             # Step 8: Create updated column mapping for transformation
             updated_column_mapping = self.column_standardizer.create_cashew_mapping(
@@ -154,14 +153,14 @@ class DataCleaner:
                 'error': f'Data cleaning failed: {str(e)}'
             }
     
-    def _focus_target_data(self, data: List[Dict], headers: List[str], template_config: Dict = None) -> List[Dict]:
+    def _focus_target_data(self, data: List[Dict], headers: List[str], template_config: Dict = None) -> TransactionFrame:
         """
         Step 1: Focus on target data only - remove unwanted columns and rows
         """
         print(f"   Step 1: Focusing target data")
         
         if not data:
-            return []
+            return TransactionFrame()
         
         # Get column mapping from template if available
         column_mapping = {}
@@ -248,8 +247,17 @@ class DataCleaner:
         else:
             print(f"       [DEBUG] No data_cleaning config found in template_config")
         
-        # Filter data to only include target columns
-        focused_data = []
+        # Keep the file's column order, so results do not depend on set iteration order
+        focus_columns = [col for col in headers if col in target_columns]
+        focus_columns += sorted(target_columns.difference(focus_columns))
+        
+        # Filter data to only include target columns, encoding rows as they are produced
+        frame = TransactionFrame.from_records(self._focused_rows(data, focus_columns, skip_patterns))
+        
+        print(f"      [SUCCESS] Focused data: {len(frame)} rows, {len(target_columns)} columns")
+        return frame
+    
+    def _focused_rows(self, data: List[Dict], target_columns: List[str], skip_patterns: List[str]) -> Iterator[Dict]:
         for row in data:
             # Check if row should be skipped based on content patterns
             should_skip = False
@@ -271,10 +279,7 @@ class DataCleaner:
             
             # Only include rows that have at least some meaningful data
             if any(str(value).strip() for value in focused_row.values()):
-                focused_data.append(focused_row)
-        
-        print(f"      [SUCCESS] Focused data: {len(focused_data)} rows, {len(target_columns)} columns")
-        return focused_data
+                yield focused_row
     
     def _count_numeric_columns(self, data: List[Dict]) -> int:
         """Count numeric columns in cleaned data"""
@@ -3,7 +3,23 @@ Data Validator
 Handles validation and removal of invalid/incomplete rows
 """
 
-from typing import List, Dict
+from typing import Any, List, Dict
+
+import numpy as np
+
+from backend.shared.models.transaction_frame import TransactionFrame
+
+# Enhanced multilingual amount column patterns
+AMOUNT_PATTERNS = [
+    'amount', 'value', 'sum', 'total', 'debit', 'credit',
+    'bedrag', 'betrag', 'montant', 'importo', 'valor'  # Dutch, German, French, Italian, Spanish
+]
+
+# Enhanced multilingual date column patterns
+DATE_PATTERNS = [
+    'date', 'timestamp', 'created', 'processed', 'time',
+    'datum', 'fecha', 'data', 'rentedatum'  # Dutch, Spanish, Italian, Dutch (interest date)
+]
 
 class DataValidator:
     """
@@ -21,22 +37,41 @@ class DataValidator:
         Returns:
             List[Dict]: Data with invalid rows removed
         """
-        print(f"    Step 6: Removing invalid rows")
-        
-        if not data:
-            return []
+        return self.remove_invalid_frame_rows(TransactionFrame.from_records(data)).to_records()
+    
+    def remove_invalid_frame_rows(self, frame: TransactionFrame) -> TransactionFrame:
+        """
+        Remove rows with invalid or missing critical data from a frame, in place
         
-        original_count = len(data)
-        valid_data = []
+        Args:
+            frame: Transaction frame to validate
+            
+        Returns:
+            TransactionFrame: The same frame with invalid rows removed
+        """
+        print(f"    Step 6: Removing invalid rows")
         
-        for row in data:
-            if self._is_valid_row(row):
-                valid_data.append(row)
+        if not len(frame):
+            return frame
         
-        removed_count = original_count - len(valid_data)
-        print(f"      [SUCCESS] Removed {removed_count} invalid rows, kept {len(valid_data)} valid rows")
+        original_count = len(frame)
         
-        return valid_data
+        # Keep row if it has either amount or date (some flexibility), checked a column at a time
+        valid = np.zeros(original_count, dtype=bool)
+        for col in frame.columns:
+            col_lower = col.lower()
+            if any(pattern in col_lower for pattern in AMOUNT_PATTERNS):
+                valid |= np.fromiter((self._is_valid_amount(value) for value in frame.column(col)),
+                                     dtype=bool, count=original_count)
+            if any(pattern in col_lower for pattern in DATE_PATTERNS):
+                valid |= np.fromiter((self._is_valid_date(value) for value in frame.column(col)),
+                                     dtype=bool, count=original_count)
+        frame.keep_rows(valid)
+        
+        removed_count = original_count - len(frame)
+        print(f"      [SUCCESS] Removed {removed_count} invalid rows, kept {len(frame)} valid rows")
+        
+        return frame
     
     def _is_valid_row(self, row: Dict) -> bool:
         """
@@ -65,21 +100,10 @@ class DataValidator:
         Returns:
             bool: True if valid amount found
         """
-        # Enhanced multilingual amount column patterns
-        amount_patterns = [
-            'amount', 'value', 'sum', 'total', 'debit', 'credit',
-            'bedrag', 'betrag', 'montant', 'importo', 'valor'  # Dutch, German, French, Italian, Spanish
-        ]
-        
         for col in row.keys():
             col_lower = col.lower()
-            if any(pattern in col_lower for pattern in amount_patterns):
-                value = row[col]
-                if (value is not None and 
-                    str(value).strip() and 
-                    str(value) != '0' and 
-                    str(value) != '0.0'):
-                    return True
+            if any(pattern in col_lower for pattern in AMOUNT_PATTERNS) and self._is_valid_amount(row[col]):
+                return True
         return False
     
     def _has_valid_date(self, row: Dict) -> bool:
@@ -92,20 +116,20 @@ class DataValidator:
         Returns:
             bool: True if valid date found
         """
-        # Enhanced multilingual date column patterns
-        date_patterns = [
-            'date', 'timestamp', 'created', 'processed', 'time',
-            'datum', 'fecha', 'data', 'rentedatum'  # Dutch, Spanish, Italian, Dutch (interest date)
-        ]
-        
         for col in row.keys():
             col_lower = col.lower()
-            if any(pattern in col_lower for pattern in date_patterns):
-                value = row[col]
-                if value is not None and str(value).strip():
-                    return True
+            if any(pattern in col_lower for pattern in DATE_PATTERNS) and self._is_valid_date(row[col]):
+                return True
         return False
     
+    @staticmethod
+    def _is_valid_amount(value: Any) -> bool:
+        return value is not None and bool(str(value).strip()) and str(value) != '0' and str(value) != '0.0'
+    
+    @staticmethod
+    def _is_valid_date(value: Any) -> bool:
+        return value is not None and bool(str(value).strip())
+    
     def validate_essential_columns(self, data: List[Dict], required_columns: List[str] = None) -> Dict[str, Dict]:
         """
         Validate that essential columns exist and have data
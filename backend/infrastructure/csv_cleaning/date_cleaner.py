@@ -3,10 +3,12 @@ Date Data Cleaner
 Handles parsing and standardization of date columns
 """
 
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Optional
 import re
+import warnings
 import pandas as pd
+from backend.shared.models.transaction_frame import TransactionFrame
+from backend.shared.utils.date_inference import DEFAULT_SAMPLE_SIZE, ColumnDateParser, normalize_date_value
 
 class DateCleaner:
     """
@@ -27,6 +29,12 @@ class DateCleaner:
             '%Y.%m.%d',             # 2025.06.30 (4-digit year)
             '%Y.%m.%d %H:%M:%S',    # 2025.06.30 12:34:56
         ]
+        
+        # Memoizing parser for single values parsed outside of a column
+        self._value_parser = ColumnDateParser(self.fallback_date_formats, self.config_date_format,
+                                              max_cache_size=4096)
+        # Column name -> values that matched no date format in the last clean_date_columns run
+        self.invalid_dates: Dict[str, List[str]] = {}
     
     def clean_date_columns(self, data: List[Dict]) -> List[Dict]:
         """
@@ -38,33 +46,48 @@ class DateCleaner:
         Returns:
             List[Dict]: Data with cleaned date values
         """
+        return self.clean_date_frame(TransactionFrame.from_records(data)).to_records()
+    
+    def clean_date_frame(self, frame: TransactionFrame) -> TransactionFrame:
+        """
+        Clean and standardize date columns of a frame in place, one column at a time
+        
+        Args:
+            frame: Transaction frame with potentially dirty date data
+            
+        Returns:
+            TransactionFrame: The same frame with cleaned date values
+        """
         print(f"    Step 5: Cleaning date columns")
         
-        if not data:
-            return []
+        if not len(frame):
+            return frame
         
         # Identify date columns
-        date_cols = self._identify_date_columns(data)
+        date_cols = self._identify_date_columns(frame)
         print(f"       Date columns found: {date_cols}")
         
-        cleaned_data = []
-        for row_idx, row in enumerate(data):
-            cleaned_row = {}
-            for col, value in row.items():
-                if col in date_cols:
-                    cleaned_value = self.parse_date_value(value)
-                    cleaned_row[col] = cleaned_value
-                    
-                    # Debug first few rows
-                    if row_idx < 3:
-                        print(f"       Row {row_idx} {col}: '{value}' → '{cleaned_value}'")
-                else:
-                    cleaned_row[col] = value
+        # Each column uses one date format: infer it once, then parse with memoization
+        date_parsers = {col: self.build_column_parser(frame.column(col)) for col in date_cols}
+        for col, parser in date_parsers.items():
+            print(f"       Date format for {col}: {parser.date_format}")
+        
+        for col, parser in date_parsers.items():
+            first_values = [frame.get(row_idx, col) for row_idx in range(min(3, len(frame)))]
+            frame.map_column(col, lambda value: self.parse_date_value(value, parser))
             
-            cleaned_data.append(cleaned_row)
+            # Debug first few rows
+            for row_idx, value in enumerate(first_values):
+                print(f"       Row {row_idx} {col}: '{value}' → '{frame.get(row_idx, col)}'")
+        
+        self.invalid_dates = {col: parser.invalid_values for col, parser in date_parsers.items()
+                              if parser.invalid_count}
+        for col, values in self.invalid_dates.items():
+            print(f"      [WARNING]  {date_parsers[col].invalid_count} unparseable value(s) in date column '{col}' "
+                  f"left unchanged: {values[:3]}")
         
         print(f"      [SUCCESS] Date cleaning complete")
-        return cleaned_data
+        return frame
     
     def _identify_date_columns(self, data: List[Dict]) -> List[str]:
         """
@@ -112,15 +135,50 @@ class DateCleaner:
         
         return any(re.search(pattern, value_str) for pattern in date_patterns)
     
-    def parse_date_value(self, value: Any) -> str:
+    def build_column_parser(self, values: List[Any]) -> ColumnDateParser:
+        """
+        Parser for one date column. The config-specified date format is authoritative
+        when it fits the column; otherwise the format is inferred from a sample, with
+        pandas' guesses for the sampled values tried ahead of the fallback formats.
+        """
+        guessed_formats = []
+        for value in self._sample_values(values):
+            try:
+                with warnings.catch_warnings():
+                    # 13/01/2025 guessed without dayfirst warns; the guess itself is what we want
+                    warnings.simplefilter('ignore', UserWarning)
+                    guessed_format = pd.tseries.api.guess_datetime_format(value)
+            except (ValueError, TypeError):
+                continue
+            if guessed_format and guessed_format not in guessed_formats:
+                guessed_formats.append(guessed_format)
+        # Ambiguous first values guess month-first, so a later day-first guess must stay in the running
+        candidate_formats = guessed_formats + [fmt for fmt in self.fallback_date_formats
+                                               if fmt not in guessed_formats]
+        return ColumnDateParser.for_column(values, candidate_formats, configured_format=self.config_date_format)
+    
+    @staticmethod
+    def _sample_values(values: List[Any], sample_size: int = DEFAULT_SAMPLE_SIZE) -> List[str]:
+        """Distinct non-empty values in column order, as infer_date_format samples them"""
+        sample = []
+        for value in values:
+            value_str = normalize_date_value(value)
+            if value_str and value_str not in sample:
+                sample.append(value_str)
+                if len(sample) >= sample_size:
+                    break
+        return sample
+    
+    def parse_date_value(self, value: Any, date_parser: Optional[ColumnDateParser] = None) -> str:
         """
         Parse and standardize date value to ISO format
         
         Args:
             value: Raw date value (string, datetime, etc.)
+            date_parser: Parser of the value's column (see build_column_parser)
             
         Returns:
-            str: Standardized date in YYYY-MM-DD format
+            str: Standardized date in YYYY-MM-DD format, or the original value if it is not a date
         """
         try:
             if value is None or str(value).strip() == '':
@@ -128,33 +186,18 @@ class DateCleaner:
             
             value_str = str(value).strip()
             
-            # First try the config-specified date format (authoritative)
-            if self.config_date_format:
+            dt = (date_parser or self._value_parser).parse(value_str)
+            if dt is None and date_parser is None:
+                # Single value without a column: let pandas guess its format
                 try:
-                    dt = datetime.strptime(value_str, self.config_date_format)
-                    return dt.strftime('%Y-%m-%d')
-                except ValueError:
+                    guessed_format = pd.tseries.api.guess_datetime_format(value_str)
+                    if guessed_format:
+                        dt = ColumnDateParser([guessed_format]).parse(value_str)
+                except (ValueError, TypeError):
                     pass
             
-            # Second try pandas guess_datetime_format for automatic detection
-            try:
-                guessed_format = pd.tseries.api.guess_datetime_format(value_str)
-                if guessed_format:
-                    dt = datetime.strptime(value_str, guessed_format)
-                    return dt.strftime('%Y-%m-%d')
-            except (ValueError, TypeError):
-                pass
-            
-            # Last resort: try unambiguous fallback formats
-            for fmt in self.fallback_date_formats:
-                try:
-                    dt = datetime.strptime(value_str, fmt)
-                    return dt.strftime('%Y-%m-%d')
-                except ValueError:
-                    continue
-            
             # If no format matches, return original
-            return value_str
+            return dt.strftime('%Y-%m-%d') if dt is not None else value_str
             
         except Exception as e:
             print(f"      [WARNING]  Could not parse date value: '{value}' - {e}")
@@ -167,6 +210,8 @@ class DateCleaner:
         Args:
             date_format: Python strptime format string
         """
-        if date_format not in self.date_formats:
-            self.date_formats.append(date_format)
+        if date_format not in self.fallback_date_formats:
+            self.fallback_date_formats.append(date_format)
+            self._value_parser = ColumnDateParser(self.fallback_date_formats, self.config_date_format,
+                                              max_cache_size=4096)
             print(f"       Added custom date format: {date_format}")
@@ -7,6 +7,7 @@ Enhanced with AmountFormat support for different regional number formats.
 from typing import List, Dict, Any, Optional, Tuple
 import re
 from ...shared.amount_formats import AmountFormat, RegionalFormatRegistry, AmountFormatDetector, FormatValidator
+from ...shared.models.transaction_frame import TransactionFrame
 
 class NumericCleaner:
     """
@@ -73,33 +74,38 @@ class NumericCleaner:
         Returns:
             List[Dict]: Data with cleaned numeric values
         """
+        return self.clean_numeric_frame(TransactionFrame.from_records(data)).to_records()
+    
+    def clean_numeric_frame(self, frame: TransactionFrame) -> TransactionFrame:
+        """
+        Clean numeric columns of a frame in place, one column at a time
+        
+        Args:
+            frame: Transaction frame with potentially dirty numeric data
+            
+        Returns:
+            TransactionFrame: The same frame with cleaned numeric values
+        """
         print(f"    Step 4: Cleaning numeric columns with format: {self.amount_format.name or 'Custom'}")
         
-        if not data:
-            return []
+        if not len(frame):
+            return frame
         
         # Identify numeric columns
-        numeric_cols = self._identify_numeric_columns(data)
+        numeric_cols = self._identify_numeric_columns(frame)
         print(f"      [DATA] Numeric columns found: {numeric_cols}")
         
-        cleaned_data = []
-        for row_idx, row in enumerate(data):
-            cleaned_row = {}
-            for col, value in row.items():
-                if col in numeric_cols:
-                    cleaned_value = self.parse_numeric_value_with_format(value, self.amount_format)
-                    cleaned_row[col] = cleaned_value
-                    
-                    # Debug first few rows
-                    if row_idx < 3:
-                        print(f"       Row {row_idx} {col}: '{value}' → {cleaned_value}")
-                else:
-                    cleaned_row[col] = value
+        for col in numeric_cols:
+            first_values = [frame.get(row_idx, col) for row_idx in range(min(3, len(frame)))]
+            # Parsed amounts are stored as a float64 column
+            frame.map_column(col, lambda value: self.parse_numeric_value_with_format(value, self.amount_format))
             
-            cleaned_data.append(cleaned_row)
+            # Debug first few rows
+            for row_idx, value in enumerate(first_values):
+                print(f"       Row {row_idx} {col}: '{value}' → {frame.get(row_idx, col)}")
         
         print(f"      [SUCCESS] Numeric cleaning complete")
-        return cleaned_data
+        return frame
     
     def _identify_numeric_columns(self, data: List[Dict]) -> List[str]:
         """
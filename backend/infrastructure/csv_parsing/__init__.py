@@ -14,6 +14,8 @@ Component Classes (for advanced usage):
     ParsingStrategies: Multiple parsing approaches
     DataProcessor: Raw data processing
     StructureAnalyzer: CSV structure analysis
+    FileBuffer: Read-once file contents shared by the components above
+    ParseCache: Content-addressed cache of parse and preview results
 """
 
 from .unified_parser import UnifiedCSVParser
@@ -23,6 +25,8 @@ from .dialect_detector import DialectDetector
 from .parsing_strategies import ParsingStrategies
 from .data_processor import DataProcessor
 from .structure_analyzer import StructureAnalyzer
+from .file_buffer import FileBuffer, open_file_buffer
+from .parse_cache import ParseCache, get_parse_cache
 
 __all__ = [
     'UnifiedCSVParser',
@@ -35,7 +39,11 @@ __all__ = [
     'DialectDetector', 
     'ParsingStrategies',
     'DataProcessor',
-    'StructureAnalyzer'
+    'StructureAnalyzer',
+    'FileBuffer',
+    'open_file_buffer',
+    'ParseCache',
+    'get_parse_cache'
 ]
 
 __version__ = "1.0.0"
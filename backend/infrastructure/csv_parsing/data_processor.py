@@ -2,7 +2,8 @@
 Data processor for converting raw CSV rows into structured format
 Handles header detection, data row extraction, and dictionary conversion
 """
-from typing import Any, Dict, List, Optional
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from .utils import normalize_column_count, sanitize_for_json, validate_csv_structure, estimate_data_types, clean_header, generate_column_names
 from .exceptions import DataExtractionError
 from .data_processing_helpers import _extract_headers, _extract_data_rows, _convert_to_dictionaries
@@ -10,6 +11,9 @@ import re
 from decimal import Decimal, InvalidOperation # Keep InvalidOperation
 from datetime import date, datetime
 
+# Rows read ahead in streaming mode to settle the header and column count
+STREAM_SAMPLE_ROWS = 100
+
 class DataProcessor:
     """Process raw CSV data into structured format"""
     
@@ -129,6 +133,103 @@ class DataProcessor:
                 'error': f"Data processing failed: {str(e)}"
             }
     
+    def process_raw_batches(self, raw_batches: Iterable[List[List[str]]], header_row: Optional[int] = None) -> Dict:
+        """
+        Streaming counterpart of process_raw_data: headers come from the first rows read,
+        then each batch is normalized, converted and sanitized on its own as it is read
+        
+        Rows are normalized to the widest of the first STREAM_SAMPLE_ROWS rows, so a
+        wider row further down the file is truncated instead of adding columns. Per-row mappings and the
+        data type estimates over all rows are not kept; processing_info fills in as
+        batches are consumed.
+        
+        Returns:
+            dict: {
+                'success': bool,
+                'headers': List[str],
+                'batches': Iterator[List[Dict]],
+                'processing_info': dict
+            }
+        """
+        batches = iter(raw_batches)
+        
+        try:
+            # Read ahead until the header row (or the rows auto-detection looks at) and a
+            # sample of data rows are in hand; the batches themselves are kept as read
+            first_batches: List[List[List[str]]] = []
+            first_rows: List[List[str]] = []
+            needed_rows = max(header_row + 1 if header_row is not None and header_row >= 0 else 5,
+                              STREAM_SAMPLE_ROWS)
+            for batch in batches:
+                first_batches.append(batch)
+                first_rows.extend(batch)
+                if len(first_rows) >= needed_rows:
+                    break
+            
+            if not first_rows:
+                return {
+                    'success': False,
+                    'headers': [],
+                    'batches': iter(()),
+                    'error': 'No raw data to process'
+                }
+            
+            column_count = max(len(row) for row in first_rows)
+            normalized_rows = normalize_column_count(first_rows, column_count)
+            print(f"    Normalized streamed rows to {column_count} columns per row")
+            
+            headers_result = _extract_headers(normalized_rows, header_row, self.header_indicators)
+            headers = headers_result['headers']
+            actual_header_row = headers_result['header_row_used']
+            print(f"    Extracted {len(headers)} headers from row {actual_header_row}")
+            
+        except Exception as e:
+            print(f"[ERROR]  Data processing failed: {str(e)}")
+            return {
+                'success': False,
+                'headers': [],
+                'batches': iter(()),
+                'error': f"Data processing failed: {str(e)}"
+            }
+        
+        data_start_row = actual_header_row + 1 if actual_header_row is not None and actual_header_row >= 0 else 0
+        processing_info = {
+            'header_row_used': actual_header_row,
+            'data_start_row': data_start_row,
+            'original_row_count': 0,
+            'final_data_count': 0,
+            'empty_rows_filtered': 0,
+            'headers_info': headers_result,
+            'streamed': True
+        }
+        
+        return {
+            'success': True,
+            'headers': headers,
+            'batches': self._process_batches(itertools.chain(first_batches, batches), headers, column_count,
+                                             data_start_row, processing_info),
+            'processing_info': processing_info,
+            'data_type': 'dict'
+        }
+    
+    def _process_batches(self, batches: Iterator[List[List[str]]], headers: List[str], column_count: int,
+                         data_start_row: int, processing_info: Dict) -> Iterator[List[Dict[str, Any]]]:
+        batch_start = 0  # Absolute index of the batch's first raw row
+        for rows in batches:
+            rows = normalize_column_count(rows, column_count)
+            skip = min(max(data_start_row - batch_start, 0), len(rows))
+            data_rows = [row for row in rows[skip:] if any(cell.strip() for cell in row)]
+            processing_info['original_row_count'] += len(rows)
+            processing_info['empty_rows_filtered'] += len(rows) - skip - len(data_rows)
+            
+            if data_rows:
+                typed_data = self._apply_type_conversion(_convert_to_dictionaries(headers, data_rows))
+                sanitized_data = sanitize_for_json(typed_data)
+                processing_info['final_data_count'] += len(sanitized_data)
+                yield sanitized_data
+            
+            batch_start += len(rows)
+    
     def _apply_type_conversion(self, data_dicts: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """
         Apply type conversion to known fields like date and amount based on header names.
@@ -3,8 +3,9 @@ CSV dialect detection utilities
 """
 import csv
 import io
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from .exceptions import DialectDetectionError
+from .file_buffer import FileBuffer, open_file_buffer
 
 class DialectDetector:
     """Detects CSV dialect parameters with confidence scoring"""
@@ -19,12 +20,12 @@ class DialectDetector:
             csv.QUOTE_NONE        # No quoting
         ]
     
-    def detect_dialect(self, file_path: str, encoding: str, sample_lines: int = 10) -> Dict:
+    def detect_dialect(self, file_path: Union[str, FileBuffer], encoding: str, sample_lines: int = 10) -> Dict:
         """
         Detect CSV dialect parameters
         
         Args:
-            file_path: Path to the CSV file
+            file_path: Path to the CSV file, or its already read FileBuffer
             encoding: File encoding to use
             sample_lines: Number of lines to analyze
             
@@ -42,47 +43,8 @@ class DialectDetector:
         print(f" Detecting CSV dialect for file: {file_path}")
         
         try:
-            # Read sample content
-            with open(file_path, 'r', encoding=encoding) as f:
-                lines = []
-                for i, line in enumerate(f):
-                    lines.append(line.rstrip('\r\n'))
-                    if i >= sample_lines - 1:
-                        break
-            
-            if not lines:
-                raise DialectDetectionError("No lines found in file", file_path)
-            
-            print(f"   [DATA] Analyzing {len(lines)} sample lines")
-            
-            # Detect delimiter
-            delimiter_result = self._detect_delimiter(lines)
-            print(f"   [SUCCESS] Delimiter: '{delimiter_result['delimiter']}' (confidence: {delimiter_result['confidence']:.2f})")
-            
-            # Detect quote character and quoting mode
-            quote_result = self._detect_quoting(lines, delimiter_result['delimiter'])
-            print(f"   [SUCCESS] Quoting: char='{quote_result['quotechar']}', mode={quote_result['quoting']} (confidence: {quote_result['confidence']:.2f})")
-            
-            # Detect line terminator
-            line_terminator = self._detect_line_terminator(file_path, encoding)
-            print(f"   [SUCCESS] Line terminator: {repr(line_terminator)}")
-            
-            # Calculate overall confidence
-            overall_confidence = (delimiter_result['confidence'] + quote_result['confidence']) / 2
-            
-            return {
-                'delimiter': delimiter_result['delimiter'],
-                'quotechar': quote_result['quotechar'],
-                'quoting': quote_result['quoting'],
-                'skipinitialspace': True,  # Generally safe default
-                'confidence': overall_confidence,
-                'line_terminator': line_terminator,
-                'detected_patterns': {
-                    'delimiter_analysis': delimiter_result,
-                    'quote_analysis': quote_result
-                }
-            }
-            
+            with open_file_buffer(file_path) as buffer:
+                return self._detect_dialect(buffer, encoding, sample_lines)
         except Exception as e:
             print(f"[ERROR]  Dialect detection failed: {str(e)}")
             # Return safe defaults
@@ -96,6 +58,48 @@ class DialectDetector:
                 'detected_patterns': {'error': str(e)}
             }
     
+    def _detect_dialect(self, buffer: FileBuffer, encoding: str, sample_lines: int) -> Dict:
+        # Read sample content
+        with buffer.open_text(encoding) as f:
+            lines = []
+            for i, line in enumerate(f):
+                lines.append(line.rstrip('\r\n'))
+                if i >= sample_lines - 1:
+                    break
+        
+        if not lines:
+            raise DialectDetectionError("No lines found in file", buffer.path)
+        
+        print(f"   [DATA] Analyzing {len(lines)} sample lines")
+        
+        # Detect delimiter
+        delimiter_result = self._detect_delimiter(lines)
+        print(f"   [SUCCESS] Delimiter: '{delimiter_result['delimiter']}' (confidence: {delimiter_result['confidence']:.2f})")
+        
+        # Detect quote character and quoting mode
+        quote_result = self._detect_quoting(lines, delimiter_result['delimiter'])
+        print(f"   [SUCCESS] Quoting: char='{quote_result['quotechar']}', mode={quote_result['quoting']} (confidence: {quote_result['confidence']:.2f})")
+        
+        # Detect line terminator
+        line_terminator = self._detect_line_terminator(buffer)
+        print(f"   [SUCCESS] Line terminator: {repr(line_terminator)}")
+        
+        # Calculate overall confidence
+        overall_confidence = (delimiter_result['confidence'] + quote_result['confidence']) / 2
+        
+        return {
+            'delimiter': delimiter_result['delimiter'],
+            'quotechar': quote_result['quotechar'],
+            'quoting': quote_result['quoting'],
+            'skipinitialspace': True,  # Generally safe default
+            'confidence': overall_confidence,
+            'line_terminator': line_terminator,
+            'detected_patterns': {
+                'delimiter_analysis': delimiter_result,
+                'quote_analysis': quote_result
+            }
+        }
+    
     def _detect_delimiter(self, lines: List[str]) -> Dict:
         """Detect the most likely delimiter"""
         delimiter_scores = {}
@@ -231,12 +235,11 @@ class DialectDetector:
             print(f"    Selective quoting detected (quote-all ratio: {quote_all_ratio:.2f})")
             return csv.QUOTE_MINIMAL
     
-    def _detect_line_terminator(self, file_path: str, encoding: str) -> str:
+    def _detect_line_terminator(self, buffer: FileBuffer) -> str:
         """Detect line terminator style including non-standard patterns"""
         try:
             # Read a larger sample to better detect line endings
-            with open(file_path, 'rb') as f:
-                sample = f.read(8192)  # Increased sample size
+            sample = buffer.head(8192)  # Increased sample size
             
             if not sample:
                 return '\n'  # Safe default for empty files
@@ -1,9 +1,13 @@
 """
 Encoding detection utilities for CSV files
+Tiered: a BOM sniff and a strict UTF-8 check of the sample settle most bank exports,
+so chardet only runs for the remaining ambiguous files; results are kept per file hash
 """
 import codecs
-import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+from backend.infrastructure.config.result_cache import MISSING, ResultCache
+from .file_buffer import FileBuffer, open_file_buffer
 
 # Attempt to import chardet
 try:
@@ -12,6 +16,18 @@ except ImportError:
     chardet = None
     print("[WARNING]  chardet library not found. Encoding detection will rely solely on the internal heuristic chain.")
 
+# Longest first, so the UTF-32 LE BOM is not taken for the UTF-16 LE one it starts with
+BOM_ENCODINGS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Detection results per (file content hash, sample size), shared by every detector
+_detection_cache = ResultCache(max_size=1000)
+
 
 class EncodingDetector:
     """Detects file encoding with confidence scoring"""
@@ -34,12 +50,12 @@ class EncodingDetector:
         # If chardet's guess, after being tested by _test_encoding, meets this, we accept it.
         self.CHARDET_TESTED_ACCEPTANCE_THRESHOLD = 0.70 
     
-    def detect_encoding(self, file_path: str, sample_size: int = 8192) -> Dict:
+    def detect_encoding(self, file_path: Union[str, FileBuffer], sample_size: int = 8192) -> Dict:
         """
         Detect file encoding with confidence scoring
         
         Args:
-            file_path: Path to the CSV file
+            file_path: Path to the CSV file, or its already read FileBuffer
             sample_size: Number of bytes to sample for detection
             
         Returns:
@@ -52,14 +68,27 @@ class EncodingDetector:
         """
         print(f" Detecting encoding for file: {file_path}")
         
+        with open_file_buffer(file_path) as buffer:
+            cache_key = (buffer.digest, sample_size)
+            result = _detection_cache.get(cache_key)
+            if result is MISSING:
+                result = self._detect_encoding(buffer.head(sample_size), buffer.size, sample_size)
+                _detection_cache.put(cache_key, result)
+            else:
+                print(f"   Reusing encoding detected for identical file content: {result['encoding']}")
+            return {**result, 'attempted_encodings': [dict(attempt) for attempt in result['attempted_encodings']]}
+    
+    def _detect_encoding(self, sample_bytes: bytes, file_size: int, sample_size: int) -> Dict:
+        # Step 0: Fast paths that need neither chardet nor the manual chain
+        fast_result = self._detect_unambiguous(sample_bytes, file_size)
+        if fast_result is not None:
+            return fast_result
+        
         attempted_encodings = []
 
         # Step 1: Try chardet if available
         if self.chardet_available:
             try:
-                with open(file_path, 'rb') as f_raw:
-                    sample_bytes = f_raw.read(sample_size)
-
                 if not sample_bytes:
                     # Handle empty file scenario early if possible
                     # _test_encoding will also handle this, but good to note
@@ -81,7 +110,7 @@ class EncodingDetector:
                         try:
                             # Test chardet's suggestion using our _test_encoding for consistent confidence
                             # and to ensure Python recognizes the encoding alias.
-                            effective_confidence = self._test_encoding(file_path, chardet_enc_norm, sample_size)
+                            effective_confidence = self._test_encoding(sample_bytes, file_size, chardet_enc_norm, sample_size)
                             attempted_encodings.append({
                                 'encoding': chardet_enc_norm,
                                 'confidence': effective_confidence,
@@ -90,7 +119,7 @@ class EncodingDetector:
                             })
                             print(f"   [SUCCESS] Chardet guess '{chardet_enc_norm}' tested: confidence {effective_confidence:.2f}")
                             if effective_confidence >= self.CHARDET_TESTED_ACCEPTANCE_THRESHOLD:
-                                bom_detected = self._is_bom_present(file_path, chardet_enc_norm)
+                                bom_detected = self._is_bom_present(sample_bytes, chardet_enc_norm)
                                 print(f"   Using chardet's suggestion '{chardet_enc_norm}' (BOM: {bom_detected})")
                                 return {
                                     'encoding': chardet_enc_norm,
@@ -124,7 +153,7 @@ class EncodingDetector:
         print(f"   ℹ Trying manual encoding chain...")
         for encoding_name in self.encoding_chain:
             try:
-                confidence = self._test_encoding(file_path, encoding_name, sample_size)
+                confidence = self._test_encoding(sample_bytes, file_size, encoding_name, sample_size)
                 attempted_encodings.append({
                     'encoding': encoding_name, 'confidence': confidence,
                     'source': 'manual_chain', 'error': None
@@ -132,7 +161,7 @@ class EncodingDetector:
                 print(f"   [SUCCESS] Manual '{encoding_name}': confidence {confidence:.2f}")
                 
                 if confidence >= self.HIGH_CONFIDENCE_THRESHOLD:
-                    bom_detected = self._is_bom_present(file_path, encoding_name)
+                    bom_detected = self._is_bom_present(sample_bytes, encoding_name)
                     print(f"   Using manual encoding '{encoding_name}' (BOM: {bom_detected})")
                     return {
                         'encoding': encoding_name, 'confidence': confidence,
@@ -152,7 +181,7 @@ class EncodingDetector:
             if valid_attempts:
                 best_attempt = max(valid_attempts, key=lambda x: x['confidence'])
                 chosen_encoding = best_attempt['encoding']
-                bom_detected = self._is_bom_present(file_path, chosen_encoding)
+                bom_detected = self._is_bom_present(sample_bytes, chosen_encoding)
                 print(f"    Best encoding from all attempts: '{chosen_encoding}' (confidence: {best_attempt['confidence']:.2f}, BOM: {bom_detected})")
                 return {
                     'encoding': chosen_encoding,
@@ -163,7 +192,7 @@ class EncodingDetector:
         
         # Step 4: Last resort fallback
         print("[WARNING] No encoding detection succeeded, falling back to utf-8")
-        bom_detected_fallback = self._is_bom_present(file_path, 'utf-8') # Unlikely for plain utf-8
+        bom_detected_fallback = self._is_bom_present(sample_bytes, 'utf-8') # Unlikely for plain utf-8
         return {
             'encoding': 'utf-8',
             'confidence': 0.1,
@@ -171,65 +200,93 @@ class EncodingDetector:
             'attempted_encodings': attempted_encodings
         }
     
-    def _test_encoding(self, file_path: str, encoding: str, sample_size: int) -> float:
-        """Test an encoding and return confidence score"""
+    def _detect_unambiguous(self, sample_bytes: bytes, file_size: int) -> Optional[Dict]:
+        """
+        Result for a sample that starts with a BOM or is strictly valid UTF-8 without
+        NUL bytes (pure ASCII is reported as 'ascii', as chardet does), else None
+        """
+        if not sample_bytes:
+            return None
+        # The sample may end mid-character unless it holds the whole file
+        final = len(sample_bytes) >= file_size
+        
+        for bom, encoding in BOM_ENCODINGS:
+            if sample_bytes.startswith(bom):
+                source = 'bom'
+                break
+        else:
+            # NUL bytes are valid UTF-8 but in practice mean UTF-16/32 without a BOM
+            if b'\x00' in sample_bytes:
+                return None
+            encoding = 'ascii' if sample_bytes.isascii() else 'utf-8'
+            source = 'utf8_validation'
+        
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read(sample_size)
-
-            if not content:
-                # Check if the file is actually empty
-                try:
-                    if os.path.getsize(file_path) == 0:
-                        return 0.7 # Moderately confident for an empty file
-                except OSError: # pragma: no cover
-                    pass # File size check failed, proceed with low confidence
-                return 0.1 # Low confidence if sample is empty but file might not be
-
-            # Basic confidence metrics
-            confidence = 0.5  # Base confidence for successful read
-            
-            # Check for CSV-like content patterns
-            csv_indicators = [',', '"', '\n', '\r']
-            if len(content) > 0: # Avoid division by zero for very small content
-                csv_score = sum(content.count(indicator) for indicator in csv_indicators)
-                # Normalize score by content length and number of indicators
-                confidence += min((csv_score / len(content)) * 0.5, 0.3) # Max 0.3 bonus
-            
-            # Penalty for replacement characters (indicates encoding issues)
-            if '\ufffd' in content:
-                confidence -= 0.4
-            
-            # Bonus for clean ASCII-printable content
-            if len(content) > 0:
-                printable_chars = sum(1 for c in content if c.isprintable() or c.isspace())
-                printable_ratio = printable_chars / len(content)
-                confidence += printable_ratio * 0.2
-            
-            return max(0.0, min(confidence, 1.0)) # Ensure confidence is between 0 and 1
-            
+            content = codecs.getincrementaldecoder(encoding)('strict').decode(sample_bytes, final=final)
         except UnicodeDecodeError:
+            return None
+        
+        confidence = self._score_content(content, file_size)
+        print(f"   [SUCCESS] Using '{encoding}' from {source} (confidence: {confidence:.2f})")
+        return {
+            'encoding': encoding,
+            'confidence': confidence,
+            'bom_detected': source == 'bom',
+            'attempted_encodings': [{
+                'encoding': encoding, 'confidence': confidence, 'source': source, 'error': None
+            }]
+        }
+    
+    def _test_encoding(self, sample_bytes: bytes, file_size: int, encoding: str, sample_size: int) -> float:
+        """Test an encoding on the sample and return confidence score"""
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)('strict')
+            content = decoder.decode(sample_bytes, final=len(sample_bytes) >= file_size)[:sample_size]
+            return self._score_content(content, file_size)
+        except (UnicodeDecodeError, LookupError): # LookupError: unknown encoding name
             return 0.0
-        except FileNotFoundError: # Re-raise, should be handled by caller or detect_encoding
-            raise
-        except Exception: # Catch other potential errors during open/read
-            return 0.0
+    
+    def _score_content(self, content: str, file_size: int) -> float:
+        """Confidence that decoded sample text is a correctly decoded CSV"""
+        if not content:
+            # Check if the file is actually empty
+            if file_size == 0:
+                return 0.7 # Moderately confident for an empty file
+            return 0.1 # Low confidence if sample is empty but file might not be
 
-    def _is_bom_present(self, file_path: str, detected_encoding_name: str) -> bool:
+        # Basic confidence metrics
+        confidence = 0.5  # Base confidence for successful read
+        
+        # Check for CSV-like content patterns
+        csv_indicators = [',', '"', '\n', '\r']
+        if len(content) > 0: # Avoid division by zero for very small content
+            csv_score = sum(content.count(indicator) for indicator in csv_indicators)
+            # Normalize score by content length and number of indicators
+            confidence += min((csv_score / len(content)) * 0.5, 0.3) # Max 0.3 bonus
+        
+        # Penalty for replacement characters (indicates encoding issues)
+        if '\ufffd' in content:
+            confidence -= 0.4
+        
+        # Bonus for clean ASCII-printable content
+        if len(content) > 0:
+            printable_chars = sum(1 for c in content if c.isprintable() or c.isspace())
+            printable_ratio = printable_chars / len(content)
+            confidence += printable_ratio * 0.2
+        
+        return max(0.0, min(confidence, 1.0)) # Ensure confidence is between 0 and 1
+
+    def _is_bom_present(self, sample_bytes: bytes, detected_encoding_name: str) -> bool:
         """
         Checks if a BOM is likely present by inspecting the first few bytes of the file,
         relevant to the detected encoding.
         """
         normalized_encoding = detected_encoding_name.lower()
-        try:
-            with open(file_path, 'rb') as f_raw:
-                if normalized_encoding == 'utf-8-sig':
-                    # Check if the file actually started with a UTF-8 BOM
-                    return f_raw.read(3) == codecs.BOM_UTF8
-                elif normalized_encoding in ['utf-16', 'utf-16-le', 'utf-16-be']:
-                    # Check for UTF-16 BOM (LE or BE)
-                    start_bytes = f_raw.read(2)
-                    return start_bytes == codecs.BOM_UTF16_LE or start_bytes == codecs.BOM_UTF16_BE
-        except IOError: # Or more specific file errors
-            return False # Failed to read for BOM check
+        if normalized_encoding == 'utf-8-sig':
+            # Check if the file actually started with a UTF-8 BOM
+            return sample_bytes[:3] == codecs.BOM_UTF8
+        elif normalized_encoding in ['utf-16', 'utf-16-le', 'utf-16-be']:
+            # Check for UTF-16 BOM (LE or BE)
+            start_bytes = sample_bytes[:2]
+            return start_bytes == codecs.BOM_UTF16_LE or start_bytes == codecs.BOM_UTF16_BE
         return False
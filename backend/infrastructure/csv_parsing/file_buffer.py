@@ -0,0 +1,170 @@
+"""
+Shared file ingestion buffer
+Reads an uploaded CSV once (memory-mapped when large) so encoding and dialect
+detection, preprocessing, header validation and parsing all work from the same
+bytes, with each decoded text kept for the next reader
+"""
+import hashlib
+import io
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+
+class _MemoryReader(io.RawIOBase):
+    """Raw, seekable binary stream over a memoryview; reads copy only what is asked for"""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), len(self._view) - self._position)
+        if size <= 0:
+            return 0
+        buffer[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class FileBuffer(os.PathLike):
+    """
+    One file's raw bytes plus the texts decoded from them. Path-like, so code that
+    still opens os.fspath(buffer) keeps working and logging shows the file path.
+    """
+
+    def __init__(self, path: str, data: Union[bytes, mmap.mmap]):
+        self.path = path
+        self._data = data
+        self._view = memoryview(data)
+        self._texts: Dict[Tuple[str, Optional[str], str], str] = {}
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def open(cls, path: str, digest: Optional[str] = None) -> 'FileBuffer':
+        """
+        Read a file once; large files are memory-mapped rather than copied. A digest
+        already computed for the file's bytes (e.g. while it was uploaded) is reused.
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= MMAP_THRESHOLD:
+                buffer = cls(path, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                buffer = cls(path, f.read())
+        buffer._digest = digest
+        return buffer
+
+    @classmethod
+    def from_text(cls, path: str, text: str, encoding: str) -> 'FileBuffer':
+        """In-memory buffer holding text as if it had been written to path with encoding"""
+        return cls(path, text.encode(encoding))
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def __str__(self) -> str:
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"FileBuffer({self.path!r}, {self.size} bytes)"
+
+    def __enter__(self) -> 'FileBuffer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._view)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return isinstance(self._data, mmap.mmap)
+
+    @property
+    def view(self) -> memoryview:
+        return self._view
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the file bytes, computed on first use"""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._view).hexdigest()
+        return self._digest
+
+    def head(self, size: int) -> bytes:
+        """The first size bytes, like open(path, 'rb').read(size)"""
+        return bytes(self._view[:size])
+
+    def open_binary(self) -> io.BufferedReader:
+        """A fresh binary stream over the buffer, like open(path, 'rb')"""
+        return io.BufferedReader(_MemoryReader(self._view))
+
+    def open_text(self, encoding: str, newline: Optional[str] = None, errors: str = 'strict') -> io.TextIOBase:
+        """
+        A fresh text stream, like open(path, 'r', encoding=..., newline=...). Served from
+        the decoded text when text() already produced it, else decoded as it is read.
+        """
+        text = self._texts.get((encoding, newline, errors))
+        if text is not None:
+            return io.StringIO(text, newline=newline)
+        return io.TextIOWrapper(self.open_binary(), encoding=encoding, newline=newline, errors=errors)
+
+    def text(self, encoding: str, newline: Optional[str] = None, errors: str = 'strict') -> str:
+        """The whole file decoded, like open(path, 'r', ...).read(), decoded once per encoding"""
+        key = (encoding, newline, errors)
+        text = self._texts.get(key)
+        if text is None:
+            with self.open_text(encoding, newline, errors) as f:
+                text = f.read()
+            self._texts[key] = text
+        return text
+
+    def close(self) -> None:
+        self._texts.clear()
+        self._view.release()
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # A stream handed out earlier still holds a view; the map is freed with it
+                pass
+
+
+@contextmanager
+def open_file_buffer(source: Union[str, FileBuffer]) -> Iterator[FileBuffer]:
+    """
+    The buffer passed in, or one read from the path for the duration of the block.
+    Lets components accept either while only the caller that read a file closes it.
+    """
+    if isinstance(source, FileBuffer):
+        yield source
+        return
+    buffer = FileBuffer.open(source)
+    try:
+        yield buffer
+    finally:
+        buffer.close()
@@ -2,14 +2,16 @@
 Validates that a given row in a CSV file matches the expected header structure.
 """
 import csv
-from typing import List
+from typing import List, Union
+
+from .file_buffer import FileBuffer, open_file_buffer
 
 class HeaderValidationError(ValueError):
     """Custom exception for header validation errors."""
     pass
 
 def find_and_validate_header(
-    file_path: str,
+    file_path: Union[str, FileBuffer],
     encoding: str,
     configured_header_row: int, # Expects 0-indexed row number
     expected_headers: List[str]
@@ -18,7 +20,7 @@ def find_and_validate_header(
     Finds a header at a specific row and validates it against expected columns.
 
     Args:
-        file_path: The absolute path to the CSV file.
+        file_path: The absolute path to the CSV file, or its already read FileBuffer.
         encoding: The file encoding to use.
         configured_header_row: The 0-indexed row where the header is expected.
         expected_headers: A list of expected header column names.
@@ -35,7 +37,7 @@ def find_and_validate_header(
 
     actual_header = []
     try:
-        with open(file_path, 'r', encoding=encoding) as f:
+        with open_file_buffer(file_path) as buffer, buffer.open_text(encoding) as f:
             reader = csv.reader(f)
             for i, row in enumerate(reader):
                 if i == configured_header_row:
@@ -0,0 +1,255 @@
+"""
+Content-addressed cache of parse results
+Users re-upload the same statements and the app re-runs preview and parse on every
+change, so results are kept per (SHA-256 of the file bytes, parse options) in a
+memory LRU and, when a cache directory is configured, as pickles on disk.
+Disk entries are signed with a per-directory secret key and only unpickled once the
+signature checks out, in a directory only the current user may write to.
+"""
+import hashlib
+import hmac
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Returned by get() on a miss, since None is a valid cached result
+MISSING = object()
+
+# Bump whenever the shape of cached parse results changes
+CACHE_VERSION = 1
+
+# Entries are held pickled, so the memory tier is bounded by their size in bytes
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Secret used to sign disk entries, created in the cache directory on first use
+KEY_FILE = '.cache_key'
+KEY_SIZE = 32
+SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+def _cache_key_prefix() -> Tuple[int, int, int]:
+    # Pickles are only trusted by the same Python
+    return (CACHE_VERSION, sys.version_info.major, sys.version_info.minor)
+
+
+def cache_dir_from_env() -> Optional[str]:
+    return os.environ.get('HISAABFLOW_PARSE_CACHE_DIR') or None
+
+
+def parse_cache_enabled() -> bool:
+    return os.environ.get('HISAABFLOW_PARSE_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+
+
+def options_key(**options: Any) -> Tuple[Tuple[str, str], ...]:
+    """Hashable, order-independent form of parse options"""
+    return tuple(sorted((name, repr(value)) for name, value in options.items()))
+
+
+class ParseCache:
+    """
+    Two-tier cache of parse results. Values are stored pickled, so every get()
+    returns a fresh copy that callers may mutate. Only persistent entries (whose
+    key does not depend on process-local state) are written to the disk tier.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: Optional[str] = None,
+                 enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        # Guards the memory tier and counters; unpickling and disk I/O happen outside it
+        self._lock = threading.Lock()
+        # Signing key of the disk tier; False once the cache directory has been refused
+        self._disk_key: Any = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, persistent: bool = False) -> Any:
+        """Cached value for key, or MISSING; a disk hit is promoted to memory"""
+        if not self.enabled:
+            return MISSING
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            return pickle.loads(data)
+        if persistent and self.cache_dir:
+            data = self._read_disk(key)
+            if data is not None:
+                with self._lock:
+                    self._remember(key, data)
+                    self.disk_hits += 1
+                return pickle.loads(data)
+        with self._lock:
+            self.misses += 1
+        return MISSING
+
+    def put(self, key: Hashable, value: Any, persistent: bool = False) -> bool:
+        """Store a copy of value; False if it could not be pickled"""
+        if not self.enabled:
+            return False
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"[WARNING] [ParseCache] Not caching unpicklable result: {e}")
+            return False
+        with self._lock:
+            self._remember(key, data)
+        if persistent and self.cache_dir:
+            self._write_disk(key, data)
+        return True
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the memory tier, and the on-disk entries too if disk is set"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pickle'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+    def _remember(self, key: Hashable, data: bytes) -> None:
+        """Add an entry to the memory tier; the caller holds the lock"""
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_path(self, key: Hashable) -> str:
+        name = hashlib.sha256(repr((_cache_key_prefix(), key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pickle")
+
+    def _signing_key(self) -> Optional[bytes]:
+        """Key of the disk tier, or None if the cache directory is not safe to unpickle from"""
+        if self._disk_key is None:
+            with self._lock:
+                if self._disk_key is None:
+                    self._disk_key = self._load_signing_key() or False
+        return self._disk_key or None
+
+    def _load_signing_key(self) -> Optional[bytes]:
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            if not _owned_by_user(self.cache_dir):
+                print(f"[WARNING] [ParseCache] Not using cache directory {self.cache_dir}: "
+                      f"it must belong to the current user and not be writable by others")
+                return None
+            key_path = os.path.join(self.cache_dir, KEY_FILE)
+            try:
+                fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                if not _owned_by_user(key_path):
+                    print(f"[WARNING] [ParseCache] Not using cache key {key_path}: wrong owner or mode")
+                    return None
+                with open(key_path, 'rb') as f:
+                    key = f.read()
+                return key if len(key) == KEY_SIZE else None
+            key = os.urandom(KEY_SIZE)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key)
+            return key
+        except OSError as e:
+            print(f"[WARNING] [ParseCache] Disk cache unavailable in {self.cache_dir}: {e}")
+            return None
+
+    def _read_disk(self, key: Hashable) -> Optional[bytes]:
+        signing_key = self._signing_key()
+        if signing_key is None:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                frame = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"[WARNING] [ParseCache] Ignoring unreadable cache entry: {e}")
+            return None
+        signature, payload = frame[:SIGNATURE_SIZE], frame[SIGNATURE_SIZE:]
+        # Never unpickle bytes this cache did not write
+        if not hmac.compare_digest(signature, hmac.new(signing_key, payload, hashlib.sha256).digest()):
+            print("[WARNING] [ParseCache] Ignoring cache entry with a bad signature")
+            return None
+        try:
+            stored_key, data = pickle.loads(payload)
+        except Exception as e:
+            print(f"[WARNING] [ParseCache] Ignoring unreadable cache entry: {e}")
+            return None
+        # The file name is a hash of the key, so check the key itself before trusting it
+        return data if stored_key == (_cache_key_prefix(), key) else None
+
+    def _write_disk(self, key: Hashable, data: bytes) -> None:
+        signing_key = self._signing_key()
+        if signing_key is None:
+            return
+        path = self._disk_path(key)
+        try:
+            payload = pickle.dumps(((_cache_key_prefix(), key), data), protocol=pickle.HIGHEST_PROTOCOL)
+            signature = hmac.new(signing_key, payload, hashlib.sha256).digest()
+            # Write then rename so concurrent workers never read a partial entry
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(signature + payload)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"[WARNING] [ParseCache] Could not write cache entry to {path}: {e}")
+
+
+def _owned_by_user(path: str) -> bool:
+    """Whether path belongs to the current user and no one else may write to it"""
+    if not hasattr(os, 'getuid'):
+        # No POSIX ownership on Windows; the per-user profile directory is relied on instead
+        return True
+    stat = os.stat(path)
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+# Global singleton instance, shared by every parser in the process
+_parse_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the process-wide parse cache, configured from the environment"""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache(cache_dir=cache_dir_from_env(), enabled=parse_cache_enabled())
+    return _parse_cache
@@ -4,9 +4,15 @@ Handles multiple parsing approaches for different CSV formats
 """
 import csv
 import io
+import itertools
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Union
 from .exceptions import DataExtractionError
+from .file_buffer import FileBuffer, open_file_buffer
+
+# Rows per batch in streaming mode
+DEFAULT_CHUNK_SIZE = 10000
+
 
 class ParsingStrategies:
     """Multiple parsing approaches with automatic fallbacks"""
@@ -14,14 +20,14 @@ class ParsingStrategies:
     def __init__(self):
         self.strategy_names = ['pandas', 'csv_module', 'manual']
     
-    def parse_with_fallbacks(self, file_path: str, encoding: str, dialect_result: Dict, 
+    def parse_with_fallbacks(self, file_path: Union[str, FileBuffer], encoding: str, dialect_result: Dict, 
                            header_row: Optional[int] = None, max_rows: Optional[int] = None, 
                            start_row: Optional[int] = None) -> Dict:
         """
         Try multiple parsing strategies with fallbacks
         
         Args:
-            file_path: Path to CSV file
+            file_path: Path to CSV file, or its already read FileBuffer
             encoding: Detected file encoding
             dialect_result: Dialect detection results
             header_row: Optional header row index
@@ -33,11 +39,17 @@ class ParsingStrategies:
         """
         print(f" Trying parsing strategies for file: {file_path}")
         
+        with open_file_buffer(file_path) as buffer:
+            return self._parse_with_fallbacks(buffer, encoding, dialect_result, header_row, max_rows, start_row)
+    
+    def _parse_with_fallbacks(self, buffer: FileBuffer, encoding: str, dialect_result: Dict,
+                              header_row: Optional[int], max_rows: Optional[int],
+                              start_row: Optional[int]) -> Dict:
         last_error = None
         
         # Strategy 1: Try Pandas first
         print("   [DATA] Strategy 1: Pandas")
-        result = self._parse_with_pandas(file_path, encoding, dialect_result, header_row, max_rows, start_row)
+        result = self._parse_with_pandas(buffer, encoding, dialect_result, header_row, max_rows, start_row)
         if result['success']:
             print(f"   [SUCCESS] Pandas parsing succeeded")
             result['strategy_used'] = 'pandas'
@@ -48,7 +60,7 @@ class ParsingStrategies:
         
         # Strategy 2: Try CSV module
         print("    Strategy 2: CSV module")
-        result = self._parse_with_csv_module(file_path, encoding, dialect_result, header_row, max_rows, start_row)
+        result = self._parse_with_csv_module(buffer, encoding, dialect_result, header_row, max_rows, start_row)
         if result['success']:
             print(f"   [SUCCESS] CSV module parsing succeeded")
             result['strategy_used'] = 'csv_module'
@@ -59,7 +71,7 @@ class ParsingStrategies:
         
         # Strategy 3: Manual parsing as last resort
         print("    Strategy 3: Manual parsing")
-        result = self._parse_manually(file_path, encoding, dialect_result, header_row, max_rows, start_row)
+        result = self._parse_manually(buffer, encoding, dialect_result, header_row, max_rows, start_row)
         if result['success']:
             print(f"   [SUCCESS] Manual parsing succeeded")
             result['strategy_used'] = 'manual'
@@ -76,49 +88,127 @@ class ParsingStrategies:
             'strategy_used': None
         }
     
-    def _parse_with_pandas(self, file_path: str, encoding: str, dialect_result: Dict, 
+    def stream_with_fallbacks(self, file_path: Union[str, FileBuffer], encoding: str, dialect_result: Dict,
+                              header_row: Optional[int] = None, max_rows: Optional[int] = None,
+                              start_row: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """
+        Streaming counterpart of parse_with_fallbacks: rows come in batches of up to
+        chunk_size, so memory depends on the chunk size rather than the file size
+        
+        The strategy is chosen on the first batch. A strategy cannot be swapped once
+        batches were handed out, so a later failure raises DataExtractionError from the
+        batch iterator. The manual strategy reads whole files and is not used here.
+        
+        Returns:
+            dict: {'success': bool, 'batches': Iterator[List[List[str]]], 'error': str, 'strategy_used': str}
+        """
+        print(f" Trying streaming parsing strategies for file: {file_path} (chunk size: {chunk_size})")
+        
+        owned = not isinstance(file_path, FileBuffer)
+        buffer = FileBuffer.open(file_path) if owned else file_path
+        last_error = None
+        
+        for strategy_name, stream in (('pandas', self._stream_with_pandas),
+                                      ('csv_module', self._stream_with_csv_module)):
+            batches = stream(buffer, encoding, dialect_result, header_row, max_rows, start_row, chunk_size)
+            try:
+                first_batch = next(batches, None)
+            except Exception as e:
+                print(f"   [ERROR]  Streaming with {strategy_name} failed: {str(e)}")
+                last_error = f"{strategy_name} streaming error: {str(e)}"
+                continue
+            
+            print(f"   [SUCCESS] Streaming with {strategy_name}")
+            first_batches = [first_batch] if first_batch is not None else []
+            return {
+                'success': True,
+                'batches': self._guarded_batches(itertools.chain(first_batches, batches), strategy_name,
+                                                 buffer if owned else None),
+                'error': None,
+                'strategy_used': strategy_name
+            }
+        
+        if owned:
+            buffer.close()
+        return {
+            'success': False,
+            'batches': iter(()),
+            'error': f"All streaming parsing strategies failed. Last error: {last_error}",
+            'strategy_used': None
+        }
+    
+    @staticmethod
+    def _guarded_batches(batches: Iterator[List[List[str]]], strategy_name: str,
+                         owned_buffer: Optional[FileBuffer]) -> Iterator[List[List[str]]]:
+        """Batches with mid-stream failures surfaced as DataExtractionError; closes a buffer it owns"""
+        rows_yielded = 0
+        try:
+            for batch in batches:
+                rows_yielded += len(batch)
+                yield batch
+        except DataExtractionError:
+            raise
+        except Exception as e:
+            raise DataExtractionError(
+                f"{strategy_name} streaming failed after {rows_yielded} rows: {str(e)}",
+                owned_buffer.path if owned_buffer is not None else None,
+                rows_yielded) from e
+        finally:
+            if owned_buffer is not None:
+                owned_buffer.close()
+    
+    def _pandas_params(self, encoding: str, dialect_result: Dict, max_rows: Optional[int]) -> Dict:
+        """pd.read_csv parameters for the detected dialect"""
+        pandas_params = {
+            'encoding': encoding,
+            'sep': dialect_result.get('delimiter', ','),
+            'quotechar': dialect_result.get('quotechar', '"'),
+            'lineterminator': dialect_result.get('line_terminator', '\n'),  # Use detected line terminator
+            'header': None,  # Always read as raw data first
+            'dtype': str,    # Keep everything as strings initially
+            'keep_default_na': False,  # Don't convert to NaN
+            'na_filter': False,        # Don't interpret NA values
+        }
+        
+        # Handle quoting parameter
+        quoting = dialect_result.get('quoting', csv.QUOTE_MINIMAL)
+        if quoting == csv.QUOTE_ALL:
+            pandas_params['quoting'] = csv.QUOTE_ALL
+        elif quoting == csv.QUOTE_NONE:
+            pandas_params['quoting'] = csv.QUOTE_NONE
+        
+        # Add row limit if specified
+        if max_rows is not None:
+            pandas_params['nrows'] = max_rows
+        
+        # Add skipinitialspace if detected
+        if dialect_result.get('skipinitialspace', False):
+            pandas_params['skipinitialspace'] = True
+        
+        return pandas_params
+    
+    @staticmethod
+    def _frame_to_rows(df: pd.DataFrame) -> List[List[str]]:
+        """DataFrame values as lists of strings, with missing cells as empty strings"""
+        raw_rows = df.values.tolist()
+        for i, row in enumerate(raw_rows):
+            raw_rows[i] = [str(cell) if pd.notna(cell) else '' for cell in row]
+        return raw_rows
+    
+    def _parse_with_pandas(self, buffer: FileBuffer, encoding: str, dialect_result: Dict, 
                           header_row: Optional[int], max_rows: Optional[int], 
                           start_row: Optional[int] = None) -> Dict:
         """Parse using pandas with detected dialect parameters"""
         try:
-            # Prepare pandas parameters
-            pandas_params = {
-                'filepath_or_buffer': file_path,
-                'encoding': encoding,
-                'sep': dialect_result.get('delimiter', ','),
-                'quotechar': dialect_result.get('quotechar', '"'),
-                'lineterminator': dialect_result.get('line_terminator', '\n'),  # Use detected line terminator
-                'header': None,  # Always read as raw data first
-                'dtype': str,    # Keep everything as strings initially
-                'keep_default_na': False,  # Don't convert to NaN
-                'na_filter': False,        # Don't interpret NA values
-            }
-            
-            # Handle quoting parameter
-            quoting = dialect_result.get('quoting', csv.QUOTE_MINIMAL)
-            if quoting == csv.QUOTE_ALL:
-                pandas_params['quoting'] = csv.QUOTE_ALL
-            elif quoting == csv.QUOTE_NONE:
-                pandas_params['quoting'] = csv.QUOTE_NONE
-            
-            # Add row limit if specified
-            if max_rows is not None:
-                pandas_params['nrows'] = max_rows
-            
-            # Add skipinitialspace if detected
-            if dialect_result.get('skipinitialspace', False):
-                pandas_params['skipinitialspace'] = True
+            pandas_params = self._pandas_params(encoding, dialect_result, max_rows)
             
             # Read CSV with detected line terminator
             print(f"         Using pandas with lineterminator: {repr(pandas_params['lineterminator'])}")
-            df = pd.read_csv(**pandas_params)
-            
-            # Convert to list of lists
-            raw_rows = df.values.tolist()
+            with buffer.open_binary() as stream:
+                df = pd.read_csv(stream, **pandas_params)
             
-            # Convert any NaN values to empty strings
-            for i, row in enumerate(raw_rows):
-                raw_rows[i] = [str(cell) if pd.notna(cell) else '' for cell in row]
+            # Convert to list of lists, with NaN values as empty strings
+            raw_rows = self._frame_to_rows(df)
             
             print(f"      [DATA] Pandas read {len(raw_rows)} rows with {len(raw_rows[0]) if raw_rows else 0} columns")
             
@@ -135,84 +225,68 @@ class ParsingStrategies:
                 'error': f"Pandas parsing error: {str(e)}"
             }
     
-    def _parse_with_csv_module(self, file_path: str, encoding: str, dialect_result: Dict, 
+    def _stream_with_pandas(self, buffer: FileBuffer, encoding: str, dialect_result: Dict,
+                            header_row: Optional[int], max_rows: Optional[int],
+                            start_row: Optional[int], chunk_size: int) -> Iterator[List[List[str]]]:
+        """Rows in batches of chunk_size from pandas' chunked reader"""
+        pandas_params = self._pandas_params(encoding, dialect_result, max_rows)
+        print(f"         Using pandas with lineterminator: {repr(pandas_params['lineterminator'])}, chunksize: {chunk_size}")
+        
+        # Bank exports often have metadata lines that only break pandas further down.
+        # Batches cannot be taken back once handed out, so check the whole file first and
+        # fail here, where the csv module can still take over. The chunked C engine
+        # re-infers the width from the first row of each chunk and silently truncates or
+        # misreads rows, so widths are counted with the csv module against the rule a
+        # whole-file read enforces, and the chunks are read with that width fixed.
+        column_count = self._check_pandas_widths(buffer, encoding, dialect_result, max_rows)
+        
+        rows_read = 0
+        with buffer.open_binary() as stream, pd.read_csv(stream, chunksize=chunk_size, names=range(column_count),
+                                                         **pandas_params) as reader:
+            for df in reader:
+                raw_rows = self._frame_to_rows(df)
+                rows_read += len(raw_rows)
+                yield raw_rows
+        print(f"      [DATA] Pandas streamed {rows_read} rows")
+    
+    @staticmethod
+    def _check_pandas_widths(buffer: FileBuffer, encoding: str, dialect_result: Dict,
+                             max_rows: Optional[int]) -> int:
+        """
+        Fields per row as a whole-file pd.read_csv infers them; raises like it for an
+        empty file or when a later row has more fields than the first
+        """
+        with buffer.open_text(encoding, newline='') as csvfile:
+            reader = csv.reader(csvfile,
+                                delimiter=dialect_result.get('delimiter', ','),
+                                quotechar=dialect_result.get('quotechar', '"'),
+                                quoting=dialect_result.get('quoting', csv.QUOTE_MINIMAL),
+                                skipinitialspace=dialect_result.get('skipinitialspace', False))
+            expected_fields = None
+            rows_checked = 0
+            for row in reader:
+                if not row:
+                    continue  # pandas skips blank lines
+                if max_rows is not None and rows_checked >= max_rows:
+                    break
+                rows_checked += 1
+                if expected_fields is None:
+                    expected_fields = len(row)
+                elif len(row) > expected_fields:
+                    raise ValueError(f"Expected {expected_fields} fields in line {reader.line_num}, saw {len(row)}")
+        if expected_fields is None:
+            raise ValueError("No columns to parse from file")
+        return expected_fields
+    
+    def _parse_with_csv_module(self, buffer: FileBuffer, encoding: str, dialect_result: Dict, 
                               header_row: Optional[int], max_rows: Optional[int], 
                               start_row: Optional[int] = None) -> Dict:
         """Parse using Python's csv module with detected dialect"""
         try:
             raw_rows = []
-            
-            # Create custom dialect with detected line terminator
-            class CustomDialect(csv.excel):
-                delimiter = dialect_result.get('delimiter', ',')
-                quotechar = dialect_result.get('quotechar', '"')
-                quoting = dialect_result.get('quoting', csv.QUOTE_MINIMAL)
-                skipinitialspace = dialect_result.get('skipinitialspace', True)
-                lineterminator = dialect_result.get('line_terminator', '\n')  # Use detected line terminator
-            
-            # Log the line terminator being used
-            print(f"         Using CSV module with lineterminator: {repr(CustomDialect.lineterminator)}")
-            
-            # Special handling for quote-all format (Forint Bank style)
-            if dialect_result.get('quoting') == csv.QUOTE_ALL:
-                print(f"      Detected quote-all format, using specialized handling")
-                CustomDialect.quoting = csv.QUOTE_ALL
-                CustomDialect.doublequote = True
-            
-            # Special handling when both header_row and start_row are specified
-            header_row_data = None
-            if header_row is not None and start_row is not None:
-                # Always read the header row separately when both are specified
-                with open(file_path, 'r', encoding=encoding, newline='') as csvfile:
-                    reader = csv.reader(csvfile, dialect=CustomDialect)
-                    for row_num, row in enumerate(reader):
-                        if row_num == header_row:
-                            # Clean the header row
-                            clean_header_row = []
-                            for cell in row:
-                                if isinstance(cell, str):
-                                    clean_cell = cell.replace('\ufeff', '').strip()
-                                    clean_header_row.append(clean_cell)
-                                else:
-                                    clean_header_row.append(str(cell))
-                            header_row_data = clean_header_row
-                            print(f"        Read header from row {header_row}: {clean_header_row[:3]}...")
-                            break
-            
-            # Read file with custom dialect
-            with open(file_path, 'r', encoding=encoding, newline='') as csvfile:
-                reader = csv.reader(csvfile, dialect=CustomDialect)
-                
-                rows_processed = 0
-                for row_num, row in enumerate(reader):
-                    # If we have separate header data, include it first
-                    if header_row_data is not None and rows_processed == 0:
-                        raw_rows.append(header_row_data)
-                        rows_processed += 1
-                    
-                    # Skip rows before start_row if specified
-                    if start_row is not None and row_num < start_row:
-                        continue
-                    
-                    # Apply max_rows limit to processed rows (after start_row, excluding header)
-                    if max_rows is not None and rows_processed - (1 if header_row_data else 0) >= max_rows:
-                        break
-                    
-                    # Convert all cells to strings and handle encoding issues
-                    clean_row = []
-                    for cell in row:
-                        if isinstance(cell, str):
-                            # Clean any remaining encoding artifacts
-                            clean_cell = cell.replace('\ufeff', '').strip()
-                            clean_row.append(clean_cell)
-                        else:
-                            clean_row.append(str(cell))
-                    
-                    raw_rows.append(clean_row)
-                    rows_processed += 1
-            
-            start_info = f" (starting from row {start_row})" if start_row is not None else ""
-            print(f"       CSV module read {len(raw_rows)} rows with {len(raw_rows[0]) if raw_rows else 0} columns{start_info}")
+            for batch in self._stream_with_csv_module(buffer, encoding, dialect_result,
+                                                      header_row, max_rows, start_row):
+                raw_rows.extend(batch)
             
             return {
                 'success': True,
@@ -227,7 +301,97 @@ class ParsingStrategies:
                 'error': f"CSV module parsing error: {str(e)}"
             }
     
-    def _parse_manually(self, file_path: str, encoding: str, dialect_result: Dict, 
+    def _stream_with_csv_module(self, buffer: FileBuffer, encoding: str, dialect_result: Dict,
+                                header_row: Optional[int], max_rows: Optional[int],
+                                start_row: Optional[int] = None,
+                                chunk_size: Optional[int] = None) -> Iterator[List[List[str]]]:
+        """Rows in batches of chunk_size (all rows in one batch when None) from the csv module"""
+        # Create custom dialect with detected line terminator
+        class CustomDialect(csv.excel):
+            delimiter = dialect_result.get('delimiter', ',')
+            quotechar = dialect_result.get('quotechar', '"')
+            quoting = dialect_result.get('quoting', csv.QUOTE_MINIMAL)
+            skipinitialspace = dialect_result.get('skipinitialspace', True)
+            lineterminator = dialect_result.get('line_terminator', '\n')  # Use detected line terminator
+        
+        # Log the line terminator being used
+        print(f"         Using CSV module with lineterminator: {repr(CustomDialect.lineterminator)}")
+        
+        # Special handling for quote-all format (Forint Bank style)
+        if dialect_result.get('quoting') == csv.QUOTE_ALL:
+            print(f"      Detected quote-all format, using specialized handling")
+            CustomDialect.quoting = csv.QUOTE_ALL
+            CustomDialect.doublequote = True
+        
+        # Special handling when both header_row and start_row are specified
+        header_row_data = None
+        if header_row is not None and start_row is not None:
+            # Always read the header row separately when both are specified
+            with buffer.open_text(encoding, newline='') as csvfile:
+                reader = csv.reader(csvfile, dialect=CustomDialect)
+                for row_num, row in enumerate(reader):
+                    if row_num == header_row:
+                        # Clean the header row
+                        clean_header_row = []
+                        for cell in row:
+                            if isinstance(cell, str):
+                                clean_cell = cell.replace('\ufeff', '').strip()
+                                clean_header_row.append(clean_cell)
+                            else:
+                                clean_header_row.append(str(cell))
+                        header_row_data = clean_header_row
+                        print(f"        Read header from row {header_row}: {clean_header_row[:3]}...")
+                        break
+        
+        # Read file with custom dialect
+        batch = []
+        rows_processed = 0
+        column_count = None
+        with buffer.open_text(encoding, newline='') as csvfile:
+            reader = csv.reader(csvfile, dialect=CustomDialect)
+            
+            for row_num, row in enumerate(reader):
+                # If we have separate header data, include it first
+                if header_row_data is not None and rows_processed == 0:
+                    batch.append(header_row_data)
+                    rows_processed += 1
+                
+                # Skip rows before start_row if specified
+                if start_row is not None and row_num < start_row:
+                    continue
+                
+                # Apply max_rows limit to processed rows (after start_row, excluding header)
+                if max_rows is not None and rows_processed - (1 if header_row_data else 0) >= max_rows:
+                    break
+                
+                # Convert all cells to strings and handle encoding issues
+                clean_row = []
+                for cell in row:
+                    if isinstance(cell, str):
+                        # Clean any remaining encoding artifacts
+                        clean_cell = cell.replace('\ufeff', '').strip()
+                        clean_row.append(clean_cell)
+                    else:
+                        clean_row.append(str(cell))
+                
+                batch.append(clean_row)
+                rows_processed += 1
+                
+                if chunk_size is not None and len(batch) >= chunk_size:
+                    if column_count is None:
+                        column_count = len(batch[0])
+                    yield batch
+                    batch = []
+        
+        if batch:
+            if column_count is None:
+                column_count = len(batch[0])
+            yield batch
+        
+        start_info = f" (starting from row {start_row})" if start_row is not None else ""
+        print(f"       CSV module read {rows_processed} rows with {column_count or 0} columns{start_info}")
+    
+    def _parse_manually(self, buffer: FileBuffer, encoding: str, dialect_result: Dict, 
                        header_row: Optional[int], max_rows: Optional[int], 
                        start_row: Optional[int] = None) -> Dict:
         """Manual parsing as fallback for problematic files"""
@@ -242,8 +406,7 @@ class ParsingStrategies:
             print(f"         Using manual parsing with lineterminator: {repr(detected_line_terminator)}")
             
             # Read the entire file and split by the detected line terminator
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
+            content = buffer.text(encoding)
             
             # Split by detected line terminator
             lines = content.split(detected_line_terminator)
@@ -2,32 +2,35 @@
 Unified CSV Parser - Main orchestrator class
 Lightweight facade that coordinates all parsing components
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Union
 from .encoding_detector import EncodingDetector
 from .dialect_detector import DialectDetector
-from .parsing_strategies import ParsingStrategies
+from .parsing_strategies import ParsingStrategies, DEFAULT_CHUNK_SIZE
 from .data_processor import DataProcessor
 from .structure_analyzer import StructureAnalyzer
 from .exceptions import CSVParsingError, NoHeadersFoundError, HeaderlessCSVDetected
+from .file_buffer import FileBuffer, open_file_buffer
+from .parse_cache import MISSING, ParseCache, get_parse_cache, options_key
 
 class UnifiedCSVParser:
     """Main API orchestrator for unified CSV parsing"""
     
-    def __init__(self):
+    def __init__(self, parse_cache: Optional[ParseCache] = None):
         self.encoding_detector = EncodingDetector()
         self.dialect_detector = DialectDetector()
         self.parsing_strategies = ParsingStrategies()
         self.data_processor = DataProcessor()
         self.structure_analyzer = StructureAnalyzer()
+        self.parse_cache = parse_cache if parse_cache is not None else get_parse_cache()
     
-    def preview_csv(self, file_path: str, encoding: Optional[str] = None, bank_name: Optional[str] = None, 
+    def preview_csv(self, file_path: Union[str, FileBuffer], encoding: Optional[str] = None, bank_name: Optional[str] = None, 
                    config_manager: Optional[Any] = None, header_row: Optional[int] = None, max_rows: int = 20, 
                    start_row: Optional[int] = None) -> Dict:
         """
         Preview CSV file with automatic detection - maintains existing interface
         
         Args:
-            file_path: Path to CSV file
+            file_path: Path to CSV file, or its already read FileBuffer
             encoding: Optional encoding override
             bank_name: Optional bank name (not used directly, maintained for compatibility)
             config_manager: Optional config manager (not used directly, maintained for compatibility)
@@ -41,60 +44,20 @@ class UnifiedCSVParser:
         print(f" UnifiedCSVParser preview: {file_path}")
         
         try:
-            # Step 1: Detect encoding
-            if encoding is None:
-                encoding_result = self.encoding_detector.detect_encoding(file_path)
-                encoding = encoding_result['encoding']
-                print(f"    Detected encoding: {encoding}")
-            else:
-                print(f"    Using provided encoding: {encoding}")
-            
-            # Step 2: Detect dialect
-            dialect_result = self.dialect_detector.detect_dialect(file_path, encoding)
-            print(f"   Detected dialect: delimiter='{dialect_result['delimiter']}', quoting={dialect_result['quoting']}, lineterminator={repr(dialect_result.get('line_terminator', 'N/A'))}")
-            
-            # Step 3: Parse with strategies (including line terminator)
-            parsing_result = self.parsing_strategies.parse_with_fallbacks(
-                file_path, encoding, dialect_result, header_row, max_rows, start_row
-            )
-            
-            if not parsing_result['success']:
-                return {
-                    'success': False,
-                    'error': parsing_result['error']
-                }
-            
-            print(f"   [SUCCESS] Parsing succeeded with {parsing_result['strategy_used']} strategy")
-            
-            # Step 4: Process data
-            # If we used start_row filtering, the header is now at position 0
-            effective_header_row = 0 if start_row is not None and header_row is not None and header_row < start_row else header_row
-            processing_result = self.data_processor.process_raw_data(
-                parsing_result['raw_rows'], effective_header_row
-            )
-            
-            if not processing_result['success']:
-                return {
-                    'success': False,
-                    'error': processing_result['error']
-                }
-            
-            # Format response to match existing PreviewService expectations
-            preview_data = processing_result['data']
-            headers = processing_result['headers']
-            
-            return {
-                'success': True,
-                'preview_data': preview_data,
-                'column_names': headers,
-                'total_rows': processing_result['row_count'],
-                'encoding_used': encoding,
-                'parsing_info': {
-                    'strategy_used': parsing_result['strategy_used'],
-                    'dialect_detected': dialect_result,
-                    'processing_info': processing_result['processing_info']
-                }
-            }
+            with open_file_buffer(file_path) as buffer:
+                # Keyed by content, so a re-upload of the same statement skips detection and parsing
+                cache_key = ('preview', buffer.digest, options_key(
+                    encoding=encoding, bank_name=bank_name, header_row=header_row,
+                    max_rows=max_rows, start_row=start_row))
+                result = self.parse_cache.get(cache_key, persistent=True)
+                if result is not MISSING:
+                    print("   [CACHE] Reusing preview of identical file content")
+                    return result
+                
+                result = self._preview_buffer(buffer, encoding, header_row, max_rows, start_row)
+                if result['success']:
+                    self.parse_cache.put(cache_key, result, persistent=True)
+                return result
             
         except Exception as e:
             print(f"[ERROR]  Preview failed: {str(e)}")
@@ -103,82 +66,237 @@ class UnifiedCSVParser:
                 'error': str(e)
             }
     
-    def parse_csv(self, file_path: str, encoding: Optional[str] = None, **parsing_options) -> Dict:
+    def _preview_buffer(self, buffer: FileBuffer, encoding: Optional[str], header_row: Optional[int],
+                        max_rows: int, start_row: Optional[int]) -> Dict:
+        """Detect and parse a preview of one buffer, uncached"""
+        # Step 1: Detect encoding
+        if encoding is None:
+            encoding_result = self.encoding_detector.detect_encoding(buffer)
+            encoding = encoding_result['encoding']
+            print(f"    Detected encoding: {encoding}")
+        else:
+            print(f"    Using provided encoding: {encoding}")
+    
+        # Step 2: Detect dialect
+        dialect_result = self.dialect_detector.detect_dialect(buffer, encoding)
+        print(f"   Detected dialect: delimiter='{dialect_result['delimiter']}', quoting={dialect_result['quoting']}, lineterminator={repr(dialect_result.get('line_terminator', 'N/A'))}")
+    
+        # Step 3: Parse with strategies (including line terminator)
+        parsing_result = self.parsing_strategies.parse_with_fallbacks(
+            buffer, encoding, dialect_result, header_row, max_rows, start_row
+        )
+    
+        if not parsing_result['success']:
+            return {
+                'success': False,
+                'error': parsing_result['error']
+            }
+    
+        print(f"   [SUCCESS] Parsing succeeded with {parsing_result['strategy_used']} strategy")
+    
+        # Step 4: Process data
+        # If we used start_row filtering, the header is now at position 0
+        effective_header_row = 0 if start_row is not None and header_row is not None and header_row < start_row else header_row
+        processing_result = self.data_processor.process_raw_data(
+            parsing_result['raw_rows'], effective_header_row
+        )
+    
+        if not processing_result['success']:
+            return {
+                'success': False,
+                'error': processing_result['error']
+            }
+    
+        # Format response to match existing PreviewService expectations
+        preview_data = processing_result['data']
+        headers = processing_result['headers']
+    
+        return {
+            'success': True,
+            'preview_data': preview_data,
+            'column_names': headers,
+            'total_rows': processing_result['row_count'],
+            'encoding_used': encoding,
+            'parsing_info': {
+                'strategy_used': parsing_result['strategy_used'],
+                'dialect_detected': dialect_result,
+                'processing_info': processing_result['processing_info']
+            }
+        }
+    
+    def parse_csv(self, file_path: Union[str, FileBuffer], encoding: Optional[str] = None, **parsing_options) -> Dict:
         """
         Full CSV parsing with automatic detection
         
         Args:
-            file_path: Path to CSV file
+            file_path: Path to CSV file, or its already read FileBuffer
             encoding: Optional encoding override
-            **parsing_options: Additional parsing options (header_row, max_rows, etc.)
+            **parsing_options: Additional parsing options (header_row, max_rows, etc.).
+                stream=True returns 'batches' of row dicts instead of 'data', each of
+                at most chunk_size rows (default DEFAULT_CHUNK_SIZE)
             
         Returns:
             dict: Complete parsing result
         """
+        if parsing_options.get('stream'):
+            return self._stream_csv(file_path, encoding, **parsing_options)
+        
         print(f"[DATA] UnifiedCSVParser full parse: {file_path}")
         
         try:
-            # Extract options
+            with open_file_buffer(file_path) as buffer:
+                # Extract options
+                header_row = parsing_options.get('header_row')
+                max_rows = parsing_options.get('max_rows')
+                start_row = parsing_options.get('start_row')
+                
+                cache_key = ('parse', buffer.digest, options_key(
+                    encoding=encoding, header_row=header_row, max_rows=max_rows, start_row=start_row))
+                result = self.parse_cache.get(cache_key, persistent=True)
+                if result is not MISSING:
+                    print("   [CACHE] Reusing parse of identical file content")
+                    return result
+                
+                result = self._parse_buffer(buffer, encoding, header_row, max_rows, start_row)
+                self.parse_cache.put(cache_key, result, persistent=True)
+                return result
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _parse_buffer(self, buffer: FileBuffer, encoding: Optional[str], header_row: Optional[int],
+                      max_rows: Optional[int], start_row: Optional[int]) -> Dict:
+        """Detect and fully parse one buffer, uncached; raises CSVParsingError on failure"""
+        # Step 1: Detect encoding
+        if encoding is None:
+            encoding_result = self.encoding_detector.detect_encoding(buffer)
+            encoding = encoding_result['encoding']
+        else:
+            encoding_result = {'encoding': encoding, 'confidence': 1.0}
+    
+        # Step 2: Detect dialect
+        dialect_result = self.dialect_detector.detect_dialect(buffer, encoding)
+    
+        # Step 3: Parse with strategies (including line terminator)
+        parsing_result = self.parsing_strategies.parse_with_fallbacks(
+            buffer, encoding, dialect_result, header_row, max_rows, start_row
+        )
+    
+        if not parsing_result['success']:
+            raise CSVParsingError(parsing_result['error'], buffer.path)
+    
+        # Step 4: Process data
+        # If we used start_row filtering, the header is now at position 0
+        effective_header_row = 0 if start_row is not None and header_row is not None and header_row < start_row else header_row
+        processing_result = self.data_processor.process_raw_data(
+            parsing_result['raw_rows'], effective_header_row
+        )
+    
+        if not processing_result['success']:
+            raise CSVParsingError(processing_result['error'], buffer.path)
+    
+        print(f"  DEBUG: UnifiedCSVParser - Encoding result being returned: {encoding_result}")
+        return {
+            'success': True,
+            'data': processing_result['data'],
+            'headers': processing_result['headers'],
+            'row_count': processing_result['row_count'],
+            'raw_rows': parsing_result['raw_rows'],  # Include raw_rows for unknown bank analysis
+            'metadata': {
+                'encoding_detection': encoding_result,
+                'dialect_detection': dialect_result,
+                'parsing_strategy': parsing_result['strategy_used'],
+                'processing_info': processing_result['processing_info']
+            }
+        }
+    
+    def _stream_csv(self, file_path: Union[str, FileBuffer], encoding: Optional[str] = None,
+                    **parsing_options) -> Dict:
+        """
+        parse_csv in streaming mode: detection runs up front, then raw rows are parsed,
+        normalized, type converted and sanitized one batch at a time as 'batches' is
+        iterated. The file stays open until the batches are exhausted or closed.
+        """
+        chunk_size = parsing_options.get('chunk_size') or DEFAULT_CHUNK_SIZE
+        print(f"[DATA] UnifiedCSVParser streaming parse: {file_path} (chunk size: {chunk_size})")
+        
+        owned = not isinstance(file_path, FileBuffer)
+        buffer = None
+        try:
+            buffer = FileBuffer.open(file_path) if owned else file_path
             header_row = parsing_options.get('header_row')
             max_rows = parsing_options.get('max_rows')
             start_row = parsing_options.get('start_row')
             
             # Step 1: Detect encoding
             if encoding is None:
-                encoding_result = self.encoding_detector.detect_encoding(file_path)
+                encoding_result = self.encoding_detector.detect_encoding(buffer)
                 encoding = encoding_result['encoding']
             else:
                 encoding_result = {'encoding': encoding, 'confidence': 1.0}
             
             # Step 2: Detect dialect
-            dialect_result = self.dialect_detector.detect_dialect(file_path, encoding)
+            dialect_result = self.dialect_detector.detect_dialect(buffer, encoding)
             
-            # Step 3: Parse with strategies (including line terminator)
-            parsing_result = self.parsing_strategies.parse_with_fallbacks(
-                file_path, encoding, dialect_result, header_row, max_rows, start_row
+            # Step 3: Stream with strategies
+            parsing_result = self.parsing_strategies.stream_with_fallbacks(
+                buffer, encoding, dialect_result, header_row, max_rows, start_row, chunk_size
             )
             
             if not parsing_result['success']:
                 raise CSVParsingError(parsing_result['error'], file_path)
             
-            # Step 4: Process data
+            # Step 4: Process batches
             # If we used start_row filtering, the header is now at position 0
             effective_header_row = 0 if start_row is not None and header_row is not None and header_row < start_row else header_row
-            processing_result = self.data_processor.process_raw_data(
-                parsing_result['raw_rows'], effective_header_row
+            processing_result = self.data_processor.process_raw_batches(
+                parsing_result['batches'], effective_header_row
             )
             
             if not processing_result['success']:
                 raise CSVParsingError(processing_result['error'], file_path)
             
-            print(f"  DEBUG: UnifiedCSVParser - Encoding result being returned: {encoding_result}")
+            batches = processing_result['batches']
+            if owned:
+                batches = self._closing_batches(batches, buffer)
             return {
                 'success': True,
-                'data': processing_result['data'],
+                'streaming': True,
                 'headers': processing_result['headers'],
-                'row_count': processing_result['row_count'],
-                'raw_rows': parsing_result['raw_rows'],  # Include raw_rows for unknown bank analysis
+                'batches': batches,
                 'metadata': {
                     'encoding_detection': encoding_result,
                     'dialect_detection': dialect_result,
                     'parsing_strategy': parsing_result['strategy_used'],
+                    'chunk_size': chunk_size,
                     'processing_info': processing_result['processing_info']
                 }
             }
             
         except Exception as e:
+            if owned and buffer is not None:
+                buffer.close()
             return {
                 'success': False,
                 'error': str(e)
             }
     
+    @staticmethod
+    def _closing_batches(batches: Iterator[List[Dict]], buffer: FileBuffer) -> Iterator[List[Dict]]:
+        try:
+            yield from batches
+        finally:
+            buffer.close()
     
-    def validate_csv(self, file_path: str, encoding: Optional[str] = None) -> Dict:
+    def validate_csv(self, file_path: Union[str, FileBuffer], encoding: Optional[str] = None) -> Dict:
         """
         Validate CSV file structure and format
         
         Args:
-            file_path: Path to CSV file
+            file_path: Path to CSV file, or its already read FileBuffer
             encoding: Optional encoding override
             
         Returns:
@@ -223,7 +341,7 @@ class UnifiedCSVParser:
                 'error': str(e)
             }
     
-    def analyze_structure(self, file_path: str, encoding: Optional[str] = None) -> Dict:
+    def analyze_structure(self, file_path: Union[str, FileBuffer], encoding: Optional[str] = None) -> Dict:
         """
         Global-ready, bank-agnostic CSV structure analysis.
         
@@ -235,7 +353,7 @@ class UnifiedCSVParser:
         - Provides content sample for bank detection
         
         Args:
-            file_path: Path to CSV file
+            file_path: Path to CSV file, or its already read FileBuffer
             encoding: Optional encoding override
             
         Returns:
@@ -256,87 +374,88 @@ class UnifiedCSVParser:
         print(f" Global structure analysis: {file_path}")
         
         try:
-            # Step 1: Detect encoding (leveraging existing robust detection)
-            if encoding is None:
-                encoding_result = self.encoding_detector.detect_encoding(file_path)
-                detected_encoding = encoding_result['encoding']
-                print(f"    Detected encoding: {detected_encoding}")
-            else:
-                detected_encoding = encoding
-                print(f"    Using provided encoding: {detected_encoding}")
-            
-            # Step 2: Detect dialect (supports international CSV formats)
-            dialect_result = self.dialect_detector.detect_dialect(file_path, detected_encoding)
-            print(f"   Detected dialect: delimiter='{dialect_result['delimiter']}'")
-            
-            # Step 3: Parse sample for structure analysis (50 rows to handle bank CSVs with metadata)
-            parsing_result = self.parsing_strategies.parse_with_fallbacks(
-                file_path, detected_encoding, dialect_result, max_rows=50
-            )
-            
-            if not parsing_result['success']:
-                return {
-                    'success': False,
-                    'error': f"Failed to parse CSV for structure analysis: {parsing_result['error']}"
-                }
-            
-            sample_rows = parsing_result['raw_rows']
-            print(f"   Parsed {len(sample_rows)} sample rows for analysis")
-            
-            # Step 4: Global header detection with multilingual support
-            header_result = self.structure_analyzer.detect_header_row_global(sample_rows)
-            
-            # Step 5: Handle results based on header detection
-            if not header_result['has_headers']:
-                # Headerless file detected
-                total_columns = len(sample_rows[0]) if sample_rows else 0
-                suggested_columns = [f'Column_{i+1}' for i in range(total_columns)]
+            with open_file_buffer(file_path) as buffer:
+                # Step 1: Detect encoding (leveraging existing robust detection)
+                if encoding is None:
+                    encoding_result = self.encoding_detector.detect_encoding(buffer)
+                    detected_encoding = encoding_result['encoding']
+                    print(f"    Detected encoding: {detected_encoding}")
+                else:
+                    detected_encoding = encoding
+                    print(f"    Using provided encoding: {detected_encoding}")
+            
+                # Step 2: Detect dialect (supports international CSV formats)
+                dialect_result = self.dialect_detector.detect_dialect(buffer, detected_encoding)
+                print(f"   Detected dialect: delimiter='{dialect_result['delimiter']}'")
+            
+                # Step 3: Parse sample for structure analysis (50 rows to handle bank CSVs with metadata)
+                parsing_result = self.parsing_strategies.parse_with_fallbacks(
+                    buffer, detected_encoding, dialect_result, max_rows=50
+                )
+            
+                if not parsing_result['success']:
+                    return {
+                        'success': False,
+                        'error': f"Failed to parse CSV for structure analysis: {parsing_result['error']}"
+                    }
+            
+                sample_rows = parsing_result['raw_rows']
+                print(f"   Parsed {len(sample_rows)} sample rows for analysis")
+            
+                # Step 4: Global header detection with multilingual support
+                header_result = self.structure_analyzer.detect_header_row_global(sample_rows)
+            
+                # Step 5: Handle results based on header detection
+                if not header_result['has_headers']:
+                    # Headerless file detected
+                    total_columns = len(sample_rows[0]) if sample_rows else 0
+                    suggested_columns = [f'Column_{i+1}' for i in range(total_columns)]
                 
-                print(f"   Headerless CSV detected: {total_columns} columns")
+                    print(f"   Headerless CSV detected: {total_columns} columns")
                 
-                # Create content sample from first few data rows
-                content_sample = self._create_content_sample_from_rows(sample_rows[:10])
+                    # Create content sample from first few data rows
+                    content_sample = self._create_content_sample_from_rows(sample_rows[:10])
                 
-                return {
-                    'success': True,
-                    'encoding': detected_encoding,
-                    'dialect': dialect_result,
-                    'suggested_header_row': None,
-                    'suggested_data_start_row': 0,
-                    'raw_headers': [],
-                    'suggested_columns': suggested_columns,
-                    'content_sample': content_sample,
-                    'confidence': header_result['confidence'],
-                    'has_headers': False,
-                    'language_hints': header_result.get('detected_languages', []),
-                    'total_columns': total_columns,
-                    'method': header_result['method']
-                }
-            else:
-                # Headers found
-                header_row_idx = header_result['suggested_row']
-                data_start_row = header_row_idx + 1
+                    return {
+                        'success': True,
+                        'encoding': detected_encoding,
+                        'dialect': dialect_result,
+                        'suggested_header_row': None,
+                        'suggested_data_start_row': 0,
+                        'raw_headers': [],
+                        'suggested_columns': suggested_columns,
+                        'content_sample': content_sample,
+                        'confidence': header_result['confidence'],
+                        'has_headers': False,
+                        'language_hints': header_result.get('detected_languages', []),
+                        'total_columns': total_columns,
+                        'method': header_result['method']
+                    }
+                else:
+                    # Headers found
+                    header_row_idx = header_result['suggested_row']
+                    data_start_row = header_row_idx + 1
                 
-                raw_headers = sample_rows[header_row_idx] if header_row_idx < len(sample_rows) else []
-                print(f"   Headers found at row {header_row_idx}: {raw_headers}")
+                    raw_headers = sample_rows[header_row_idx] if header_row_idx < len(sample_rows) else []
+                    print(f"   Headers found at row {header_row_idx}: {raw_headers}")
                 
-                # Create content sample including headers and some data
-                content_sample = self._create_content_sample_with_headers(sample_rows, header_row_idx)
+                    # Create content sample including headers and some data
+                    content_sample = self._create_content_sample_with_headers(sample_rows, header_row_idx)
                 
-                return {
-                    'success': True,
-                    'encoding': detected_encoding,
-                    'dialect': dialect_result,
-                    'suggested_header_row': header_row_idx,
-                    'suggested_data_start_row': data_start_row,
-                    'raw_headers': raw_headers,
-                    'content_sample': content_sample,
-                    'confidence': header_result['confidence'],
-                    'has_headers': True,
-                    'language_hints': header_result.get('detected_languages', []),
-                    'total_columns': len(raw_headers),
-                    'method': header_result['method']
-                }
+                    return {
+                        'success': True,
+                        'encoding': detected_encoding,
+                        'dialect': dialect_result,
+                        'suggested_header_row': header_row_idx,
+                        'suggested_data_start_row': data_start_row,
+                        'raw_headers': raw_headers,
+                        'content_sample': content_sample,
+                        'confidence': header_result['confidence'],
+                        'has_headers': True,
+                        'language_hints': header_result.get('detected_languages', []),
+                        'total_columns': len(raw_headers),
+                        'method': header_result['method']
+                    }
                 
         except Exception as e:
             print(f"[ERROR]  Structure analysis failed: {str(e)}")
@@ -385,12 +504,12 @@ class UnifiedCSVParser:
         
         return '\n'.join(content_lines)
 
-    def detect_data_range(self, file_path: str, encoding: Optional[str] = None) -> Dict:
+    def detect_data_range(self, file_path: Union[str, FileBuffer], encoding: Optional[str] = None) -> Dict:
         """
         Auto-detect where the actual data starts (compatibility method)
         
         Args:
-            file_path: Path to CSV file
+            file_path: Path to CSV file, or its already read FileBuffer
             encoding: Optional encoding override
             
         Returns:
@@ -399,37 +518,38 @@ class UnifiedCSVParser:
         print(f" Data range detection: {file_path}")
         
         try:
-            # Use structure detection to find header row
-            structure_result = self.analyze_structure(file_path, encoding)
+            with open_file_buffer(file_path) as buffer:
+                # Use structure detection to find header row
+                structure_result = self.analyze_structure(buffer, encoding)
+            
+                if not structure_result['success']:
+                    return {
+                        'success': False,
+                        'error': structure_result['error']
+                    }
+            
+                suggested_header_row = structure_result.get('suggested_header_row', 0)
+            
+                # Parse small sample to get total row estimate (including line terminator)
+                parsing_result = self.parsing_strategies.parse_with_fallbacks(
+                    buffer, 
+                    structure_result['encoding'], 
+                    structure_result['dialect'], 
+                    max_rows=50
+                )
+            
+                if parsing_result['success']:
+                    total_rows = len(parsing_result['raw_rows'])
+                else:
+                    total_rows = None
             
-            if not structure_result['success']:
                 return {
-                    'success': False,
-                    'error': structure_result['error']
+                    'success': True,
+                    'suggested_header_row': suggested_header_row,
+                    'total_rows': total_rows,
+                    'confidence': structure_result.get('confidence', 0.0)
                 }
             
-            suggested_header_row = structure_result.get('suggested_header_row', 0)
-            
-            # Parse small sample to get total row estimate (including line terminator)
-            parsing_result = self.parsing_strategies.parse_with_fallbacks(
-                file_path, 
-                structure_result['encoding'], 
-                structure_result['dialect'], 
-                max_rows=50
-            )
-            
-            if parsing_result['success']:
-                total_rows = len(parsing_result['raw_rows'])
-            else:
-                total_rows = None
-            
-            return {
-                'success': True,
-                'suggested_header_row': suggested_header_row,
-                'total_rows': total_rows,
-                'confidence': structure_result.get('confidence', 0.0)
-            }
-            
         except Exception as e:
             return {
                 'success': False,
@@ -246,6 +246,24 @@ def get_user_config_dir() -> Optional[str]:
     # Fallback to default (None means use default behavior)
     return None
 
+def get_user_cache_dir() -> str:
+    """Get the per-user directory for rebuildable caches, outside the config directory"""
+    import os
+    import sys
+    
+    # Electron launcher keeps everything under the user directory
+    user_dir = os.environ.get('HISAABFLOW_USER_DIR')
+    if user_dir:
+        return os.path.join(user_dir, 'cache')
+    
+    if sys.platform == 'win32':
+        base_dir = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+        return os.path.join(base_dir, 'HisaabFlow', 'Cache')
+    if sys.platform == 'darwin':
+        return os.path.expanduser(os.path.join('~', 'Library', 'Caches', 'HisaabFlow'))
+    base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base_dir, 'hisaabflow')
+
 def get_config_dir_for_manager() -> Optional[str]:
     """Get config directory for BankConfigManager with fallback"""
     user_config = get_user_config_dir()
@@ -2,12 +2,14 @@
 Generic CSV Preprocessor - Bank-Agnostic CSV Sanitization
 Handles universal CSV structural issues before parsing, regardless of bank
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import csv
 import re
 import os
 from io import StringIO
 
+from backend.infrastructure.csv_parsing.file_buffer import FileBuffer, open_file_buffer
+
 class GenericCSVPreprocessor:
     """
     Bank-agnostic CSV preprocessor that fixes common CSV structural issues
@@ -24,14 +26,18 @@ class GenericCSVPreprocessor:
     def __init__(self):
         self.debug = True
         
-    def preprocess_csv(self, file_path: str, encoding: str = 'utf-8', skip_empty_row_removal: bool = False) -> Dict:
+    def preprocess_csv(self, file_path: Union[str, FileBuffer], encoding: str = 'utf-8',
+                       skip_empty_row_removal: bool = False) -> Dict:
         """
         Generic CSV preprocessing that works for any bank
         
+        A path is cleaned into a '_cleaned' copy on disk; a FileBuffer is cleaned into
+        an in-memory FileBuffer for that same path, so nothing is written or re-read.
+        
         Returns:
         {
             'success': bool,
-            'processed_file_path': str,
+            'processed_file_path': str or FileBuffer,
             'original_rows': int,
             'processed_rows': int, 
             'issues_fixed': List[str],
@@ -46,7 +52,8 @@ class GenericCSVPreprocessor:
         
         try:
             # Step 1: Read raw file content
-            raw_content = self._read_raw_content(file_path, encoding)
+            with open_file_buffer(file_path) as buffer:
+                raw_content = self._read_raw_content(buffer, encoding)
             original_line_count = len(raw_content.splitlines())
             
             # For absolute positioning banks, do minimal preprocessing to preserve row numbers
@@ -82,8 +89,11 @@ class GenericCSVPreprocessor:
                 processed_row_count = len([line for line in final_lines if line.strip()])
             
             # Step 7: Save processed file
-            processed_file_path = self._create_temp_file(file_path, '_cleaned')
-            self._write_content(processed_file_path, cleaned_content, encoding)
+            processed_file_path = self._create_temp_file(os.fspath(file_path), '_cleaned')
+            if isinstance(file_path, FileBuffer):
+                processed_file_path = FileBuffer.from_text(processed_file_path, cleaned_content, encoding)
+            else:
+                self._write_content(processed_file_path, cleaned_content, encoding)
             
             print(f"   [SUCCESS] Generic preprocessing complete:")
             print(f"      [DATA] Original lines: {original_line_count}")
@@ -114,21 +124,19 @@ class GenericCSVPreprocessor:
                 'warnings': warnings + [f'Preprocessing failed: {str(e)}']
             }
     
-    def _read_raw_content(self, file_path: str, encoding: str = 'utf-8') -> str:
+    def _read_raw_content(self, buffer: FileBuffer, encoding: str = 'utf-8') -> str:
         """Read file with proper encoding handling"""
         try:
             # Try UTF-8 with BOM first
             if encoding == 'utf-8':
                 encoding = 'utf-8-sig'
             
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
+            return buffer.text(encoding)
         except UnicodeDecodeError:
             # Fallback to different encodings
             for fallback_encoding in ['utf-8', 'latin-1', 'cp1252']:
                 try:
-                    with open(file_path, 'r', encoding=fallback_encoding) as f:
-                        return f.read()
+                    return buffer.text(fallback_encoding)
                 except UnicodeDecodeError:
                     continue
             raise Exception("Could not decode file with any common encoding")
@@ -289,7 +297,8 @@ class CSVPreprocessor:
     def __init__(self):
         self.generic_preprocessor = GenericCSVPreprocessor()
     
-    def preprocess_csv(self, file_path: str, bank_type: str, encoding: str = 'utf-8', skip_empty_row_removal: bool = False) -> Dict:
+    def preprocess_csv(self, file_path: Union[str, FileBuffer], bank_type: str, encoding: str = 'utf-8',
+                       skip_empty_row_removal: bool = False) -> Dict:
         """
         Bank-agnostic preprocessing (bank_type parameter ignored)
         """
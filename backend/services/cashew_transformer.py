@@ -2,10 +2,11 @@
 CashewTransformer Service - Clean, standalone data transformation to Cashew format.
 Handles column mapping, data parsing, and universal fallback logic.
 """
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import re
-from datetime import datetime
 import pandas as pd
+from backend.shared.models.transaction_frame import TransactionFrame
+from backend.shared.utils.date_inference import ColumnDateParser
 
 
 class CashewTransformer:
@@ -14,8 +15,32 @@ class CashewTransformer:
     No external dependencies - handles all transformation logic internally.
     """
 
+    # Formats with time are tried first
+    DATETIME_FORMATS = [
+        '%Y-%m-%d %H:%M:%S',  # 2025-04-30 15:23:00
+        '%Y.%m.%d %H:%M:%S',  # 2025.04.30 15:23:00 (Hungarian with time)
+        '%d %b %Y %I:%M %p',  # 30 Apr 2025 3:23 PM
+        '%d %b %Y %H:%M',     # 30 Apr 2025 15:23
+    ]
+    
+    # Date-only formats (00:00:00 time is added)
+    DATE_ONLY_FORMATS = [
+        '%Y-%m-%d',           # 2025-04-30
+        '%Y.%m.%d',           # 2025.04.30 (Hungarian format)
+        '%d.%m.%y',           # 20.02.18 (German format)
+        '%d/%m/%Y',           # 30/04/2025
+        '%m/%d/%Y',           # 04/30/2025
+        '%d-%m-%Y',           # 30-04-2025
+    ]
+    
+    TIME_DIRECTIVES = ['%H', '%I', '%M', '%S', '%p']
+    
+    VALUE_DATE_CACHE_SIZE = 4096
+
     def __init__(self):
         print("[START] [CashewTransformer] Initializing clean standalone transformer...")
+        # Memoizing parsers for parse_date calls without a column parser, by configured format
+        self._value_date_parsers: Dict[Optional[str], ColumnDateParser] = {}
 
     def transform_to_cashew(self, data: List[Dict], column_mapping: Dict[str, str],
                            bank_name: str = "", categorization_rules: List[Dict] = None,
@@ -33,11 +58,27 @@ class CashewTransformer:
         Returns:
             List of transformed Cashew format rows
         """
+        return list(self._cashew_rows(data, column_mapping, bank_name, account_mapping, config))
+
+    def transform_to_cashew_frame(self, data: Union[TransactionFrame, List[Dict]], column_mapping: Dict[str, str],
+                                  bank_name: str = "", account_mapping: Dict = None,
+                                  config: Dict = None) -> TransactionFrame:
+        """
+        Same transformation as transform_to_cashew, with each Cashew row encoded into a
+        frame as it is produced so the transformed rows never exist as a list of dicts.
+        """
+        return TransactionFrame.from_records(self._cashew_rows(data, column_mapping, bank_name, account_mapping, config))
+
+    def _cashew_rows(self, data: Union[TransactionFrame, List[Dict]], column_mapping: Dict[str, str],
+                     bank_name: str, account_mapping: Optional[Dict], config: Optional[Dict]) -> Iterator[Dict]:
         print(f" [CashewTransformer] Starting clean transformation for bank: '{bank_name}'")
         print(f"   [DATA] Input rows: {len(data)}, Column mapping: {column_mapping}")
         print(f"   [DEBUG] Account mapping: {account_mapping}")
         
-        cashew_data = []
+        data = TransactionFrame.coerce(data)
+        valid_rows = 0
+        # One inferred-format, memoizing date parser per (source bank, date column)
+        date_parsers: Dict[Tuple[str, str], ColumnDateParser] = {}
         
         for idx, row in enumerate(data):
             # Get source bank for debugging
@@ -103,7 +144,10 @@ class CashewTransformer:
                             bank_specific_config = config.get(source_bank, {})
                             date_format_from_config = bank_specific_config.get('csv_config', {}).get('date_format')
                         
-                        cashew_row[cashew_col] = self.parse_date(str(value_found), date_format=date_format_from_config)
+                        date_parser = self._get_column_date_parser(date_parsers, data, source_bank, source_col,
+                                                                   date_format_from_config)
+                        cashew_row[cashew_col] = self.parse_date(str(value_found), date_format=date_format_from_config,
+                                                                 date_parser=date_parser)
                         # --- END NEW LOGIC ---
                     elif cashew_col == 'amount':
                         source_value = value_found
@@ -161,7 +205,11 @@ class CashewTransformer:
                             if config and source_bank in config:
                                 bank_specific_config = config.get(source_bank, {})
                                 date_format_from_config = bank_specific_config.get('csv_config', {}).get('date_format')
-                            cashew_row[cashew_field] = self.parse_date(fallback_value, date_format=date_format_from_config)
+                            fallback_col = 'date' if str(row.get('date') or '').strip() else 'backupdate'
+                            date_parser = self._get_column_date_parser(date_parsers, data, source_bank, fallback_col,
+                                                                       date_format_from_config)
+                            cashew_row[cashew_field] = self.parse_date(fallback_value, date_format=date_format_from_config,
+                                                                       date_parser=date_parser)
                         elif cashew_field == 'amount':
                             cashew_row[cashew_field] = self.parse_amount(fallback_value)
                         else:
@@ -186,8 +234,8 @@ class CashewTransformer:
             
             if amount_val and amount_val != '0' and amount_val != 0:
                 # Convert to uppercase for final Cashew format before adding to results
-                final_cashew_row = self._convert_to_final_cashew_format(cashew_row)
-                cashew_data.append(final_cashew_row)
+                valid_rows += 1
+                yield self._convert_to_final_cashew_format(cashew_row)
                 if source_bank == 'Meezan':
                     print(f"   [SUCCESS] Meezan row {idx} INCLUDED with amount '{amount_val}'")
             else:
@@ -196,8 +244,12 @@ class CashewTransformer:
                     print(f"   [CRITICAL] MEEZAN ROW FILTERED! Row data: {cashew_row}")
                     print(f"   [DEBUG] Original row data from input: {data[idx] if idx < len(data) else 'Index out of range'}")
         
-        print(f"   [SUCCESS] Clean transformation complete: {len(cashew_data)} valid rows")
-        return cashew_data
+        for (parser_bank, parser_col), parser in date_parsers.items():
+            if parser.invalid_values:
+                print(f"   [WARNING] {parser.invalid_count} unparseable date value(s) for '{parser_bank}' column "
+                      f"'{parser_col}' left unchanged: {parser.invalid_values[:3]}")
+        
+        print(f"   [SUCCESS] Clean transformation complete: {valid_rows} valid rows")
 
     def resolve_field_with_fallback(self, row, primary_field):
         """
@@ -254,68 +306,50 @@ class CashewTransformer:
             
         return final_row
 
-    def parse_date(self, date_str: str, date_format: Optional[str] = None) -> str:
+    def _get_column_date_parser(self, date_parsers: Dict[Tuple[str, str], ColumnDateParser], data: TransactionFrame,
+                                source_bank: str, source_col: str, date_format: Optional[str]) -> ColumnDateParser:
+        """Date parser for a source bank's date column, with its format inferred from that bank's rows"""
+        parser = date_parsers.get((source_bank, source_col))
+        if parser is None:
+            values = [value for value, row_bank in zip(data.coalesce([source_col, 'date']),
+                                                       data.column('_source_bank', 'unknown'))
+                      if row_bank == source_bank]
+            parser = ColumnDateParser.for_column(values, self.DATETIME_FORMATS + self.DATE_ONLY_FORMATS,
+                                                 configured_format=date_format)
+            date_parsers[(source_bank, source_col)] = parser
+        return parser
+
+    def parse_date(self, date_str: str, date_format: Optional[str] = None,
+                   date_parser: Optional[ColumnDateParser] = None) -> str:
         """
         Parse a date string into standard Cashew format: YYYY-MM-DD HH:MM:SS
+        
+        date_parser is the memoizing parser of the value's column; the configured
+        date_format is tried first otherwise. Unparseable dates are returned unchanged
+        and recorded in the parser's invalid_values.
         """
         if not date_str or str(date_str).strip() == '' or str(date_str).lower() == 'nan':
             return ''
             
         date_str = str(date_str).strip()
         
-        # --- NEW LOGIC ---
-        if date_format:
-            try:
-                dt = datetime.strptime(date_str, date_format)
-                # Check if time info is present in the format string
-                if any(c in date_format for c in ['%H', '%I', '%M', '%S', '%p']):
-                    return dt.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    return dt.strftime('%Y-%m-%d 00:00:00')
-            except (ValueError, TypeError):
-                print(f"[WARNING] Date '{date_str}' did not match configured format '{date_format}'. Falling back.")
-        # --- END NEW LOGIC ---
+        if date_parser is None:
+            date_parser = self._value_date_parsers.get(date_format)
+            if date_parser is None:
+                date_parser = ColumnDateParser(self.DATETIME_FORMATS + self.DATE_ONLY_FORMATS, date_format,
+                                               max_cache_size=self.VALUE_DATE_CACHE_SIZE)
+                self._value_date_parsers[date_format] = date_parser
         
-        try:
-            # Handle common date formats with time
-            datetime_formats = [
-                '%Y-%m-%d %H:%M:%S',  # 2025-04-30 15:23:00
-                '%Y.%m.%d %H:%M:%S',  # 2025.04.30 15:23:00 (Hungarian with time)
-                '%d %b %Y %I:%M %p',  # 30 Apr 2025 3:23 PM
-                '%d %b %Y %H:%M',     # 30 Apr 2025 15:23
-            ]
-            
-            # Try formats with time first
-            for fmt in datetime_formats:
-                try:
-                    dt = datetime.strptime(date_str, fmt)
-                    return dt.strftime('%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    continue
-            
-            # Handle date-only formats (add 00:00:00 time)
-            date_only_formats = [
-                '%Y-%m-%d',           # 2025-04-30
-                '%Y.%m.%d',           # 2025.04.30 (Hungarian format)
-                '%d.%m.%y',           # 20.02.18 (German format)
-                '%d/%m/%Y',           # 30/04/2025
-                '%m/%d/%Y',           # 04/30/2025
-                '%d-%m-%Y',           # 30-04-2025
-            ]
-            
-            for fmt in date_only_formats:
-                try:
-                    dt = datetime.strptime(date_str, fmt)
-                    return dt.strftime('%Y-%m-%d 00:00:00')
-                except ValueError:
-                    continue
-            
+        dt = date_parser.parse(date_str)
+        if dt is None:
             # If no format matches, return original
             return date_str
-            
-        except Exception as e:
-            print(f"[WARNING]  Date parsing error for '{date_str}': {e}")
-            return date_str
+        
+        # Check if time info is present in the format that parsed the value
+        matched_format = date_parser.format_of(date_str) or ''
+        if any(c in matched_format for c in self.TIME_DIRECTIVES):
+            return dt.strftime('%Y-%m-%d %H:%M:%S')
+        return dt.strftime('%Y-%m-%d 00:00:00')
 
     def parse_amount(self, amount_str: str) -> str:
         """
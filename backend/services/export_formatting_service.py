@@ -229,7 +229,9 @@ class ExportFormattingService:
             "potential_transfers": transfer_analysis_raw.get('potential_transfers', []),
             "potential_pairs": transfer_analysis_raw.get('potential_pairs', []),
             "conflicts": transfer_analysis_raw.get('conflicts', []),
-            "flagged_transactions": transfer_analysis_raw.get('flagged_transactions', [])
+            "flagged_transactions": transfer_analysis_raw.get('flagged_transactions', []),
+            # Incremental detection session to continue with the next statement
+            "session_id": transfer_analysis_raw.get('session_id')
         }
     
     def format_transformation_summary(self, csv_data_list: List[Dict[str, Any]], 
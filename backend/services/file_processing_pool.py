@@ -0,0 +1,81 @@
+"""
+Process pool for parsing uploaded files in parallel
+Encoding and dialect detection, pandas parsing and regex cleaning are CPU-bound and
+independent per file, so multi-file uploads are spread over a bounded pool of worker
+processes, each with its own CSVProcessingService
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from backend.services.bank_detection_cache import get_bank_detection_cache
+
+# Upper bound for the default worker count; HISAABFLOW_PARSE_WORKERS overrides it
+DEFAULT_MAX_WORKERS = 4
+
+
+def default_worker_count() -> int:
+    """Workers to use when none are configured; 1 means files are processed serially"""
+    configured = os.environ.get('HISAABFLOW_PARSE_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    return max(1, min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS))
+
+
+# Set in each worker process by _init_worker
+_worker_service = None
+
+
+def _init_worker(config_dir: Optional[str]) -> None:
+    global _worker_service
+    from backend.infrastructure.config.unified_config_service import get_unified_config_service
+    from backend.infrastructure.config.dependency_injection import create_csv_processing_service
+    get_unified_config_service(config_dir)
+    _worker_service = create_csv_processing_service()
+
+
+def process_file_in_worker(file_info: Dict[str, Any], parse_config: Any, enable_cleaning: bool,
+                           cached_detection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """CSVProcessingService.process_single_file, run in a worker process"""
+    # Workers outlive requests, so pick up config files changed since the last file
+    _worker_service.config_service.reload_changed_configs()
+    if cached_detection:
+        # Bank detection cached by the parent's preview step
+        get_bank_detection_cache().set(file_info['original_name'], file_info['temp_path'], cached_detection)
+    return _worker_service.process_single_file(file_info, parse_config, enable_cleaning)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_file_processing_pool(max_workers: int, config_dir: Optional[str] = None) -> ProcessPoolExecutor:
+    """The shared pool, (re)created when missing or sized differently"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Spawned rather than forked: the API server runs requests on threads
+            _pool = ProcessPoolExecutor(max_workers=max_workers,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker, initargs=(config_dir,))
+            _pool_workers = max_workers
+        return _pool
+
+
+def shutdown_file_processing_pool(wait: bool = True) -> None:
+    """Stop the worker processes; the next parallel parse starts a new pool"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(shutdown_file_processing_pool)
@@ -2,18 +2,25 @@
 Multi-CSV parsing service for coordinating CSV processing operations
 """
 import os
-from typing import Any, Dict, List
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
 from backend.shared.models.csv_models import CSVRow, BankDetectionResult
 from decimal import Decimal
 
 from backend.services.export_formatting_service import ExportFormattingService
+from backend.services.bank_detection_cache import get_bank_detection_cache
+from backend.services.file_processing_pool import (
+    default_worker_count, get_file_processing_pool, process_file_in_worker, shutdown_file_processing_pool
+)
 from backend.infrastructure.config.unified_config_service import get_unified_config_service
 
 class MultiCSVService:
     """Service for coordinating multi-CSV parsing operations using focused services"""
     
-    def __init__(self, preview_service=None):
+    def __init__(self, preview_service=None, max_workers: Optional[int] = None):
         self.config_service = get_unified_config_service()
+        # Files processed at once; 1 processes them one after another in this process
+        self.max_workers = max_workers if max_workers is not None else default_worker_count()
         
         # Initialize focused services with preview service for bank detection caching
         from backend.infrastructure.config.dependency_injection import create_csv_processing_service
@@ -44,15 +51,10 @@ class MultiCSVService:
         try:
             results = []
             
-            # Process each file using the focused CSV processing service
-            for i, (file_info, config) in enumerate(zip(file_infos, parse_configs)):
-                print(f"   Processing file {i+1}/{len(file_infos)}: {file_info['file_id']}")
-                
-                # Use the focused CSV processing service
-                processing_result = self.csv_processing_service.process_single_file(
-                    file_info, config, enable_cleaning
-                )
-                
+            # Process the files using the focused CSV processing service, results in input order
+            processing_results = self._process_files(list(zip(file_infos, parse_configs)), enable_cleaning)
+            
+            for processing_result in processing_results:
                 if not processing_result['success']:
                     print(f"      [ERROR] Failed to process file: {processing_result.get('error', 'Unknown error')}")
                     results.append(processing_result)
@@ -97,3 +99,42 @@ class MultiCSVService:
                 "error": str(e)
             }
     
+    def _process_files(self, files: List[tuple], enable_cleaning: bool) -> List[Dict[str, Any]]:
+        """process_single_file for each (file_info, config), in a process pool when several files are given"""
+        workers = min(self.max_workers, len(files))
+        if workers <= 1:
+            return [self._process_file(i, len(files), file_info, config, enable_cleaning)
+                    for i, (file_info, config) in enumerate(files)]
+        
+        print(f"   Processing {len(files)} files in parallel ({self.max_workers} workers)")
+        detection_cache = get_bank_detection_cache()
+        try:
+            pool = get_file_processing_pool(self.max_workers, self.config_service.config_dir)
+            futures = [
+                pool.submit(process_file_in_worker, file_info, config, enable_cleaning,
+                            detection_cache.get(file_info['original_name'], file_info['temp_path']))
+                for file_info, config in files
+            ]
+        except Exception as e:
+            print(f"   [WARNING] Could not start parallel processing ({e}), processing files serially")
+            shutdown_file_processing_pool(wait=False)
+            return [self._process_file(i, len(files), file_info, config, enable_cleaning)
+                    for i, (file_info, config) in enumerate(files)]
+        
+        results = []
+        for i, (future, (file_info, config)) in enumerate(zip(futures, files)):
+            try:
+                results.append(future.result())
+                print(f"   Processed file {i+1}/{len(files)}: {file_info['file_id']}")
+            except Exception as e:
+                # A crashed worker or an unpicklable result only costs this file its parallel run
+                print(f"   [WARNING] Worker failed for {file_info['file_id']} ({e}), processing it here instead")
+                if isinstance(e, BrokenProcessPool):
+                    shutdown_file_processing_pool(wait=False)
+                results.append(self._process_file(i, len(files), file_info, config, enable_cleaning))
+        return results
+    
+    def _process_file(self, index: int, total: int, file_info: Dict[str, Any], config: Any,
+                      enable_cleaning: bool) -> Dict[str, Any]:
+        print(f"   Processing file {index+1}/{total}: {file_info['file_id']}")
+        return self.csv_processing_service.process_single_file(file_info, config, enable_cleaning)
@@ -58,6 +58,8 @@ class TransformationService:
             raw_data: Raw request data from frontend, may include:
                      - csv_data_list: CSV data for transformation
                      - manually_confirmed_pairs: User-confirmed transfer pairs for categorization
+                     - incremental_detection: Only match the posted CSVs against a detection session
+                     - detection_session_id: Session returned by a previous incremental request
             
         Returns:
             dict: Multi-CSV transformation result
@@ -100,7 +102,11 @@ class TransformationService:
             
             # Step 3: Run transfer detection
             print(f"   Step 3: Transfer detection...")
-            transfer_analysis_raw = self.transfer_processing_service.run_transfer_detection(enhanced_result, csv_data_list)
+            detection_session_id = raw_data.get('detection_session_id')
+            incremental_detection = bool(raw_data.get('incremental_detection') or detection_session_id)
+            transfer_analysis_raw = self.transfer_processing_service.run_transfer_detection(
+                enhanced_result, csv_data_list, incremental=incremental_detection, session_id=detection_session_id
+            )
             
             # Step 4: Apply transfer categorization
             print(f"   Step 4: Transfer categorization...")
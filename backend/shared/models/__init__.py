@@ -6,5 +6,6 @@ of the application for type safety and data validation.
 """
 
 from .csv_models import CSVRow, BankDetectionResult
+from .transaction_frame import TransactionFrame
 
-__all__ = ['CSVRow', 'BankDetectionResult']
\ No newline at end of file
+__all__ = ['CSVRow', 'BankDetectionResult', 'TransactionFrame']
\ No newline at end of file
@@ -0,0 +1,446 @@
+"""
+Columnar transaction frame
+Holds transactions as one array per column instead of one dict per row: strings are
+dictionary-encoded as int32 codes over interned values and floats are float64 arrays,
+so pipeline stages read and update whole columns in place and dict rows are only
+built where an API response needs them
+"""
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class _Missing:
+    """Cell of a row that has no such key"""
+
+    __slots__ = ()
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+    def __reduce__(self):
+        return (_Missing, ())
+
+
+MISSING = _Missing()
+
+Positions = Union[Sequence[int], np.ndarray]
+
+
+class _StringColumn:
+    """int32 codes into a list of interned strings; code -1 is a missing cell"""
+
+    kind = 'str'
+    __slots__ = ('codes', 'values', '_lookup')
+
+    def __init__(self, codes: np.ndarray, values: List[str]):
+        self.codes = codes
+        self.values = values
+        self._lookup = {value: code for code, value in enumerate(values)}
+
+    @classmethod
+    def encode(cls, cells: Sequence[Any]) -> '_StringColumn':
+        column = cls(np.empty(0, dtype=np.int32), [])
+        column.codes = np.fromiter((column.code_of(cell) for cell in cells), dtype=np.int32, count=len(cells))
+        return column
+
+    def code_of(self, cell: Any) -> int:
+        if cell is MISSING:
+            return -1
+        code = self._lookup.get(cell)
+        if code is None:
+            code = len(self.values)
+            cell = sys.intern(cell)
+            self.values.append(cell)
+            self._lookup[cell] = code
+        return code
+
+    def accepts(self, cell: Any) -> bool:
+        return cell is MISSING or type(cell) is str
+
+    def cells(self, missing: Any = MISSING) -> List[Any]:
+        table = np.empty(len(self.values) + 1, dtype=object)
+        table[:-1] = self.values
+        table[-1] = missing  # Code -1 picks the last entry
+        return table[self.codes].tolist()
+
+    def cell(self, position: int) -> Any:
+        code = self.codes[position]
+        return self.values[code] if code >= 0 else MISSING
+
+    def present(self) -> np.ndarray:
+        return self.codes >= 0
+
+    def assign(self, positions: Positions, cells: Sequence[Any]) -> None:
+        self.codes[positions] = [self.code_of(cell) for cell in cells]
+
+    def take(self, positions: Positions) -> '_StringColumn':
+        return _StringColumn(self.codes[positions], list(self.values))
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(sys.getsizeof(value) for value in self.values)
+
+
+class _FloatColumn:
+    """float64 values with a mask of the cells that are present"""
+
+    kind = 'float'
+    __slots__ = ('data', 'mask')
+
+    def __init__(self, data: np.ndarray, mask: np.ndarray):
+        self.data = data
+        self.mask = mask
+
+    @classmethod
+    def encode(cls, cells: Sequence[Any]) -> '_FloatColumn':
+        mask = np.fromiter((cell is not MISSING for cell in cells), dtype=bool, count=len(cells))
+        data = np.fromiter((cell if cell is not MISSING else 0.0 for cell in cells), dtype=np.float64,
+                           count=len(cells))
+        return cls(data, mask)
+
+    def accepts(self, cell: Any) -> bool:
+        return cell is MISSING or type(cell) is float
+
+    def cells(self, missing: Any = MISSING) -> List[Any]:
+        cells = self.data.tolist()
+        for position in np.flatnonzero(~self.mask).tolist():
+            cells[position] = missing
+        return cells
+
+    def cell(self, position: int) -> Any:
+        return float(self.data[position]) if self.mask[position] else MISSING
+
+    def present(self) -> np.ndarray:
+        return self.mask.copy()
+
+    def assign(self, positions: Positions, cells: Sequence[Any]) -> None:
+        self.mask[positions] = [cell is not MISSING for cell in cells]
+        self.data[positions] = [cell if cell is not MISSING else 0.0 for cell in cells]
+
+    def take(self, positions: Positions) -> '_FloatColumn':
+        return _FloatColumn(self.data[positions], self.mask[positions])
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.mask.nbytes
+
+
+class _ObjectColumn:
+    """Any other values, as an object array holding MISSING for missing cells"""
+
+    kind = 'object'
+    __slots__ = ('data',)
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    @classmethod
+    def encode(cls, cells: Sequence[Any]) -> '_ObjectColumn':
+        data = np.empty(len(cells), dtype=object)
+        data[:] = cells
+        return cls(data)
+
+    def accepts(self, cell: Any) -> bool:
+        return True
+
+    def cells(self, missing: Any = MISSING) -> List[Any]:
+        cells = self.data.tolist()
+        if missing is not MISSING:
+            cells = [missing if cell is MISSING else cell for cell in cells]
+        return cells
+
+    def cell(self, position: int) -> Any:
+        return self.data[position]
+
+    def present(self) -> np.ndarray:
+        return np.fromiter((cell is not MISSING for cell in self.data), dtype=bool, count=len(self.data))
+
+    def assign(self, positions: Positions, cells: Sequence[Any]) -> None:
+        values = np.empty(len(cells), dtype=object)
+        values[:] = list(cells)
+        self.data[positions] = values
+
+    def take(self, positions: Positions) -> '_ObjectColumn':
+        return _ObjectColumn(self.data[positions])
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + sum(sys.getsizeof(cell) for cell in self.data if cell is not MISSING)
+
+
+_Column = Union[_StringColumn, _FloatColumn, _ObjectColumn]
+
+
+def _encode(cells: Sequence[Any]) -> _Column:
+    """The most compact column holding cells exactly: strings, floats, or anything else"""
+    kinds = {type(cell) for cell in cells if cell is not MISSING}
+    if kinds <= {str}:
+        return _StringColumn.encode(cells)
+    if kinds == {float}:
+        return _FloatColumn.encode(cells)
+    return _ObjectColumn.encode(cells)
+
+
+class TransactionFrame:
+    """
+    Transactions stored column by column. Rows may lack some columns, as dict rows may
+    lack keys; those cells are MISSING and left out of the dicts the frame builds.
+    Columns keep the order their keys were first seen in.
+
+    Iterating the frame or indexing it by position yields dict rows, so row-at-a-time
+    code works on a frame as on a list of dicts while whole-column stages use
+    column(), set_values() and the other column operations.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, _Column]] = None, length: int = 0):
+        self._columns: Dict[str, _Column] = dict(columns or {})
+        self._length = length
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> 'TransactionFrame':
+        """Encode dict rows in one pass; records may be a generator, so a stage's rows never need to be a list"""
+        cells: Dict[str, List[Any]] = {}
+        length = 0
+        for record in records:
+            for key, value in record.items():
+                column = cells.get(key)
+                if column is None:
+                    column = cells[key] = [MISSING] * length
+                column.append(value)
+            length += 1
+            if len(record) != len(cells):
+                for column in cells.values():
+                    if len(column) < length:
+                        column.append(MISSING)
+        return cls({name: _encode(column) for name, column in cells.items()}, length)
+
+    @classmethod
+    def coerce(cls, data: Union['TransactionFrame', Iterable[Mapping[str, Any]]]) -> 'TransactionFrame':
+        """The frame passed in, or one encoded from dict rows"""
+        return data if isinstance(data, TransactionFrame) else cls.from_records(data)
+
+    def like(self, data: Union['TransactionFrame', Iterable[Mapping[str, Any]]]) -> Union['TransactionFrame', List[Dict[str, Any]]]:
+        """This frame if data was a frame, else its rows as dicts, so a stage returns the kind it was given"""
+        return self if isinstance(data, TransactionFrame) else self.to_records()
+
+    @classmethod
+    def concat(cls, frames: Sequence['TransactionFrame']) -> 'TransactionFrame':
+        """Rows of all frames in order; a column missing from a frame is MISSING in its rows"""
+        names: Dict[str, None] = {}
+        for frame in frames:
+            names.update(dict.fromkeys(frame._columns))
+        combined = cls(length=sum(len(frame) for frame in frames))
+        for name in names:
+            cells: List[Any] = []
+            for frame in frames:
+                column = frame._columns.get(name)
+                cells.extend(column.cells() if column is not None else [MISSING] * len(frame))
+            combined._columns[name] = _encode(cells)
+        return combined
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"TransactionFrame({self._length} rows, columns={self.columns})"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the column arrays and distinct string values"""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def kind(self, name: str) -> Optional[str]:
+        """'str', 'float' or 'object' storage of a column, None if there is no such column"""
+        column = self._columns.get(name)
+        return column.kind if column is not None else None
+
+    # Reading
+
+    def column(self, name: str, default: Any = None) -> List[Any]:
+        """A column's values as a list, with default for missing cells (like row.get(name, default))"""
+        column = self._columns.get(name)
+        if column is None:
+            return [default] * self._length
+        return column.cells(default)
+
+    def present(self, name: str) -> np.ndarray:
+        """Boolean mask of the rows that have the column"""
+        column = self._columns.get(name)
+        if column is None:
+            return np.zeros(self._length, dtype=bool)
+        return column.present()
+
+    def coalesce(self, names: Sequence[str], default: Any = None) -> List[Any]:
+        """Per row, the value of the first of names the row has, like nested row.get calls"""
+        result = [default] * self._length
+        filled = np.zeros(self._length, dtype=bool)
+        for name in names:
+            column = self._columns.get(name)
+            if column is None:
+                continue
+            cells = column.cells()
+            for position in np.flatnonzero(column.present() & ~filled).tolist():
+                result[position] = cells[position]
+            filled |= column.present()
+        return result
+
+    def factorize(self, name: str, default: Any = None) -> Tuple[np.ndarray, List[Any]]:
+        """
+        (codes, uniques) of a column in order of first appearance, with default for
+        missing cells: uniques[codes[i]] is row i's value. Lets a stage work once per
+        distinct value, e.g. once per account instead of once per transaction.
+        """
+        column = self._columns.get(name)
+        if column is None:
+            if not self._length:
+                return np.zeros(0, dtype=np.intp), []
+            return np.zeros(self._length, dtype=np.intp), [default]
+        if isinstance(column, _StringColumn):
+            raw_codes = column.codes.astype(np.intp)
+            table = list(column.values) + [default]
+            raw_codes[raw_codes < 0] = len(column.values)
+            used, first_rows, inverse = np.unique(raw_codes, return_index=True, return_inverse=True)
+            order = np.argsort(first_rows, kind='stable')
+            rank = np.empty(len(order), dtype=np.intp)
+            rank[order] = np.arange(len(order))
+            return rank[inverse.reshape(-1)], [table[code] for code in used[order].tolist()]
+        codes = np.empty(self._length, dtype=np.intp)
+        lookup: Dict[Any, int] = {}
+        uniques: List[Any] = []
+        for position, cell in enumerate(column.cells(default)):
+            code = lookup.get(cell)
+            if code is None:
+                code = lookup[cell] = len(uniques)
+                uniques.append(cell)
+            codes[position] = code
+        return codes, uniques
+
+    def get(self, position: int, name: str, default: Any = None) -> Any:
+        column = self._columns.get(name)
+        cell = column.cell(position) if column is not None else MISSING
+        return default if cell is MISSING else cell
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """One row as a dict"""
+        if not -self._length <= position < self._length:
+            raise IndexError(f"row {position} out of range for {self._length} rows")
+        position %= self._length
+        row = {}
+        for name, column in self._columns.items():
+            cell = column.cell(position)
+            if cell is not MISSING:
+                row[name] = cell
+        return row
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """A row as a dict, or a list of them for a slice (as data[0] and data[:10] on dict rows)"""
+        if isinstance(position, slice):
+            return self.records(np.arange(self._length)[position])
+        return self.record(position)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Dict rows, built one at a time"""
+        names = list(self._columns)
+        columns = [column.cells() for column in self._columns.values()]
+        complete = all(bool(column.present().all()) for column in self._columns.values())
+        for cells in zip(*columns):
+            if complete:
+                yield dict(zip(names, cells))
+            else:
+                yield {name: cell for name, cell in zip(names, cells) if cell is not MISSING}
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """All rows as dicts, for API responses and callers that still take dict rows"""
+        return list(self)
+
+    def records(self, positions: Positions) -> List[Dict[str, Any]]:
+        """The rows at positions as dicts"""
+        return self.take(positions).to_records()
+
+    # Writing, in place
+
+    def set_column(self, name: str, values: Sequence[Any]) -> None:
+        """Replace or append a whole column; MISSING values leave those rows without it"""
+        if len(values) != self._length:
+            raise ValueError(f"column '{name}' has {len(values)} values for {self._length} rows")
+        self._columns[name] = _encode(list(values))
+
+    def fill(self, name: str, value: Any) -> None:
+        """Set a column to the same value in every row"""
+        if type(value) is str:
+            self._columns[name] = _StringColumn(np.zeros(self._length, dtype=np.int32), [sys.intern(value)])
+        else:
+            self.set_column(name, [value] * self._length)
+
+    def set_values(self, name: str, positions: Positions, values: Sequence[Any]) -> None:
+        """Set a column at some rows, adding the column (missing elsewhere) if needed"""
+        positions = np.asarray(positions, dtype=np.intp)
+        values = list(values)
+        if len(positions) != len(values):
+            raise ValueError(f"{len(values)} values for {len(positions)} positions")
+        if not len(positions):
+            return
+        column = self._columns.get(name)
+        if column is None:
+            cells: List[Any] = [MISSING] * self._length
+            for position, value in zip(positions.tolist(), values):
+                cells[position] = value
+            self._columns[name] = _encode(cells)
+            return
+        if not all(column.accepts(value) for value in values):
+            column = self._columns[name] = _ObjectColumn.encode(column.cells())
+        column.assign(positions, values)
+
+    def map_column(self, name: str, func: Callable[[Any], Any]) -> None:
+        """Replace each present cell of a column with func(cell)"""
+        column = self._columns.get(name)
+        if column is None:
+            return
+        cells = column.cells()
+        self._columns[name] = _encode([cell if cell is MISSING else func(cell) for cell in cells])
+
+    def rename_columns(self, mapping: Mapping[str, str]) -> None:
+        """
+        Rename columns as rebuilding every row with {mapping.get(k, k): v} would: when
+        several columns get one name, it keeps the first position and the last value.
+        """
+        renamed: Dict[str, _Column] = {}
+        for name, column in self._columns.items():
+            new_name = mapping.get(name, name)
+            earlier = renamed.get(new_name)
+            if earlier is None:
+                renamed[new_name] = column
+                continue
+            cells = earlier.cells()
+            for position, cell in enumerate(column.cells()):
+                if cell is not MISSING:
+                    cells[position] = cell
+            renamed[new_name] = _encode(cells)
+        self._columns = renamed
+
+    def keep_rows(self, mask: np.ndarray) -> None:
+        """Drop the rows where mask is False"""
+        positions = np.flatnonzero(mask)
+        self._columns = {name: column.take(positions) for name, column in self._columns.items()}
+        self._length = len(positions)
+
+    def take(self, positions: Positions) -> 'TransactionFrame':
+        """A new frame with the rows at positions, in that order"""
+        positions = np.asarray(positions, dtype=np.intp)
+        return TransactionFrame({name: column.take(positions) for name, column in self._columns.items()},
+                                len(positions))
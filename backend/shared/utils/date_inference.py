@@ -0,0 +1,148 @@
+"""
+Per-column date format inference with memoized parsing
+
+Bank statements use a single date format per column, so instead of trying every
+known strptime format on every value, a column is sampled once to pick its format
+(the bank's configured date_format wins when it fits the sample). Values are then
+parsed with that one format, and results are memoized because daily statements
+repeat the same date string many times.
+
+Values that cannot be parsed are returned as None and recorded in invalid_values,
+so callers can flag them instead of silently substituting a default date.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_SAMPLE_SIZE = 50
+
+# Invalid values kept for reporting; invalid_count keeps counting past this
+MAX_INVALID_VALUES = 100
+
+_EMPTY_VALUES = ('', 'nan', 'none', 'null', 'nat')
+
+
+def normalize_date_value(value) -> str:
+    """Strip a raw date value; empty markers such as 'nan' become ''"""
+    if value is None:
+        return ''
+    value_str = str(value).strip()
+    return '' if value_str.lower() in _EMPTY_VALUES else value_str
+
+
+def infer_date_format(values: Iterable, candidate_formats: Sequence[str],
+                      configured_format: Optional[str] = None,
+                      sample_size: int = DEFAULT_SAMPLE_SIZE) -> Optional[str]:
+    """
+    Pick the strptime format for a column from a sample of its distinct values.
+
+    The configured format is used when it parses the whole sample. Otherwise the
+    candidate that parses the most sampled values wins, earlier candidates winning
+    ties. Returns None when nothing parses.
+    """
+    sample: List[str] = []
+    seen = set()
+    for value in values:
+        value_str = normalize_date_value(value)
+        if value_str and value_str not in seen:
+            seen.add(value_str)
+            sample.append(value_str)
+            if len(sample) >= sample_size:
+                break
+
+    if not sample:
+        return configured_format
+
+    if configured_format and _count_parsed(sample, configured_format) == len(sample):
+        return configured_format
+
+    best_format = None
+    best_count = 0
+    for fmt in candidate_formats:
+        count = _count_parsed(sample, fmt)
+        if count > best_count:
+            best_format, best_count = fmt, count
+            if count == len(sample):
+                break
+    return best_format
+
+
+def _count_parsed(sample: List[str], fmt: str) -> int:
+    count = 0
+    for value in sample:
+        try:
+            datetime.strptime(value, fmt)
+            count += 1
+        except ValueError:
+            pass
+    return count
+
+
+class ColumnDateParser:
+    """
+    Parses the values of one date column with its inferred format.
+
+    Values the inferred format rejects are retried against the configured and
+    candidate formats, so a stray differently formatted row still parses. Every
+    result, including failures, is memoized per distinct string.
+    """
+
+    def __init__(self, candidate_formats: Sequence[str], configured_format: Optional[str] = None,
+                 date_format: Optional[str] = None, max_cache_size: Optional[int] = None):
+        self.candidate_formats = list(candidate_formats)
+        self.configured_format = configured_format
+        self.date_format = date_format or configured_format
+        # Long-lived parsers (not tied to one column) bound their memo; None means unbounded
+        self.max_cache_size = max_cache_size
+        self.invalid_values: List[str] = []
+        self.invalid_count = 0
+        self._cache: Dict[str, Optional[datetime]] = {}
+        # Which format parsed each value; used to tell callers whether time is present
+        self._formats: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def for_column(cls, values: Iterable, candidate_formats: Sequence[str],
+                   configured_format: Optional[str] = None,
+                   sample_size: int = DEFAULT_SAMPLE_SIZE) -> 'ColumnDateParser':
+        """Build a parser whose format is inferred from the column's values"""
+        date_format = infer_date_format(values, candidate_formats, configured_format, sample_size)
+        return cls(candidate_formats, configured_format, date_format)
+
+    def parse(self, value) -> Optional[datetime]:
+        """Parse one value; None if it is empty or matches no known format"""
+        if isinstance(value, datetime):
+            return value
+        value_str = normalize_date_value(value)
+        if not value_str:
+            return None
+        try:
+            return self._cache[value_str]
+        except KeyError:
+            pass
+
+        parsed, fmt = self._parse_uncached(value_str)
+        if self.max_cache_size is not None and len(self._cache) >= self.max_cache_size:
+            self._cache.clear()
+            self._formats.clear()
+        self._cache[value_str] = parsed
+        self._formats[value_str] = fmt
+        if parsed is None:
+            self.invalid_count += 1
+            if len(self.invalid_values) < MAX_INVALID_VALUES:
+                self.invalid_values.append(value_str)
+        return parsed
+
+    def format_of(self, value) -> Optional[str]:
+        """The format that parsed value (after parse() has seen it)"""
+        return self._formats.get(normalize_date_value(value))
+
+    def _parse_uncached(self, value_str: str):
+        tried = set()
+        for fmt in (self.date_format, self.configured_format, *self.candidate_formats):
+            if not fmt or fmt in tried:
+                continue
+            tried.add(fmt)
+            try:
+                return datetime.strptime(value_str, fmt), fmt
+            except ValueError:
+                continue
+        return None, None
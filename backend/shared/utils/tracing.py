@@ -0,0 +1,187 @@
+"""
+Structured tracing for hot code paths
+
+Modules get a Tracer once at import time and guard every trace call with one of
+its level flags, so nothing is formatted or written while tracing is off:
+
+    _trace = get_tracer('transfer_detection')
+    ...
+    if _trace.debug:
+        _trace.event('candidate_rejected', reason='date', hours_diff=hours_diff)
+
+Tracing is configured per module through HISAABFLOW_TRACE, e.g.
+"transfer_detection=debug,bank_detection=info" or "*=trace". Events go to an
+in-memory ring buffer tagged with the current trace id (one per API request, see
+start_trace), and optionally to a JSON lines file (HISAABFLOW_TRACE_FILE) and to
+the console (HISAABFLOW_TRACE_ECHO=1).
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Union
+
+# Same numeric values as the logging module, plus TRACE for per-candidate detail
+LEVELS = {
+    'off': 100,
+    'error': 40,
+    'warning': 30,
+    'info': 20,
+    'debug': 10,
+    'trace': 5,
+}
+
+DEFAULT_BUFFER_SIZE = 10000
+
+_current_trace_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('hisaabflow_trace_id', default=None)
+
+
+def _parse_level(level: Union[str, int]) -> int:
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown trace level '{level}'. Use one of: {', '.join(LEVELS)}")
+
+
+class TraceSink:
+    """Ring buffer of trace events, with optional JSON lines file and console output"""
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, file_path: Optional[str] = None,
+                 echo: bool = False):
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self.file_path = file_path
+        self.echo = echo
+
+    def write(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._events.append(event)
+            if self.file_path:
+                with open(self.file_path, 'a', encoding='utf-8') as trace_file:
+                    trace_file.write(json.dumps(event, default=str) + '\n')
+        if self.echo:
+            fields = ', '.join(f"{key}={value}" for key, value in event['fields'].items())
+            print(f"TRACE {event['module']} {event['event']}: {fields}")
+
+    def events(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Buffered events, optionally only those of one trace"""
+        with self._lock:
+            if trace_id is None:
+                return list(self._events)
+            return [event for event in self._events if event['trace_id'] == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+class Tracer:
+    """
+    Per-module tracer. The error/warning/info/debug/trace flags are plain
+    attributes, recomputed when tracing is configured, so checking them in a
+    loop costs a single attribute lookup.
+    """
+
+    def __init__(self, module: str, level: int, sink: TraceSink):
+        self.module = module
+        self.sink = sink
+        self.set_level(level)
+
+    def set_level(self, level: int) -> None:
+        self.level = level
+        self.error = level <= LEVELS['error']
+        self.warning = level <= LEVELS['warning']
+        self.info = level <= LEVELS['info']
+        self.debug = level <= LEVELS['debug']
+        self.trace = level <= LEVELS['trace']
+        self.enabled = self.error
+
+    def event(self, event: str, level: str = 'debug', **fields: Any) -> None:
+        """Record a structured event; callers check the level flag first"""
+        self.sink.write({
+            'time': time.time(),
+            'trace_id': _current_trace_id.get(),
+            'module': self.module,
+            'level': level,
+            'event': event,
+            'fields': fields,
+        })
+
+
+_sink = TraceSink(
+    buffer_size=int(os.environ.get('HISAABFLOW_TRACE_BUFFER', DEFAULT_BUFFER_SIZE)),
+    file_path=os.environ.get('HISAABFLOW_TRACE_FILE') or None,
+    echo=os.environ.get('HISAABFLOW_TRACE_ECHO', '').lower() in ('1', 'true', 'yes'),
+)
+_tracers: Dict[str, Tracer] = {}
+_module_levels: Dict[str, int] = {}
+_default_level = LEVELS['off']
+
+
+def get_tracer(module: str) -> Tracer:
+    """Get the shared tracer for a module name such as 'transfer_detection'"""
+    tracer = _tracers.get(module)
+    if tracer is None:
+        tracer = Tracer(module, _module_levels.get(module, _default_level), _sink)
+        _tracers[module] = tracer
+    return tracer
+
+
+def configure_tracing(spec: Union[str, Dict[str, Union[str, int]], None]) -> None:
+    """
+    Set trace levels from "module=level,..." (or a dict); "*" sets the default
+    for all other modules. None or "" turns tracing off everywhere.
+    """
+    global _default_level
+
+    if isinstance(spec, str):
+        levels = {}
+        for item in spec.split(','):
+            if not item.strip():
+                continue
+            module, _, level = item.partition('=')
+            levels[module.strip()] = level or 'debug'
+    else:
+        levels = dict(spec or {})
+
+    _module_levels.clear()
+    _default_level = LEVELS['off']
+    for module, level in levels.items():
+        if module == '*':
+            _default_level = _parse_level(level)
+        else:
+            _module_levels[module] = _parse_level(level)
+
+    for module, tracer in _tracers.items():
+        tracer.set_level(_module_levels.get(module, _default_level))
+
+
+def tracing_enabled() -> bool:
+    """True if any module traces at error level or finer"""
+    if _default_level < LEVELS['off']:
+        return True
+    return any(level < LEVELS['off'] for level in _module_levels.values())
+
+
+def start_trace(trace_id: Optional[str] = None) -> str:
+    """Tag events recorded in the current context (e.g. one API request) with a trace id"""
+    trace_id = trace_id or uuid.uuid4().hex
+    _current_trace_id.set(trace_id)
+    return trace_id
+
+
+def get_trace(trace_id: str) -> List[Dict[str, Any]]:
+    """Buffered events of one trace, oldest first"""
+    return _sink.events(trace_id)
+
+
+def get_trace_sink() -> TraceSink:
+    return _sink
+
+
+configure_tracing(os.environ.get('HISAABFLOW_TRACE', ''))
@@ -0,0 +1,31 @@
+"""
+Shared test setup: config snapshots go to temporary paths, never to the user
+cache directory, including for services created while tests are collected.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_session_snapshot_dir = None
+
+
+def pytest_configure(config):
+    global _session_snapshot_dir
+    _session_snapshot_dir = tempfile.mkdtemp(prefix='hisaabflow-snapshot-')
+    os.environ['HISAABFLOW_CONFIG_SNAPSHOT'] = os.path.join(_session_snapshot_dir, 'config_snapshot.pickle')
+
+
+def pytest_unconfigure(config):
+    if _session_snapshot_dir:
+        shutil.rmtree(_session_snapshot_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def config_snapshot_path(tmp_path, monkeypatch):
+    """Each test gets its own snapshot file"""
+    path = tmp_path / 'config_snapshot.pickle'
+    monkeypatch.setenv('HISAABFLOW_CONFIG_SNAPSHOT', str(path))
+    return path
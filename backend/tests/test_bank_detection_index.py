@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the compiled bank detection index against per-bank, per-pattern scoring.
+"""
+
+import re
+
+import pytest
+
+from backend.infrastructure.config.bank_detection_index import BankDetectionIndex
+from backend.infrastructure.config.unified_config_service import BankDetectionInfo, UnifiedConfigService
+
+
+def reference_confidence(filename, content, headers, info):
+    """BankDetector._calculate_confidence before the detection index"""
+    filename_score = 0.0
+    for pattern in info.filename_patterns:
+        score = 0.0
+        if pattern.startswith('*') and pattern.endswith('*') and pattern.count('*') == 2:
+            if pattern[1:-1].lower() in filename.lower():
+                score = 0.9
+        elif any(c in pattern for c in ['^', '$', '\\d', '\\w', '+', '?', '[', ']', '(', ')']) or (
+                pattern.count('*') > 0 and not (pattern.startswith('*') and pattern.endswith('*'))):
+            try:
+                if re.match(pattern, filename, re.IGNORECASE):
+                    score = 1.0
+            except re.error:
+                if pattern.lower() in filename.lower():
+                    score = 0.7
+        elif pattern.lower() in filename.lower():
+            score = 0.8
+        filename_score = max(filename_score, score)
+
+    signatures = info.content_signatures
+    content_score = (sum(1 for s in signatures if content.lower().find(s.lower()) >= 0) / len(signatures)
+                     if signatures else 0.0)
+
+    header_score = 0.0
+    if info.required_headers and headers:
+        headers_lower = [h.lower().strip() for h in headers]
+        matches = sum(1 for required in info.required_headers
+                      if any(required.lower().strip() in header for header in headers_lower))
+        header_score = matches / len(info.required_headers)
+
+    confidence, reasons = 0.0, []
+    if filename_score > 0:
+        confidence += filename_score * 0.2
+        reasons.append(f"filename_match({filename_score:.1f})")
+    if content_score > 0:
+        confidence += content_score * 0.4
+        reasons.append(f"content_signature({content_score:.1f})")
+    if header_score > 0:
+        confidence += header_score * 0.4
+        reasons.append(f"header_match({header_score:.1f})")
+    return confidence, reasons
+
+
+def reference_detect(detection_patterns, filename, content_sample=None):
+    """UnifiedConfigService.detect_bank before the detection index"""
+    matches = []
+    for bank_name, info in detection_patterns.items():
+        confidence = 0.0
+        for pattern in info.filename_patterns:
+            if pattern.startswith('^') or pattern.startswith('.*'):
+                try:
+                    if re.match(pattern, filename) or re.match(pattern, filename.lower()):
+                        confidence += 100 * info.confidence_weight
+                except re.error:
+                    if pattern.lower() in filename.lower():
+                        confidence += len(pattern) * info.confidence_weight
+            elif pattern.lower() in filename.lower():
+                confidence += len(pattern) * info.confidence_weight
+        if content_sample and info.content_signatures:
+            for signature in info.content_signatures:
+                if signature.lower() in content_sample.lower():
+                    confidence += 50 * info.confidence_weight
+        if confidence > 0:
+            matches.append((bank_name, confidence))
+    matches.sort(key=lambda x: x[1], reverse=True)
+    return matches[0][0] if matches else None
+
+
+SYNTHETIC_PATTERNS = {
+    'alpha': BankDetectionInfo('alpha', 'Alpha', ['Alpha Bank', 'IBAN', ''], ['Date', ' Amount ', 'Ref'],
+                               ['*alpha*', '^alpha_\\d+\\.csv$', 'bad[regex', 'statement'], 1.5),
+    'beta': BankDetectionInfo('beta', 'Beta', ['beta', 'iban'], ['Amount', 'Balance'],
+                              ['.*beta.*', 'beta*.csv', 'stat'], 1.0),
+    'gamma': BankDetectionInfo('gamma', 'Gamma', [], [], ['.*(broken', 'gamma'], 0.5),
+}
+
+
+class TestBankDetectionIndex:
+    """Index scores must equal scoring every pattern of every bank"""
+
+    @pytest.mark.parametrize('filename,content,headers', [
+        ('alpha_123.csv', 'Alpha Bank statement, IBAN DE00', ['Date', 'Amount', 'Reference']),
+        ('ALPHA_statement.CSV', '', []),
+        ('beta_2024.csv', 'BETA iban', ['Transaction Amount', 'balance']),
+        ('bad[regex.csv', 'nothing here', ['x']),
+        ('my_gamma.csv', 'gamma', ['']),
+        ('unrelated.txt', 'Alpha BankIBAN', ['date\x00amount']),
+    ])
+    def test_synthetic_patterns_match_reference(self, filename, content, headers):
+        index = BankDetectionIndex(SYNTHETIC_PATTERNS)
+        for score in index.score_banks(filename, content, headers):
+            expected = reference_confidence(filename, content, headers, SYNTHETIC_PATTERNS[score.bank_name])
+            assert (score.confidence, score.reasons) == expected, score.bank_name
+        for sample in (None, content):
+            assert index.detect(filename, sample) == reference_detect(SYNTHETIC_PATTERNS, filename, sample)
+
+    def test_real_configs_match_reference(self):
+        service = UnifiedConfigService()
+        detection_patterns = service.get_detection_patterns()
+        index = service.get_detection_index()
+        samples = [(f'{bank_name}_statement.csv', ' '.join(info.content_signatures), info.required_headers)
+                   for bank_name, info in detection_patterns.items()]
+        samples.append(('transactions.csv', '', []))
+        for filename, content, headers in samples:
+            for score in index.score_banks(filename, content, headers):
+                expected = reference_confidence(filename, content, headers, detection_patterns[score.bank_name])
+                assert (score.confidence, score.reasons) == expected, (filename, score.bank_name)
+            assert service.detect_bank(filename, content) == reference_detect(detection_patterns, filename, content)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
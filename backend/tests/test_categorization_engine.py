@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the compiled categorization engine against per-pattern regex matching.
+"""
+
+import re
+from functools import lru_cache
+
+import pytest
+
+from backend.infrastructure.config.categorization_engine import (
+    APP_RESERVED_SECTIONS, CategorizationRule, CategorizationTier, LiteralAutomaton
+)
+from backend.infrastructure.config.unified_config_service import UnifiedConfigService
+
+
+@lru_cache(maxsize=None)
+def reference_regex(pattern):
+    """Regex categorize_merchant_with_debug searched per pattern before compilation, None if invalid"""
+    try:
+        if any(char in pattern for char in ['.*', '|', '\\', '^', '$', '[', ']', '{', '}', '(', ')', '+', '?']):
+            return re.compile(pattern.lower())
+        return re.compile(r'\b' + re.escape(pattern.lower()) + r'\b')
+    except re.error:
+        return None
+
+
+def reference_pattern_matches(pattern, merchant_lower):
+    regex = reference_regex(pattern)
+    if regex is None:
+        return pattern.lower() in merchant_lower
+    return bool(regex.search(merchant_lower))
+
+
+def reference_first_match(patterns, merchant):
+    merchant_lower = merchant.lower()
+    for pattern in sorted(patterns, key=len, reverse=True):
+        if reference_pattern_matches(pattern, merchant_lower):
+            return pattern
+    return None
+
+
+def tier_first_match(patterns, merchant):
+    tier = CategorizationTier([CategorizationRule(p, 'Category', 'test') for p in patterns], 'test')
+    rule = tier.match(merchant.lower())
+    return rule.pattern if rule else None
+
+
+class TestCategorizationEngine:
+    """Compiled tiers must pick the same pattern as trying patterns one by one"""
+
+    def test_automaton_reports_overlapping_literals(self):
+        automaton = LiteralAutomaton(['he', 'she', 'hers', 'his'])
+        found = {(automaton.literals[literal_id], end) for literal_id, end in automaton.find_all('ushers')}
+        assert found == {('she', 4), ('he', 4), ('hers', 6)}
+
+    def test_word_literal_and_regex_edge_cases(self):
+        patterns = ['Uber', 'Uber Eats', 'C&A', '(Gap', 'Netflix.*|Disney.*', 'Bad[regex', 'Amazon.com.*',
+                    '^Spotify', 'Fee', '.*', 'café']
+        merchants = ['uber', 'Ubereats', 'uber eats order', 'C&A store', 'xc&a', 'a(gap', '(gap sale',
+                     'disney+', 'bad[regex', 'amazonxcom', 'my spotify', 'Spotify AB', 'fees', 'fee_', 'fee-1',
+                     'Café Mocha', 'cafés', '']
+        for merchant in merchants:
+            assert tier_first_match(patterns, merchant) == reference_first_match(patterns, merchant), merchant
+            # Without the catch-all '.*' the lower ranked literals decide
+            assert tier_first_match(patterns[:-2], merchant) == reference_first_match(patterns[:-2], merchant), merchant
+
+    def test_real_configs_match_reference(self):
+        service = UnifiedConfigService()
+        app_config = service._app_config
+        app_patterns = [pattern for section in app_config.sections() if section not in APP_RESERVED_SECTIONS
+                        for pattern in app_config[section]]
+        app_defaults = app_config['default_category_rules'] if 'default_category_rules' in app_config else {}
+        assert app_patterns
+
+        # Merchant strings built from the patterns themselves hit every literal and its boundaries
+        merchants = ['Card transaction of 12.50 EUR issued by Lidl Berlin', 'Outgoing fund transfer to John',
+                     'Netflix.com Monthly', 'UBER *TRIP', 'Random merchant 123']
+        for pattern in app_patterns[::3]:
+            text = re.sub(r'[.*^$\\\[\](){}+?]', '', pattern.split('|')[0])
+            merchants.extend([text, f'paid {text} ltd', f'x{text}x'])
+
+        for bank_name in service.list_banks():
+            bank_config = service.get_bank_config(bank_name)
+            for merchant in merchants[:300]:
+                result = service.categorize_merchant_with_debug(bank_name, merchant)
+                expected = (reference_first_match(bank_config.categorization_rules, merchant)
+                            or reference_first_match(bank_config.default_category_rules, merchant)
+                            or reference_first_match(app_patterns, merchant)
+                            or reference_first_match(app_defaults, merchant))
+                assert (result['pattern'] if result else None) == expected, (bank_name, merchant)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test compiled conditional overrides against per-row rule dict evaluation.
+"""
+
+import random
+
+import pytest
+
+from backend.infrastructure.config.conditional_override_rules import ConditionalOverrideRules
+
+
+def reference_override(rules, row):
+    """Rule dict evaluation as _apply_conditional_description_overrides did it per row"""
+    for rule in rules:
+        amount_val = row.get('Amount')
+        note_val = row.get('Note', '')
+        current_title = row.get('Title', '')
+        if isinstance(amount_val, str):
+            try:
+                amount_val = float(amount_val)
+            except ValueError:
+                continue
+        numeric = isinstance(amount_val, (int, float))
+        checks = [('if_amount_min', lambda t: amount_val >= t), ('if_amount_max', lambda t: amount_val <= t),
+                  ('if_amount_less_than', lambda t: amount_val < t), ('if_amount_greater_than', lambda t: amount_val > t),
+                  ('if_amount_equals', lambda t: amount_val == t)]
+        met = all(numeric and check(float(rule[key])) for key, check in checks if key in rule)
+        if met and 'if_note_equals' in rule and note_val != rule['if_note_equals']:
+            met = False
+        if met and 'if_note_contains' in rule and rule['if_note_contains'].lower() not in note_val.lower():
+            met = False
+        if met and 'if_description_contains' in rule and rule['if_description_contains'].lower() not in current_title.lower():
+            met = False
+        if met:
+            new_title = rule.get('set_description')
+            if new_title and current_title != new_title:
+                return new_title
+    return None
+
+
+RULES = [
+    {'name': 'ride_hailing_raast', 'set_description': 'Ride Hailing Services', 'if_amount_min': '-2000',
+     'if_amount_max': '-0.01', 'if_note_equals': 'Raast Out', 'if_description_contains': 'Outgoing fund transfer to'},
+    {'name': 'refund', 'set_description': 'Refund', 'if_amount_greater_than': '0', 'if_note_contains': 'REVERSAL'},
+    {'name': 'already', 'set_description': 'Fee', 'if_description_contains': 'fee'},
+    {'name': 'fee', 'set_description': 'Bank Fee', 'if_amount_less_than': '0', 'if_amount_equals': '-1.5'},
+    {'name': 'empty', 'set_description': '', 'if_note_contains': 'x'},
+]
+
+
+class TestConditionalOverrideRules:
+    """Compiled overrides must pick the same description as evaluating rule dicts per row"""
+
+    def test_randomized_rows_match_reference(self):
+        rng = random.Random(7)
+        amounts = [-2500, -2000, -150.0, '-150', '-0.01', 0, 12.5, '12.5', -1.5, '-1.5', 'n/a', None, True]
+        notes = ['Raast Out', 'raast out', 'Card reversal', 'REVERSAL', '', 'x']
+        titles = ['Outgoing fund transfer to Ali', 'OUTGOING FUND TRANSFER TO', 'Fee', 'Monthly fee', 'Shop', '']
+        rows = [{'Amount': rng.choice(amounts), 'Note': rng.choice(notes), 'Title': rng.choice(titles)}
+                for _ in range(500)]
+
+        compiled = ConditionalOverrideRules('test', RULES)
+        results = compiled.apply([r['Amount'] for r in rows], [r['Note'] for r in rows], [r['Title'] for r in rows])
+        for row, rule in zip(rows, results):
+            assert (rule.set_description if rule else None) == reference_override(RULES, row), row
+
+    def test_invalid_threshold_never_matches(self):
+        compiled = ConditionalOverrideRules('test', [{'name': 'bad', 'set_description': 'X', 'if_amount_min': 'abc'}])
+        assert [rule.name for rule in compiled.invalid_rules] == ['bad']
+        assert compiled.apply([5], [''], ['Title']) == [None]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
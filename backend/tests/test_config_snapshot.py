@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk config snapshot used for fast cold starts.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+
+import pytest
+
+from backend.api.models import ParseConfig
+from backend.infrastructure.config import config_snapshot, unified_config_service
+from backend.infrastructure.config.dependency_injection import create_csv_processing_service
+from backend.infrastructure.config.unified_config_service import UnifiedConfigService
+from backend.infrastructure.csv_parsing import ParseCache
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_data')
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    source = UnifiedConfigService().config_dir
+    os.remove(os.environ['HISAABFLOW_CONFIG_SNAPSHOT'])
+    target = tmp_path / 'configs'
+    target.mkdir()
+    for file_name in os.listdir(source):
+        if file_name.endswith('.conf'):
+            shutil.copy(os.path.join(source, file_name), target)
+    return str(target)
+
+
+def restored(service):
+    return service.get_detection_index() is not None and set(service._snapshot_bank_configs) == set(service.list_banks())
+
+
+class TestConfigSnapshot:
+    """A current snapshot replaces parsing; any .conf change rebuilds it"""
+
+    def test_snapshot_restores_identical_state(self, config_dir, config_snapshot_path):
+        built = UnifiedConfigService(config_dir)
+        assert config_snapshot_path.exists()
+        assert all(name.endswith('.conf') for name in os.listdir(config_dir))
+
+        service = UnifiedConfigService(config_dir)
+        assert restored(service)
+        for bank_name in built.list_banks():
+            assert service.get_bank_config(bank_name) == built.get_bank_config(bank_name)
+            for description in ['Card transaction of 3.00 EUR issued by Lidl', 'Sent money to John Smith', 'Netflix']:
+                assert (service.categorize_merchant_with_debug(bank_name, description)
+                        == built.categorize_merchant_with_debug(bank_name, description))
+                assert (service.apply_description_cleaning(bank_name, description)
+                        == built.apply_description_cleaning(bank_name, description))
+                assert (service.match_transfer_pattern(bank_name, description)
+                        == built.match_transfer_pattern(bank_name, description))
+        assert service.detect_bank('wise_statement.csv') == built.detect_bank('wise_statement.csv')
+
+    def test_changed_conf_rebuilds_snapshot(self, config_dir):
+        UnifiedConfigService(config_dir)
+        with open(os.path.join(config_dir, 'app.conf'), 'a') as f:
+            f.write('\n[SnapshotTestCategory]\nZzsnapshotshop\n')
+
+        service = UnifiedConfigService(config_dir)
+        assert service.categorize_merchant('wise', 'Zzsnapshotshop') == 'SnapshotTestCategory'
+        assert restored(UnifiedConfigService(config_dir))
+
+    def test_touched_but_unchanged_conf_keeps_snapshot(self, config_dir, capsys):
+        UnifiedConfigService(config_dir)
+        path = os.path.join(config_dir, 'wise.conf')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        capsys.readouterr()
+
+        UnifiedConfigService(config_dir)
+        assert '[SNAPSHOT]' in capsys.readouterr().out
+
+    def test_corrupt_snapshot_is_ignored(self, config_dir, config_snapshot_path):
+        UnifiedConfigService(config_dir)
+        config_snapshot_path.write_bytes(b'not a pickle')
+        service = UnifiedConfigService(config_dir)
+        assert service.get_bank_config('wise') is not None
+
+    def test_snapshot_from_other_code_is_ignored(self, config_dir, monkeypatch, capsys):
+        UnifiedConfigService(config_dir)
+        monkeypatch.setattr(config_snapshot, '_code_version', lambda: '0.0.0+other')
+        capsys.readouterr()
+
+        UnifiedConfigService(config_dir)
+        assert '[SNAPSHOT]' not in capsys.readouterr().out
+        UnifiedConfigService(config_dir)
+        assert '[SNAPSHOT]' in capsys.readouterr().out
+
+
+class TestSnapshotOutputs:
+    """A snapshot only saves work; banks still load on first use"""
+
+    def test_snapshot_does_not_load_banks(self, config_dir):
+        UnifiedConfigService(config_dir)
+        service = UnifiedConfigService(config_dir)
+
+        assert restored(service)
+        assert not service.snapshot().bank_configs
+        assert service.get_bank_config('wise') is not None
+        assert list(service.snapshot().bank_configs) == ['wise']
+
+    def test_parse_output_matches_without_snapshot(self, config_dir, monkeypatch):
+        # Misdetected as Meezan, so its cleaning depends on which banks are loaded
+        file_info = {'file_id': 'bunq', 'temp_path': os.path.join(SAMPLE_DIR, '2019-03-02_11-50-46_bunq-statement.csv'),
+                     'original_name': '2019-03-02_11-50-46_bunq-statement.csv'}
+
+        def process():
+            config_service = UnifiedConfigService(config_dir)
+            monkeypatch.setattr(unified_config_service, '_unified_config_service', config_service)
+            with contextlib.redirect_stdout(io.StringIO()):
+                service = create_csv_processing_service()
+                service.parse_cache = ParseCache(enabled=False)
+                # wise is not loaded yet, so its own categorization rules do not apply
+                category = config_service.categorize_merchant_with_debug('wise', 'Otpmobl Vimpay ticket')
+                return service.process_single_file(file_info, ParseConfig(start_row=0), True), category
+
+        monkeypatch.setenv('HISAABFLOW_CONFIG_SNAPSHOT_DISABLED', '1')
+        without_snapshot = process()
+        monkeypatch.delenv('HISAABFLOW_CONFIG_SNAPSHOT_DISABLED')
+        built = process()
+        from_snapshot = process()
+
+        assert without_snapshot[0]['success']
+        assert built == without_snapshot
+        assert from_snapshot == without_snapshot
+
+
+class TestSnapshotPath:
+    """Snapshots default to the user cache directory, one per config directory"""
+
+    def test_default_path_is_outside_config_dir(self, config_dir, tmp_path, monkeypatch):
+        monkeypatch.delenv('HISAABFLOW_CONFIG_SNAPSHOT')
+        monkeypatch.setenv('HISAABFLOW_USER_DIR', str(tmp_path / 'user'))
+
+        path = config_snapshot.snapshot_path(config_dir)
+        UnifiedConfigService(config_dir)
+
+        assert os.path.dirname(path) == str(tmp_path / 'user' / 'cache')
+        assert os.path.exists(path)
+        assert config_snapshot.snapshot_path(str(tmp_path)) != path
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test copy-on-write config states and per-context snapshot pinning.
+"""
+
+import shutil
+import threading
+
+import pytest
+
+from backend.infrastructure.config.unified_config_service import UnifiedConfigService
+
+
+@pytest.fixture
+def service(tmp_path):
+    shutil.copytree(UnifiedConfigService().config_dir, tmp_path, dirs_exist_ok=True)
+    return UnifiedConfigService(str(tmp_path))
+
+
+class TestConfigState:
+    """Readers see whole states; reloads swap in new ones"""
+
+    def test_state_is_read_only(self, service):
+        state = service.snapshot()
+        with pytest.raises(TypeError):
+            state.bank_configs['wise'] = None
+        with pytest.raises(TypeError):
+            state.detection_patterns['wise'] = None
+
+    def test_pinned_snapshot_survives_reload(self, service):
+        wise = service.get_bank_config('wise')
+        with service.pinned_snapshot() as pinned:
+            seen = []
+            reloader = threading.Thread(target=lambda: seen.append(service.reload_all_configs(force=True, full=True)))
+            reloader.start()
+            reloader.join()
+            assert seen == [True]
+            assert service.snapshot() is pinned
+            assert service.get_bank_config('wise') is wise
+            categorized = service.categorize_merchant('wise', 'Lidl')
+
+        assert service.snapshot() is not pinned
+        assert service.config_generation > pinned.generation
+        assert service.categorize_merchant('wise', 'Lidl') == categorized
+
+    def test_pinned_context_sees_its_own_changes(self, service):
+        with service.pinned_snapshot() as pinned:
+            service.refresh_bank_detection_index('wise')
+            assert service.snapshot() is not pinned
+            assert 'wise' not in service.snapshot().bank_configs
+
+    def test_pinned_lazy_load_keeps_pinned_app_config(self, service, tmp_path):
+        pinned = service.snapshot().with_bank_configs({})
+        with service.pinned_snapshot(pinned):
+            before = service.categorize_merchant_with_debug('wise', 'Zorblax Market')
+
+            def reload():
+                with open(tmp_path / 'app.conf', 'a') as f:
+                    f.write('\n[Zorblax Goods]\nZorblax.*\n')
+                service.reload_changed_configs()
+
+            reloader = threading.Thread(target=reload)
+            reloader.start()
+            reloader.join()
+            assert service.get_bank_config('wise') is not None
+            assert service.snapshot().app_config is pinned.app_config
+            assert service.categorize_merchant_with_debug('wise', 'Zorblax Market') == before
+
+        assert 'wise' in service.snapshot().bank_configs
+        assert service.categorize_merchant_with_debug('wise', 'Zorblax Market')['category'] == 'Zorblax Goods'
+
+    def test_readers_never_see_a_half_built_state(self, service):
+        banks = set(service.list_banks())
+        stop = threading.Event()
+        failures = []
+
+        def read():
+            while not stop.is_set():
+                state = service.snapshot()
+                if set(state.detection_patterns) != banks:
+                    failures.append(set(state.detection_patterns))
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for _ in range(5):
+            service.reload_all_configs(force=True, full=True)
+        stop.set()
+        for reader in readers:
+            reader.join()
+        assert failures == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,98 @@
+"""
+Test that indexed candidate lookup in CrossBankMatcher produces the same
+transfer pairs as scanning every incoming transaction.
+"""
+
+import pytest
+from backend.core.transfer_detection import CrossBankMatcher, MatchingIndex
+from backend.core.transfer_detection.date_parser import DateParser
+from backend.core.transfer_detection.transaction_record import TransactionRecord
+from backend.infrastructure.config.unified_config_service import get_unified_config_service
+
+
+def _transaction(index, csv_index, bank, amount, date, title, currency, **extra):
+    return {
+        'Date': date,
+        'Amount': amount,
+        'Title': title,
+        'Description': title,
+        'Currency': currency,
+        '_csv_index': csv_index,
+        '_transaction_index': index,
+        '_csv_name': f'{bank}.csv',
+        '_bank_type': bank,
+        **extra
+    }
+
+
+class TestMatchingIndex:
+    """Test the amount/date bucketed index"""
+
+    def test_lookup_respects_amount_and_date_window(self):
+        from datetime import datetime
+        day = lambda d: DateParser.to_timestamp(datetime(2025, 1, d))
+        index = MatchingIndex(date_tolerance_hours=72)
+        index.add(0, 'EUR', 100.0, day(15))
+        index.add(1, 'EUR', 100.0, day(30))    # outside window
+        index.add(2, 'EUR', 100.004, day(16))  # neighbouring cent bucket
+        index.add(3, 'USD', 100.0, day(15))    # other currency
+        index.add(4, 'EUR', 250.0, day(15))    # other amount
+
+        assert index.find_candidates([('EUR', 100.0)], day(14)) == [0, 2]
+        assert index.find_candidates([('EUR', 100.0), ('USD', 100.0)], day(14)) == [0, 2, 3]
+
+
+class TestIndexedCrossBankMatching:
+    """Indexed matching must give exactly the same pairs as the full scan"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.config = get_unified_config_service()
+        for bank in ('nayapay', 'wise'):
+            self.config.get_bank_config(bank)
+        self.matcher = CrossBankMatcher(config_service=self.config)
+
+    def _transactions(self):
+        return [
+            _transaction(0, 0, 'nayapay', -1500.0, '2025-01-15', 'Outgoing fund transfer to John Doe', 'PKR'),
+            _transaction(1, 0, 'nayapay', -200.0, '2025-01-20', 'Outgoing fund transfer to Alice Smith', 'PKR'),
+            _transaction(2, 1, 'wise', -50.0, '2025-01-21', 'Sent money to Ammar Qazi', 'EUR',
+                         **{'Exchange To': 'PKR', 'Exchange To Amount': '15000'}),
+            _transaction(3, 1, 'wise', 1500.0, '2025-01-16', 'Received money from John Doe', 'PKR'),
+            _transaction(4, 1, 'wise', 200.0, '2025-01-21', 'Received money from Bob Jones', 'PKR'),
+            _transaction(5, 0, 'nayapay', 15000.0, '2025-01-22', 'Incoming fund transfer from Ammar Qazi', 'PKR'),
+            _transaction(6, 1, 'wise', 1500.0, '2025-02-20', 'Received money from John Doe', 'PKR'),
+        ]
+
+    def _match(self, monkeypatch, use_index):
+        transactions = self._transactions()
+        candidates = self.matcher.find_transfer_candidates(transactions)
+        if not use_index:
+            # Every indexed position becomes a candidate, i.e. the original full scan
+            monkeypatch.setattr(MatchingIndex, 'find_candidates', lambda index, probes, date: list(range(len(index))))
+        pairs = self.matcher.match_cross_bank_transfers(candidates, transactions, [])
+        potential = self.matcher.get_potential_pairs()
+        return (
+            [(p['outgoing']['_transaction_index'], p['incoming']['_transaction_index'], p['match_strategy'], p['confidence']) for p in pairs],
+            [(p['outgoing']['_transaction_index'], p['incoming']['_transaction_index']) for p in potential]
+        )
+
+    def test_indexed_matching_equals_full_scan(self, monkeypatch):
+        indexed_pairs, indexed_potential = self._match(monkeypatch, use_index=True)
+        scanned_pairs, scanned_potential = self._match(monkeypatch, use_index=False)
+
+        assert indexed_pairs == scanned_pairs
+        assert indexed_potential == scanned_potential
+        assert (0, 3, 'traditional_same_currency') in [pair[:3] for pair in indexed_pairs]
+        assert (2, 5, 'exchange_amount') in [pair[:3] for pair in indexed_pairs]
+        assert (1, 4) in indexed_potential
+
+    def test_transaction_record_parses_once(self):
+        transaction = self._transactions()[2]
+        record = TransactionRecord.from_transaction(transaction)
+
+        assert record.amount_minor == -5000
+        assert record.exchange_amount == 15000.0
+        assert record.exchange_currency == 'PKR'
+        assert record.description_lower == 'sent money to ammar qazi'
+        assert record.date.strftime('%Y-%m-%d') == '2025-01-21'
@@ -0,0 +1,50 @@
+"""
+Test that hash-joined currency conversion matching produces the same pairs
+as comparing every conversion candidate with every other candidate.
+"""
+
+import random
+from backend.core.transfer_detection import CurrencyConverter
+
+
+def _conversion_rows(seed=7, count=120):
+    rng = random.Random(seed)
+    rows = []
+    for n in range(count):
+        from_amount = rng.choice([100.0, 100.01, 250.5, 99.99, round(rng.uniform(1, 500), 2)])
+        to_amount = round(from_amount * 1.08 + rng.choice([0, 0.004, 0.01]), 2)
+        day = 1 + rng.randint(0, 20)
+        title = f'Converted {from_amount} EUR to {to_amount} USD'
+        rows.append({'Date': f'2025-03-{day:02d}', 'Amount': -from_amount, 'Title': title,
+                     '_csv_index': 0, '_csv_name': 'wise_eur.csv'})
+        if rng.random() < 0.8:
+            rows.append({'Date': f'2025-03-{day + rng.choice([0, 1, 5]):02d}', 'Amount': to_amount,
+                         'Title': title, '_csv_index': 1, '_csv_name': 'wise_usd.csv'})
+    rng.shuffle(rows)
+    for index, row in enumerate(rows):
+        row['_transaction_index'] = index
+    return rows
+
+
+def _pair_ids(pairs):
+    return [(p['outgoing']['_transaction_index'], p['incoming']['_transaction_index'], p['confidence'])
+            for p in pairs]
+
+
+def test_hash_join_matches_pairwise_scan(monkeypatch):
+    indexed = CurrencyConverter().match_currency_conversions(_conversion_rows())
+
+    # Reference: every later candidate is a potential partner
+    monkeypatch.setattr(CurrencyConverter, '_get_conversion_partners',
+                        lambda self, index, conv, position: range(position + 1, self._candidate_count))
+    original = CurrencyConverter._build_conversion_index
+
+    def build_and_count(self, candidates):
+        self._candidate_count = len(candidates)
+        return original(self, candidates)
+
+    monkeypatch.setattr(CurrencyConverter, '_build_conversion_index', build_and_count)
+    scanned = CurrencyConverter().match_currency_conversions(_conversion_rows())
+
+    assert indexed
+    assert _pair_ids(indexed) == _pair_ids(scanned)
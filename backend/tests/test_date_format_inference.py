@@ -0,0 +1,94 @@
+"""
+Test per-column date format inference, memoized parsing and flagging of invalid dates.
+"""
+from datetime import datetime
+
+from backend.core.transfer_detection import TransferDetector
+from backend.infrastructure.csv_cleaning.date_cleaner import DateCleaner
+from backend.services.cashew_transformer import CashewTransformer
+from backend.shared.utils.date_inference import ColumnDateParser, infer_date_format
+
+FORMATS = ['%d/%m/%Y', '%m/%d/%Y', '%Y-%m-%d']
+
+
+def test_infers_format_from_column_sample():
+    # 03/04/2025 alone is ambiguous; 12/31/2025 settles the column as month-first
+    assert infer_date_format(['03/04/2025', '12/31/2025'], FORMATS) == '%m/%d/%Y'
+    assert infer_date_format(['03/04/2025', '13/04/2025'], FORMATS) == '%d/%m/%Y'
+    # A configured format that fits the sample wins over candidate order
+    assert infer_date_format(['03/04/2025'], FORMATS, configured_format='%m/%d/%Y') == '%m/%d/%Y'
+
+
+def test_column_parser_memoizes_and_flags_invalid_values():
+    parser = ColumnDateParser.for_column(['03/04/2025', '12/31/2025', 'garbage'], FORMATS)
+
+    assert parser.parse('03/04/2025') == datetime(2025, 3, 4)
+    assert parser.parse('2025-01-02') == datetime(2025, 1, 2)  # stray format still parses
+    assert parser.parse('garbage') is None
+    assert parser.parse('garbage') is None
+    assert parser.parse('') is None
+
+    assert parser.invalid_values == ['garbage']
+    assert parser.invalid_count == 1
+
+
+def test_cleaner_and_transformer_use_column_format():
+    cleaner = DateCleaner()
+    data = [{'Date': '02 Feb 2025'}, {'Date': 'not a date'}]
+    cleaned = cleaner.clean_date_columns(data)
+    assert [row['Date'] for row in cleaned] == ['2025-02-02', 'not a date']
+    assert cleaner.invalid_dates == {'Date': ['not a date']}
+
+    transformer = CashewTransformer()
+    assert transformer.parse_date('2025.04.30', date_format='%Y.%m.%d') == '2025-04-30 00:00:00'
+    assert transformer.parse_date('2025-04-30 15:23:00') == '2025-04-30 15:23:00'
+    assert transformer.parse_date('31st of April') == '31st of April'
+
+
+def test_transformer_infers_each_date_column_separately():
+    # Date is day-first (13/04), BackupDate month-first (12/31); 03/04 must follow its own column
+    data = [
+        {'Date': '13/04/2025', 'backupdate': '12/31/2025', 'Amount': '-1', '_source_bank': 'wise'},
+        {'Date': '', 'backupdate': '03/04/2025', 'Amount': '-2', '_source_bank': 'wise'},
+        {'Date': '03/04/2025', 'backupdate': '', 'Amount': '-3', '_source_bank': 'wise'},
+    ]
+    rows = CashewTransformer().transform_to_cashew(data, {'date': 'Date', 'amount': 'Amount'}, 'Wise')
+
+    assert [row['Date'] for row in rows] == ['2025-04-13 00:00:00', '2025-03-04 00:00:00', '2025-04-03 00:00:00']
+
+
+def test_cleaner_considers_guesses_beyond_the_first_value():
+    # pandas guesses 06/02/2025 as month-first; 20/06/2025 settles the column as day-first
+    cleaner = DateCleaner()
+    data = [{'Date': '06/02/2025'}, {'Date': '06/02/2025'}, {'Date': '20/06/2025'}]
+    cleaned = cleaner.clean_date_columns(data)
+
+    assert [row['Date'] for row in cleaned] == ['2025-02-06', '2025-02-06', '2025-06-20']
+    assert cleaner.invalid_dates == {}
+
+
+def test_invalid_dates_are_flagged_not_matched():
+    def row(amount, date, title, currency='PKR'):
+        return {'Date': date, 'Amount': amount, 'Title': title, 'Description': title, 'Currency': currency}
+
+    csvs = [
+        {'data': [row(-1500.0, 'someday', 'Outgoing fund transfer to John Doe')],
+         'file_name': 'nayapay.csv', 'bank_info': {'bank_name': 'nayapay'}},
+        {'data': [row(1500.0, '2025-01-16', 'Received money from John Doe')],
+         'file_name': 'wise.csv', 'bank_info': {'bank_name': 'wise'}},
+    ]
+    result = TransferDetector().detect_transfers(csvs)
+
+    assert result['transfers'] == []
+    assert [(f['transaction_index'], f['reason']) for f in result['flagged_transactions']] == [(0, 'invalid_date')]
+
+
+def test_transfer_categorization_tolerates_invalid_dates():
+    pair = {
+        'outgoing': {'_csv_index': 0, 'Amount': '-1500', 'Date': 'someday', 'Description': 'Sent to John Doe'},
+        'incoming': {'_csv_index': 1, 'Amount': '1500', 'Date': '2025-01-16', 'Description': 'From John Doe'},
+        'pair_id': 'transfer_1', 'transfer_type': 'cross_bank'
+    }
+    matches = TransferDetector().apply_transfer_categorization([], [pair])
+
+    assert [match['date'] for match in matches] == ['', '2025-01-16']
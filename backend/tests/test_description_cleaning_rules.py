@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test compiled description cleaning rules against per-row re.sub cleaning.
+"""
+
+import re
+
+import pytest
+
+from backend.infrastructure.config.description_cleaning_rules import DescriptionCleaningRules
+from backend.infrastructure.config.unified_config_service import UnifiedConfigService
+
+
+def reference_clean(rules, description):
+    """Cleaning as apply_description_cleaning did it before rules were compiled"""
+    for rule_name, rule_pattern in rules.items():
+        try:
+            if '|' in rule_pattern:
+                pattern, replacement = rule_pattern.rsplit('|', 1)
+                description = re.sub(pattern.strip(), replacement.strip(), description,
+                                     flags=re.IGNORECASE | re.DOTALL)
+            elif rule_name in description:
+                description = description.replace(rule_name, rule_pattern)
+        except re.error:
+            if '|' in rule_pattern:
+                pattern, replacement = rule_pattern.rsplit('|', 1)
+                description = description.replace(pattern, replacement)
+    return description
+
+
+class TestDescriptionCleaningRules:
+    """Compiled rules must clean exactly like the per-row implementation"""
+
+    def test_rule_kinds_and_invalid_regex(self):
+        rules = {
+            'card': r'Card transaction of .* issued by (.*)|\1',
+            'pipes': r'(Foo|Bar) Ltd|\1',
+            'typo': 'Paymnet',
+            'broken': 'Bad[regex|x',
+            'badgroup': r'Sent (.*)|\3',
+        }
+        compiled = DescriptionCleaningRules('test', rules)
+        assert {rule.name for rule in compiled.invalid_rules} == {'broken', 'badgroup'}
+        descriptions = ['Card transaction of 1.00 EUR issued by Lidl', 'CARD TRANSACTION OF 2 issued by\nAldi',
+                        'foo ltd', 'typo Paymnet', 'Bad[regex here', 'Sent money', '']
+        for description in descriptions:
+            assert compiled.apply(description) == reference_clean(rules, description), description
+
+    def test_real_configs_match_reference(self):
+        service = UnifiedConfigService()
+        descriptions = ['Card transaction of 12.50 EUR issued by Lidl Berlin', 'Sent money to John Smith',
+                        'Outgoing fund transfer to Jane Doe', 'Mobile top-up purchased|Zong 03001234567',
+                        'Money added from JOHN DOE', 'Incoming fund transfer from Ali\nRef 123', 'Netflix']
+        for bank_name in service.list_banks():
+            bank_config = service.get_bank_config(bank_name)
+            rules = bank_config.data_cleaning.description_cleaning_rules
+            expected = [reference_clean(rules, description) for description in descriptions]
+            assert service.clean_descriptions(bank_name, descriptions + descriptions) == expected + expected
+            assert [service.apply_description_cleaning(bank_name, d) for d in descriptions] == expected
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test tiered encoding detection: BOMs and valid UTF-8 are settled without chardet,
+ambiguous files still go through it, and results are reused per file content.
+"""
+
+import codecs
+import contextlib
+import io
+
+import pytest
+
+from backend.infrastructure.csv_parsing import encoding_detector as encoding_detector_module
+from backend.infrastructure.csv_parsing import EncodingDetector, FileBuffer, ParseCache, UnifiedCSVParser
+from backend.infrastructure.config.result_cache import ResultCache
+
+TEXT = 'Date,Description,Amount\n' + ''.join(f'2024-01-{day:02d},Café Müller,-{day}.50\n' for day in range(1, 29))
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    monkeypatch.setattr(encoding_detector_module, '_detection_cache', ResultCache())
+    detector = EncodingDetector()
+    calls = []
+    if detector.chardet_available:
+        detect = encoding_detector_module.chardet.detect
+        monkeypatch.setattr(encoding_detector_module.chardet, 'detect',
+                            lambda sample: calls.append(sample) or detect(sample))
+    detector.chardet_calls = calls
+    return detector
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestFastPaths:
+    """Unambiguous samples never reach chardet"""
+
+    @pytest.mark.parametrize('data, encoding, bom', [
+        (TEXT.encode('utf-8'), 'utf-8', False),
+        (codecs.BOM_UTF8 + TEXT.encode('utf-8'), 'utf-8-sig', True),
+        (TEXT.encode('utf-16'), 'utf-16', True),
+        (codecs.BOM_UTF16_BE + TEXT.encode('utf-16-be'), 'utf-16', True),
+        (TEXT.encode('utf-32'), 'utf-32', True),
+        (b'Date,Amount\n2024-01-01,5\n', 'ascii', False),
+    ])
+    def test_detected_without_chardet(self, detector, tmp_path, data, encoding, bom):
+        result = detector.detect_encoding(write(tmp_path, 'statement.csv', data))
+
+        assert result['encoding'] == encoding
+        assert result['bom_detected'] is bom
+        assert result['confidence'] >= 0.7
+        assert not detector.chardet_calls
+
+    def test_sample_cut_mid_character_is_still_utf8(self, detector, tmp_path):
+        data = ('x' * 8191 + 'é,1\n').encode('utf-8')
+
+        assert detector.detect_encoding(write(tmp_path, 'statement.csv', data))['encoding'] == 'utf-8'
+
+    def test_invalid_utf8_falls_back_to_chardet(self, detector, tmp_path):
+        if not detector.chardet_available:
+            pytest.skip('chardet not installed')
+        result = detector.detect_encoding(write(tmp_path, 'statement.csv', TEXT.encode('cp1252')))
+
+        assert result['encoding'] not in ('utf-8', 'ascii')
+        assert TEXT.encode('cp1252').decode(result['encoding']).startswith('Date,Description')
+        assert len(detector.chardet_calls) == 1
+
+    def test_utf16_without_bom_goes_to_chardet(self, detector, tmp_path):
+        if not detector.chardet_available:
+            pytest.skip('chardet not installed')
+        rows = ''.join(f'2024-01-{day % 28 + 1:02d},-{day}.50,Coffee {day}\n' for day in range(300))
+        path = write(tmp_path, 'statement.csv', ('Date,Amount,Description\n' + rows).encode('utf-16-le'))
+
+        result = detector.detect_encoding(path)
+
+        assert result['encoding'].startswith('utf-16')
+        assert len(detector.chardet_calls) == 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            parsed = UnifiedCSVParser(parse_cache=ParseCache(enabled=False)).parse_csv(path)
+        assert parsed['headers'] == ['Date', 'Amount', 'Description']
+        assert parsed['row_count'] == 300
+
+
+class TestDetectionCache:
+    """Identical content is detected once, whatever its path"""
+
+    def test_reused_for_same_content(self, detector, tmp_path, monkeypatch):
+        calls = []
+        detect = detector._detect_encoding
+        monkeypatch.setattr(detector, '_detect_encoding', lambda *args: calls.append(args) or detect(*args))
+        first_path = write(tmp_path, 'first.csv', TEXT.encode('cp1252'))
+        second_path = write(tmp_path, 'second.csv', TEXT.encode('cp1252'))
+
+        first = detector.detect_encoding(first_path)
+        first['attempted_encodings'].clear()
+        with FileBuffer.open(second_path) as buffer:
+            second = detector.detect_encoding(buffer)
+        detector.detect_encoding(write(tmp_path, 'third.csv', TEXT.encode('utf-8')))
+
+        assert len(calls) == 2
+        assert second['encoding'] == first['encoding'] and second['attempted_encodings']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the shared file buffer: one read per upload, same results as reading the path.
+"""
+
+import builtins
+import csv
+import os
+
+import pytest
+
+from backend.infrastructure.csv_parsing import file_buffer as file_buffer_module
+from backend.infrastructure.csv_parsing import (
+    DialectDetector, EncodingDetector, FileBuffer, UnifiedCSVParser, open_file_buffer
+)
+from backend.infrastructure.csv_parsing.header_validator import find_and_validate_header
+from backend.infrastructure.preprocessing.csv_preprocessor import GenericCSVPreprocessor
+
+CSV_CONTENT = (
+    'Statement for Alpha Bank\r\n'
+    '\r\n'
+    'Date,Description,Amount\r\n'
+    '2024-01-01,"Coffee, large",-3.50\r\n'
+    '2024-01-02,Salary,1000.00\r\n'
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_bytes(CSV_CONTENT.encode('utf-8'))
+    return str(path)
+
+
+@pytest.fixture
+def count_opens(monkeypatch):
+    """Count builtin open() calls on one path"""
+    opened = []
+    real_open = builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        opened.append(os.fspath(file) if isinstance(file, (str, os.PathLike)) else file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, 'open', counting_open)
+    return lambda path: opened.count(path)
+
+
+class TestFileBuffer:
+    """Streams and texts match what open() on the path returns"""
+
+    @pytest.mark.parametrize('newline', [None, ''])
+    def test_text_matches_open(self, csv_file, newline):
+        with FileBuffer.open(csv_file) as buffer:
+            with open(csv_file, 'r', encoding='utf-8', newline=newline) as f:
+                expected = f.read()
+            assert buffer.text('utf-8', newline) == expected
+            with buffer.open_text('utf-8', newline) as f:
+                assert f.read(10) == expected[:10]
+            with buffer.open_text('utf-8', newline) as f:
+                assert list(csv.reader(f)) == list(csv.reader(expected.splitlines()))
+
+    def test_text_is_decoded_once(self, csv_file):
+        with FileBuffer.open(csv_file) as buffer:
+            assert buffer.text('utf-8') is buffer.text('utf-8')
+
+    def test_large_files_are_memory_mapped(self, csv_file, monkeypatch):
+        monkeypatch.setattr(file_buffer_module, 'MMAP_THRESHOLD', 1)
+        with FileBuffer.open(csv_file) as buffer:
+            assert buffer.is_memory_mapped
+            assert buffer.head(9) == b'Statement'
+            with buffer.open_binary() as stream:
+                assert stream.read() == CSV_CONTENT.encode('utf-8')
+
+    def test_open_file_buffer_leaves_passed_buffer_open(self, csv_file):
+        with FileBuffer.open(csv_file) as buffer:
+            with open_file_buffer(buffer) as same:
+                assert same is buffer
+            assert buffer.head(4) == b'Stat'
+
+    def test_buffer_is_path_like(self, csv_file):
+        with FileBuffer.open(csv_file) as buffer:
+            assert os.fspath(buffer) == csv_file
+            assert os.path.basename(buffer) == 'statement.csv'
+
+
+class TestSharedIngestion:
+    """Detectors, preprocessing and parsing give the same results from a buffer as from a path"""
+
+    def test_detectors_match_path_results(self, csv_file):
+        with FileBuffer.open(csv_file) as buffer:
+            assert EncodingDetector().detect_encoding(buffer) == EncodingDetector().detect_encoding(csv_file)
+            assert (DialectDetector().detect_dialect(buffer, 'utf-8')
+                    == DialectDetector().detect_dialect(csv_file, 'utf-8'))
+            assert (find_and_validate_header(buffer, 'utf-8', 2, ['Date', 'Amount'])
+                    == find_and_validate_header(csv_file, 'utf-8', 2, ['Date', 'Amount']))
+
+    def test_parse_reads_file_once(self, csv_file, count_opens):
+        result = UnifiedCSVParser().parse_csv(csv_file, header_row=2, start_row=3)
+        assert result['success']
+        assert result['headers'] == ['Date', 'Description', 'Amount']
+        assert count_opens(csv_file) == 1
+
+    def test_parse_from_buffer_does_not_reopen_file(self, csv_file, count_opens):
+        expected = UnifiedCSVParser().parse_csv(csv_file, header_row=2, start_row=3)
+        with FileBuffer.open(csv_file) as buffer:
+            opens_before = count_opens(csv_file)
+            result = UnifiedCSVParser().parse_csv(buffer, header_row=2, start_row=3)
+            assert count_opens(csv_file) == opens_before
+        assert result == expected
+
+    def test_preprocessing_buffer_stays_in_memory(self, csv_file):
+        preprocessor = GenericCSVPreprocessor()
+        with FileBuffer.open(csv_file) as buffer:
+            result = preprocessor.preprocess_csv(buffer, 'utf-8')
+        cleaned = result['processed_file_path']
+        assert isinstance(cleaned, FileBuffer)
+        assert not os.path.exists(cleaned.path)
+
+        on_disk = preprocessor.preprocess_csv(csv_file, 'utf-8')
+        with open(on_disk['processed_file_path'], 'r', encoding='utf-8') as f:
+            assert cleaned.text('utf-8') == f.read()
+        assert result['issues_fixed'] == on_disk['issues_fixed']
+        assert os.fspath(cleaned) == on_disk['processed_file_path']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
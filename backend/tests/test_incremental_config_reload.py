@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test mtime-aware incremental config reloading and the background config watcher.
+"""
+
+import configparser
+import os
+import shutil
+import time
+
+import pytest
+
+from backend.infrastructure.config.unified_config_service import UnifiedConfigService
+
+
+@pytest.fixture
+def service(tmp_path):
+    shutil.copytree(UnifiedConfigService().config_dir, tmp_path, dirs_exist_ok=True)
+    service = UnifiedConfigService(str(tmp_path))
+    yield service
+    service.stop_config_watcher()
+
+
+def append_line(path, line):
+    with open(path, 'a') as f:
+        f.write(line)
+    # Make sure the change is visible even on filesystems with coarse mtimes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestIncrementalConfigReload:
+    """Only changed .conf files are reloaded, and each change bumps the config generation"""
+
+    def test_unchanged_configs_are_kept(self, service):
+        wise = service.get_bank_config('wise')
+        generation = service.config_generation
+        assert service.reload_all_configs(force=True)
+        assert service.get_bank_config('wise') is wise
+        assert service.config_generation == generation
+
+    def test_changed_bank_config_is_reloaded(self, service):
+        wise = service.get_bank_config('wise')
+        revolut = service.get_bank_config('revolut')
+        generation = service.config_generation
+
+        config_path = os.path.join(service.config_dir, 'wise.conf')
+        config = configparser.ConfigParser(allow_no_value=True)
+        config.read(config_path)
+        if 'description_cleaning' not in config:
+            config['description_cleaning'] = {}
+        config['description_cleaning']['reloadtest'] = 'ReloadMe|Reloaded'
+        with open(config_path, 'w') as f:
+            config.write(f)
+        append_line(config_path, '\n')
+        assert service.reload_changed_configs() == ['wise.conf']
+        assert service.config_generation > generation
+        assert service.get_bank_config('revolut') is revolut
+        assert service.get_bank_config('wise') is not wise
+        assert service.apply_description_cleaning('wise', 'ReloadMe') == 'Reloaded'
+
+    def test_added_removed_and_app_conf(self, service):
+        shutil.copy(os.path.join(service.config_dir, 'wise.conf'), os.path.join(service.config_dir, 'wisecopy.conf'))
+        assert service.reload_changed_configs() == ['wisecopy.conf']
+        assert 'wisecopy' in service.list_banks()
+
+        os.remove(os.path.join(service.config_dir, 'wisecopy.conf'))
+        assert service.reload_changed_configs() == ['wisecopy.conf']
+        assert 'wisecopy' not in service.list_banks()
+        assert service.get_bank_config('wisecopy') is None
+
+        assert service.categorize_merchant('wise', 'Zzreloadtestshop') is None
+        append_line(os.path.join(service.config_dir, 'app.conf'), '\n[ReloadTestCategory]\nZzreloadtestshop\n')
+        assert service.reload_changed_configs() == ['app.conf']
+        assert service.categorize_merchant('wise', 'Zzreloadtestshop') == 'ReloadTestCategory'
+
+    def test_watcher_picks_up_changes(self, service):
+        watcher = service.start_config_watcher(interval=0.05)
+        generation = service.config_generation
+        append_line(os.path.join(service.config_dir, 'nayapay.conf'), '\n')
+        deadline = time.time() + 5
+        while service.config_generation == generation and time.time() < deadline:
+            time.sleep(0.05)
+        assert service.config_generation > generation
+        service.stop_config_watcher()
+        assert not watcher.is_running
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,114 @@
+"""
+Test that incremental transfer detection over statements added one at a time
+finds the same pairs as detecting over all statements at once.
+"""
+
+import threading
+
+from backend.core.transfer_detection import TransferDetector
+from backend.infrastructure.config.unified_config_service import get_unified_config_service
+
+
+def _row(amount, date, title, currency):
+    return {'Date': date, 'Amount': amount, 'Title': title, 'Description': title, 'Currency': currency}
+
+
+def _csv(bank, rows):
+    return {'data': rows, 'file_name': f'{bank}.csv', 'bank_info': {'bank_name': bank}}
+
+
+def _nayapay_csv():
+    return _csv('nayapay', [
+        _row(-1500.0, '2025-01-15', 'Outgoing fund transfer to John Doe', 'PKR'),
+        _row(-200.0, '2025-01-20', 'Outgoing fund transfer to Alice Smith', 'PKR'),
+        _row(15000.0, '2025-01-22', 'Incoming fund transfer from Ammar Qazi', 'PKR'),
+    ])
+
+
+def _wise_csv():
+    sent = _row(-50.0, '2025-01-21', 'Sent money to Ammar Qazi', 'EUR')
+    sent.update({'Exchange To': 'PKR', 'Exchange To Amount': '15000'})
+    return _csv('wise', [
+        sent,
+        _row(1500.0, '2025-01-16', 'Received money from John Doe', 'PKR'),
+        _row(-100.0, '2025-01-25', 'Converted 100.00 EUR to 108.00 USD', 'EUR'),
+    ])
+
+
+def _wise_usd_csv():
+    return _csv('wise_usd', [
+        _row(108.0, '2025-01-25', 'Converted 100.00 EUR to 108.00 USD', 'USD'),
+    ])
+
+
+def _pair_keys(pairs):
+    return sorted((p['outgoing']['Description'], p['incoming']['Description'], p['match_strategy']) for p in pairs)
+
+
+def _detector():
+    config = get_unified_config_service()
+    for bank in ('nayapay', 'wise'):
+        config.get_bank_config(bank)
+    return TransferDetector(config_service=config)
+
+
+def test_incremental_batches_find_same_pairs_as_full_run():
+    full = _detector().detect_transfers([_nayapay_csv(), _wise_csv(), _wise_usd_csv()])
+
+    detector = _detector()
+    first = detector.detect_transfers_incremental([_nayapay_csv()])
+    second = detector.detect_transfers_incremental([_wise_csv()], first['session_id'])
+    third = detector.detect_transfers_incremental([_wise_usd_csv()], first['session_id'])
+
+    assert first['transfers'] == []
+    assert second['session_id'] == third['session_id'] == first['session_id']
+    assert len(second['processed_transactions']) == 3
+    assert [t['_transaction_index'] for t in third['processed_transactions']] == [6]
+
+    incremental_pairs = second['transfers'] + third['transfers']
+    assert _pair_keys(incremental_pairs) == _pair_keys(full['transfers'])
+    assert len({p['pair_id'] for p in incremental_pairs}) == len(incremental_pairs)
+    assert third['summary']['session_transfer_pairs'] == len(full['transfers'])
+
+
+def test_unknown_session_starts_new_session():
+    detector = _detector()
+    result = detector.detect_transfers_incremental([_nayapay_csv()], 'expired-session')
+
+    assert result['session_id'] == 'expired-session'
+    assert detector.get_session('expired-session').next_transaction_index == 3
+    assert detector.end_session('expired-session')
+    assert detector.get_session('expired-session') is None
+
+
+def test_reposted_file_is_skipped():
+    detector = _detector()
+    first = detector.detect_transfers_incremental([_nayapay_csv()])
+    second = detector.detect_transfers_incremental([_wise_csv()], first['session_id'])
+    again = detector.detect_transfers_incremental([_wise_csv(), _nayapay_csv(), _wise_usd_csv()],
+                                                  first['session_id'])
+
+    assert again['skipped_files'] == ['wise.csv', 'nayapay.csv']
+    assert [t['_csv_name'] for t in again['processed_transactions']] == ['wise_usd.csv']
+    session = detector.get_session(first['session_id'])
+    assert session.next_transaction_index == 7
+    matched = [(p['outgoing']['_transaction_index'], p['incoming']['_transaction_index']) for p in session.pairs]
+    assert len(matched) == len(set(matched)) == len(second['transfers']) + len(again['transfers'])
+
+
+def test_concurrent_batches_of_one_session():
+    detector = _detector()
+    session_id = detector.detect_transfers_incremental([])['session_id']
+    results = []
+    batches = [[_nayapay_csv()], [_wise_csv()], [_wise_usd_csv()]]
+    threads = [threading.Thread(target=lambda batch=batch: results.append(
+        detector.detect_transfers_incremental(batch, session_id))) for batch in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    session = detector.get_session(session_id)
+    assert sorted(t['_transaction_index'] for t in session.transactions) == list(range(7))
+    assert len(session.pairs) == sum(len(result['transfers']) for result in results)
+    assert len({p['pair_id'] for p in session.pairs}) == len(session.pairs)
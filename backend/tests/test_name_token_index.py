@@ -0,0 +1,32 @@
+"""
+Test that the name-token index finds exactly the names CrossBankMatcher._names_match accepts.
+"""
+from backend.core.transfer_detection import CrossBankMatcher, NameTokenIndex
+
+
+def test_matching_positions_agree_with_names_match():
+    incoming_names = ['John Doe', 'Alice Smith', 'johnny', 'KHALID AHMED', 'Sara', None, 'Doe']
+    outgoing_names = ['John', 'john doe', 'Ali', 'Bob', 'smith alice', 'Sara Khan', 'ahmed']
+
+    index = NameTokenIndex()
+    for position, name in enumerate(incoming_names):
+        index.add(position, name)
+
+    matcher = CrossBankMatcher.__new__(CrossBankMatcher)
+    for outgoing_name in outgoing_names:
+        expected = {position for position, incoming_name in enumerate(incoming_names)
+                    if incoming_name and matcher._names_match(outgoing_name, incoming_name)}
+        assert index.matching_positions(outgoing_name) == expected, outgoing_name
+
+    # "Ali" only matches "KHALID AHMED" by containment, not by a shared token
+    assert index.matching_positions('Ali') == {1, 3}
+    assert index.name_at(5) is None
+    assert index.name_at(0) == 'John Doe'
+
+
+def test_index_updates_after_add():
+    index = NameTokenIndex()
+    index.add(0, 'John Doe')
+    assert index.matching_positions('doe') == {0}
+    index.add(1, 'Jane Doe')
+    assert index.matching_positions('doe') == {0, 1}
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test parallel multi-file parsing: the process pool returns the results serial
+processing would, in input order, and one failing file does not fail the others.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+
+import pytest
+
+from backend.api.models import ParseConfig
+from backend.benchmarks import SyntheticStatementGenerator
+from backend.services import file_processing_pool
+from backend.services.multi_csv_service import MultiCSVService
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_data')
+
+
+@pytest.fixture(scope='module')
+def uploads(tmp_path_factory):
+    dataset = SyntheticStatementGenerator(seed=11).generate(300, str(tmp_path_factory.mktemp('statements')))
+    file_infos = [{'file_id': f'file-{index}', 'temp_path': statement.path, 'original_name': statement.file_name}
+                  for index, statement in enumerate(dataset.statements)]
+    configs = [ParseConfig(start_row=statement.profile.header_row) for statement in dataset.statements]
+    yield file_infos, configs
+    file_processing_pool.shutdown_file_processing_pool()
+
+
+def parse(file_infos, configs, max_workers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return MultiCSVService(max_workers=max_workers).parse_multiple_files(file_infos, configs)
+
+
+class TestParallelParsing:
+    """Pool results match serial ones file for file"""
+
+    def test_matches_serial_in_input_order(self, uploads):
+        file_infos, configs = uploads
+
+        serial = parse(file_infos, configs, max_workers=1)
+        parallel = parse(file_infos, configs, max_workers=2)
+
+        assert len(file_infos) > 2
+        assert parallel['success'] and parallel['total_files'] == len(file_infos)
+        assert [result['file_id'] for result in parallel['parsed_csvs']] == [info['file_id'] for info in file_infos]
+        assert parallel == serial
+
+    def test_misdetected_and_multi_bank_batch_matches_serial(self, tmp_path, monkeypatch):
+        # Each worker starts with no bank configs loaded, whatever this process has loaded
+        monkeypatch.setenv('HISAABFLOW_CONFIG_SNAPSHOT_DISABLED', '1')
+        monkeypatch.setenv('HISAABFLOW_PARSE_CACHE_DISABLED', '1')
+        file_processing_pool.shutdown_file_processing_pool()
+        names = ['2019-03-02_11-50-46_bunq-statement.csv', 'AccountFullStatement.CSV',
+                 'm-02-2025.csv', '2019-03-02_11-50-46_bunq-statement.csv']
+        file_infos = []
+        for index, name in enumerate(names):
+            path = shutil.copy(os.path.join(SAMPLE_DIR, name), tmp_path / f'{index}-{name}')
+            file_infos.append({'file_id': f'file-{index}', 'temp_path': str(path), 'original_name': name})
+        configs = [ParseConfig(start_row=0) for _ in names]
+
+        try:
+            parallel = parse(file_infos, configs, max_workers=2)
+        finally:
+            file_processing_pool.shutdown_file_processing_pool()
+        serial = parse(file_infos, configs, max_workers=1)
+
+        assert [csv['success'] for csv in parallel['parsed_csvs']] == [True] * len(names)
+        assert parallel == serial
+
+    def test_failing_file_is_isolated(self, uploads, tmp_path):
+        file_infos, configs = uploads
+        missing = {'file_id': 'missing', 'temp_path': str(tmp_path / 'gone.csv'), 'original_name': 'gone.csv'}
+
+        result = parse([file_infos[0], missing, file_infos[1]], [configs[0], configs[0], configs[1]], max_workers=2)
+
+        assert result['success']
+        assert [csv['success'] for csv in result['parsed_csvs']] == [True, False, True]
+        assert 'gone.csv' in result['parsed_csvs'][1]['error']
+
+    def test_single_file_does_not_start_a_pool(self, uploads, monkeypatch):
+        file_infos, configs = uploads
+        monkeypatch.setattr(file_processing_pool, '_pool', None)
+        started = []
+        monkeypatch.setattr('backend.services.multi_csv_service.get_file_processing_pool',
+                            lambda *args: started.append(args))
+
+        result = parse(file_infos[:1], configs[:1], max_workers=4)
+
+        assert result['parsed_csvs'][0]['success']
+        assert not started
+
+    def test_worker_count_from_environment(self, monkeypatch):
+        monkeypatch.setenv('HISAABFLOW_PARSE_WORKERS', '3')
+        assert file_processing_pool.default_worker_count() == 3
+        monkeypatch.setenv('HISAABFLOW_PARSE_WORKERS', '0')
+        assert file_processing_pool.default_worker_count() == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
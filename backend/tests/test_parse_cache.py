@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed parse cache: identical bytes and options skip detection
+and parsing, callers get their own copies, and the disk tier survives a new process.
+"""
+
+import os
+import pickle
+import threading
+
+import pytest
+
+from backend.infrastructure.csv_parsing import FileBuffer, ParseCache, UnifiedCSVParser
+from backend.infrastructure.csv_parsing.parse_cache import MISSING, options_key
+
+CSV_CONTENT = (
+    'Date,Description,Amount\n'
+    '2024-01-01,Coffee,-3.50\n'
+    '2024-01-02,Salary,1000.00\n'
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_text(CSV_CONTENT, encoding='utf-8')
+    return str(path)
+
+
+def counting_parser(cache):
+    parser = UnifiedCSVParser(parse_cache=cache)
+    calls = []
+    detect = parser.encoding_detector.detect_encoding
+    parser.encoding_detector.detect_encoding = lambda buffer: calls.append(buffer) or detect(buffer)
+    return parser, calls
+
+
+class Exploding:
+    def __reduce__(self):
+        return (pytest.fail, ('unverified cache entry was unpickled',))
+
+
+class TestParseCache:
+    """Memory LRU bounded by bytes, disk tier keyed by content"""
+
+    def test_get_returns_fresh_copies(self):
+        cache = ParseCache()
+        cache.put('key', {'data': [{'Amount': 1.0}]})
+
+        first = cache.get('key')
+        first['data'][0]['Amount'] = 2.0
+
+        assert cache.get('key') == {'data': [{'Amount': 1.0}]}
+        assert cache.get('other') is MISSING
+        assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = ParseCache(max_bytes=300)
+        cache.put('a', 'x' * 100)
+        cache.put('b', 'x' * 100)
+        cache.get('a')
+        cache.put('c', 'x' * 100)
+
+        assert cache.get('b') is MISSING
+        assert cache.get('a') != MISSING and cache.get('c') != MISSING
+        assert cache.stats()['bytes'] <= 300
+
+    def test_concurrent_access_keeps_size_accounting(self):
+        cache = ParseCache(max_bytes=1000)
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(2000):
+                    key = (i + offset) % 12
+                    if cache.get(key) is MISSING:
+                        cache.put(key, 'x' * (50 + key * 10))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert errors == []
+        assert stats['hits'] + stats['misses'] == 4 * 2000
+        assert stats['bytes'] == sum(len(data) for data in cache._entries.values()) <= 1000
+
+    def test_disk_tier_is_shared_between_instances(self, tmp_path):
+        ParseCache(cache_dir=str(tmp_path)).put(('parse', 'abc'), [1, 2], persistent=True)
+        ParseCache(cache_dir=str(tmp_path)).put(('process', 'abc'), [3])
+        cache = ParseCache(cache_dir=str(tmp_path))
+
+        assert cache.get(('parse', 'abc'), persistent=True) == [1, 2]
+        assert cache.get(('process', 'abc'), persistent=True) is MISSING
+        assert cache.stats()['disk_hits'] == 1
+
+        cache.clear(disk=True)
+        assert os.listdir(tmp_path) == ['.cache_key']
+
+    def test_disk_entries_are_verified_before_unpickling(self, tmp_path):
+        cache = ParseCache(cache_dir=str(tmp_path))
+        cache.put(('parse', 'abc'), [1, 2], persistent=True)
+        path = cache._disk_path(('parse', 'abc'))
+        with open(path, 'rb') as f:
+            frame = f.read()
+        # A payload that would run code when unpickled, under a forged signature
+        with open(path, 'wb') as f:
+            f.write(frame[:32] + pickle.dumps(Exploding()))
+
+        assert ParseCache(cache_dir=str(tmp_path)).get(('parse', 'abc'), persistent=True) is MISSING
+
+    @pytest.mark.skipif(not hasattr(os, 'getuid'), reason='POSIX permissions only')
+    def test_refuses_directory_writable_by_others(self, tmp_path):
+        os.chmod(tmp_path, 0o777)
+        cache = ParseCache(cache_dir=str(tmp_path))
+        cache.put(('parse', 'abc'), [1, 2], persistent=True)
+
+        assert os.listdir(tmp_path) == []
+        assert ParseCache(cache_dir=str(tmp_path)).get(('parse', 'abc'), persistent=True) is MISSING
+
+    def test_options_key_ignores_order(self):
+        assert options_key(header_row=2, encoding=None) == options_key(encoding=None, header_row=2)
+        assert options_key(header_row=2) != options_key(header_row='2')
+
+
+class TestParserCaching:
+    """parse_csv and preview_csv reuse results for identical content and options"""
+
+    def test_parse_skips_detection_for_same_content(self, csv_file, tmp_path):
+        parser, calls = counting_parser(ParseCache())
+        copy_path = tmp_path / 'copy.csv'
+        copy_path.write_text(CSV_CONTENT, encoding='utf-8')
+
+        first = parser.parse_csv(csv_file)
+        first['data'].clear()
+        second = parser.parse_csv(str(copy_path))
+
+        assert len(calls) == 1
+        assert second['success'] and len(second['data']) == 2
+
+    def test_options_and_content_are_part_of_the_key(self, csv_file):
+        parser, calls = counting_parser(ParseCache())
+
+        parser.parse_csv(csv_file)
+        parser.parse_csv(csv_file, max_rows=1)
+        parser.preview_csv(csv_file)
+        with open(csv_file, 'a', encoding='utf-8') as f:
+            f.write('2024-01-03,Rent,-500.00\n')
+        changed = parser.parse_csv(csv_file)
+
+        assert len(calls) == 4
+        assert changed['row_count'] == 3
+
+    def test_cached_result_matches_uncached(self, csv_file):
+        expected = UnifiedCSVParser(parse_cache=ParseCache(enabled=False)).parse_csv(csv_file)
+        parser = UnifiedCSVParser(parse_cache=ParseCache())
+        parser.parse_csv(csv_file)
+
+        with FileBuffer.open(csv_file) as buffer:
+            assert parser.parse_csv(buffer) == expected
+        assert parser.parse_cache.stats()['hits'] == 1
+
+    def test_failures_are_not_cached(self, tmp_path):
+        parser = UnifiedCSVParser(parse_cache=ParseCache())
+        path = tmp_path / 'empty.csv'
+        path.write_bytes(b'')
+
+        assert not parser.preview_csv(str(path))['success']
+        assert len(parser.parse_cache) == 0
+
+    def test_disk_tier_skips_parsing_in_a_new_parser(self, csv_file, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        expected = UnifiedCSVParser(parse_cache=ParseCache(cache_dir=cache_dir)).preview_csv(csv_file)
+        parser, calls = counting_parser(ParseCache(cache_dir=cache_dir))
+
+        assert parser.preview_csv(csv_file) == expected
+        assert not calls
+
+
+class TestProcessingCaching:
+    """process_single_file reuses results until the configs change"""
+
+    def test_reuses_result_for_new_upload_of_same_file(self, csv_file, monkeypatch):
+        import contextlib
+        import io
+
+        from backend.infrastructure.config.dependency_injection import create_csv_processing_service
+        from backend.infrastructure.csv_parsing import parse_cache as parse_cache_module
+
+        monkeypatch.setattr(parse_cache_module, '_parse_cache', ParseCache())
+        config = {'encoding': 'utf-8', 'start_row': None, 'end_row': None}
+        with contextlib.redirect_stdout(io.StringIO()):
+            service = create_csv_processing_service()
+            first = service.process_single_file(
+                {'file_id': 'one', 'temp_path': csv_file, 'original_name': 'statement.csv'}, config)
+            second = service.process_single_file(
+                {'file_id': 'two', 'temp_path': csv_file, 'original_name': 'statement.csv'}, config)
+            state = service.config_service._state
+            with service.config_service.pinned_snapshot(state.with_detection_patterns(state.detection_patterns)):
+                third = service.process_single_file(
+                    {'file_id': 'three', 'temp_path': csv_file, 'original_name': 'statement.csv'}, config)
+
+        assert first['success'] and second['file_id'] == 'two'
+        assert {**second, 'file_id': 'one'} == first
+        assert third['parse_result'] == first['parse_result']
+        assert service.parse_cache.stats()['hits'] == 2  # The process hit plus its nested parse after the config change
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
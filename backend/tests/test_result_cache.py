@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the memoized description cleaning and categorization results.
+"""
+
+import shutil
+import sys
+import threading
+
+import pytest
+
+from backend.infrastructure.config.result_cache import MISSING, ResultCache
+from backend.infrastructure.config.unified_config_service import UnifiedConfigService
+
+
+@pytest.fixture
+def service(tmp_path):
+    source = UnifiedConfigService()
+    shutil.copytree(source.config_dir, tmp_path, dirs_exist_ok=True)
+    service = UnifiedConfigService(str(tmp_path))
+    assert service.get_bank_config('wise')
+    return service
+
+
+class TestResultCache:
+    """Repeated descriptions are served from the cache until configs change"""
+
+    def test_lru_eviction_and_counters(self):
+        cache = ResultCache(max_size=2)
+        cache.put('a', None)
+        cache.put('b', 2)
+        assert cache.get('a') is None  # None is a valid result and 'a' becomes most recent
+        cache.put('c', 3)
+        assert cache.get('b') is MISSING
+        assert cache.get('c') == 3
+        assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+        assert len(cache) == 2
+
+    def test_concurrent_get_and_put(self):
+        cache = ResultCache(max_size=4)
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(20000):
+                    key = (i + offset) % 8
+                    if cache.get(key) is MISSING:
+                        cache.put(key, key)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+        # Switch threads often so gets and evicting puts interleave
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+        assert cache.hits + cache.misses == 4 * 20000
+        assert len(cache) <= 4
+
+    def test_repeated_descriptions_hit(self, service):
+        first = service.categorize_merchant_with_debug('wise', 'Card transaction issued by Lidl')
+        first_cleaned = service.apply_description_cleaning('wise', 'Card transaction issued by Lidl')
+        first['category'] = 'mutated by caller'
+        for _ in range(3):
+            assert service.categorize_merchant_with_debug('wise', 'CARD TRANSACTION ISSUED BY LIDL')['category'] != 'mutated by caller'
+            assert service.apply_description_cleaning('wise', 'Card transaction issued by Lidl') == first_cleaned
+        stats = service.get_result_cache_stats()
+        assert stats['categorization']['hits'] == 3 and stats['categorization']['misses'] == 1
+        assert stats['description_cleaning']['hits'] == 3 and stats['description_cleaning']['misses'] == 1
+
+        service.reset_result_cache_stats()
+        assert service.get_result_cache_stats()['categorization']['hits'] == 0
+
+    def test_reload_and_save_clear_results(self, service):
+        service.categorize_merchant_with_debug('wise', 'Lidl')
+        service.reload_all_configs(force=True, full=True)
+        assert service.get_result_cache_stats()['categorization']['size'] == 0
+        service.categorize_merchant_with_debug('wise', 'Lidl')
+        assert service.get_result_cache_stats()['categorization']['misses'] == 2
+
+        service.get_bank_config('wise')
+        service.apply_description_cleaning('wise', 'Sent money to John')
+        service.save_bank_config('cachetest', {'bank_info': {'bank_name': 'cachetest'}})
+        assert service.get_result_cache_stats()['description_cleaning']['size'] == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test streaming parse mode against the whole-file parse.
+"""
+
+import glob
+import os
+
+import pytest
+
+from backend.infrastructure.csv_parsing import FileBuffer, UnifiedCSVParser
+from backend.infrastructure.csv_parsing.exceptions import DataExtractionError
+from backend.infrastructure.csv_parsing.parsing_strategies import ParsingStrategies
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_data')
+
+DIALECT = {'delimiter': ',', 'quotechar': '"', 'quoting': 0, 'skipinitialspace': True, 'line_terminator': '\n'}
+
+
+def write_statement(path, rows, metadata=()):
+    lines = list(metadata) + ['Date,Description,Amount,Balance']
+    lines += [f'2024-01-{day % 28 + 1:02d},"Payment {day}, ref",-{day}.50,{1000 + day}' for day in range(rows)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def collect(result):
+    assert result['success'], result.get('error')
+    batches = list(result['batches'])
+    return batches, [row for batch in batches for row in batch]
+
+
+class TestStreamingParse:
+    """Streamed batches concatenate to the rows parse_csv returns in one piece"""
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 100, 10000])
+    @pytest.mark.parametrize('options', [{}, {'header_row': 0, 'start_row': 1}, {'header_row': 2, 'start_row': 3}])
+    def test_matches_full_parse(self, tmp_path, chunk_size, options):
+        path = write_statement(tmp_path / 'statement.csv', 250, metadata=['Account,12345', ''])
+        parser = UnifiedCSVParser()
+        expected = parser.parse_csv(path, **options)
+
+        result = parser.parse_csv(path, stream=True, chunk_size=chunk_size, **options)
+        batches, rows = collect(result)
+
+        assert result['headers'] == expected['headers']
+        assert rows == expected['data']
+        assert result['metadata']['parsing_strategy'] == expected['metadata']['parsing_strategy']
+        assert all(len(batch) <= chunk_size for batch in batches)
+        info = result['metadata']['processing_info']
+        assert info['final_data_count'] == expected['row_count']
+        assert info['empty_rows_filtered'] == expected['metadata']['processing_info']['empty_rows_filtered']
+
+    def test_batches_are_bounded_by_chunk_size(self, tmp_path):
+        path = write_statement(tmp_path / 'large.csv', 25000)
+        result = UnifiedCSVParser().parse_csv(path, stream=True, chunk_size=10000)
+        batches, rows = collect(result)
+        assert [len(batch) for batch in batches] == [9999, 10000, 5001]  # The first raw batch held the header
+        assert len(rows) == 25000
+
+    def test_max_rows(self, tmp_path):
+        path = write_statement(tmp_path / 'statement.csv', 50)
+        parser = UnifiedCSVParser()
+        expected = parser.parse_csv(path, max_rows=20)
+        _, rows = collect(parser.parse_csv(path, stream=True, chunk_size=6, max_rows=20))
+        assert rows == expected['data']
+
+    def test_sample_statements_match_full_parse(self):
+        parser = UnifiedCSVParser()
+        for path in sorted(glob.glob(os.path.join(SAMPLE_DIR, '*'))):
+            expected = parser.parse_csv(path)
+            result = parser.parse_csv(path, stream=True)
+            _, rows = collect(result)
+            assert result['headers'] == expected['headers'], path
+            assert rows == expected['data'], path
+
+    def test_owned_buffer_is_closed_after_iteration(self, tmp_path, monkeypatch):
+        path = write_statement(tmp_path / 'statement.csv', 30)
+        closed = []
+        real_close = FileBuffer.close
+        monkeypatch.setattr(FileBuffer, 'close', lambda self: closed.append(self.path) or real_close(self))
+
+        result = UnifiedCSVParser().parse_csv(path, stream=True, chunk_size=10)
+        assert path not in closed
+        collect(result)
+        assert path in closed
+
+
+class TestStreamingStrategies:
+    """Strategy choice happens before any batch is handed out"""
+
+    def test_falls_back_to_csv_module_when_pandas_breaks_late(self, tmp_path):
+        # pandas only sees the extra fields on the last line
+        path = write_statement(tmp_path / 'statement.csv', 40)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('Total,,,,,,\n')
+        strategies = ParsingStrategies()
+        expected = strategies.parse_with_fallbacks(path, 'utf-8', DIALECT)
+
+        result = strategies.stream_with_fallbacks(path, 'utf-8', DIALECT, chunk_size=5)
+        _, rows = collect(result)
+        assert result['strategy_used'] == expected['strategy_used'] == 'csv_module'
+        assert rows == expected['raw_rows']
+
+    def test_failure_after_first_batch_raises(self, tmp_path, monkeypatch):
+        path = write_statement(tmp_path / 'statement.csv', 40)
+        strategies = ParsingStrategies()
+
+        def failing_stream(*args):
+            yield [['a']]
+            raise ValueError('broken row')
+
+        monkeypatch.setattr(strategies, '_stream_with_pandas', failing_stream)
+        result = strategies.stream_with_fallbacks(path, 'utf-8', DIALECT, chunk_size=5)
+        batches = result['batches']
+        assert next(batches) == [['a']]
+        with pytest.raises(DataExtractionError, match='after 1 rows'):
+            next(batches)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
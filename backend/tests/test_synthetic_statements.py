@@ -0,0 +1,30 @@
+"""
+Test that synthetic statements follow the bank configs and that their planted
+transfer pairs are recovered by transfer detection.
+"""
+import csv
+
+from backend.benchmarks import SyntheticStatementGenerator
+from backend.core.transfer_detection import TransferDetector
+
+
+def test_statements_use_configured_headers(tmp_path):
+    dataset = SyntheticStatementGenerator(seed=1).generate(300, str(tmp_path))
+
+    assert dataset.total_rows == 300
+    for statement in dataset.statements:
+        with open(statement.path, newline='', encoding='utf-8') as csv_file:
+            lines = list(csv.reader(csv_file))
+        header = lines[statement.profile.header_row]
+        assert header == statement.profile.headers
+        assert len(lines) == statement.profile.header_row + 1 + len(statement.transactions)
+
+
+def test_planted_pairs_are_recovered():
+    dataset = SyntheticStatementGenerator(seed=3).generate(1000)
+    kinds = {pair.kind for pair in dataset.planted_pairs}
+    assert kinds == {'cross_bank', 'currency_conversion'}
+
+    result = TransferDetector().detect_transfers(dataset.detector_input())
+
+    assert len(dataset.recovered_pairs(result['transfers'])) == len(dataset.planted_pairs)
@@ -0,0 +1,60 @@
+"""
+Test the structured tracing facility and that traced code paths run with
+tracing switched on.
+"""
+
+import pytest
+from backend.core.bank_detection import BankDetector
+from backend.core.transfer_detection import TransferDetector
+from backend.infrastructure.config.unified_config_service import get_unified_config_service
+from backend.shared.utils.tracing import configure_tracing, get_trace, get_tracer, start_trace, tracing_enabled
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    configure_tracing('')
+    yield
+    configure_tracing('')
+
+
+def test_disabled_by_default():
+    tracer = get_tracer('transfer_detection')
+    assert not tracing_enabled()
+    assert not tracer.error and not tracer.debug and not tracer.trace
+
+
+def test_per_module_levels():
+    configure_tracing('transfer_detection=trace,bank_detection=info')
+
+    assert get_tracer('transfer_detection').trace
+    assert get_tracer('bank_detection').info and not get_tracer('bank_detection').debug
+    assert not get_tracer('data_cleaning').enabled
+
+    configure_tracing({'*': 'debug'})
+    assert get_tracer('data_cleaning').debug and not get_tracer('data_cleaning').trace
+
+    with pytest.raises(ValueError):
+        configure_tracing('transfer_detection=loud')
+
+
+def test_traced_detection_records_events_for_one_trace():
+    configure_tracing('*=trace')
+    trace_id = start_trace()
+
+    config = get_unified_config_service()
+    for bank in ('nayapay', 'wise'):
+        config.get_bank_config(bank)
+    sent = {'Date': '2025-01-21', 'Amount': -50.0, 'Title': 'Sent money to Ammar Qazi', 'Currency': 'EUR',
+            'Exchange To': 'PKR', 'Exchange To Amount': '15000'}
+    received = {'Date': '2025-01-22', 'Amount': 15000.0, 'Title': 'Incoming fund transfer from Ammar Qazi',
+                'Currency': 'PKR'}
+    result = TransferDetector(config_service=config).detect_transfers([
+        {'data': [sent], 'file_name': 'wise.csv', 'bank_info': {'bank_name': 'wise'}},
+        {'data': [received], 'file_name': 'nayapay.csv', 'bank_info': {'bank_name': 'nayapay'}},
+    ])
+    BankDetector(config).detect_bank('wise.csv', 'TransferwiseId,Date,Amount', ['TransferwiseId', 'Date'])
+
+    events = {event['event'] for event in get_trace(trace_id)}
+    assert len(result['transfers']) == 1
+    assert {'candidate_added', 'match_outgoing', 'best_match', 'bank_candidate'} <= events
+    assert get_trace('other-request') == []
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test the columnar transaction frame and the pipeline stages that run on it:
+frames must give back exactly the dict rows the list-based stages produced.
+"""
+
+import contextlib
+import copy
+import io
+
+import numpy as np
+import pytest
+
+from backend.benchmarks import SyntheticStatementGenerator
+from backend.benchmarks.run_benchmarks import parse_statements
+from backend.infrastructure.csv_cleaning.column_standardizer import ColumnStandardizer
+from backend.infrastructure.csv_cleaning.data_validator import DataValidator
+from backend.infrastructure.csv_cleaning.date_cleaner import DateCleaner
+from backend.shared.models import TransactionFrame
+from backend.shared.models.transaction_frame import MISSING
+
+ROWS = [
+    {'Date': '2024-01-01', 'Amount': -3.5, 'Title': 'Coffee', 'Account': 'Alpha'},
+    {'Date': '2024-01-02', 'Amount': 1000.0, 'Title': 'Salary', 'Account': 'Beta', '_transaction_index': 1},
+    {'Title': 'Coffee', 'Date': '2024-01-03', 'Account': 'Alpha', 'Note': None},
+]
+
+
+class TestTransactionFrame:
+    """Encoding, reading and in-place column updates"""
+
+    def test_round_trip_keeps_missing_keys(self):
+        frame = TransactionFrame.from_records(iter(ROWS))
+
+        assert len(frame) == 3
+        assert frame.columns == ['Date', 'Amount', 'Title', 'Account', '_transaction_index', 'Note']
+        assert frame.to_records() == ROWS
+        assert list(frame) == ROWS
+        assert frame[1] == ROWS[1] and frame[-1] == ROWS[-1]
+        assert frame[:2] == ROWS[:2]
+        with pytest.raises(IndexError):
+            frame.record(3)
+
+    def test_storage_per_column(self):
+        frame = TransactionFrame.from_records(ROWS)
+
+        assert frame.kind('Title') == 'str'
+        assert frame.kind('Amount') == 'float'
+        assert frame.kind('_transaction_index') == 'object'
+        assert frame.kind('Note') == 'object'
+        assert frame.kind('Category') is None
+
+    def test_column_reads_match_row_get(self):
+        frame = TransactionFrame.from_records(ROWS)
+
+        assert frame.column('Amount') == [row.get('Amount') for row in ROWS]
+        assert frame.column('Note', '') == [row.get('Note', '') for row in ROWS]
+        assert frame.column('Category', 'x') == ['x', 'x', 'x']
+        assert frame.present('Amount').tolist() == [True, True, False]
+        assert frame.get(2, 'Amount', 0.0) == 0.0
+        assert frame.coalesce(['Note', 'Title'], '') == [row.get('Note', row.get('Title', '')) for row in ROWS]
+
+    def test_factorize_in_first_appearance_order(self):
+        frame = TransactionFrame.from_records(ROWS + [{'Title': 'No account'}])
+
+        codes, uniques = frame.factorize('Account', 'Unknown')
+
+        assert uniques == ['Alpha', 'Beta', 'Unknown']
+        assert [uniques[code] for code in codes] == ['Alpha', 'Beta', 'Alpha', 'Unknown']
+
+    def test_set_values_adds_or_widens_columns(self):
+        frame = TransactionFrame.from_records(ROWS)
+
+        frame.set_values('Title', [0, 2], ['Espresso', 'Latte'])
+        frame.set_values('Category', [1], ['Income'])
+        frame.set_values('Amount', [2], ['12.00'])
+        frame.fill('Currency', 'EUR')
+
+        assert frame.kind('Title') == 'str'
+        assert frame.kind('Amount') == 'object'
+        expected = copy.deepcopy(ROWS)
+        expected[0]['Title'], expected[2]['Title'] = 'Espresso', 'Latte'
+        expected[1]['Category'] = 'Income'
+        expected[2]['Amount'] = '12.00'
+        for row in expected:
+            row['Currency'] = 'EUR'
+        assert frame.to_records() == [{key: row[key] for key in frame.columns if key in row} for row in expected]
+
+    def test_rename_columns_like_rebuilding_rows(self):
+        rows = [{'TIMESTAMP': 'a', 'DATE': 'b'}, {'DATE': 'c'}, {'TIMESTAMP': 'd'}]
+        mapping = {'TIMESTAMP': 'Date', 'DATE': 'Date'}
+        frame = TransactionFrame.from_records(rows)
+
+        frame.rename_columns(mapping)
+
+        assert frame.to_records() == [{mapping.get(key, key): value for key, value in row.items()} for row in rows]
+
+    def test_map_column_and_keep_rows(self):
+        frame = TransactionFrame.from_records(ROWS)
+
+        frame.map_column('Amount', abs)
+        frame.keep_rows(np.array([True, False, True]))
+
+        assert frame.column('Amount') == [3.5, None]
+        assert frame.column('Title') == ['Coffee', 'Coffee']
+
+    def test_concat_and_like(self):
+        first = TransactionFrame.from_records(ROWS[:1])
+        second = TransactionFrame.from_records([{'Title': 'Fee', 'Account': 'Gamma'}])
+
+        combined = TransactionFrame.concat([first, second])
+
+        assert combined.to_records() == [ROWS[0], {'Title': 'Fee', 'Account': 'Gamma'}]
+        assert combined.like(combined) is combined
+        assert combined.like([]) == combined.to_records()
+        assert TransactionFrame.coerce(combined) is combined
+
+    def test_repeated_strings_stored_once(self):
+        rows = [{'Account': 'Alpha Checking', 'Category': 'Groceries', 'Amount': float(index)}
+                for index in range(5000)]
+        frame = TransactionFrame.from_records(rows)
+
+        assert frame.nbytes < 5000 * 24
+        assert MISSING not in frame.column('Account')
+
+
+class TestCleaningStagesOnFrames:
+    """Frame versions of the cleaning steps give the list versions' rows"""
+
+    def test_date_cleaner(self):
+        rows = [{'Date': '02 Feb 2025', 'Title': 'a'}, {'Date': 'not a date', 'Title': 'b'}, {'Title': 'c'}]
+        cleaner = DateCleaner()
+
+        cleaned = cleaner.clean_date_columns(rows)
+
+        assert cleaned == [{'Date': '2025-02-02', 'Title': 'a'}, {'Date': 'not a date', 'Title': 'b'},
+                           {'Title': 'c'}]
+        assert cleaner.invalid_dates == {'Date': ['not a date']}
+
+    def test_data_validator_matches_row_check(self):
+        rows = [{'Amount': 0.0, 'Date': ''}, {'Amount': '12', 'Title': 'x'}, {'Title': 'only'},
+                {'Datum': '2024-01-01'}, {'Debit': None, 'Credit': '0'}]
+        validator = DataValidator()
+
+        kept = validator.remove_invalid_frame_rows(TransactionFrame.from_records(rows)).to_records()
+
+        assert kept == [row for row in rows if validator._is_valid_row(row)]
+
+    def test_column_standardizer(self):
+        rows = [{'TIMESTAMP': '2024-01-01', 'AMOUNT': '1', 'running_total': '5'}]
+
+        standardized, mapping = ColumnStandardizer().standardize_columns(rows, {'column_mapping': {}})
+
+        assert mapping['running_total'] == 'RunningTotal'
+        assert standardized == [{'Date': '2024-01-01', 'Amount': '1', 'RunningTotal': '5'}]
+
+
+@pytest.fixture(scope='module')
+def parsed_statements(tmp_path_factory):
+    dataset = SyntheticStatementGenerator(seed=5).generate(400, str(tmp_path_factory.mktemp('statements')))
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse_statements(dataset)
+
+
+class TestPipelineOnFrames:
+    """Transform and cleaning stages run on one frame end to end"""
+
+    def test_advanced_processing_same_for_list_and_frame(self, parsed_statements):
+        from backend.services.transformation_service import TransformationService
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            service = TransformationService()
+            transformed = service.cashew_transformation_service.transform_multi_csv_data(
+                copy.deepcopy(parsed_statements))['data']
+            rows = transformed.to_records()
+            from_list = service.data_cleaning_service.apply_advanced_processing(rows, parsed_statements)
+            from_frame = service.data_cleaning_service.apply_advanced_processing(transformed, parsed_statements)
+
+        assert isinstance(transformed, TransactionFrame)
+        assert isinstance(from_list, list)
+        assert from_frame is transformed
+        assert from_frame.to_records() == from_list
+
+    def test_transform_leaves_request_rows_untouched(self, parsed_statements):
+        from backend.services.transformation_service import TransformationService
+
+        request = copy.deepcopy(parsed_statements)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = TransformationService().transform_multi_csv_data({'csv_data_list': request})
+
+        assert result['success']
+        assert isinstance(result['transformed_data'], list)
+        assert request == parsed_statements
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,47 @@
+"""
+Test that compiled transfer patterns pick the same pattern and name as
+checking each configured pattern in turn.
+"""
+
+from backend.infrastructure.config.transfer_pattern_registry import BankTransferPatterns
+
+
+def _is_valid_name(name):
+    return len(name.strip()) >= 2 and not name.strip().isdigit()
+
+
+def _sequential_match(outgoing, incoming, description):
+    """Reference: first pattern (outgoing first, config order) that matches"""
+    patterns = BankTransferPatterns(outgoing, incoming, _is_valid_name)
+    for compiled in patterns.ordered:
+        matched, name = compiled.matches(description, description.lower(), _is_valid_name)
+        if matched:
+            return compiled.direction, compiled.pattern, name
+    return None
+
+
+class TestBankTransferPatterns:
+
+    OUTGOING = ['Transfer to {name}', 'Money sent to {name}', 'To {user_name}']
+    INCOMING = ['Incoming fund transfer from {name}', 'Received money from {name}', 'Top-up by']
+
+    def test_combined_match_equals_sequential_scan(self):
+        compiled = BankTransferPatterns(self.OUTGOING, self.INCOMING, _is_valid_name)
+        descriptions = [
+            'Transfer to Ammar Qazi',
+            'money sent to JOHN DOE, ref 42',
+            'Incoming fund transfer from Jane (Wise)',
+            'Received money from 12',       # numeric name is rejected, no later match
+            'Top-up by card',
+            'Received money from 12 then To Someone Else',
+            'Grocery store purchase',
+            '',
+        ]
+        for description in descriptions:
+            assert compiled.match(description) == _sequential_match(self.OUTGOING, self.INCOMING, description), description
+
+    def test_extract_name_by_direction(self):
+        compiled = BankTransferPatterns(self.OUTGOING, self.INCOMING, _is_valid_name)
+        assert compiled.extract_name('outgoing', 'Transfer to Ammar Qazi') == 'Ammar Qazi'
+        assert compiled.extract_name('incoming', 'Transfer to Ammar Qazi') is None
+        assert compiled.extract_name('incoming', 'Received money from Ali, ref') == 'Ali'
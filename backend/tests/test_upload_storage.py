@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test streamed uploads: files are written in chunks with their hash and line count,
+uploads over the size limit are rejected without leaving a temp file behind.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from backend.api import file_endpoints
+from backend.api.file_manager import FileManager
+from backend.api.upload_storage import save_upload
+from backend.infrastructure.csv_parsing import FileBuffer
+
+CONTENT = b'Date,Description,Amount\n2024-01-01,Coffee,-3.50\n2024-01-02,Salary,1000.00'
+
+
+def upload(data, name='statement.csv'):
+    return UploadFile(file=io.BytesIO(data), filename=name)
+
+
+class TestSaveUpload:
+    """Chunked copy with hash, size and line count"""
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+    def test_stores_content_with_hash_and_lines(self, chunk_size):
+        stored = asyncio.run(save_upload(upload(CONTENT), chunk_size=chunk_size))
+        try:
+            with open(stored['temp_path'], 'rb') as f:
+                assert f.read() == CONTENT
+            assert stored['size'] == len(CONTENT)
+            assert stored['content_hash'] == hashlib.sha256(CONTENT).hexdigest()
+            assert stored['line_count'] == 3
+            with FileBuffer.open(stored['temp_path']) as buffer:
+                assert buffer.digest == stored['content_hash']
+        finally:
+            os.unlink(stored['temp_path'])
+
+    def test_empty_upload(self):
+        stored = asyncio.run(save_upload(upload(b'')))
+        os.unlink(stored['temp_path'])
+        assert (stored['size'], stored['line_count']) == (0, 0)
+
+    def test_oversized_upload_is_rejected_and_removed(self, monkeypatch, tmp_path):
+        monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(save_upload(upload(CONTENT), max_bytes=20, chunk_size=8))
+        assert error.value.status_code == 413
+        assert not os.listdir(tmp_path)
+
+    def test_cleanup_keeps_the_original_error(self, monkeypatch, tmp_path):
+        monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+
+        class FailingUpload:
+            async def read(self, size):
+                for path in os.listdir(tmp_path):
+                    os.unlink(tmp_path / path)
+                raise ConnectionResetError('client went away')
+
+        with pytest.raises(ConnectionResetError):
+            asyncio.run(save_upload(FailingUpload()))
+        assert not os.listdir(tmp_path)
+
+    def test_limit_from_environment(self, monkeypatch):
+        monkeypatch.setenv('HISAABFLOW_MAX_UPLOAD_BYTES', '10')
+        with pytest.raises(HTTPException):
+            asyncio.run(save_upload(upload(CONTENT)))
+
+
+class TestUploadEndpoints:
+    """Both upload paths return and record the content hash"""
+
+    def test_file_manager(self):
+        manager = FileManager()
+        response = asyncio.run(manager.upload_file(upload(CONTENT)))
+        try:
+            info = manager.get_file_info(response['file_id'])
+            assert response['content_hash'] == info['content_hash'] == hashlib.sha256(CONTENT).hexdigest()
+            assert response['size'] == info['size'] == len(CONTENT)
+            assert info['original_name'] == 'statement.csv'
+        finally:
+            manager.cleanup_file(response['file_id'])
+
+    def test_file_manager_limit(self):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(FileManager(max_upload_bytes=10).upload_file(upload(CONTENT)))
+        assert error.value.status_code == 413
+
+    def test_file_endpoint(self):
+        response = asyncio.run(file_endpoints.upload_file(upload(CONTENT)))
+        try:
+            info = file_endpoints.get_uploaded_file(response['file_id'])
+            assert info['content_hash'] == response['content_hash']
+            assert response['line_count'] == info['line_count'] == 3
+        finally:
+            asyncio.run(file_endpoints.cleanup_file(response['file_id']))
+        assert file_endpoints.get_uploaded_file(response['file_id']) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,77 @@
+"""
+Test that cross-bank matching with the vectorized kernel finds the same pairs and
+potential pairs as the per-pair checks.
+"""
+import random
+
+from backend.core.transfer_detection import TransferDetector
+from backend.core.transfer_detection.cross_bank_matcher import CrossBankMatcher
+
+
+def _generate_csvs(seed=7, rows_per_bank=150):
+    rng = random.Random(seed)
+    names = ['John Doe', 'Alice Smith', 'Ammar Qazi', 'Sara Khan']
+    nayapay, wise = [], []
+    for i in range(rows_per_bank):
+        day = f'2025-{rng.randint(1, 3):02d}-{rng.randint(1, 28):02d}'
+        name = rng.choice(names)
+        amount = float(rng.choice([500, 1500, 2000, 15000, rng.randint(1, 50000)]))
+        nayapay.append({'Date': day, 'Amount': -amount, 'Title': f'Outgoing fund transfer to {name}',
+                        'Description': f'Outgoing fund transfer to {name}', 'Currency': 'PKR'})
+        wise.append({'Date': day, 'Amount': amount, 'Title': f'Received money from {name}',
+                     'Description': f'Received money from {name}', 'Currency': 'PKR'})
+        if i % 5 == 0:
+            sent = {'Date': day, 'Amount': -50.0, 'Title': f'Sent money to {name}',
+                    'Description': f'Sent money to {name}', 'Currency': 'EUR',
+                    'Exchange To': 'PKR', 'Exchange To Amount': str(amount)}
+            wise.append(sent)
+            nayapay.append({'Date': day, 'Amount': amount, 'Title': f'Incoming fund transfer from {name}',
+                            'Description': f'Incoming fund transfer from {name}', 'Currency': 'PKR'})
+    return [
+        {'data': nayapay, 'file_name': 'nayapay.csv', 'bank_info': {'bank_name': 'nayapay'}},
+        {'data': wise, 'file_name': 'wise.csv', 'bank_info': {'bank_name': 'wise'}},
+    ]
+
+
+def _summarize(result):
+    pairs = [(p['outgoing']['_transaction_index'], p['incoming']['_transaction_index'],
+              p['match_strategy'], p['confidence']) for p in result['transfers']]
+    potential = [(p['outgoing']['_transaction_index'], p['incoming']['_transaction_index'])
+                 for p in result['potential_pairs']]
+    return pairs, potential
+
+
+def test_vectorized_kernel_matches_scalar_checks(monkeypatch):
+    csvs = _generate_csvs()
+
+    monkeypatch.setattr(CrossBankMatcher, 'use_vectorized_kernel', True)
+    vectorized = _summarize(TransferDetector().detect_transfers(csvs))
+    monkeypatch.setattr(CrossBankMatcher, 'use_vectorized_kernel', False)
+    scalar = _summarize(TransferDetector().detect_transfers(csvs))
+
+    assert vectorized[0], "expected the generated data to contain transfer pairs"
+    assert vectorized == scalar
+
+
+def test_same_day_bonus_only_counts_date_column(monkeypatch):
+    from backend.core.transfer_detection.confidence_calculator import ConfidenceCalculator
+    from backend.core.transfer_detection.transaction_record import TransactionRecord
+
+    outgoing = {'Date': '2025-02-03', 'Amount': '-500', 'Description': 'Sent money to John Doe'}
+    incoming = {'TIMESTAMP': '2025-02-03', 'Amount': '500', 'Description': 'Received money from John Doe'}
+    calculator = ConfidenceCalculator()
+    expected = calculator.calculate_confidence(outgoing, incoming, is_cross_bank=True)
+    scored = calculator.calculate_record_confidence(TransactionRecord.from_transaction(outgoing),
+                                                    TransactionRecord.from_transaction(incoming),
+                                                    is_cross_bank=True)
+    assert scored == expected == 0.7
+
+    csvs = _generate_csvs(rows_per_bank=40)
+    for row in csvs[1]['data']:
+        row['TIMESTAMP'] = row.pop('Date')
+    monkeypatch.setattr(CrossBankMatcher, 'use_vectorized_kernel', True)
+    vectorized = _summarize(TransferDetector().detect_transfers(csvs))
+    monkeypatch.setattr(CrossBankMatcher, 'use_vectorized_kernel', False)
+    scalar = _summarize(TransferDetector().detect_transfers(csvs))
+
+    assert vectorized[0] and vectorized == scalar